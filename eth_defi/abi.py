@@ -28,6 +28,7 @@ from web3.contract.contract import Contract, ContractEvent, ContractFunction
 # Cache loaded ABI files in-process memory for speedup
 from web3.datastructures import AttributeDict
 
+from eth_defi.abi_index import get_call_output_types, get_default_abi_index
 from eth_defi.compat import abi_to_signature, get_function_info
 
 # How big are our ABI and contract caches
@@ -94,6 +95,9 @@ def get_contract(
 
     Any results are cached. Web3 connection is part of the cache key.
 
+    If ``ABI_INDEX_PATH`` is set, the ABI and bytecode are read from
+    the precompiled :py:mod:`eth_defi.abi_index` instead of parsing the JSON file.
+
     .. note::
 
         If the contract requires library linking (Forge ``linkReferences``),
@@ -122,35 +126,44 @@ def get_contract(
         Contract proxy class
     """
 
-    contract_interface = get_abi_by_filename(fname)
+    index = get_default_abi_index()
+    indexed = index.load_contract_interface(fname) if index is not None else None
 
-    if type(contract_interface) == list:
-        # Etherscan
-        abi = contract_interface
-        bytecode = None
+    if indexed is not None:
+        # Precompiled ABI index, see eth_defi.abi_index
+        abi, indexed_bytecode = indexed
+        if bytecode is None:
+            bytecode = indexed_bytecode
     else:
-        # Solc output
-        abi = contract_interface["abi"]
+        contract_interface = get_abi_by_filename(fname)
 
-        if bytecode is None:
-            bytecode = contract_interface.get("bytecode")
-
-        if type(bytecode) == dict:
-            # Sol 0.8 / Forge?
-            # Contains keys object, sourceMap, linkReferences
-            bytecode = bytecode["object"]
-            # Auto-link unresolved library placeholders with zero address.
-            # Forge leaves __$<hash>$__ patterns in bytecode for external
-            # libraries (e.g. HypercoreVaultLib). When not explicitly linked
-            # via get_contract_with_forge_libraries(), replace with zeros so
-            # the bytecode is valid hex. The library code paths must never be
-            # entered at runtime on chains where the library is not deployed.
-            if "__$" in bytecode:
-                bytecode = re.sub(r"__\$[0-9a-f]+\$__", "0" * 40, bytecode)
+        if type(contract_interface) == list:
+            # Etherscan
+            abi = contract_interface
+            bytecode = None
         else:
-            # Sol 0.6 / legacy
-            # Bytecode hex is directly in the key.
-            pass
+            # Solc output
+            abi = contract_interface["abi"]
+
+            if bytecode is None:
+                bytecode = contract_interface.get("bytecode")
+
+            if type(bytecode) == dict:
+                # Sol 0.8 / Forge?
+                # Contains keys object, sourceMap, linkReferences
+                bytecode = bytecode["object"]
+                # Auto-link unresolved library placeholders with zero address.
+                # Forge leaves __$<hash>$__ patterns in bytecode for external
+                # libraries (e.g. HypercoreVaultLib). When not explicitly linked
+                # via get_contract_with_forge_libraries(), replace with zeros so
+                # the bytecode is valid hex. The library code paths must never be
+                # entered at runtime on chains where the library is not deployed.
+                if "__$" in bytecode:
+                    bytecode = re.sub(r"__\$[0-9a-f]+\$__", "0" * 40, bytecode)
+            else:
+                # Sol 0.6 / legacy
+                # Bytecode hex is directly in the key.
+                pass
 
     Contract = web3.eth.contract(abi=abi, bytecode=bytecode)
     return Contract
@@ -365,7 +378,8 @@ def encode_with_signature(function_signature: str, args: Sequence) -> bytes:
 def decode_function_output(func: ContractFunction, data: bytes) -> Any:
     """Decode raw return value of Solidity function using Contract proxy object.
 
-    Uses `web3.Contract.functions` prepared function as the ABI source.
+    Uses the output types of the ABI index selector table if enabled,
+    see :py:mod:`eth_defi.abi_index`, otherwise `web3.Contract.functions` prepared function as the ABI source.
 
     :param func:
         Function which arguments we are going to encode.
@@ -377,6 +391,10 @@ def decode_function_output(func: ContractFunction, data: bytes) -> Any:
     """
     assert isinstance(func, ContractFunction)
 
+    output_types = get_call_output_types(bytes.fromhex(func.selector[2:]))
+    if output_types is not None:
+        return eth_abi.decode(output_types, data)
+
     web3 = func.w3
 
     fn_abi, fn_selector, aligned_fn_arguments = get_function_info(
@@ -0,0 +1,449 @@
+"""Precompiled index of the bundled ABI files.
+
+The ``eth_defi/abi`` tree is over 200 MB of compiler artefacts: ABI, bytecode,
+source maps and ASTs. :py:func:`eth_defi.abi.get_contract` needs only the ABI
+and the bytecode, but every process, including every loky worker, parses
+the full JSON files again.
+
+- :py:func:`build_abi_index` compiles the tree once, in parallel, into a single binary file:
+  compact ABI JSON and bytecode per file, function selectors with output types,
+  and event topics
+- :py:class:`AbiIndex` memory-maps the file. ABIs are read on demand, so opening
+  the index costs a few milliseconds regardless of how many contracts a process uses
+- Entries are checked against the source file size and modification time,
+  so edited ABI files fall back to JSON parsing until the index is rebuilt
+- :py:meth:`eth_defi.event_reader.multicall_batcher.EncodedCallResult.decode` decodes
+  raw multicall results with the output types of the selector table,
+  without creating web3 contract objects
+
+Building the index takes a while, so it is never built implicitly.
+Build it once after installing or updating the package, then enable it for
+:py:func:`eth_defi.abi.get_contract` by setting ``ABI_INDEX_PATH``
+to the file path, or to ``default`` for :py:data:`DEFAULT_ABI_INDEX_PATH`.
+If the file does not exist, ABI files are parsed from JSON as usual.
+
+.. code-block:: shell
+
+    export ABI_INDEX_PATH=default
+    python -m eth_defi.abi_index
+
+Example:
+
+.. code-block:: python
+
+    from eth_defi.abi_index import get_default_abi_index
+
+    index = get_default_abi_index()
+    for function in index.get_functions_by_selector(bytes.fromhex("70a08231")):
+        print(function.fname, function.signature, function.output_types)
+"""
+
+import json
+import logging
+import mmap
+import os
+import pickle
+import re
+import struct
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from eth_defi.disk_cache import DEFAULT_CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+#: Where the bundled ABI files live
+ABI_ROOT = Path(__file__).resolve().parent / "abi"
+
+#: Default index location
+DEFAULT_ABI_INDEX_PATH = DEFAULT_CACHE_ROOT / "abi-index.bin"
+
+#: File magic and format version
+ABI_INDEX_MAGIC = b"EDFABI04"
+
+#: Magic, file directory length, selector and topic table length
+_HEADER = struct.Struct("<8sQQ")
+
+
+@dataclass(slots=True, frozen=True)
+class AbiIndexEntry:
+    """Where one ABI file is in the index payload."""
+
+    #: Path relative to :py:data:`ABI_ROOT`, with forward slashes
+    fname: str
+
+    #: Source file size when indexed
+    source_size: int
+
+    #: Source file modification time when indexed
+    source_mtime_ns: int
+
+    abi_offset: int
+
+    abi_length: int
+
+    #: -1 if the file has no bytecode
+    bytecode_offset: int
+
+    bytecode_length: int
+
+
+@dataclass(slots=True, frozen=True)
+class AbiFunctionInfo:
+    """Function known by its 4-byte selector."""
+
+    fname: str
+
+    name: str
+
+    #: Canonical signature, e.g. ``balanceOf(address)``
+    signature: str
+
+    #: Canonical output types for :py:func:`eth_abi.decode`
+    output_types: tuple[str, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class AbiEventInfo:
+    """Event known by its topic 0."""
+
+    fname: str
+
+    name: str
+
+    signature: str
+
+    #: Canonical types of all inputs
+    input_types: tuple[str, ...]
+
+    #: Which inputs are indexed topics
+    indexed: tuple[bool, ...]
+
+
+def _compile_abi_file(abi_root: Path, path: Path) -> tuple | None:
+    """Extract what the index stores from one JSON file. Runs in a worker process."""
+    from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector  # noqa: PLC0415
+    from eth_utils.abi import abi_to_signature, collapse_if_tuple  # noqa: PLC0415
+
+    stat = path.stat()
+    with open(path, "rt", encoding="utf-8") as f:
+        contract_interface = json.load(f)
+
+    if isinstance(contract_interface, list):
+        # Etherscan
+        abi = contract_interface
+        bytecode = None
+    else:
+        abi = contract_interface.get("abi")
+        if abi is None:
+            return None
+        bytecode = contract_interface.get("bytecode")
+        if isinstance(bytecode, dict):
+            # Same linking placeholder handling as get_contract()
+            bytecode = bytecode["object"]
+            if "__$" in bytecode:
+                bytecode = re.sub(r"__\$[0-9a-f]+\$__", "0" * 40, bytecode)
+
+    if not isinstance(abi, list):
+        # Odd artefacts, e.g. ABI as an embedded string, stay on the JSON path
+        return None
+
+    fname = path.relative_to(abi_root).as_posix()
+    functions = []
+    events = []
+    for item in abi:
+        if not isinstance(item, dict):
+            continue
+        try:
+            if item.get("type") == "function":
+                functions.append(
+                    (
+                        function_abi_to_4byte_selector(item),
+                        (fname, item["name"], abi_to_signature(item), tuple(collapse_if_tuple(o) for o in item.get("outputs", []))),
+                    )
+                )
+            elif item.get("type") == "event":
+                events.append(
+                    (
+                        event_abi_to_log_topic(item),
+                        (fname, item["name"], abi_to_signature(item), tuple(collapse_if_tuple(i) for i in item["inputs"]), tuple(bool(i.get("indexed")) for i in item["inputs"])),
+                    )
+                )
+        except (KeyError, TypeError, ValueError) as e:
+            # Hand written ABIs with odd entries
+            logger.debug("Skipping ABI item in %s: %s", fname, e)
+
+    abi_bytes = json.dumps(abi, separators=(",", ":")).encode()
+    bytecode_bytes = bytecode.encode() if isinstance(bytecode, str) else None
+    return fname, stat.st_size, stat.st_mtime_ns, abi_bytes, bytecode_bytes, functions, events
+
+
+def _compile_abi_files(abi_root: Path, paths: list[Path]) -> list[tuple]:
+    return [_compile_abi_file(abi_root, p) for p in paths]
+
+
+def build_abi_index(
+    output_path: Path,
+    abi_root: Path = ABI_ROOT,
+    max_workers: int | None = None,
+) -> Path:
+    """Compile all ABI JSON files under a directory into an index file.
+
+    - Files are parsed in parallel worker processes
+    - Written atomically: concurrent builders and readers see either the old or the new file
+
+    :param output_path:
+        Index file to write.
+
+    :param abi_root:
+        Directory of ABI JSON files.
+
+    :param max_workers:
+        Worker processes. ``1`` parses in this process.
+
+    :return:
+        ``output_path``
+    """
+    paths = sorted(abi_root.rglob("*.json"))
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+
+    if max_workers == 1:
+        compiled = _compile_abi_files(abi_root, paths)
+    else:
+        # Interleave so big Aave test artefacts do not all land in one batch
+        batches = [paths[i :: max_workers * 4] for i in range(max_workers * 4)]
+        compiled = []
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for result in executor.map(_compile_abi_files, [abi_root] * len(batches), batches):
+                compiled.extend(result)
+
+    # Plain tuples: unpickling them is several times faster than dataclasses
+    entries = {}
+    functions: dict[bytes, list[tuple]] = {}
+    events: dict[bytes, list[tuple]] = {}
+    payload = bytearray()
+    for item in compiled:
+        if item is None:
+            continue
+        fname, size, mtime_ns, abi_bytes, bytecode_bytes, file_functions, file_events = item
+        abi_offset = len(payload)
+        payload += abi_bytes
+        if bytecode_bytes is not None:
+            bytecode_offset = len(payload)
+            payload += bytecode_bytes
+        else:
+            bytecode_offset = -1
+        entries[fname] = (size, mtime_ns, abi_offset, len(abi_bytes), bytecode_offset, len(bytecode_bytes or b""))
+        for selector, info in file_functions:
+            functions.setdefault(selector, []).append(info)
+        for topic, info in file_events:
+            events.setdefault(topic, []).append(info)
+
+    directory = pickle.dumps(entries, protocol=pickle.HIGHEST_PROTOCOL)
+    tables = pickle.dumps((functions, events), protocol=pickle.HIGHEST_PROTOCOL)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(ABI_INDEX_MAGIC, len(directory), len(tables)))
+            f.write(directory)
+            f.write(tables)
+            f.write(payload)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    logger.info("Built ABI index %s: %d files, %d selectors, %d topics, %d bytes", output_path, len(entries), len(functions), len(events), output_path.stat().st_size)
+    return output_path
+
+
+class AbiIndex:
+    """Memory-mapped ABI index.
+
+    Thread safe for reading.
+
+    :param path:
+        File written by :py:func:`build_abi_index`.
+
+    :param abi_root:
+        Source tree, for staleness checks.
+    """
+
+    def __init__(self, path: Path, abi_root: Path = ABI_ROOT):
+        self.path = Path(path)
+        self.abi_root = abi_root
+        with open(self.path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, directory_length, tables_length = _HEADER.unpack_from(self.mmap, 0)
+        if magic != ABI_INDEX_MAGIC:
+            raise ValueError(f"Not an ABI index, or an old format: {self.path}")
+        self.tables_offset = _HEADER.size + directory_length
+        self.payload_offset = self.tables_offset + tables_length
+
+        #: fname -> (source size, source mtime, ABI offset, ABI length, bytecode offset, bytecode length)
+        self.entries: dict[str, tuple] = pickle.loads(self.mmap[_HEADER.size : self.tables_offset])
+
+        # Selector and topic tables are loaded on the first lookup,
+        # processes that only create contracts never pay for them
+        self._functions: dict[bytes, list[tuple]] | None = None
+        self._events: dict[bytes, list[tuple]] | None = None
+        self._output_types: dict[bytes, tuple[str, ...] | None] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<AbiIndex {self.path}, {len(self.entries)} files>"
+
+    def close(self):
+        self.mmap.close()
+
+    def _load_tables(self):
+        with self._lock:
+            if self._functions is None:
+                self._functions, self._events = pickle.loads(self.mmap[self.tables_offset : self.payload_offset])
+
+    def _read(self, offset: int, length: int) -> bytes:
+        start = self.payload_offset + offset
+        return self.mmap[start : start + length]
+
+    def get_entry(self, fname: str | Path) -> AbiIndexEntry | None:
+        """Get an up-to-date entry for a bundled ABI file.
+
+        :return:
+            ``None`` if not indexed, or the source file changed since indexing
+        """
+        fname = Path(fname).as_posix()
+        values = self.entries.get(fname)
+        if values is None:
+            return None
+        entry = AbiIndexEntry(fname, *values)
+        try:
+            stat = (self.abi_root / fname).stat()
+        except FileNotFoundError:
+            return None
+        if stat.st_size != entry.source_size or stat.st_mtime_ns != entry.source_mtime_ns:
+            return None
+        return entry
+
+    def load_contract_interface(self, fname: str | Path) -> tuple[list, str | None] | None:
+        """Load ABI and bytecode of a bundled file.
+
+        Bytecode has Forge library placeholders replaced like in :py:func:`eth_defi.abi.get_contract`.
+
+        :return:
+            Tuple (ABI, bytecode hex or ``None``), or ``None`` if the file must be read from JSON
+        """
+        entry = self.get_entry(fname)
+        if entry is None:
+            return None
+        abi = json.loads(self._read(entry.abi_offset, entry.abi_length))
+        bytecode = self._read(entry.bytecode_offset, entry.bytecode_length).decode() if entry.bytecode_offset >= 0 else None
+        return abi, bytecode
+
+    def get_functions_by_selector(self, selector: bytes) -> list[AbiFunctionInfo]:
+        """Functions in any bundled ABI matching a 4-byte selector."""
+        if self._functions is None:
+            self._load_tables()
+        return [AbiFunctionInfo(*values) for values in self._functions.get(bytes(selector[:4]), [])]
+
+    def get_output_types(self, selector: bytes) -> tuple[str, ...] | None:
+        """Output types for decoding a call result.
+
+        Memoised, as bulk decoding asks the same few selectors over and over.
+
+        :return:
+            ``None`` if the selector is unknown, or ABIs disagree on the outputs
+        """
+        selector = bytes(selector[:4])
+        try:
+            return self._output_types[selector]
+        except KeyError:
+            pass
+        candidates = {f.output_types for f in self.get_functions_by_selector(selector)}
+        output_types = candidates.pop() if len(candidates) == 1 else None
+        self._output_types[selector] = output_types
+        return output_types
+
+    def get_events_by_topic(self, topic: bytes) -> list[AbiEventInfo]:
+        """Events in any bundled ABI matching topic 0."""
+        if self._functions is None:
+            self._load_tables()
+        return [AbiEventInfo(*values) for values in self._events.get(bytes(topic), [])]
+
+
+_default_index: AbiIndex | None = None
+_default_index_path: Path | None = None
+_default_index_lock = threading.Lock()
+_missing_index_paths: set[Path] = set()
+
+
+def get_abi_index_path() -> Path | None:
+    """Get the index file configured with ``ABI_INDEX_PATH``.
+
+    :return:
+        ``None`` if ``ABI_INDEX_PATH`` is not set
+    """
+    value = os.environ.get("ABI_INDEX_PATH")
+    if not value:
+        return None
+    return DEFAULT_ABI_INDEX_PATH if value == "default" else Path(value).expanduser()
+
+
+def get_default_abi_index() -> AbiIndex | None:
+    """Get the process-wide index configured with ``ABI_INDEX_PATH``.
+
+    - Opened once per process
+    - Never built here, see :py:func:`main`
+
+    :return:
+        ``None`` if ``ABI_INDEX_PATH`` is not set, or the index has not been built
+    """
+    global _default_index, _default_index_path
+
+    path = get_abi_index_path()
+    if path is None:
+        return None
+
+    with _default_index_lock:
+        if _default_index is not None and _default_index_path == path:
+            return _default_index
+        if not path.exists():
+            if path not in _missing_index_paths:
+                logger.warning("ABI index %s not built, parsing ABI JSON files. Build it with: python -m eth_defi.abi_index", path)
+                _missing_index_paths.add(path)
+            return None
+        _default_index = AbiIndex(path)
+        _default_index_path = path
+        return _default_index
+
+
+def get_call_output_types(selector: bytes) -> tuple[str, ...] | None:
+    """Output types of a function selector from the index configured with ``ABI_INDEX_PATH``.
+
+    :return:
+        ``None`` if the index is not enabled or built, or it does not know the selector unambiguously
+    """
+    index = get_default_abi_index()
+    if index is None:
+        return None
+    return index.get_output_types(selector)
+
+
+def main():
+    """Build the index at ``ABI_INDEX_PATH``, or :py:data:`DEFAULT_ABI_INDEX_PATH` if not set."""
+    from eth_defi.utils import setup_console_logging  # noqa: PLC0415
+
+    setup_console_logging(default_log_level=os.environ.get("LOG_LEVEL", "info"))
+    path = get_abi_index_path() or DEFAULT_ABI_INDEX_PATH
+    build_abi_index(path)
+    print(f"ABI index written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -44,6 +44,7 @@ from eth_defi.apex.vault import (
     fetch_vault_history,
 )
 from eth_defi.compat import native_datetime_utc_now
+from eth_defi.perp_dex.duckdb_engine import replace_rows
 from eth_defi.perp_dex.metrics import (
     PerpVaultIdentity,
     SourcePositionDataStatus,
@@ -53,6 +54,32 @@ from eth_defi.perp_dex.storage import initialise_perp_vault_observation_schema,
 
 logger = logging.getLogger(__name__)
 
+#: ``vault_metadata`` columns in insertion order.
+#:
+#: ``redemption_delay`` is last in databases created before it was added, so inserts name the columns.
+VAULT_METADATA_COLUMNS = (
+    "vault_id",
+    "synthetic_address",
+    "reported_ethereum_address",
+    "name",
+    "description",
+    "status",
+    "vault_type",
+    "created_at",
+    "source_updated_at",
+    "finished_at",
+    "max_amount",
+    "purchase_fee_rate_raw",
+    "share_profit_ratio_raw",
+    "redemption_delay",
+    "current_nav",
+    "current_tvl",
+    "current_share_count",
+    "first_seen",
+    "last_seen",
+    "missing_since",
+)
+
 
 @dataclass(slots=True, frozen=True)
 class ApexHistoryFetchResult:
@@ -340,29 +367,7 @@ class ApexMetricsDatabase:
         :return:
             Values ordered for ``vault_metadata`` insertion.
         """
-        columns = (
-            "vault_id",
-            "synthetic_address",
-            "reported_ethereum_address",
-            "name",
-            "description",
-            "status",
-            "vault_type",
-            "created_at",
-            "source_updated_at",
-            "finished_at",
-            "max_amount",
-            "purchase_fee_rate_raw",
-            "share_profit_ratio_raw",
-            "redemption_delay",
-            "current_nav",
-            "current_tvl",
-            "current_share_count",
-            "first_seen",
-            "last_seen",
-            "missing_since",
-        )
-        return [row[column] for column in columns]
+        return [row[column] for column in VAULT_METADATA_COLUMNS]
 
     @staticmethod
     def _sync_values(row: dict[str, object]) -> list[object]:
@@ -418,36 +423,7 @@ class ApexMetricsDatabase:
         identifiers = [str(row["vault_id"]) for row in materialised]
         if len(identifiers) != len(set(identifiers)):
             raise ValueError("Duplicate logical vault_metadata keys in staged batch")
-        con.executemany("DELETE FROM vault_metadata WHERE vault_id = ?", [(vault_id,) for vault_id in identifiers])
-        con.executemany(
-            """
-            INSERT INTO vault_metadata (
-                vault_id,
-                synthetic_address,
-                reported_ethereum_address,
-                name,
-                description,
-                status,
-                vault_type,
-                created_at,
-                source_updated_at,
-                finished_at,
-                max_amount,
-                purchase_fee_rate_raw,
-                share_profit_ratio_raw,
-                redemption_delay,
-                current_nav,
-                current_tvl,
-                current_share_count,
-                first_seen,
-                last_seen,
-                missing_since
-            ) VALUES (
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-            )
-            """,
-            [self._metadata_values(row) for row in materialised],
-        )
+        replace_rows(con, "vault_metadata", VAULT_METADATA_COLUMNS, [self._metadata_values(row) for row in materialised], key_columns=("vault_id",))
 
     def _replace_sync(self, rows: Iterable[dict[str, object]]) -> None:
         """Replace logical history state rows inside the caller's transaction.
@@ -467,11 +443,7 @@ class ApexMetricsDatabase:
         identifiers = [str(row["vault_id"]) for row in materialised]
         if len(identifiers) != len(set(identifiers)):
             raise ValueError("Duplicate logical history_sync keys in staged batch")
-        con.executemany("DELETE FROM history_sync WHERE vault_id = ?", [(vault_id,) for vault_id in identifiers])
-        con.executemany(
-            "INSERT INTO history_sync VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            [self._sync_values(row) for row in materialised],
-        )
+        replace_rows(con, "history_sync", None, [self._sync_values(row) for row in materialised], key_columns=("vault_id",))
 
     def apply_ranking(  # noqa: PLR0914
         self,
@@ -611,13 +583,7 @@ class ApexMetricsDatabase:
         with self._transaction():
             self._replace_metadata(metadata_rows)
             self._replace_sync(sync_rows.values())
-            if ranking_rows:
-                keys = [(row[0], row[2]) for row in ranking_rows]
-                con.executemany(
-                    "DELETE FROM vault_prices WHERE vault_id = ? AND timestamp = ? AND source = 'ranking_snapshot'",
-                    keys,
-                )
-                con.executemany("INSERT INTO vault_prices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", ranking_rows)
+            replace_rows(con, "vault_prices", None, ranking_rows, key_columns=("vault_id", "timestamp", "source"))
 
     def select_history_candidates(
         self,
@@ -757,12 +723,10 @@ class ApexMetricsDatabase:
 
         with self._transaction():
             if points:
-                con.executemany(
-                    "DELETE FROM vault_prices WHERE vault_id = ? AND timestamp = ?",
-                    [(vault_id, point.timestamp) for point in points],
-                )
-                con.executemany(
-                    "INSERT INTO vault_prices VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                replace_rows(
+                    con,
+                    "vault_prices",
+                    None,
                     [
                         (
                             vault_id,
@@ -777,6 +741,7 @@ class ApexMetricsDatabase:
                         )
                         for point in points
                     ],
+                    key_columns=("vault_id", "timestamp"),
                 )
             canonical = con.execute(
                 """
@@ -546,6 +546,31 @@ def _calculate_md5_hex(payload: bytes) -> str:
         return hashlib.md5(payload).hexdigest()  # noqa: S324
 
 
+def is_remote_source_current(
+    remote_head: dict[str, Any],
+    source_digest: R2SourceDigest,
+) -> bool:
+    """Check whether a remote object was created from the same source.
+
+    Compares only the checksum metadata written by the upload helpers.
+    Unlike :py:func:`_is_remote_object_current`, this does not need the
+    upload body, so callers can skip producing the payload altogether
+    when the source digest describes its inputs, e.g. the price series
+    of a sparkline image.
+
+    :param remote_head:
+        ``head_object()`` response for the remote object.
+
+    :param source_digest:
+        Digest of the source.
+
+    :return:
+        ``True`` if the remote object metadata matches the source digest.
+    """
+    metadata = {key.lower(): value for key, value in (remote_head.get("Metadata") or {}).items()}
+    return metadata.get(R2_SOURCE_SHA256_METADATA_KEY) == source_digest.sha256 and metadata.get(R2_SOURCE_SIZE_METADATA_KEY) == str(source_digest.size)
+
+
 def _is_remote_object_current(  # noqa: PLR0917
     remote_head: dict[str, Any],
     source_digest: R2SourceDigest,
@@ -597,9 +622,7 @@ def _is_remote_object_current(  # noqa: PLR0917
     if cache_control is not None and remote_head.get("CacheControl") != cache_control:
         return False
 
-    metadata = {key.lower(): value for key, value in (remote_head.get("Metadata") or {}).items()}
-
-    if metadata.get(R2_SOURCE_SHA256_METADATA_KEY) == source_digest.sha256 and metadata.get(R2_SOURCE_SIZE_METADATA_KEY) == str(source_digest.size):
+    if is_remote_source_current(remote_head, source_digest):
         return True
 
     etag = str(remote_head.get("ETag", "")).strip('"')
@@ -747,6 +770,8 @@ def upload_file_to_r2(
     content_type: str | None = None,
     cache_control: str | None = R2_DEFAULT_CACHE_CONTROL,
     callback: Callable[[int], None] | None = None,
+    source_digest: R2SourceDigest | None = None,
+    transfer_config: Any | None = None,
 ) -> bool:
     """Upload a file from disk to R2.
 
@@ -778,13 +803,19 @@ def upload_file_to_r2(
     :param callback:
         Optional boto3 progress callback.
 
+    :param source_digest:
+        Optional precomputed digest of the file, to avoid hashing it twice.
+
+    :param transfer_config:
+        Optional boto3 ``TransferConfig`` for multipart uploads.
+
     :return:
         ``True`` if the file was uploaded, ``False`` if it was skipped as
         unchanged.
     """
     from botocore.exceptions import ClientError  # noqa: PLC0415
 
-    source_digest = calculate_file_digest(file_path)
+    source_digest = source_digest or calculate_file_digest(file_path)
 
     if skip_if_current:
         try:
@@ -812,6 +843,10 @@ def upload_file_to_r2(
     if cache_control is not None:
         extra_args["CacheControl"] = cache_control
 
+    upload_kwargs: dict[str, Any] = {}
+    if transfer_config is not None:
+        upload_kwargs["Config"] = transfer_config
+
     with file_path.open("rb") as handle:
         try:
             s3_client.upload_fileobj(
@@ -820,6 +855,7 @@ def upload_file_to_r2(
                 object_name,
                 ExtraArgs=extra_args,
                 Callback=callback,
+                **upload_kwargs,
             )
         except ClientError as exc:
             raise _create_r2_operation_error(exc, s3_client, bucket_name, object_name) from exc
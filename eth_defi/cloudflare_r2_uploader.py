@@ -0,0 +1,651 @@
+"""Parallel Cloudflare R2 uploader with a local upload manifest.
+
+The export jobs push thousands of objects to R2 per run: metadata JSON files,
+logos, sparklines and data files.  With :py:func:`~eth_defi.cloudflare_r2.upload_bytes_to_r2`
+and ``skip_if_current`` every object costs a ``HeadObject`` round trip,
+even when nothing changed, and each job ran its own upload loop.
+
+:py:class:`R2Uploader` is the shared uploader for these jobs.
+
+- :py:class:`R2UploadManifest` stores the source digest and headers of every
+  object the uploader has written or verified.  Unchanged objects are skipped
+  without talking to R2, changed objects are uploaded without a ``HeadObject``
+  preflight.  Objects not in the manifest, or with entries older than
+  :py:data:`R2_UPLOAD_MANIFEST_MAX_AGE`, are checked with ``HeadObject`` as before.
+- Uploads run on a bounded thread pool, and large files use multipart uploads
+- Payloads can be compressed with ``gzip`` or ``zstd``.  R2 stores and serves
+  one representation per object, so the encoding is chosen per object:
+  ``gzip`` for anything browsers fetch, ``zstd`` for files only read by our own jobs.
+- Transient failures are retried within a retry budget shared by all
+  uploads of the uploader, so an R2 outage fails the run fast instead of
+  retrying every object
+
+The manifest is opt-in.  Set ``R2_UPLOAD_MANIFEST_PATH`` to a file path,
+or to ``default`` for :py:data:`DEFAULT_R2_UPLOAD_MANIFEST_PATH`:
+
+.. code-block:: shell
+
+    export R2_UPLOAD_MANIFEST_PATH=default
+
+Example:
+
+.. code-block:: python
+
+    with R2Uploader(s3_client, bucket_name, manifest=get_default_r2_upload_manifest()) as uploader:
+        futures = [uploader.submit_file(path, path.name) for path in paths]
+        uploaded = [future.result() for future in futures]
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+import zstandard
+
+from eth_defi.cloudflare_r2 import (
+    R2_DEFAULT_CACHE_CONTROL,
+    R2ConflictError,
+    R2OperationError,
+    R2RetryableOperationError,
+    R2SourceDigest,
+    calculate_bytes_digest,
+    calculate_file_digest,
+    create_r2_client,
+    fetch_r2_object_head,
+    is_remote_source_current,
+    upload_bytes_to_r2,
+    upload_file_to_r2,
+)
+from eth_defi.compat import native_datetime_utc_now
+from eth_defi.disk_cache import DEFAULT_CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+#: Default manifest location
+DEFAULT_R2_UPLOAD_MANIFEST_PATH = DEFAULT_CACHE_ROOT / "r2-upload-manifest.sqlite"
+
+#: Environment variable enabling the manifest
+R2_UPLOAD_MANIFEST_ENV = "R2_UPLOAD_MANIFEST_PATH"
+
+#: Manifest entries older than this are verified with ``HeadObject`` again.
+#:
+#: Catches objects deleted or overwritten outside the uploader.
+R2_UPLOAD_MANIFEST_MAX_AGE = datetime.timedelta(days=7)
+
+#: Payload encodings :py:func:`encode_r2_payload` supports
+R2_UPLOAD_ENCODINGS = ("gzip", "zstd")
+
+#: Files larger than this are uploaded in parts
+R2_MULTIPART_THRESHOLD = 64 * 1024 * 1024
+
+#: Multipart upload part size
+R2_MULTIPART_CHUNK_SIZE = 16 * 1024 * 1024
+
+#: Parallel parts per multipart upload
+R2_MULTIPART_CONCURRENCY = 4
+
+#: Default upload threads
+R2_UPLOADER_MAX_WORKERS = 8
+
+#: Zstandard level for ``zstd`` encoded payloads
+R2_ZSTD_LEVEL = 19
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True, frozen=True)
+class R2UploadRetry:
+    """Retry policy for uploads.
+
+    Each upload is tried up to ``max_attempts`` times, but all uploads of one
+    :py:class:`R2Uploader` share ``budget`` retries.  Once the budget is
+    spent, the next transient failure is raised immediately.
+    """
+
+    #: Maximum attempts per upload
+    max_attempts: int = 3
+
+    #: Delay before the first retry, in seconds
+    initial_delay_seconds: float = 1.0
+
+    #: Exponential backoff multiplier between retries
+    backoff: float = 2.0
+
+    #: Retries shared by all uploads of an uploader
+    budget: int = 50
+
+    def validate(self) -> None:
+        """Validate retry policy values."""
+        if self.max_attempts < 1:
+            message = "retry.max_attempts must be at least one"
+            raise ValueError(message)
+
+        if self.initial_delay_seconds < 0:
+            message = "retry.initial_delay_seconds must be non-negative"
+            raise ValueError(message)
+
+        if self.backoff <= 0:
+            message = "retry.backoff must be positive"
+            raise ValueError(message)
+
+        if self.budget < 0:
+            message = "retry.budget must be non-negative"
+            raise ValueError(message)
+
+
+#: Default upload retry policy
+R2_UPLOAD_RETRY = R2UploadRetry()
+
+
+@dataclass(slots=True)
+class R2UploadStats:
+    """Counters of one uploader."""
+
+    #: Objects uploaded
+    uploaded: int = 0
+
+    #: Objects skipped because the manifest had them current
+    skipped_by_manifest: int = 0
+
+    #: Objects skipped after a ``HeadObject`` check
+    skipped_by_head: int = 0
+
+    #: Retries used from the retry budget
+    retries: int = 0
+
+    #: Uploads that raised
+    failed: int = 0
+
+
+def encode_r2_payload(payload: bytes, encoding: str | None) -> bytes:
+    """Compress a payload for a ``Content-Encoding``.
+
+    The output is deterministic, so the same source gives the same object body.
+
+    :param encoding:
+        One of :py:data:`R2_UPLOAD_ENCODINGS`, or ``None`` to upload as is.
+    """
+    if encoding is None:
+        return payload
+    if encoding == "gzip":
+        return gzip.compress(payload, mtime=0)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=R2_ZSTD_LEVEL).compress(payload)
+    raise ValueError(f"Unsupported encoding {encoding}, supported: {R2_UPLOAD_ENCODINGS}")
+
+
+class R2UploadManifest:
+    """Source digests of objects last uploaded or verified in R2.
+
+    Stored in a SQLite file, keyed by bucket and object key.
+    The whole manifest is read into memory on open,
+    and every write is committed immediately, so an interrupted run
+    keeps the entries of the uploads it finished.
+
+    Thread safe.
+    """
+
+    def __init__(self, path: Path, max_age: datetime.timedelta = R2_UPLOAD_MANIFEST_MAX_AGE):
+        """
+        :param path:
+            SQLite file. Created if it does not exist.
+
+        :param max_age:
+            Entries older than this are treated as unknown.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS r2_uploads (
+                    bucket TEXT NOT NULL,
+                    object_key TEXT NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    recorded_at TEXT NOT NULL,
+                    PRIMARY KEY (bucket, object_key)
+                )
+                """
+            )
+        rows = self.connection.execute("SELECT bucket, object_key, sha256, size, headers, recorded_at FROM r2_uploads").fetchall()
+        self.entries: dict[tuple[str, str], tuple[str, int, str, datetime.datetime]] = {(bucket, key): (sha256, size, headers, datetime.datetime.fromisoformat(recorded_at)) for bucket, key, sha256, size, headers, recorded_at in rows}
+
+    def __repr__(self):
+        return f"<R2UploadManifest {self.path}, {len(self.entries)} entries>"
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def check(
+        self,
+        bucket_name: str,
+        object_name: str,
+        source_digest: R2SourceDigest,
+        headers: str,
+        now_: datetime.datetime | None = None,
+    ) -> bool | None:
+        """Check whether an object is current.
+
+        :param headers:
+            Object headers from :py:func:`format_r2_upload_headers`.
+
+        :return:
+            ``True`` if the object was uploaded from the same source with the same headers,
+            ``False`` if it was uploaded from another source or with other headers,
+            ``None`` if the object is not in the manifest or its entry is too old.
+        """
+        entry = self.entries.get((bucket_name, object_name))
+        if entry is None:
+            return None
+        sha256, size, entry_headers, recorded_at = entry
+        now_ = now_ or native_datetime_utc_now()
+        if now_ - recorded_at > self.max_age:
+            return None
+        return sha256 == source_digest.sha256 and size == source_digest.size and entry_headers == headers
+
+    def record(
+        self,
+        bucket_name: str,
+        object_name: str,
+        source_digest: R2SourceDigest,
+        headers: str,
+        now_: datetime.datetime | None = None,
+    ):
+        """Record an object uploaded or verified to be current."""
+        now_ = now_ or native_datetime_utc_now()
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO r2_uploads (bucket, object_key, sha256, size, headers, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (bucket_name, object_name, source_digest.sha256, source_digest.size, headers, now_.isoformat()),
+                )
+            self.entries[bucket_name, object_name] = (source_digest.sha256, source_digest.size, headers, now_)
+
+
+def format_r2_upload_headers(
+    content_type: str | None,
+    content_encoding: str | None,
+    cache_control: str | None,
+) -> str:
+    """Format object headers for a manifest entry.
+
+    Changing any of the headers makes the object stale.
+    """
+    return f"{content_type or ''}|{content_encoding or ''}|{cache_control or ''}"
+
+
+_default_manifest: R2UploadManifest | None = None
+_default_manifest_lock = threading.Lock()
+
+
+def get_default_r2_upload_manifest() -> R2UploadManifest | None:
+    """Get the process-wide manifest configured with ``R2_UPLOAD_MANIFEST_PATH``.
+
+    :return:
+        ``None`` if ``R2_UPLOAD_MANIFEST_PATH`` is not set
+    """
+    global _default_manifest
+
+    value = os.environ.get(R2_UPLOAD_MANIFEST_ENV)
+    if not value:
+        return None
+
+    path = DEFAULT_R2_UPLOAD_MANIFEST_PATH if value == "default" else Path(value).expanduser()
+    with _default_manifest_lock:
+        if _default_manifest is None or _default_manifest.path != path:
+            _default_manifest = R2UploadManifest(path)
+        return _default_manifest
+
+
+class R2Uploader:
+    """Upload objects to one R2 bucket.
+
+    The ``upload_*`` methods upload in the calling thread,
+    the ``submit_*`` methods on the uploader thread pool.
+
+    Thread safe.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        bucket_name: str,
+        *,
+        manifest: R2UploadManifest | None = None,
+        max_workers: int = R2_UPLOADER_MAX_WORKERS,
+        retry: R2UploadRetry = R2_UPLOAD_RETRY,
+        multipart_threshold: int = R2_MULTIPART_THRESHOLD,
+        multipart_concurrency: int = R2_MULTIPART_CONCURRENCY,
+    ):
+        """
+        :param s3_client:
+            Authenticated boto3 S3 client.
+            Create with ``max_pool_connections`` of at least ``max_workers * multipart_concurrency``.
+
+        :param manifest:
+            Upload manifest, or ``None`` to check every object with ``HeadObject``.
+
+        :param max_workers:
+            Upload threads of the ``submit_*`` methods.
+
+        :param retry:
+            Retry policy for transient failures.
+
+        :param multipart_threshold:
+            Files larger than this are uploaded in parts.
+
+        :param multipart_concurrency:
+            Parallel parts per multipart upload.
+        """
+        retry.validate()
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.manifest = manifest
+        self.max_workers = max_workers
+        self.retry = retry
+        self.multipart_threshold = multipart_threshold
+        self.multipart_concurrency = multipart_concurrency
+        self.stats = R2UploadStats()
+        self.lock = threading.Lock()
+        self.executor: ThreadPoolExecutor | None = None
+        self.transfer_config = None
+
+    def __repr__(self):
+        return f"<R2Uploader {self.bucket_name}, {self.stats}>"
+
+    def __enter__(self) -> R2Uploader:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Wait for the submitted uploads to finish."""
+        with self.lock:
+            executor = self.executor
+            self.executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        logger.info("R2 uploads to %s: %s", self.bucket_name, self.stats)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="r2-upload")
+            return self.executor
+
+    def _get_transfer_config(self):
+        with self.lock:
+            if self.transfer_config is None:
+                from boto3.s3.transfer import TransferConfig  # noqa: PLC0415
+
+                self.transfer_config = TransferConfig(
+                    multipart_threshold=self.multipart_threshold,
+                    multipart_chunksize=R2_MULTIPART_CHUNK_SIZE,
+                    max_concurrency=self.multipart_concurrency,
+                )
+            return self.transfer_config
+
+    def _count(self, field: str, amount: int = 1):
+        with self.lock:
+            setattr(self.stats, field, getattr(self.stats, field) + amount)
+
+    def _take_retry(self) -> bool:
+        with self.lock:
+            if self.stats.retries >= self.retry.budget:
+                return False
+            self.stats.retries += 1
+            return True
+
+    def _call_with_retry(self, func: Callable[[], T], object_name: str) -> T:
+        from botocore.exceptions import ConnectionError as BotoConnectionError  # noqa: PLC0415
+        from botocore.exceptions import HTTPClientError  # noqa: PLC0415
+
+        attempt = 1
+        delay = self.retry.initial_delay_seconds
+        while True:
+            try:
+                return func()
+            except (R2RetryableOperationError, R2ConflictError, BotoConnectionError, HTTPClientError) as exc:
+                if attempt >= self.retry.max_attempts or not self._take_retry():
+                    self._count("failed")
+                    raise
+                logger.warning(
+                    "R2 upload of s3://%s/%s failed on attempt %d/%d, retrying in %.2f seconds: %s",
+                    self.bucket_name,
+                    object_name,
+                    attempt,
+                    self.retry.max_attempts,
+                    delay,
+                    exc,
+                )
+                time.sleep(delay)
+                delay *= self.retry.backoff
+                attempt += 1
+            except Exception:
+                self._count("failed")
+                raise
+
+    def _check_manifest(self, object_name: str, source_digest: R2SourceDigest, headers: str) -> bool | None:
+        if self.manifest is None:
+            return None
+        return self.manifest.check(self.bucket_name, object_name, source_digest, headers)
+
+    def _record(self, object_name: str, source_digest: R2SourceDigest, headers: str):
+        if self.manifest is not None:
+            self.manifest.record(self.bucket_name, object_name, source_digest, headers)
+
+    def is_current(
+        self,
+        object_name: str,
+        source_digest: R2SourceDigest,
+        *,
+        content_type: str | None = None,
+        encoding: str | None = None,
+        cache_control: str | None = R2_DEFAULT_CACHE_CONTROL,
+    ) -> bool:
+        """Check whether an object was uploaded from a source, without uploading it.
+
+        Lets callers skip producing payloads, e.g. rendering images,
+        whose source did not change.  Uses the manifest, and ``HeadObject``
+        for objects the manifest does not know.
+
+        :return:
+            ``True`` if the object is current
+        """
+        headers = format_r2_upload_headers(content_type, encoding, cache_control)
+        state = self._check_manifest(object_name, source_digest, headers)
+        if state is not None:
+            return state
+
+        try:
+            remote_head = self._call_with_retry(lambda: fetch_r2_object_head(self.s3_client, self.bucket_name, object_name), object_name)
+        except R2OperationError as e:
+            logger.warning("Could not check s3://%s/%s, uploading anyway: %s", self.bucket_name, object_name, e)
+            return False
+
+        current = remote_head is not None and is_remote_source_current(remote_head, source_digest)
+        if current:
+            self._record(object_name, source_digest, headers)
+        return current
+
+    def upload_bytes(
+        self,
+        object_name: str,
+        payload: bytes | Callable[[], bytes],
+        *,
+        content_type: str | None = None,
+        encoding: str | None = None,
+        cache_control: str | None = R2_DEFAULT_CACHE_CONTROL,
+        source_digest: R2SourceDigest | None = None,
+        skip_if_current: bool = True,
+    ) -> bool:
+        """Upload an in-memory payload.
+
+        :param payload:
+            Source payload, or a function producing it.
+            The function is only called if the object needs to be uploaded.
+
+        :param encoding:
+            Compress the payload and set this ``Content-Encoding``.
+            One of :py:data:`R2_UPLOAD_ENCODINGS`.
+
+        :param source_digest:
+            Digest of the source.
+            Required if ``payload`` is a function, otherwise the digest of ``payload``.
+
+        :param skip_if_current:
+            Skip objects uploaded from the same source before.
+
+        :return:
+            ``True`` if uploaded, ``False`` if skipped as unchanged
+        """
+        if source_digest is None:
+            assert not callable(payload), f"source_digest is needed for a payload function, uploading {object_name}"
+            source_digest = calculate_bytes_digest(payload)
+
+        headers = format_r2_upload_headers(content_type, encoding, cache_control)
+        state = self._check_manifest(object_name, source_digest, headers) if skip_if_current else False
+        if state:
+            self._count("skipped_by_manifest")
+            return False
+
+        if callable(payload):
+            payload = payload()
+        body = encode_r2_payload(payload, encoding)
+
+        uploaded = self._call_with_retry(
+            lambda: upload_bytes_to_r2(
+                s3_client=self.s3_client,
+                payload=body,
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                content_type=content_type,
+                content_encoding=encoding,
+                cache_control=cache_control,
+                # Only objects unknown to the manifest need a HeadObject
+                skip_if_current=state is None,
+                source_digest=source_digest,
+            ),
+            object_name,
+        )
+        self._count("uploaded" if uploaded else "skipped_by_head")
+        self._record(object_name, source_digest, headers)
+        return uploaded
+
+    def upload_file(
+        self,
+        file_path: Path,
+        object_name: str,
+        *,
+        content_type: str | None = None,
+        cache_control: str | None = R2_DEFAULT_CACHE_CONTROL,
+        callback: Callable[[int], None] | None = None,
+        skip_if_current: bool = True,
+    ) -> bool:
+        """Upload a file from disk.
+
+        Files larger than the multipart threshold are uploaded in parallel parts.
+
+        :param callback:
+            Optional boto3 progress callback.
+
+        :param skip_if_current:
+            Skip objects uploaded from the same source before.
+
+        :return:
+            ``True`` if uploaded, ``False`` if skipped as unchanged
+        """
+        source_digest = calculate_file_digest(file_path)
+        headers = format_r2_upload_headers(content_type, None, cache_control)
+        state = self._check_manifest(object_name, source_digest, headers) if skip_if_current else False
+        if state:
+            self._count("skipped_by_manifest")
+            return False
+
+        transfer_config = self._get_transfer_config() if source_digest.size > self.multipart_threshold else None
+        uploaded = self._call_with_retry(
+            lambda: upload_file_to_r2(
+                s3_client=self.s3_client,
+                file_path=file_path,
+                bucket_name=self.bucket_name,
+                object_name=object_name,
+                skip_if_current=state is None,
+                content_type=content_type,
+                cache_control=cache_control,
+                callback=callback,
+                source_digest=source_digest,
+                transfer_config=transfer_config,
+            ),
+            object_name,
+        )
+        self._count("uploaded" if uploaded else "skipped_by_head")
+        self._record(object_name, source_digest, headers)
+        return uploaded
+
+    def submit_bytes(self, object_name: str, payload: bytes | Callable[[], bytes], **kwargs) -> Future[bool]:
+        """Upload an in-memory payload on the thread pool.
+
+        Takes the arguments of :py:meth:`upload_bytes`.
+        """
+        return self._get_executor().submit(self.upload_bytes, object_name, payload, **kwargs)
+
+    def submit_file(self, file_path: Path, object_name: str, **kwargs) -> Future[bool]:
+        """Upload a file on the thread pool.
+
+        Takes the arguments of :py:meth:`upload_file`.
+        """
+        return self._get_executor().submit(self.upload_file, file_path, object_name, **kwargs)
+
+
+_shared_uploaders: dict[tuple[str, str, str], R2Uploader] = {}
+_shared_uploaders_lock = threading.Lock()
+
+
+def get_shared_r2_uploader(
+    endpoint_url: str,
+    access_key_id: str,
+    secret_access_key: str,
+    bucket_name: str,
+) -> R2Uploader:
+    """Get a process-wide uploader for a bucket.
+
+    For helpers uploading one object per call, so that they reuse one
+    boto3 client and the manifest configured with ``R2_UPLOAD_MANIFEST_PATH``
+    instead of creating a client and checking the object with ``HeadObject`` on every call.
+    """
+    key = (endpoint_url, access_key_id, bucket_name)
+    with _shared_uploaders_lock:
+        uploader = _shared_uploaders.get(key)
+        if uploader is None:
+            s3_client = create_r2_client(
+                endpoint_url=endpoint_url,
+                access_key_id=access_key_id,
+                secret_access_key=secret_access_key,
+                max_pool_connections=R2_UPLOADER_MAX_WORKERS * R2_MULTIPART_CONCURRENCY,
+            )
+            uploader = R2Uploader(s3_client, bucket_name, manifest=get_default_r2_upload_manifest())
+            _shared_uploaders[key] = uploader
+        return uploader
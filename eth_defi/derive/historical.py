@@ -78,6 +78,7 @@ from eth_defi.event_reader.multicall_batcher import (
     read_multicall_historical,
 )
 from eth_defi.event_reader.web3factory import TunedWeb3Factory
+from eth_defi.perp_dex.duckdb_engine import insert_new_rows
 
 logger = logging.getLogger(__name__)
 
@@ -1200,22 +1201,7 @@ class DeriveFundingRateDatabase:
         ]
 
         with self._lock:
-            count_before = self.conn.execute(
-                "SELECT COUNT(*) FROM open_interest WHERE instrument = ?",
-                [entries[0].instrument],
-            ).fetchone()[0]
-
-            self.conn.executemany(
-                "INSERT OR IGNORE INTO open_interest (instrument, ts, open_interest, perp_price, index_price) VALUES (?, ?, ?, ?, ?)",
-                rows,
-            )
-
-            count_after = self.conn.execute(
-                "SELECT COUNT(*) FROM open_interest WHERE instrument = ?",
-                [entries[0].instrument],
-            ).fetchone()[0]
-
-        return count_after - count_before
+            return insert_new_rows(self.conn, "open_interest", ("instrument", "ts", "open_interest", "perp_price", "index_price"), rows, key_columns=("instrument", "ts"))
 
     def _insert_batch(self, entries: list[FundingRateEntry]) -> int:
         """Insert a batch of funding rate rows, ignoring duplicates.
@@ -1231,22 +1217,7 @@ class DeriveFundingRateDatabase:
         rows = [(e.instrument, e.timestamp_ms, float(e.funding_rate)) for e in entries]
 
         with self._lock:
-            count_before = self.conn.execute(
-                "SELECT COUNT(*) FROM funding_rates WHERE instrument = ?",
-                [entries[0].instrument],
-            ).fetchone()[0]
-
-            self.conn.executemany(
-                "INSERT OR IGNORE INTO funding_rates (instrument, ts, funding_rate) VALUES (?, ?, ?)",
-                rows,
-            )
-
-            count_after = self.conn.execute(
-                "SELECT COUNT(*) FROM funding_rates WHERE instrument = ?",
-                [entries[0].instrument],
-            ).fetchone()[0]
-
-        return count_after - count_before
+            return insert_new_rows(self.conn, "funding_rates", ("instrument", "ts", "funding_rate"), rows, key_columns=("instrument", "ts"))
 
     def _update_sync_state(self, instrument_name: str, data_type: str = DATA_TYPE_FUNDING_RATES, table_name: str = "funding_rates"):
         """Recompute and store sync state for an instrument.
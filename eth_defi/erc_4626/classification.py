@@ -17,6 +17,7 @@ from web3.types import BlockIdentifier
 
 from eth_defi.abi import ZERO_ADDRESS_STR
 from eth_defi.erc_4626.core import ERC4626Feature
+from eth_defi.erc_4626.probe_cache import CachedProbeResult, VaultProbeCache, get_probe_set_fingerprint
 from eth_defi.erc_4626.vault_protocol.arcus.constants import ARCUS_BRIDGE_VAULT, ARCUS_CHAIN_ID
 from eth_defi.erc_4626.vault_protocol.axis.constants import AXIS_CHAIN_ID, AXIS_STAKED_USDX_VAULT
 from eth_defi.erc_4626.vault_protocol.frankencoin.vault import FRANKENCOIN_SAVINGS_VAULTS
@@ -27,6 +28,7 @@ from eth_defi.erc_4626.vault_protocol.pallas.constants import PALLAS_VAULT_ADDRE
 from eth_defi.event_reader.multicall_batcher import EncodedCall, EncodedCallResult, MultiprocessMulticallReader, read_multicall_chunked
 from eth_defi.event_reader.web3factory import Web3Factory
 from eth_defi.midas.constants import MIDAS_PRODUCTS, MIDAS_PRODUCTS_BY_TOKEN
+from eth_defi.provider.code_hash import fetch_runtime_code_hashes
 from eth_defi.tokenised_fund.asseto.constants import ASSETO_PRODUCTS, ASSETO_PRODUCTS_BY_TOKEN
 from eth_defi.tokenised_fund.centrifuge.constants import CENTRIFUGE_TRANCHE_PRODUCTS, CENTRIFUGE_TRANCHE_PRODUCTS_BY_TOKEN
 from eth_defi.tokenised_fund.fdit.constants import FDIT_PRODUCTS, FDIT_PRODUCTS_BY_TOKEN
@@ -548,6 +550,38 @@ CHAIN_RESTRICTED_PROBES: dict[str, set[int]] = {
 }
 
 
+#: Probes :py:func:`probe_vaults` runs first for every lead.
+#:
+#: These are enough for :py:func:`identify_vault_features` to reject non-vaults
+#: (broken contracts, plain tokens, Securitize DSTokens), so only the survivors
+#: get the full protocol-specific probe set.
+CORE_PROBE_FUNCTIONS = frozenset(
+    {
+        "EVM IS BROKEN SHIT",
+        "name",
+        "convertToShares",
+        "shareManager",
+        "getAssetCount",
+        "COMPLIANCE_SERVICE",
+        "assetsWhitelistAddress",
+    }
+)
+
+#: Protocol probes whose classification depends on the returned value,
+#: not just on whether the selector exists in the contract code.
+#:
+#: Never served from :py:class:`~eth_defi.erc_4626.probe_cache.VaultProbeCache`.
+VALUE_DEPENDENT_PROBE_FUNCTIONS = frozenset(
+    {
+        "bridgeVault",
+        "withdrawalQueue",
+        "isTotalAssetsValid",
+        "contractType",
+        "DEPLOYER_ADDRESS",
+    }
+)
+
+
 def _should_yield_probe(func_name: str, chain_id: int | None) -> bool:
     """Check if a probe call should be yielded based on chain restrictions.
 
@@ -1793,6 +1827,24 @@ def _is_hypurrfi_name(name: str) -> bool:
     return bool(re.search(r"hy[^-]+-\s*\d+(?:\x00|$)", name, re.IGNORECASE))
 
 
+def _needs_protocol_probes(address: HexAddress, calls: dict[str, EncodedCallResult], chain_id: int) -> bool:
+    """Check if core probe results leave the classification open.
+
+    Mirrors the early returns of :py:func:`identify_vault_features`:
+    if any of them is hit, protocol probe results cannot change the outcome.
+
+    :param calls:
+        Results of :py:data:`CORE_PROBE_FUNCTIONS`, wrapped in :py:class:`_ProbeResultsDict`.
+    """
+    if _get_hardcoded_protocol_features(address, chain_id=chain_id) is not None:
+        return False
+
+    if calls["EVM IS BROKEN SHIT"].success or calls["COMPLIANCE_SERVICE"].success:
+        return False
+
+    return calls["convertToShares"].success or len(calls["convertToShares"].result) == 32
+
+
 def probe_vaults(
     chain_id: int,
     web3factory: Web3Factory,
@@ -1800,9 +1852,22 @@ def probe_vaults(
     block_identifier: BlockIdentifier,
     max_workers=8,
     progress_bar_desc: str | None = None,
+    probe_cache: VaultProbeCache | None = None,
 ) -> Iterable[VaultFeatureProbe]:
     """Perform multicalls against each vault address to extract the features of the vault smart contract.
 
+    Probing is staged, as most leads are not vaults:
+
+    1. :py:data:`CORE_PROBE_FUNCTIONS` are called for all addresses
+    2. The protocol-specific probes are called only for addresses
+       that still may be vaults after the core probes
+
+    :param probe_cache:
+        Reuse protocol probe results across contracts sharing the same runtime code,
+        following proxies to their implementation.
+
+        See :py:mod:`eth_defi.erc_4626.probe_cache`.
+
     :return:
         Iterator of what vault smart contract features we detected for each potential vault address
     """
@@ -1811,21 +1876,83 @@ def probe_vaults(
 
     probe_calls = list(create_probe_calls(addresses, chain_id=chain_id))
 
+    core_calls = [c for c in probe_calls if c.func_name in CORE_PROBE_FUNCTIONS]
+    protocol_calls_per_address: dict[HexAddress, list[EncodedCall]] = defaultdict(list)
+    for call in probe_calls:
+        if call.func_name not in CORE_PROBE_FUNCTIONS:
+            protocol_calls_per_address[call.address].append(call)
+
     # Temporary work buffer were we count that all calls to the address have been made,
     # because results are dropping in one by one
     results_per_address: dict[HexAddress, dict] = defaultdict(dict)
 
-    for call_result in read_multicall_chunked(
+    def _read(calls: list[EncodedCall], desc: str | None):
+        if not calls:
+            return
+        for call_result in read_multicall_chunked(
+            chain_id,
+            web3factory,
+            calls,
+            block_identifier=block_identifier,
+            progress_bar_desc=desc,
+            max_workers=max_workers,
+        ):
+            address = call_result.call.address
+            address_calls = results_per_address[address]
+            address_calls[call_result.call.func_name] = call_result
+
+    _read(core_calls, progress_bar_desc)
+
+    # Wrap with _ProbeResultsDict to handle missing probes from chain filtering
+    survivors = [address for address, address_call_results in results_per_address.items() if _needs_protocol_probes(address, _ProbeResultsDict(address_call_results), chain_id)]
+
+    code_hashes = {}
+    cached_results = {}
+    probe_set = None
+    if probe_cache is not None and survivors:
+        code_hashes = fetch_runtime_code_hashes(web3factory(), survivors, block_identifier)
+        probe_set = get_probe_set_fingerprint(c.func_name for c in protocol_calls_per_address[survivors[0]] if c.func_name not in VALUE_DEPENDENT_PROBE_FUNCTIONS)
+        cached_results = probe_cache.get_many(chain_id, code_hashes.values(), probe_set)
+
+    # Clones sharing uncached code: the first one is fully probed,
+    # the others get only value-dependent probes and its results
+    representatives: dict[bytes, HexAddress] = {}
+    clones: dict[HexAddress, HexAddress] = {}
+    protocol_calls = []
+    for address in survivors:
+        code_hash = code_hashes.get(address)
+        cached = cached_results.get(code_hash)
+        if cached is not None:
+            results_per_address[address].update(cached)
+        elif code_hash is not None and code_hash in representatives:
+            clones[address] = representatives[code_hash]
+        else:
+            if code_hash is not None:
+                representatives[code_hash] = address
+            protocol_calls += protocol_calls_per_address[address]
+            continue
+        protocol_calls += [c for c in protocol_calls_per_address[address] if c.func_name in VALUE_DEPENDENT_PROBE_FUNCTIONS]
+
+    logger.info(
+        "Probing chain %d: %d addresses, %d need protocol probes, %d served from code hash cache, %d clones of probed code, %d protocol probe calls",
         chain_id,
-        web3factory,
-        probe_calls,
-        block_identifier=block_identifier,
-        progress_bar_desc=progress_bar_desc,
-        max_workers=max_workers,
-    ):
-        address = call_result.call.address
-        address_calls = results_per_address[address]
-        address_calls[call_result.call.func_name] = call_result
+        len(results_per_address),
+        len(survivors),
+        sum(1 for a in survivors if code_hashes.get(a) in cached_results),
+        len(clones),
+        len(protocol_calls),
+    )
+
+    _read(protocol_calls, f"{progress_bar_desc}, protocol probes" if progress_bar_desc else None)
+
+    if probe_cache is not None:
+        new_entries = {}
+        for code_hash, address in representatives.items():
+            address_call_results = results_per_address[address]
+            new_entries[code_hash] = {c.func_name: CachedProbeResult(c.func_name, address_call_results[c.func_name].success, address_call_results[c.func_name].result) for c in protocol_calls_per_address[address] if c.func_name not in VALUE_DEPENDENT_PROBE_FUNCTIONS and c.func_name in address_call_results}
+        for address, representative in clones.items():
+            results_per_address[address].update(new_entries[code_hashes[representative]])
+        probe_cache.put_many(chain_id, probe_set, new_entries)
 
     for address, address_call_results in results_per_address.items():
         # Wrap with _ProbeResultsDict to handle missing probes from chain filtering
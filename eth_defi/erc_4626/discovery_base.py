@@ -29,6 +29,7 @@ from eth_defi.compat import native_datetime_utc_now
 from eth_defi.enzyme.onyx_permission import fetch_onyx_current_deposit_permissions
 from eth_defi.erc_4626.classification import ODA_FACT_HARDCODED_LEADS, probe_vaults
 from eth_defi.erc_4626.core import ERC4262VaultDetection, ERC4626Feature, get_erc_4626_contract
+from eth_defi.erc_4626.probe_cache import VaultProbeCache
 from eth_defi.erc_4626.vault_protocol.axis.constants import AXIS_HARDCODED_LEADS
 from eth_defi.erc_4626.vault_protocol.nara.constants import NARAUSD_PLUS_HARDCODED_LEADS
 from eth_defi.erc_4626.vault_protocol.pallas.constants import PALLAS_HARDCODED_LEADS
@@ -783,6 +784,9 @@ class VaultDiscoveryBase(abc.ABC):
         self.max_workers = max_workers
         self.existing_leads = {}
 
+        #: Optional code hash keyed cache for protocol probes, see :py:mod:`eth_defi.erc_4626.probe_cache`
+        self.probe_cache: VaultProbeCache | None = None
+
     def seed_existing_leads(self, leads: dict[HexAddress, PotentialVaultMatch]):
         """Seed existing leads to continue the scan where we were left last time."""
         self.existing_leads = leads
@@ -912,6 +916,7 @@ class VaultDiscoveryBase(abc.ABC):
             block_identifier=end_block,
             max_workers=self.max_workers,
             progress_bar_desc=progress_bar_desc,
+            probe_cache=self.probe_cache,
         ):
             if feature_probe.address.lower() in BROKEN_VAULT_CONTRACTS:
                 logger.warning(f"Skipping known broken vault {feature_probe.address}")
@@ -9,6 +9,7 @@
 
 import asyncio
 import logging
+import time
 
 from eth_abi.exceptions import DecodingError
 from eth_typing import HexAddress, HexStr
@@ -21,6 +22,7 @@ from eth_defi.compat import native_datetime_utc_fromtimestamp
 from eth_defi.enzyme.blue_discovery import create_enzyme_blue_factory_candidate, fetch_enzyme_blue_dispatchers_for_chain, fetch_enzyme_blue_vault_deployed_event_topic, is_enzyme_blue_factory_log
 from eth_defi.enzyme.onyx_discovery import ENZYME_BASE_CHAIN_ID, create_enzyme_factory_candidate, decode_enzyme_deposit_handler_event, fetch_enzyme_deposit_handler_event_topics, fetch_enzyme_shares_deployed_event_topic, fetch_enzyme_shares_factories_for_chain, is_enzyme_factory_log
 from eth_defi.erc_4626.discovery_base import HardcodedVaultLeadSources, LeadScanReport, PotentialVaultMatch, VaultDiscoveryBase, add_enzyme_blue_factory_candidate_lead, add_enzyme_factory_candidate_lead, add_mellow_factory_candidate_lead, get_vault_discovery_events, get_vault_event_topic_map, is_configuration_event, is_deposit_event
+from eth_defi.erc_4626.lead_range_scan import LeadRangeCheckpoint, LeadRangeCheckpointDatabase, merge_lead_maps, split_block_range
 from eth_defi.event_reader.web3factory import Web3Factory
 from eth_defi.hypersync.hypersync_timestamp import HypersyncFlaky, get_hypersync_block_height_with_retries, is_hypersync_next_block_range_error, is_hypersync_rate_limit_error, is_hypersync_retryable_runtime_error
 from eth_defi.mellow.discovery import create_mellow_factory_candidate, fetch_mellow_created_event_topic, fetch_mellow_factories_for_chain, is_mellow_factory_log
@@ -71,6 +73,9 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
         client: hypersync.HypersyncClient,
         max_workers: int = 8,
         recv_timeout: float = 90.0,
+        parallel_ranges: int = 1,
+        checkpoint_db: LeadRangeCheckpointDatabase | None = None,
+        checkpoint_interval: float = 60.0,
     ):
         """Create vault discover.
 
@@ -88,12 +93,27 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
 
         :param max_workers:
             How many worker processes use in multicall probing
+
+        :param parallel_ranges:
+            Split a large scan to this many block ranges streamed concurrently.
+
+            Ranges smaller than :py:data:`~eth_defi.erc_4626.lead_range_scan.DEFAULT_MIN_RANGE_BLOCKS`
+            are not split, so incremental scans stay in a single stream.
+
+        :param checkpoint_db:
+            Save per-range cursors and partial leads, so an interrupted scan can resume.
+
+        :param checkpoint_interval:
+            Seconds between checkpoint writes per range.
         """
         super().__init__(max_workers=max_workers)
         self.web3 = web3
         self.web3factory = web3factory
         self.client = client
         self.recv_timeout = recv_timeout
+        self.parallel_ranges = parallel_ranges
+        self.checkpoint_db = checkpoint_db
+        self.checkpoint_interval = checkpoint_interval
 
     def get_topic_signatures(self) -> list[HexStr]:
         """Get topic signatures that can seed vault leads.
@@ -441,6 +461,10 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
 
         - Scan all event matches using HyperSync
 
+        - With ``parallel_ranges`` or ``checkpoint_db`` set, split the scan to
+          block ranges streamed concurrently, checkpointing each range cursor,
+          see :py:mod:`eth_defi.erc_4626.lead_range_scan`
+
         - See stream() example here: https://github.com/enviodev/hypersync-client-python/blob/main/examples/all-erc20-transfers.py
         """
         assert end_block > start_block
@@ -450,6 +474,99 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
         # Build topic map for classifying events (ERC-4626 and BrinkVault)
         topic_map = get_vault_event_topic_map(self.web3)
 
+        if display_progress:
+            chain_name = get_chain_name(self.web3.eth.chain_id)
+            progress_bar = tqdm(
+                total=end_block - start_block,
+                desc=f"HypersyncVaultDiscover: scanning vault leads on {chain_name}",
+            )
+        else:
+            progress_bar = None
+
+        report = LeadScanReport(backend=self)
+        report.old_leads = len(self.existing_leads)
+        seen = set()
+
+        # Enzyme deposit handler events update existing lead state in block order,
+        # so they cannot be scanned out of order
+        ranged = (self.parallel_ranges > 1 or self.checkpoint_db is not None) and chain != ENZYME_BASE_CHAIN_ID
+
+        try:
+            if not ranged:
+                report.leads = self.existing_leads.copy()
+                await self.stream_range(
+                    LeadRangeCheckpoint(chain, start_block, end_block, start_block, leads=report.leads),
+                    report,
+                    topic_map,
+                    seen,
+                    progress_bar,
+                )
+            else:
+                report.leads = await self.stream_ranges(chain, start_block, end_block, report, topic_map, seen, progress_bar)
+        finally:
+            if progress_bar is not None:
+                progress_bar.close()
+
+        return report
+
+    async def stream_ranges(
+        self,
+        chain: int,
+        start_block: int,
+        end_block: int,
+        report: LeadScanReport,
+        topic_map: dict[str, object],
+        seen: set[HexAddress],
+        progress_bar: tqdm | None,
+    ) -> dict[HexAddress, PotentialVaultMatch]:
+        """Stream block ranges concurrently and merge their leads with the existing leads.
+
+        :return:
+            Merged lead map
+        """
+        if self.checkpoint_db is not None:
+            plan = self.checkpoint_db.plan_ranges(chain, start_block, end_block, self.parallel_ranges)
+        else:
+            plan = [LeadRangeCheckpoint(chain, s, e, s) for s, e in split_block_range(start_block, end_block, self.parallel_ranges)]
+
+        logger.info(
+            "Scanning vault leads on chain %d in %d block ranges: %s",
+            chain,
+            len(plan),
+            ", ".join(f"{c.start_block:,}-{c.end_block:,}" for c in plan),
+        )
+
+        # Per-range counters, so that a resumed range does not double count
+        range_reports = [LeadScanReport(backend=self, deposits=c.deposits, withdrawals=c.withdrawals) for c in plan]
+
+        if progress_bar is not None:
+            progress_bar.update(sum(c.cursor_block - c.start_block for c in plan))
+
+        await asyncio.gather(*[self.stream_range(c, r, topic_map, seen, progress_bar) for c, r in zip(plan, range_reports) if not c.is_complete()])
+
+        leads = merge_lead_maps(self.existing_leads, *[c.leads for c in plan])
+        report.new_leads = sum(1 for address in leads if address not in self.existing_leads)
+        report.deposits = sum(r.deposits for r in range_reports)
+        report.withdrawals = sum(r.withdrawals for r in range_reports)
+        return leads
+
+    async def stream_range(
+        self,
+        checkpoint: LeadRangeCheckpoint,
+        report: LeadScanReport,
+        topic_map: dict[str, object],
+        seen: set[HexAddress],
+        progress_bar: tqdm | None,
+    ):
+        """Stream one block range from its cursor to its end.
+
+        Leads are collected to ``checkpoint.leads``.
+        If we have a checkpoint database, the cursor and leads are saved periodically.
+        """
+        chain = checkpoint.chain_id
+        start_block = checkpoint.cursor_block
+        end_block = checkpoint.end_block
+
         logger.info("Building HyperSync query")
         query = self.build_query(start_block, end_block)
 
@@ -467,25 +584,12 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
             _raise_recoverable_hypersync_error(e, "vault-lead-discovery")
             raise
 
-        if display_progress:
-            chain_name = get_chain_name(self.web3.eth.chain_id)
-            progress_bar = tqdm(
-                total=end_block - start_block,
-                desc=f"HypersyncVaultDiscover: scanning vault leads on {chain_name}",
-            )
-        else:
-            progress_bar = None
-
         last_block = start_block
 
         logger.info("Streaming HyperSync")
 
         last_synced = None
-
-        report = LeadScanReport(backend=self)
-        report.old_leads = len(self.existing_leads)
-        report.leads = self.existing_leads.copy()
-        seen = set()
+        last_checkpoint_at = time.monotonic()
 
         while True:
             try:
@@ -501,7 +605,7 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
             if res is None:
                 break
 
-            current_block = res.next_block
+            current_block = min(res.next_block, end_block)
 
             if res.data.logs:
                 block_lookup = {b.number: b for b in res.data.blocks}
@@ -509,7 +613,7 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
                 for log in res.data.logs:
                     self.process_log(
                         report,
-                        report.leads,
+                        checkpoint.leads,
                         topic_map,
                         chain,
                         log,
@@ -519,6 +623,13 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
 
             last_synced = res.archive_height
 
+            checkpoint.cursor_block = current_block
+            checkpoint.deposits = report.deposits
+            checkpoint.withdrawals = report.withdrawals
+            if self.checkpoint_db is not None and time.monotonic() - last_checkpoint_at > self.checkpoint_interval:
+                self.checkpoint_db.save(checkpoint)
+                last_checkpoint_at = time.monotonic()
+
             if progress_bar is not None:
                 progress_bar.update(current_block - last_block)
                 last_block = current_block
@@ -530,9 +641,8 @@ class HypersyncVaultDiscover(VaultDiscoveryBase):
                     }
                 )
 
-        logger.info(f"HyperSync sees {last_synced} as the last block")
+        checkpoint.cursor_block = end_block
+        if self.checkpoint_db is not None:
+            self.checkpoint_db.save(checkpoint)
 
-        if progress_bar is not None:
-            progress_bar.close()
-
-        return report
+        logger.info(f"HyperSync sees {last_synced} as the last block")
@@ -0,0 +1,261 @@
+"""Parallel block ranges and resumable cursors for vault lead discovery.
+
+:py:class:`~eth_defi.erc_4626.hypersync_discovery.HypersyncVaultDiscover`
+used to stream a chain linearly from the last scanned block in one HyperSync
+query.  A fresh chain backfill therefore used one stream out of the available
+HyperSync concurrency, and an interrupted scan restarted from the beginning,
+as the lead state is only persisted with the whole
+:py:class:`~eth_defi.vault.vaultdb.VaultDatabase` after the chain completes.
+
+This module provides the building blocks to
+
+- Split a large block range to half-open sub-ranges streamed in parallel,
+  see :py:func:`split_block_range`
+
+- Merge per-range :py:class:`~eth_defi.erc_4626.discovery_base.PotentialVaultMatch`
+  counters with a commutative reducer, so range completion order does not matter,
+  see :py:func:`merge_lead_maps`
+
+- Checkpoint the per-range cursor and partial leads to a small SQLite sidecar
+  database next to the vault database, so an interrupted scan resumes exactly
+  where each range stopped, see :py:class:`LeadRangeCheckpointDatabase`
+"""
+
+import dataclasses
+import logging
+import pickle
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from eth_typing import HexAddress
+
+from eth_defi.erc_4626.discovery_base import PotentialVaultMatch
+
+logger = logging.getLogger(__name__)
+
+#: Sidecar database file name, stored next to the vault database
+LEAD_RANGE_CHECKPOINT_DATABASE_FILENAME = "lead-discovery-ranges.sqlite"
+
+#: Do not split ranges smaller than this, to keep incremental scans in a single stream
+DEFAULT_MIN_RANGE_BLOCKS = 2_000_000
+
+
+def split_block_range(
+    start_block: int,
+    end_block: int,
+    range_count: int,
+    min_range_blocks: int = DEFAULT_MIN_RANGE_BLOCKS,
+) -> list[tuple[int, int]]:
+    """Split a half-open block range ``[start_block, end_block)`` into contiguous sub-ranges.
+
+    :param range_count:
+        Maximum number of sub-ranges.
+
+    :param min_range_blocks:
+        Each sub-range spans at least this many blocks.
+
+    :return:
+        List of ``(start, end)`` half-open ranges covering the input exactly.
+    """
+    assert end_block > start_block, f"Empty range {start_block} - {end_block}"
+    assert range_count >= 1
+
+    span = end_block - start_block
+    range_count = max(1, min(range_count, span // max(min_range_blocks, 1)))
+    step = span // range_count
+
+    ranges = []
+    cursor = start_block
+    for i in range(range_count):
+        range_end = end_block if i == range_count - 1 else cursor + step
+        ranges.append((cursor, range_end))
+        cursor = range_end
+    return ranges
+
+
+def merge_potential_vault_match(a: PotentialVaultMatch, b: PotentialVaultMatch) -> PotentialVaultMatch:
+    """Combine two observations of the same lead from different block ranges.
+
+    - Event counters are summed
+    - The earliest first seen block wins
+    - Factory metadata is kept from whichever side has it
+
+    The reducer is commutative and associative; inputs are not modified.
+    """
+    assert a.chain == b.chain and a.address.lower() == b.address.lower(), f"Cannot merge different leads {a} and {b}"
+
+    earliest = a if a.first_seen_at_block <= b.first_seen_at_block else b
+    other = b if earliest is a else a
+    handlers = earliest.enzyme_active_deposit_handlers
+    return dataclasses.replace(
+        earliest,
+        deposit_count=a.deposit_count + b.deposit_count,
+        withdrawal_count=a.withdrawal_count + b.withdrawal_count,
+        configuration_count=a.configuration_count + b.configuration_count,
+        mellow_factory_candidate=earliest.mellow_factory_candidate or other.mellow_factory_candidate,
+        enzyme_factory_candidate=earliest.enzyme_factory_candidate or other.enzyme_factory_candidate,
+        enzyme_active_deposit_handlers=handlers if handlers is not None else other.enzyme_active_deposit_handlers,
+        enzyme_blue_factory_candidate=earliest.enzyme_blue_factory_candidate or other.enzyme_blue_factory_candidate,
+    )
+
+
+def merge_lead_maps(*lead_maps: dict[HexAddress, PotentialVaultMatch]) -> dict[HexAddress, PotentialVaultMatch]:
+    """Merge lead maps produced by independent block range scans.
+
+    :return:
+        New lead map. Leads only present in one input are passed through as is.
+    """
+    merged: dict[HexAddress, PotentialVaultMatch] = {}
+    for lead_map in lead_maps:
+        for address, lead in lead_map.items():
+            existing = merged.get(address)
+            merged[address] = lead if existing is None else merge_potential_vault_match(existing, lead)
+    return merged
+
+
+@dataclass(slots=True)
+class LeadRangeCheckpoint:
+    """Progress of streaming one block range."""
+
+    chain_id: int
+
+    #: Range start, inclusive
+    start_block: int
+
+    #: Range end, exclusive
+    end_block: int
+
+    #: Next block to stream
+    cursor_block: int
+
+    #: Leads collected so far in this range
+    leads: dict[HexAddress, PotentialVaultMatch] = dataclasses.field(default_factory=dict)
+
+    #: Diagnostics counters collected so far in this range
+    deposits: int = 0
+
+    #: Diagnostics counters collected so far in this range
+    withdrawals: int = 0
+
+    def is_complete(self) -> bool:
+        return self.cursor_block >= self.end_block
+
+
+class LeadRangeCheckpointDatabase:
+    """SQLite sidecar storing per-range lead discovery cursors.
+
+    The vault database remains the authoritative store of leads.
+    Checkpoints only live between the start of a discovery scan and
+    the moment its results have been written to the vault database,
+    after which :py:meth:`clear_chain` removes them.
+    """
+
+    def __init__(self, path: Path):
+        assert isinstance(path, Path), f"Expected Path, got {type(path)}"
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lead_range_checkpoint (
+                    chain_id INTEGER NOT NULL,
+                    start_block INTEGER NOT NULL,
+                    end_block INTEGER NOT NULL,
+                    cursor_block INTEGER NOT NULL,
+                    deposits INTEGER NOT NULL,
+                    withdrawals INTEGER NOT NULL,
+                    leads BLOB NOT NULL,
+                    PRIMARY KEY (chain_id, start_block)
+                )
+                """
+            )
+
+    def __repr__(self):
+        return f"<LeadRangeCheckpointDatabase {self.path}>"
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=60)
+
+    def load_chain(self, chain_id: int) -> list[LeadRangeCheckpoint]:
+        """Load all stored range checkpoints for a chain, ordered by start block."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT start_block, end_block, cursor_block, deposits, withdrawals, leads FROM lead_range_checkpoint WHERE chain_id = ? ORDER BY start_block",
+                (chain_id,),
+            ).fetchall()
+        return [
+            LeadRangeCheckpoint(
+                chain_id=chain_id,
+                start_block=start_block,
+                end_block=end_block,
+                cursor_block=cursor_block,
+                deposits=deposits,
+                withdrawals=withdrawals,
+                leads=pickle.loads(leads),
+            )
+            for start_block, end_block, cursor_block, deposits, withdrawals, leads in rows
+        ]
+
+    def save(self, checkpoint: LeadRangeCheckpoint):
+        """Persist the progress of one range."""
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO lead_range_checkpoint (chain_id, start_block, end_block, cursor_block, deposits, withdrawals, leads) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    checkpoint.chain_id,
+                    checkpoint.start_block,
+                    checkpoint.end_block,
+                    checkpoint.cursor_block,
+                    checkpoint.deposits,
+                    checkpoint.withdrawals,
+                    pickle.dumps(checkpoint.leads),
+                ),
+            )
+
+    def clear_chain(self, chain_id: int):
+        """Drop checkpoints after the results have been persisted in the vault database."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM lead_range_checkpoint WHERE chain_id = ?", (chain_id,))
+
+    def plan_ranges(
+        self,
+        chain_id: int,
+        start_block: int,
+        end_block: int,
+        range_count: int,
+        min_range_blocks: int = DEFAULT_MIN_RANGE_BLOCKS,
+    ) -> list[LeadRangeCheckpoint]:
+        """Create or resume the range plan for a scan.
+
+        If an interrupted scan with the same start block is found, its ranges and
+        partial results are reused as is, and blocks past its end are appended as
+        a new tail range. Otherwise stale checkpoints are dropped and a fresh plan is made.
+
+        :return:
+            Range checkpoints to stream. Complete ranges are included.
+        """
+        existing = self.load_chain(chain_id)
+        if existing and existing[0].start_block == start_block and existing[-1].end_block <= end_block:
+            plan = existing
+            planned_end = existing[-1].end_block
+            if planned_end < end_block:
+                tail = LeadRangeCheckpoint(chain_id, planned_end, end_block, planned_end)
+                self.save(tail)
+                plan.append(tail)
+            logger.info(
+                "Resuming lead discovery for chain %d: %d ranges, %d complete",
+                chain_id,
+                len(plan),
+                sum(1 for c in plan if c.is_complete()),
+            )
+            return plan
+
+        if existing:
+            logger.info("Dropping %d stale lead discovery checkpoints for chain %d", len(existing), chain_id)
+            self.clear_chain(chain_id)
+
+        plan = [LeadRangeCheckpoint(chain_id, s, e, s) for s, e in split_block_range(start_block, end_block, range_count, min_range_blocks)]
+        for checkpoint in plan:
+            self.save(checkpoint)
+        return plan
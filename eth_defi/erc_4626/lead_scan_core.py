@@ -17,6 +17,8 @@ from web3 import Web3
 
 from eth_defi.chain import get_chain_name
 from eth_defi.erc_4626.discovery_base import LeadScanReport
+from eth_defi.erc_4626.lead_range_scan import LEAD_RANGE_CHECKPOINT_DATABASE_FILENAME, LeadRangeCheckpointDatabase
+from eth_defi.erc_4626.probe_cache import create_vault_probe_cache_from_env
 from eth_defi.erc_4626.rpc_discovery import JSONRPCVaultDiscover
 from eth_defi.erc_4626.scan import create_vault_scan_record_subprocess
 from eth_defi.hypersync.hypersync_timestamp import get_hypersync_block_height
@@ -109,6 +111,7 @@ def scan_leads(
     max_display_entries: int | None = None,
     rpc_request_stats: RPCRequestStats | None = None,
     web3: Web3 | None = None,
+    parallel_ranges: int | None = None,
 ) -> LeadScanReport:
     """Core loop to discover new vaults on a chain.
 
@@ -127,6 +130,11 @@ def scan_leads(
     :param web3:
         Optional phase-owned Web3 connection. Supplying it lets an outer
         scanner establish the chain id before entering exception-handled work.
+    :param parallel_ranges:
+        Number of block ranges HyperSync lead discovery streams concurrently.
+        ``None`` falls back to the ``LEAD_DISCOVERY_PARALLEL_RANGES`` env var, then to 1.
+        With more than one range, range cursors are checkpointed next to the vault database,
+        so an interrupted scan resumes where each range stopped.
     """
 
     from eth_defi.erc_4626.hypersync_discovery import HypersyncVaultDiscover
@@ -169,17 +177,30 @@ def scan_leads(
 
     if hypersync_config.hypersync_client:
         # Create a scanner that uses web3, HyperSync and subprocesses
+        if parallel_ranges is None:
+            parallel_ranges = int(os.environ.get("LEAD_DISCOVERY_PARALLEL_RANGES", "1"))
+
+        # Ranged scanning and its checkpoints are opt-in,
+        # the default is the single linear stream
+        if parallel_ranges > 1:
+            checkpoint_db = LeadRangeCheckpointDatabase(vault_db_file.parent / LEAD_RANGE_CHECKPOINT_DATABASE_FILENAME)
+        else:
+            checkpoint_db = None
+
         vault_discover = HypersyncVaultDiscover(
             web3,
             web3factory,
             hypersync_config.hypersync_client,
             max_workers=max_workers,
+            parallel_ranges=parallel_ranges,
+            checkpoint_db=checkpoint_db,
         )
 
         if not end_block:
             end_block = get_hypersync_block_height(hypersync_config.hypersync_client)
 
     else:
+        checkpoint_db = None
         if start_block <= 1:
             message = "Initial vault lead discovery requires HyperSync; refusing genesis-to-head JSON-RPC event scanning"
             raise RuntimeError(message)
@@ -196,6 +217,8 @@ def scan_leads(
     existing_leads = existing_db.get_existing_leads_by_chain(chain_id)
     vault_discover.seed_existing_leads(existing_leads)
 
+    vault_discover.probe_cache = create_vault_probe_cache_from_env()
+
     printer(f"Chain: {name}: scan range {start_block:,} - {end_block:,}")
 
     # Perform vault discovery and categorisation,
@@ -265,6 +288,11 @@ def scan_leads(
         rows=data_dict,
     )
     existing_db.write(vault_db_file)
+
+    # Leads are now safely in the vault database
+    if checkpoint_db is not None:
+        checkpoint_db.clear_chain(chain_id)
+
     printer(f"Chain: {name}: {len(report.leads)} leads, {len(report.detections)} detections, {len(report.rows)} metadata rows")
     printer(f"Vault database has {existing_db.get_lead_count()} entries")
     printer(f"Total: {len(rows)} vaults detected, last block is now {report.end_block:,}")
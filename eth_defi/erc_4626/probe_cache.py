@@ -0,0 +1,147 @@
+"""Runtime code hash keyed cache for vault feature probes.
+
+:py:func:`~eth_defi.erc_4626.classification.probe_vaults` identifies a vault
+by firing dozens of protocol-specific probe calls at it. Most vaults are
+deployed by factories, so thousands of addresses share the same runtime code,
+either directly or behind a proxy pointing to the same implementation.
+Whether a protocol selector answers is a property of that code, so the
+protocol probe results of one vault are valid for all of its clones.
+
+- :py:func:`~eth_defi.provider.code_hash.fetch_runtime_code_hashes` resolves the code identity
+  of an address, following EIP-1167 minimal proxies, the EIP-1967 implementation slot and
+  the EIP-1967 beacon slot
+
+- :py:class:`VaultProbeCache` stores protocol probe results in a SQLite file,
+  keyed by chain, code hash and the probe set fingerprint, so adding or changing
+  a probe invalidates old entries automatically
+
+Probes whose classification depends on the returned value, not just on whether
+the selector exists, are never cached and always called live. See
+:py:data:`~eth_defi.erc_4626.classification.VALUE_DEPENDENT_PROBE_FUNCTIONS`.
+
+Enable for the vault scanner with ``VAULT_PROBE_CACHE_PATH`` environment variable.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+
+from eth_defi.disk_cache import DEFAULT_CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+#: Default location of the probe cache
+DEFAULT_VAULT_PROBE_CACHE_PATH = DEFAULT_CACHE_ROOT / "vault-probe" / "vault-probe-results.sqlite"
+
+
+class CachedProbeResult:
+    """Probe result served from :py:class:`VaultProbeCache`.
+
+    Quacks like :py:class:`~eth_defi.event_reader.multicall_batcher.EncodedCallResult`
+    for :py:func:`~eth_defi.erc_4626.classification.identify_vault_features`.
+    """
+
+    __slots__ = ("func_name", "success", "result")
+
+    def __init__(self, func_name: str, success: bool, result: bytes):
+        self.func_name = func_name
+        self.success = success
+        self.result = result
+
+    def __repr__(self):
+        return f"<CachedProbeResult {self.func_name} {self.success}>"
+
+
+def get_probe_set_fingerprint(func_names: Iterable[str]) -> str:
+    """Identify the set of probes whose results are cached.
+
+    Changing the probe set in :py:func:`~eth_defi.erc_4626.classification.create_probe_calls`
+    changes the fingerprint, so stale cache entries are not used.
+    """
+    return hashlib.sha256(",".join(sorted(func_names)).encode()).hexdigest()[:16]
+
+
+class VaultProbeCache:
+    """SQLite cache of protocol probe results keyed by runtime code hash.
+
+    Safe to share between processes; each operation opens its own connection.
+    """
+
+    def __init__(self, path: Path = DEFAULT_VAULT_PROBE_CACHE_PATH):
+        assert isinstance(path, Path), f"Expected Path, got {type(path)}"
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS probe_result (
+                    chain_id INTEGER NOT NULL,
+                    code_hash BLOB NOT NULL,
+                    probe_set TEXT NOT NULL,
+                    results BLOB NOT NULL,
+                    PRIMARY KEY (chain_id, code_hash, probe_set)
+                )
+                """
+            )
+
+    def __repr__(self):
+        return f"<VaultProbeCache {self.path}>"
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=60)
+
+    def get_many(self, chain_id: int, code_hashes: Iterable[bytes], probe_set: str) -> dict[bytes, dict[str, CachedProbeResult]]:
+        """Look up cached probe results.
+
+        :return:
+            Code hash -> func name -> result, for hits only
+        """
+        code_hashes = list(set(code_hashes))
+        hits = {}
+        with self._connect() as connection:
+            # Stay below SQLite's host parameter limit
+            for i in range(0, len(code_hashes), 500):
+                chunk = code_hashes[i : i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT code_hash, results FROM probe_result WHERE chain_id = ? AND probe_set = ? AND code_hash IN ({placeholders})",
+                    (chain_id, probe_set, *chunk),
+                ).fetchall()
+                for code_hash, results in rows:
+                    hits[bytes(code_hash)] = {func_name: CachedProbeResult(func_name, success, result) for func_name, (success, result) in pickle.loads(results).items()}
+        return hits
+
+    def put_many(self, chain_id: int, probe_set: str, entries: dict[bytes, dict]):
+        """Store probe results.
+
+        :param entries:
+            Code hash -> func name -> probe result with ``success`` and ``result`` attributes
+        """
+        if not entries:
+            return
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO probe_result (chain_id, code_hash, probe_set, results) VALUES (?, ?, ?, ?)",
+                [(chain_id, code_hash, probe_set, pickle.dumps({func_name: (r.success, bytes(r.result)) for func_name, r in results.items()})) for code_hash, results in entries.items()],
+            )
+
+
+def create_vault_probe_cache_from_env() -> VaultProbeCache | None:
+    """Create the scanner probe cache if enabled.
+
+    - ``VAULT_PROBE_CACHE_PATH``: SQLite file, or ``default`` for :py:data:`DEFAULT_VAULT_PROBE_CACHE_PATH`
+
+    :return:
+        Cache, or ``None`` if ``VAULT_PROBE_CACHE_PATH`` is not set.
+    """
+    path = os.environ.get("VAULT_PROBE_CACHE_PATH", "").strip()
+    if not path:
+        return None
+
+    path = DEFAULT_VAULT_PROBE_CACHE_PATH if path == "default" else Path(path).expanduser()
+    return VaultProbeCache(path)
@@ -225,6 +225,7 @@ def fetch_vault_settlement_logs_hypersync_for_addresses(
         topic0_list=topic0_list,
         start_block=start_block,
         end_block=end_block,
+        web3=web3,
     )
     logger.info(
         "Fetched %d vault settlement logs for %d vaults using Hypersync from blocks %d - %d",
@@ -702,6 +702,7 @@ class AccountableDepositManager(ERC4626DepositManager):
             topic0_list=[get_topic_signature_from_event(event).lower()],
             start_block=start_block,
             end_block=end_block,
+            web3=self.web3,
         )
         chain_id = int(self.web3.eth.chain_id)
         vault_address = Web3.to_checksum_address(self.vault.address)
@@ -1069,6 +1069,7 @@ class EmberDepositManager(ERC4626DepositManager):
             topic0_list=[topic],
             start_block=start_block,
             end_block=end_block,
+            web3=self.web3,
         )
         chain_id = int(self.web3.eth.chain_id)
         vault_address = Web3.to_checksum_address(self.vault.address)
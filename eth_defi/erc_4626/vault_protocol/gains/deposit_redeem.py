@@ -852,6 +852,7 @@ class OstiumV15DepositManager(ERC4626DepositManager):
             topic0_list=list(topic_map.keys()),
             start_block=start_block,
             end_block=end_block,
+            web3=self.web3,
         )
         chain_id = self.web3.eth.chain_id
         vault_address = Web3.to_checksum_address(vault.address)
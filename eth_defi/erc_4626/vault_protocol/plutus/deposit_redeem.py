@@ -552,6 +552,7 @@ class PlutusAsyncDepositManager(ERC4626DepositManager):
             topic0_list=[role_granted_topic],
             start_block=0,
             end_block=head,
+            web3=self.web3,
         )
         candidates = [Web3.to_checksum_address("0x" + log.topics[2][-40:]) for log in logs if log.topics[1] is not None and bytes.fromhex(log.topics[1][2:]) == operator_role]
         for candidate in reversed(candidates):
@@ -282,6 +282,7 @@ class ERC7540DepositManager(VaultDepositManager):
             topic0_list=list(topic_map.keys()),
             start_block=start_block,
             end_block=end_block,
+            web3=self.web3,
         )
         chain_id = self.web3.eth.chain_id
         vault_address = Web3.to_checksum_address(vault.address)
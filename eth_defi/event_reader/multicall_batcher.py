@@ -29,8 +29,9 @@ from http.client import RemoteDisconnected
 from itertools import islice
 from pathlib import Path
 from pprint import pformat
-from typing import Any, Callable, Final, Generator, Hashable, Iterable, TypeAlias
+from typing import Any, Callable, Final, Generator, Hashable, Iterable, Sequence, TypeAlias
 
+import eth_abi
 from eth_typing import BlockIdentifier, BlockNumber, HexAddress
 from hexbytes import HexBytes
 from joblib import Parallel, delayed
@@ -42,13 +43,16 @@ from web3.contract import Contract
 from web3.contract.contract import ContractFunction
 
 from eth_defi.abi import ZERO_ADDRESS, ZERO_ADDRESS_STR, encode_function_call, format_debug_instructions, get_deployed_contract
+from eth_defi.abi_index import get_call_output_types
 from eth_defi.chain import get_default_call_gas_limit
 from eth_defi.compat import native_datetime_utc_now
 from eth_defi.event_reader.fast_json_rpc import get_last_headers
+from eth_defi.event_reader.multicall_cache import MulticallResultCache, get_process_multicall_cache
 from eth_defi.event_reader.multicall_timestamp import fetch_block_timestamps_multiprocess_auto_backend
 from eth_defi.event_reader.timestamp_cache import DEFAULT_TIMESTAMP_CACHE_FOLDER
 from eth_defi.event_reader.web3factory import Web3Factory
 from eth_defi.middleware import ProbablyNodeHasNoBlock, is_retryable_http_exception
+from eth_defi.provider.domain_rate_limit import parse_retry_after
 from eth_defi.provider.fallback import ChainIdMismatch, FallbackProvider
 from eth_defi.provider.multi_provider import MultiProviderWeb3Factory
 from eth_defi.provider.named import get_provider_name
@@ -972,6 +976,30 @@ class EncodedCallResult:
         assert type(self.success) == bool, f"Got success: {self.success}"
         assert type(self.result) == bytes
 
+    def decode(self, output_types: Sequence[str] | None = None) -> tuple:
+        """Decode the return value.
+
+        Without ``output_types``, the types are looked up by the call selector
+        from the ABI index, see :py:func:`eth_defi.abi_index.get_call_output_types`,
+        so bulk decoding needs no web3 contract objects.
+
+        :param output_types:
+            ABI output types, e.g. ``("uint256",)``
+
+        :return:
+            Values as returned by :py:func:`eth_abi.decode`
+
+        :raise ValueError:
+            The call failed, or the output types are not given and the ABI index does not know them
+        """
+        if not self.success:
+            raise ValueError(f"Cannot decode failed call {self.call.func_name} at {self.call.address}")
+        if output_types is None:
+            output_types = get_call_output_types(self.call.data[:4])
+            if output_types is None:
+                raise ValueError(f"Output types of {self.call.func_name} ({self.call.data[:4].hex()}) not in the ABI index, pass output_types, or build the index with: python -m eth_defi.abi_index")
+        return eth_abi.decode(output_types, self.result)
+
 
 @dataclass(slots=True, frozen=True)
 class CombinedEncodedCallResult:
@@ -1162,6 +1190,7 @@ class MultiprocessMulticallReader:
         backswitch_threshold=100,
         too_many_requets_sleep=61.0,
         rpc_request_stats: RPCRequestStats | None = None,
+        multicall_cache: MulticallResultCache | None = None,
     ):
         """Create subprocess worker instance.
 
@@ -1173,6 +1202,9 @@ class MultiprocessMulticallReader:
 
             Manually tuned number if your RPC nodes start to crap out, as they hit their internal time limits.
 
+        :param multicall_cache:
+            Serve and store finalised block results from a persistent cache.
+
         """
         if isinstance(web3factory, Web3):
             # Directly passed
@@ -1206,12 +1238,36 @@ class MultiprocessMulticallReader:
 
         self.too_many_requets_sleep = too_many_requets_sleep
 
+        #: Optional persistent cache for historical block-pinned results
+        self.multicall_cache = multicall_cache
+
     def __repr__(self):
         return f"<MultiprocessMulticallReader process: {os.getpid()}, thread: {threading.current_thread()}, chain: {self.web3.eth.chain_id}>"
 
     def get_block_timestamp(self, block_number: int) -> datetime.datetime:
         return get_block_timestamp(self.web3, block_number)
 
+    def get_too_many_requests_sleep(self, headers: dict | None) -> float:
+        """How long to sleep after HTTP 429.
+
+        - Honour ``Retry-After`` header if the provider sent one,
+          otherwise fall back to ``too_many_requets_sleep``
+
+        - If the provider has a shared :py:class:`~eth_defi.provider.domain_rate_limit.DomainRateLimiter`,
+          the throttle is reported there so that other worker processes
+          pause too instead of hammering the same quota
+        """
+        retry_after = parse_retry_after(headers)
+        sleep = self.too_many_requets_sleep if retry_after is None else retry_after
+
+        provider = self.web3.provider
+        if isinstance(provider, FallbackProvider) and provider.rate_limiter is not None:
+            domain = provider.get_active_provider_domain()
+            if provider.rate_limiter.get_limit(domain) is not None:
+                sleep = provider.rate_limiter.report_throttled(domain, retry_after)
+
+        return sleep
+
     def get_gas_hint(self, chain_id: int, batch_calls: list[tuple[HexAddress, bytes]]) -> int | None:
         """Fix non-standard out of gas issues
 
@@ -1277,6 +1333,12 @@ class MultiprocessMulticallReader:
             for address, data in batch_calls:
                 assert address.lower() not in BROKEN_VAULT_CONTRACTS, f"Contract {address} is broken, cannot call multicall on it."
 
+            if self.multicall_cache is not None:
+                cached_results = self.multicall_cache.get(chain_id, block_identifier, batch_calls)
+                if cached_results is not None:
+                    calls_results += cached_results
+                    continue
+
             # https://github.com/onflow/go-ethereum/blob/18406ff59b887a1d132f46068aa0bee2a9234bd7/core/state/reader.go#L303C6-L303C25
             # https://etherscan.io/address/0xcA11bde05977b3631167028862bE2a173976CA11#code
             bound_func = multicall_contract.functions.tryBlockAndAggregate(
@@ -1362,6 +1424,9 @@ class MultiprocessMulticallReader:
                         last_headers = get_last_headers()
                         raise MulticallStateProblem(f"Multicall gave empty result: at block {block_identifier} at chain {self.web3.eth.chain_id}.\nDebug data is:\n{debug_str}\nRPC is: {rpc_name}\nBatch result: {batch_results}\nBatch calls: {batch_calls}\nReceived block number: {received_block_number}\nResponse headers: {pformat(last_headers)}\nLive multicall readers are: {pformat(readers)}")
 
+            if self.multicall_cache is not None:
+                self.multicall_cache.put(chain_id, block_identifier, batch_calls, batch_results)
+
             calls_results += batch_results
 
         return calls_results
@@ -1622,8 +1687,9 @@ class MultiprocessMulticallReader:
                 for i in range(fallback_attempts):
                     if status_code == 429:
                         # Alchemy/Quicknode throttling us
-                        logger.warning("Received HTTP 429: sleeping %f, cause %s", self.too_many_requets_sleep, cause)
-                        time.sleep(self.too_many_requets_sleep)
+                        throttle_sleep = self.get_too_many_requests_sleep(headers)
+                        logger.warning("Received HTTP 429: sleeping %f, cause %s", throttle_sleep, cause)
+                        time.sleep(throttle_sleep)
                     else:
                         # Sleep between retries to give RPC nodes time to converge.
                         # Without this delay, all retries fire within milliseconds and
@@ -1757,6 +1823,7 @@ def read_multicall_historical(
     hypersync_client: "HypersyncClient | None" = None,
     timestamp_cache_file: Path = DEFAULT_TIMESTAMP_CACHE_FOLDER,
     rpc_request_stats: RPCRequestStats | None = None,
+    multicall_cache: MulticallResultCache | None = None,
 ) -> Iterable[CombinedEncodedCallResult]:
     """Read historical data using multiple threads in parallel for speedup.
 
@@ -1798,6 +1865,12 @@ def read_multicall_historical(
         Optional HyperSync client used to fetch the sampled block timestamps
         through the shared cache. This keeps timestamp reads out of the
         archive JSON-RPC workers.
+
+    :param multicall_cache:
+        Persistent result cache for finalised blocks.
+
+        Makes re-running a crashed or re-scoped backfill nearly free.
+        See :py:mod:`eth_defi.event_reader.multicall_cache`.
     """
 
     assert type(start_block) == int, f"Got: {start_block}"
@@ -1872,6 +1945,7 @@ def read_multicall_historical(
                 timestamp=timestamps[block_number] if timestamps is not None else None,
                 require_multicall_result=require_multicall_result,
                 collect_rpc_request_stats=rpc_request_stats is not None,
+                multicall_cache=multicall_cache,
             )
             logger.debug(
                 "Created task for block %d with %d calls",
@@ -1922,6 +1996,7 @@ def read_multicall_historical_stateful(
     hypersync_client: "HypersyncClient | None" = None,
     timestamp_cache_file: Path = DEFAULT_TIMESTAMP_CACHE_FOLDER,
     rpc_request_stats: RPCRequestStats | None = None,
+    multicall_cache: MulticallResultCache | None = None,
 ) -> Iterable[CombinedEncodedCallResult]:
     """Read historical data using multicall with reading state and adaptive frequency filtering.
 
@@ -1938,6 +2013,11 @@ def read_multicall_historical_stateful(
 
         Between chunks we blindly push data to subprocesses for speedup,
         do not attempt to hear back from the multiprocess to update the state.
+
+    :param multicall_cache:
+        Persistent result cache for finalised blocks.
+
+        See :py:mod:`eth_defi.event_reader.multicall_cache`.
     """
 
     assert type(start_block) == int, f"Got: {start_block}"
@@ -2066,6 +2146,7 @@ def read_multicall_historical_stateful(
             timestamp=timestamp,
             require_multicall_result=require_multicall_result,
             collect_rpc_request_stats=rpc_request_stats is not None,
+            multicall_cache=multicall_cache,
         )
 
         chunk.append(task)
@@ -2350,6 +2431,9 @@ class MulticallHistoricalTask:
     #: Shared parent counter when running under the threading backend.
     rpc_request_stats: RPCRequestStats | None = None
 
+    #: Persistent historical result cache, opened lazily in the subprocess
+    multicall_cache: MulticallResultCache | None = None
+
     def __post_init__(self):
         assert callable(self.web3factory)
         assert type(self.block_number) in (int, str), f"Got: {self.block_number}"
@@ -2397,6 +2481,9 @@ def _execute_multicall_subprocess(
     if callable(set_rpc_request_stats):
         set_rpc_request_stats(task_rpc_request_stats)
 
+    # Cached readers are shared between tasks, with or without a cache
+    reader.multicall_cache = get_process_multicall_cache(task.multicall_cache)
+
     try:
         # Read block timestamp for this batch
         assert task.chain_id == reader.web3.eth.chain_id, f"chain_id mismatch. Wanted: {task.chain_id}, reader has: {reader.web3.eth.chain_id}"
@@ -0,0 +1,344 @@
+"""Persistent cache for block-pinned historical multicall results.
+
+Historical vault reads (:py:func:`~eth_defi.event_reader.multicall_batcher.read_multicall_historical`,
+:py:func:`~eth_defi.event_reader.multicall_batcher.read_multicall_historical_stateful`)
+ask the same ``tryBlockAndAggregate`` batch at the same block again whenever
+a scan is re-run after a crash, a schema change or a partial
+``vault_addresses`` rewrite.  The answer of an ``eth_call`` at a finalised
+block never changes, so it can be stored on disk and served without
+touching the RPC.
+
+- Content-addressed: the key is ``(chain id, block number, hash of the encoded call batch)``
+- Only blocks at or below :py:attr:`MulticallResultCache.finalised_block` are cached,
+  set by the caller with :py:meth:`MulticallResultCache.update_finalised_block`
+- Stored in a SQLite file, compressed with zstd
+- Size-capped: least recently used entries are evicted when the file grows over ``max_bytes``.
+  Access times of hits are written in batches, not on every hit
+- Pickle-friendly, so the same cache object can be passed to loky workers;
+  each worker process keeps one cache instance and SQLite connection per cache file,
+  see :py:func:`get_process_multicall_cache`
+
+Opt-in for the scanner by setting the ``MULTICALL_CACHE_PATH`` environment variable,
+see :py:func:`create_multicall_result_cache_from_env`.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable
+
+import msgpack
+import zstandard
+from eth_typing import HexAddress
+from web3 import Web3
+
+from eth_defi.disk_cache import DEFAULT_CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+#: Default location of the historical multicall result cache
+DEFAULT_MULTICALL_CACHE_PATH = DEFAULT_CACHE_ROOT / "multicall" / "multicall-results.sqlite"
+
+#: Default maximum cache size before LRU eviction kicks in, 4 GB
+DEFAULT_MULTICALL_CACHE_MAX_BYTES = 4 * 1024**3
+
+#: How many blocks behind the chain tip we consider final,
+#: when the node does not support ``finalized`` block tag
+DEFAULT_REORG_SAFETY_BLOCKS = 256
+
+#: Check the total cache size after this many writes
+_EVICTION_CHECK_INTERVAL = 256
+
+#: Write access times of this many cache hits at once
+_ACCESS_FLUSH_INTERVAL = 256
+
+
+def hash_encoded_calls(encoded_calls: Iterable[tuple[HexAddress, bytes]]) -> bytes:
+    """Content hash of a multicall batch.
+
+    :param encoded_calls:
+        ``(target address, call data)`` tuples as passed to ``tryBlockAndAggregate``.
+
+    :return:
+        32 bytes SHA-256 digest
+    """
+    h = hashlib.sha256()
+    for address, data in encoded_calls:
+        h.update(bytes.fromhex(address[2:].lower()))
+        h.update(len(data).to_bytes(4, "big"))
+        h.update(data)
+    return h.digest()
+
+
+class MulticallResultCache:
+    """SQLite-backed cache of ``tryBlockAndAggregate`` results at finalised blocks.
+
+    Example:
+
+    .. code-block:: python
+
+        cache = MulticallResultCache()
+        cache.update_finalised_block(web3)
+
+        scan_historical_prices_to_parquet(
+            ...,
+            multicall_cache=cache,
+        )
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_MULTICALL_CACHE_PATH,
+        max_bytes: int = DEFAULT_MULTICALL_CACHE_MAX_BYTES,
+        finalised_block: int | None = None,
+    ):
+        """
+        :param path:
+            SQLite file.
+
+        :param max_bytes:
+            Evict least recently used entries when the payload total exceeds this.
+
+        :param finalised_block:
+            The highest block number we are allowed to cache.
+
+            If ``None``, reads are served from the cache but nothing new is written.
+        """
+        assert isinstance(path, Path), f"Expected Path, got {type(path)}"
+        self.path = path
+        self.max_bytes = max_bytes
+        self.finalised_block = finalised_block
+
+        #: Statistics for logging
+        self.hits = 0
+        self.misses = 0
+
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+        self._writes_since_eviction_check = 0
+
+        #: Access times of cache hits not yet written
+        self._pending_accesses: list[tuple] = []
+
+    def __repr__(self):
+        return f"<MulticallResultCache {self.path}, finalised block {self.finalised_block}, hits {self.hits}, misses {self.misses}>"
+
+    def __getstate__(self) -> dict:
+        # SQLite connections cannot cross process boundaries
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_connection_pid"] = None
+        state["_pending_accesses"] = []
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazily open one connection per process."""
+        if self._connection is None or self._connection_pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS multicall_result (
+                    chain_id INTEGER NOT NULL,
+                    block_number INTEGER NOT NULL,
+                    batch_hash BLOB NOT NULL,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (chain_id, block_number, batch_hash)
+                )
+                """
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS multicall_result_accessed_at ON multicall_result (accessed_at)")
+            connection.commit()
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self.flush_accesses()
+            self._connection.close()
+        self._connection = None
+
+    def flush_accesses(self):
+        """Write the access times of cache hits, used for LRU eviction."""
+        if not self._pending_accesses:
+            return
+        self.connection.executemany(
+            "UPDATE multicall_result SET accessed_at = ? WHERE chain_id = ? AND block_number = ? AND batch_hash = ?",
+            self._pending_accesses,
+        )
+        self.connection.commit()
+        self._pending_accesses = []
+
+    def update_finalised_block(self, web3: Web3, reorg_safety_blocks: int = DEFAULT_REORG_SAFETY_BLOCKS) -> int:
+        """Set the cacheable block horizon from the chain.
+
+        Use the ``finalized`` block tag where the node supports it,
+        otherwise stay ``reorg_safety_blocks`` behind the tip.
+
+        :return:
+            The new finalised block number
+        """
+        try:
+            block_number = web3.eth.get_block("finalized")["number"]
+        except Exception as e:
+            logger.info("Node does not support finalized block tag (%s), using %d blocks reorg safety", e, reorg_safety_blocks)
+            block_number = web3.eth.block_number - reorg_safety_blocks
+        self.finalised_block = block_number
+        return block_number
+
+    def is_cacheable(self, block_identifier) -> bool:
+        """Can results at this block be written to the cache."""
+        return type(block_identifier) == int and self.finalised_block is not None and block_identifier <= self.finalised_block
+
+    def get(
+        self,
+        chain_id: int,
+        block_number: int,
+        encoded_calls: list[tuple[HexAddress, bytes]],
+    ) -> list[tuple[bool, bytes]] | None:
+        """Look up a cached multicall batch result.
+
+        :return:
+            ``(success, return data)`` tuples in the call order, or ``None`` on a cache miss.
+        """
+        if type(block_number) != int:
+            return None
+
+        key = (chain_id, block_number, hash_encoded_calls(encoded_calls))
+        row = self.connection.execute(
+            "SELECT payload FROM multicall_result WHERE chain_id = ? AND block_number = ? AND batch_hash = ?",
+            key,
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self._pending_accesses.append((time.time(), *key))
+        if len(self._pending_accesses) >= _ACCESS_FLUSH_INTERVAL:
+            self.flush_accesses()
+        self.hits += 1
+        decoded = msgpack.unpackb(zstandard.ZstdDecompressor().decompress(row[0]))
+        return [(bool(success), bytes(data)) for success, data in decoded]
+
+    def put(
+        self,
+        chain_id: int,
+        block_number: int,
+        encoded_calls: list[tuple[HexAddress, bytes]],
+        results: list[tuple[bool, bytes]],
+    ) -> bool:
+        """Store a multicall batch result.
+
+        Failed calls are stored with their success flag, as a revert at a final block
+        is as deterministic as a return value. Nothing is stored for non-final blocks,
+        or when every call in the batch came back empty: that is a symptom of
+        a broken RPC node rather than real chain state.
+
+        :return:
+            True if the result was written
+        """
+        if not self.is_cacheable(block_number):
+            return False
+
+        assert len(encoded_calls) == len(results), f"Call and result count mismatch: {len(encoded_calls)} vs {len(results)}"
+
+        if all(data == b"" for success, data in results):
+            return False
+
+        payload = zstandard.ZstdCompressor().compress(msgpack.packb([(bool(success), bytes(data)) for success, data in results]))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO multicall_result (chain_id, block_number, batch_hash, payload, size, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (chain_id, block_number, hash_encoded_calls(encoded_calls), payload, len(payload), time.time()),
+        )
+        self.connection.commit()
+
+        self._writes_since_eviction_check += 1
+        if self._writes_since_eviction_check >= _EVICTION_CHECK_INTERVAL:
+            self.evict()
+
+        return True
+
+    def get_total_size(self) -> int:
+        """Total stored payload bytes."""
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM multicall_result").fetchone()[0]
+
+    def evict(self) -> int:
+        """Drop least recently used entries until we are below 90% of ``max_bytes``.
+
+        :return:
+            Number of deleted entries
+        """
+        self._writes_since_eviction_check = 0
+        self.flush_accesses()
+        total = self.get_total_size()
+        if total <= self.max_bytes:
+            return 0
+
+        target = int(self.max_bytes * 0.9)
+        deleted = 0
+        rows = self.connection.execute("SELECT rowid, size FROM multicall_result ORDER BY accessed_at").fetchall()
+        to_delete = []
+        for rowid, size in rows:
+            if total <= target:
+                break
+            to_delete.append((rowid,))
+            total -= size
+            deleted += 1
+
+        self.connection.executemany("DELETE FROM multicall_result WHERE rowid = ?", to_delete)
+        self.connection.commit()
+        logger.info("Multicall cache %s: evicted %d entries, size now %d bytes", self.path, deleted, total)
+        return deleted
+
+
+#: Cache instances of this process by SQLite file
+_process_caches: dict[Path, MulticallResultCache] = {}
+
+
+def get_process_multicall_cache(cache: MulticallResultCache | None) -> MulticallResultCache | None:
+    """Get the cache instance of this process for a cache passed to a worker.
+
+    Each loky task unpickles its own copy of the cache. Use the first copy
+    for each file for all later tasks, so a worker process keeps one SQLite
+    connection and its hit statistics instead of reopening the file for every block.
+
+    :param cache:
+        Cache as received by the task.
+
+    :return:
+        Process-wide cache for the same file, with the finalised block of ``cache``
+    """
+    if cache is None:
+        return None
+
+    process_cache = _process_caches.setdefault(cache.path, cache)
+    process_cache.finalised_block = cache.finalised_block
+    process_cache.max_bytes = cache.max_bytes
+    return process_cache
+
+
+def create_multicall_result_cache_from_env() -> MulticallResultCache | None:
+    """Create the scanner multicall cache if enabled.
+
+    - ``MULTICALL_CACHE_PATH``: SQLite file, or ``default`` for :py:data:`DEFAULT_MULTICALL_CACHE_PATH`
+    - ``MULTICALL_CACHE_MAX_BYTES``: optional size cap
+
+    :return:
+        Cache, or ``None`` if ``MULTICALL_CACHE_PATH`` is not set.
+    """
+    path = os.environ.get("MULTICALL_CACHE_PATH", "").strip()
+    if not path:
+        return None
+
+    path = DEFAULT_MULTICALL_CACHE_PATH if path == "default" else Path(path).expanduser()
+    max_bytes = int(os.environ.get("MULTICALL_CACHE_MAX_BYTES", DEFAULT_MULTICALL_CACHE_MAX_BYTES))
+    return MulticallResultCache(path, max_bytes=max_bytes)
@@ -29,6 +29,7 @@ from eth_defi.event_reader.reorganisation_monitor import ReorganisationMonitor
 from eth_defi.event_reader.web3factory import TunedWeb3Factory
 from eth_defi.event_reader.web3worker import create_thread_pool_executor, get_worker_web3
 from eth_defi.middleware import is_retryable_http_exception
+from eth_defi.provider.log_block_range import LogRangePlanner, read_logs_planned
 
 logger = logging.getLogger(__name__)
 
@@ -378,6 +379,22 @@ def prepare_filter(events: List[ContractEvent]) -> Filter:
     return filter
 
 
+def get_filter_key(filter: Filter) -> tuple:
+    """Hashable identity of a filter, for per-filter log density history.
+
+    See :py:class:`~eth_defi.provider.log_block_range.LogRangePlanner`.
+    """
+    addresses = filter.contract_address
+    if addresses is None:
+        addresses = []
+    elif isinstance(addresses, str):
+        addresses = [addresses]
+    return (
+        tuple(sorted(str(t).lower() for t in filter.topics)),
+        tuple(sorted(a.lower() for a in addresses)),
+    )
+
+
 def read_events(
     web3: Web3,
     start_block: int,
@@ -389,6 +406,7 @@ def read_events(
     extract_timestamps: Optional[Callable] = extract_timestamps_json_rpc,
     filter: Optional[Filter] = None,
     reorg_mon: Optional[ReorganisationMonitor] = None,
+    planner: Optional[LogRangePlanner] = None,
 ) -> Iterable[LogResult]:
     """Reads multiple events from the blockchain.
 
@@ -518,6 +536,13 @@ def read_events(
     :param reorg_mon:
         If passed, use this instance to monitor and raise chain reorganisation exceptions.
 
+    :param planner:
+        Size each eth_getLogs window with this
+        :py:class:`~eth_defi.provider.log_block_range.LogRangePlanner` instead of fixed ``chunk_size``.
+
+        Windows the provider rejects for too many results or too wide range
+        are retried smaller. Each window is read fully before its events are yielded.
+
     :return:
         Iterate over :py:class:`LogResult` instances for each event matched in
         the filter.
@@ -538,23 +563,27 @@ def read_events(
 
     last_timestamp = None
 
-    for block_num in range(start_block, end_block + 1, chunk_size):
-        last_of_chunk = min(end_block, block_num + chunk_size - 1)
-
-        logger.debug("Extracting eth_getLogs from %d - %d", block_num, last_of_chunk)
-
+    def _iterate_windows():
+        if planner is None:
+            for block_num in range(start_block, end_block + 1, chunk_size):
+                last_of_chunk = min(end_block, block_num + chunk_size - 1)
+                logger.debug("Extracting eth_getLogs from %d - %d", block_num, last_of_chunk)
+                # Stream the events
+                yield block_num, last_of_chunk, extract_events(web3, block_num, last_of_chunk, filter, context, extract_timestamps, reorg_mon)
+        else:
+            yield from read_logs_planned(
+                web3,
+                start_block,
+                end_block,
+                fetch=lambda s, e: list(extract_events(web3, s, e, filter, context, extract_timestamps, reorg_mon)),
+                filter_key=get_filter_key(filter),
+                planner=planner,
+            )
+
+    for block_num, last_of_chunk, window_events in _iterate_windows():
         batch_events = 0
 
-        # Stream the events
-        for event in extract_events(
-            web3,
-            block_num,
-            last_of_chunk,
-            filter,
-            context,
-            extract_timestamps,
-            reorg_mon,
-        ):
+        for event in window_events:
             last_timestamp = event.get("timestamp")
             total_events += 1
             batch_events += 1
@@ -564,7 +593,7 @@ def read_events(
         # only when we have an event hit not to cause unnecessary block header fetches
         # TODO: Add argument notify always
         if notify is not None and batch_events:
-            notify(block_num, start_block, end_block, chunk_size, total_events, last_timestamp, context)
+            notify(block_num, start_block, end_block, last_of_chunk - block_num + 1, total_events, last_timestamp, context)
 
 
 def read_events_concurrent(
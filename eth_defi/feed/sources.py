@@ -20,6 +20,8 @@ if TYPE_CHECKING:
 
 from strictyaml import Enum, Int, Map, Optional, Seq, Str, load
 
+from eth_defi.metadata_bundle import read_metadata_yaml
+
 logger = logging.getLogger(__name__)
 
 
@@ -154,6 +156,21 @@ _MAPPING_SCHEMA = Map(
     }
 )
 
+
+def parse_feeder_yaml(yaml_content: str) -> dict:
+    """Parse feeder YAML text against the feeder schema.
+
+    :return:
+        Parsed YAML as a dictionary, before slug and role validation
+    """
+    return load(yaml_content, _MAPPING_SCHEMA).data
+
+
+def _read_feeder_yaml(yaml_path: Path) -> dict:
+    """Read a feeder YAML file, from :py:mod:`eth_defi.metadata_bundle` when enabled."""
+    return read_metadata_yaml(yaml_path, "feeder", parse_feeder_yaml)
+
+
 #: Feed source fields that must NOT appear in alias YAML files.
 _FEED_SOURCE_KEYS = ("twitter", "linkedin", "rss")
 
@@ -568,7 +585,7 @@ def _load_mapping_file(mapping_file: Path) -> tuple[list[TrackedPostSource], Fee
         holds the alias metadata.  Otherwise ``alias`` is ``None``.
     """
 
-    parsed = load(mapping_file.read_text(), _MAPPING_SCHEMA).data
+    parsed = _read_feeder_yaml(mapping_file)
     feeder_id = _validate_slug(parsed.get("feeder-id"), "feeder-id", mapping_file)
     name = parsed.get("name")
     if not isinstance(name, str) or not name.strip():
@@ -957,7 +974,7 @@ def load_post_sources(mappings_dir: Path = FEEDS_DATA_DIR) -> tuple[list[Tracked
             raise ValueError(f"canonical-feeder-id {alias.canonical_feeder_id!r} in {alias.mapping_file} does not match any known feeder-id")
         # Ensure the resolved target is a source-bearing feeder, not another alias
         target_yaml = resolve_canonical_feeder_yaml(alias.canonical_feeder_id, mappings_dir)
-        target_parsed = load(target_yaml.read_text(), _MAPPING_SCHEMA).data
+        target_parsed = _read_feeder_yaml(target_yaml)
         if target_parsed.get("canonical-feeder-id") is not None:
             raise ValueError(f"Alias {alias.feeder_id!r} in {alias.mapping_file} points to {alias.canonical_feeder_id!r} which resolves to {target_yaml} — but that file is itself an alias.  Alias chains are not allowed; point directly to the source-bearing feeder instead.")
 
@@ -1030,7 +1047,7 @@ def load_feeder_metadata(yaml_path: Path) -> dict:
         ``curatorwatch``, ``short_description``, ``long_description``, ``twitter``,
         ``linkedin``, ``rss``, etc.
     """
-    parsed = load(yaml_path.read_text(), _MAPPING_SCHEMA).data
+    parsed = _read_feeder_yaml(yaml_path)
     feeder_id = _validate_slug(parsed.get("feeder-id"), "feeder-id", yaml_path)
     role = _validate_role(parsed.get("role"), yaml_path)
     _normalise_mapping_metadata(parsed, role, yaml_path)
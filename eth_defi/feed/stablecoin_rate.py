@@ -16,6 +16,9 @@ to resolve a vault denomination token to stablecoin rate metadata. The returned
 :py:func:`eth_defi.research.vault_metrics.calculate_lifetime_metrics` under the
 ``denomination_token_rate`` JSON field.
 
+With ``STABLECOIN_RATE_TABLE_PATH`` set, refreshed rate fields go to a single
+sidecar table instead of the YAML files, see :py:mod:`eth_defi.feed.stablecoin_rate_table`.
+
 See `CoinGecko simple price documentation <https://docs.coingecko.com/reference/simple-price>`__
 and `CoinGecko coins list documentation <https://docs.coingecko.com/reference/coins-list>`__.
 """
@@ -28,8 +31,11 @@ import os
 import re
 import stat
 import tempfile
+import threading
+import time
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Iterator, Sequence, TypeVar
@@ -41,6 +47,7 @@ from tqdm_loggable.auto import tqdm
 from eth_defi.compat import native_datetime_utc_fromtimestamp, native_datetime_utc_now
 from eth_defi.currency_api.constants import SOURCE_NAME
 from eth_defi.currency_api.database import CurrencyRateDatabase
+from eth_defi.feed.stablecoin_rate_table import StablecoinRateTable, get_default_stablecoin_rate_table
 from eth_defi.stablecoin_metadata import STABLECOINS_DATA_DIR, normalise_token_symbol, read_stablecoin_metadata
 
 try:
@@ -99,6 +106,18 @@ NATIVE_RATE_CROSS_CHECK_RELATIVE_TOLERANCE = 0.02
 STABLECOIN_RATE_SOURCE_COINGECKO = "coingecko"
 STABLECOIN_RATE_SOURCE_FIXED = "fixed"
 
+#: Most coin ids in one CoinGecko simple price request
+COINGECKO_SIMPLE_PRICE_MAX_IDS = 200
+
+#: Longest comma-separated ``ids`` parameter, keeps request URLs below common proxy limits
+COINGECKO_SIMPLE_PRICE_MAX_IDS_LENGTH = 4000
+
+#: Request budget for CoinGecko simple price calls, the keyless and demo API limit
+COINGECKO_REQUESTS_PER_MINUTE = 30
+
+#: Concurrent CoinGecko simple price requests
+COINGECKO_MAX_WORKERS = 4
+
 _RATE_FIELDS = (
     "source_currency",
     "source_currency_source",
@@ -258,6 +277,9 @@ class StablecoinRateRefreshSummary:
     coingecko_ids_valid: int = 0
     coingecko_id_validation_failed_count: int = 0
 
+    #: Entries written to the sidecar rate table instead of YAML files.
+    rate_table_entries_updated: int = 0
+
 
 @dataclass(slots=True)
 class SourceCurrencyRate:
@@ -375,6 +397,11 @@ class StablecoinRateFeeder:
         )
 
     data_dir: Path = STABLECOINS_DATA_DIR
+
+    #: Sidecar rate table joined over the YAML files.
+    #: Defaults to the one enabled with ``STABLECOIN_RATE_TABLE_PATH``.
+    rate_table: StablecoinRateTable | None = None
+
     _depegged_contracts: set[tuple[int, str]] | None = field(default=None, init=False, repr=False)
     _depegged_symbols: set[str] | None = field(default=None, init=False, repr=False)
     _rate_contracts: dict[tuple[int, str], DenominationTokenRate] | None = field(default=None, init=False, repr=False)
@@ -392,7 +419,7 @@ class StablecoinRateFeeder:
             return fixed_usd_rate
 
         if self._rate_contracts is None or self._rate_symbols is None:
-            self._rate_contracts, self._rate_symbols = build_stablecoin_rate_lookups(self.data_dir)
+            self._rate_contracts, self._rate_symbols = build_stablecoin_rate_lookups(self.data_dir, rate_table=self.rate_table)
 
         key = _normalise_contract_key(chain_id, address)
         if key and key in self._rate_contracts:
@@ -421,14 +448,14 @@ class StablecoinRateFeeder:
     def depegged_contracts(self) -> set[tuple[int, str]]:
         """Set of ``(chain_id, lowercased_address)`` keys for depegged tokens (built lazily, cached)."""
         if self._depegged_contracts is None or self._depegged_symbols is None:
-            self._depegged_contracts, self._depegged_symbols = build_depegged_stablecoin_lookups(self.data_dir)
+            self._depegged_contracts, self._depegged_symbols = build_depegged_stablecoin_lookups(self.data_dir, rate_table=self.rate_table)
         return self._depegged_contracts
 
     @property
     def depegged_symbols(self) -> set[str]:
         """Set of unambiguously depegged normalised symbols (built lazily, cached)."""
         if self._depegged_contracts is None or self._depegged_symbols is None:
-            self._depegged_contracts, self._depegged_symbols = build_depegged_stablecoin_lookups(self.data_dir)
+            self._depegged_contracts, self._depegged_symbols = build_depegged_stablecoin_lookups(self.data_dir, rate_table=self.rate_table)
         return self._depegged_symbols
 
     def is_depegged_stablecoin_token(
@@ -475,11 +502,16 @@ def resolve_coingecko_metadata(entry: dict[str, Any]) -> tuple[str | None, str |
     return None, explicit_link, source
 
 
-def iter_stablecoin_rate_targets(data_dir: Path = STABLECOINS_DATA_DIR) -> Iterator[StablecoinRateTarget]:
-    """Iterate stablecoin YAML entries that can participate in rate refreshes."""
+def iter_stablecoin_rate_targets(data_dir: Path = STABLECOINS_DATA_DIR, rate_table: StablecoinRateTable | None = None) -> Iterator[StablecoinRateTarget]:
+    """Iterate stablecoin YAML entries that can participate in rate refreshes.
+
+    :param rate_table:
+        Sidecar rate table joined over the YAML data.
+        Defaults to the one enabled with ``STABLECOIN_RATE_TABLE_PATH``.
+    """
     for yaml_path in sorted(data_dir.glob("*.yaml")):
         try:
-            data = read_stablecoin_metadata(yaml_path)
+            data = read_stablecoin_metadata(yaml_path, rate_table=rate_table)
         except YAMLError as e:
             raise ValueError(f"Could not read stablecoin metadata {yaml_path}: {e}") from e
         symbol = data["symbol"]
@@ -492,9 +524,19 @@ def iter_stablecoin_rate_targets(data_dir: Path = STABLECOINS_DATA_DIR) -> Itera
             yield _build_target(yaml_path, None, slug, symbol, data.get("category", ""), data)
 
 
-def fetch_stablecoin_rates(targets: Sequence[StablecoinRateTarget], timeout: float = 20.0, progress_bar: bool = False) -> dict[str, dict[str, Any]]:
+def fetch_stablecoin_rates(
+    targets: Sequence[StablecoinRateTarget],
+    timeout: float = 20.0,
+    progress_bar: bool = False,
+    max_workers: int = COINGECKO_MAX_WORKERS,
+    requests_per_minute: float = COINGECKO_REQUESTS_PER_MINUTE,
+) -> dict[str, dict[str, Any]]:
     """Fetch CoinGecko prices for due stablecoin targets.
 
+    Coin ids are packed into as few simple price requests as
+    :py:data:`COINGECKO_SIMPLE_PRICE_MAX_IDS` and :py:data:`COINGECKO_SIMPLE_PRICE_MAX_IDS_LENGTH` allow.
+    The requests run concurrently, started no faster than ``requests_per_minute``.
+
     :param targets:
         Due targets with resolved CoinGecko ids.
 
@@ -504,8 +546,17 @@ def fetch_stablecoin_rates(targets: Sequence[StablecoinRateTarget], timeout: flo
     :param progress_bar:
         Show a tqdm progress bar for CoinGecko request batches.
 
+    :param max_workers:
+        Concurrent requests.
+
+    :param requests_per_minute:
+        Request budget shared by the workers.
+
     :return:
         CoinGecko response keyed by coin id.
+
+    :raise:
+        The first failed request fails the whole fetch.
     """
     ids = sorted({target.coingecko_id for target in targets if target.coingecko_id})
     if not ids:
@@ -513,12 +564,11 @@ def fetch_stablecoin_rates(targets: Sequence[StablecoinRateTarget], timeout: flo
 
     vs_currencies = sorted({"usd"} | {target.peg_currency for target in targets if target.peg_currency})
     headers = _coingecko_headers()
+    batches = _batch_coingecko_ids(ids)
+    pacer = _RequestPacer(requests_per_minute)
 
-    result: dict[str, dict[str, Any]] = {}
-    batch_size = 200
-    batch_starts = list(range(0, len(ids), batch_size))
-    for start in _progress(batch_starts, progress_bar, "Fetching CoinGecko batches", "batch"):
-        batch = ids[start : start + batch_size]
+    def _fetch_batch(batch: list[str]) -> dict[str, Any]:
+        pacer.wait()
         response = requests.get(
             COINGECKO_SIMPLE_PRICE_URL,
             params={
@@ -533,7 +583,17 @@ def fetch_stablecoin_rates(targets: Sequence[StablecoinRateTarget], timeout: flo
         payload = response.json()
         if not isinstance(payload, dict):
             raise ValueError("CoinGecko simple price response was not a JSON object")
-        result.update(payload)
+        return payload
+
+    result: dict[str, dict[str, Any]] = {}
+    if len(batches) == 1 or max_workers <= 1:
+        for batch in _progress(batches, progress_bar, "Fetching CoinGecko batches", "batch"):
+            result.update(_fetch_batch(batch))
+        return result
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches)), thread_name_prefix="coingecko") as executor:
+        for payload in _progress(list(executor.map(_fetch_batch, batches)), progress_bar, "Fetching CoinGecko batches", "batch"):
+            result.update(payload)
     return result
 
 
@@ -660,6 +720,7 @@ def refresh_stablecoin_rates(
     progress_bar: bool = False,
     currency_db_path: Path | None = None,
     currency_source: str = SOURCE_NAME,
+    rate_table: StablecoinRateTable | None = None,
 ) -> StablecoinRateRefreshSummary:
     """Refresh stablecoin rates and persist YAML metadata updates.
 
@@ -668,9 +729,15 @@ def refresh_stablecoin_rates(
     the whole run. HTTP-level failures are recorded for all due targets in the
     batch, then returned in the summary. Depeg decisions are made only when the
     token's peg currency can be inferred and CoinGecko returns that currency.
+
+    :param rate_table:
+        Write the updates to this sidecar table in one transaction instead of
+        rewriting the YAML files.
+        Defaults to the one enabled with ``STABLECOIN_RATE_TABLE_PATH``.
     """
     now_ = now_ or native_datetime_utc_now()
-    targets = list(_progress(iter_stablecoin_rate_targets(data_dir), progress_bar, "Reading stablecoin YAML", "entry"))
+    rate_table = rate_table or get_default_stablecoin_rate_table()
+    targets = list(_progress(iter_stablecoin_rate_targets(data_dir, rate_table=rate_table), progress_bar, "Reading stablecoin YAML", "entry"))
     summary = StablecoinRateRefreshSummary(
         files_scanned=len({target.yaml_path for target in targets}),
         entries_seen=len(targets),
@@ -705,7 +772,7 @@ def refresh_stablecoin_rates(
             for target in due_with_ids:
                 summary.failed_count += 1
                 updates[(target.yaml_path, target.entry_index)] = _failure_update(now_, "coingecko_http_error", target)
-            return _apply_refresh_updates(updates, summary, progress_bar=progress_bar)
+            return _apply_refresh_updates(updates, summary, progress_bar=progress_bar, rate_table=rate_table)
 
         checked_ids = {target.coingecko_id for target in due_with_ids if target.coingecko_id}
         summary.coingecko_ids_checked = len(checked_ids)
@@ -728,7 +795,7 @@ def refresh_stablecoin_rates(
             for target in valid_targets:
                 summary.failed_count += 1
                 updates[(target.yaml_path, target.entry_index)] = _failure_update(now_, "coingecko_http_error", target)
-            return _apply_refresh_updates(updates, summary, progress_bar=progress_bar)
+            return _apply_refresh_updates(updates, summary, progress_bar=progress_bar, rate_table=rate_table)
 
     fetched_ids: set[str] = set()
     for target in _progress(valid_targets, progress_bar, "Applying CoinGecko prices", "entry"):
@@ -818,10 +885,10 @@ def refresh_stablecoin_rates(
         fetched_ids.add(target.coingecko_id or "")
 
     summary.rates_fetched = len(fetched_ids)
-    return _apply_refresh_updates(updates, summary, progress_bar=progress_bar)
+    return _apply_refresh_updates(updates, summary, progress_bar=progress_bar, rate_table=rate_table)
 
 
-def build_depegged_stablecoin_lookups(data_dir: Path = STABLECOINS_DATA_DIR) -> tuple[set[tuple[int, str]], set[str]]:
+def build_depegged_stablecoin_lookups(data_dir: Path = STABLECOINS_DATA_DIR, rate_table: StablecoinRateTable | None = None) -> tuple[set[tuple[int, str]], set[str]]:
     """Build contract and unambiguous symbol lookups for depegged stablecoins.
 
     Determine which denomination tokens should be treated as depegged for vault
@@ -849,6 +916,9 @@ def build_depegged_stablecoin_lookups(data_dir: Path = STABLECOINS_DATA_DIR) ->
     :param data_dir:
         Directory of stablecoin metadata YAML files.
 
+    :param rate_table:
+        Sidecar rate table joined over the YAML data.
+
     :return:
         Tuple of ``(depegged_contract_keys, depegged_symbols)``.
     """
@@ -857,7 +927,7 @@ def build_depegged_stablecoin_lookups(data_dir: Path = STABLECOINS_DATA_DIR) ->
     depegged_symbol_candidates: set[str] = set()
     depegged_without_contract: list[StablecoinRateTarget] = []
 
-    for target in iter_stablecoin_rate_targets(data_dir):
+    for target in iter_stablecoin_rate_targets(data_dir, rate_table=rate_table):
         normalised_symbol = normalise_token_symbol(target.symbol)
         # ``non_evm`` tokens have no ERC-20 on any indexed chain, so they have no
         # EVM symbol presence and must never participate in ticker matching —
@@ -899,12 +969,16 @@ def build_depegged_stablecoin_lookups(data_dir: Path = STABLECOINS_DATA_DIR) ->
     return depegged_contracts, depegged_symbols
 
 
-def build_stablecoin_rate_lookups(data_dir: Path = STABLECOINS_DATA_DIR) -> tuple[dict[tuple[int, str], DenominationTokenRate], dict[str, DenominationTokenRate]]:
-    """Build contract and unambiguous symbol lookups for all known rate data."""
+def build_stablecoin_rate_lookups(data_dir: Path = STABLECOINS_DATA_DIR, rate_table: StablecoinRateTable | None = None) -> tuple[dict[tuple[int, str], DenominationTokenRate], dict[str, DenominationTokenRate]]:
+    """Build contract and unambiguous symbol lookups for all known rate data.
+
+    :param rate_table:
+        Sidecar rate table joined over the YAML data.
+    """
     contract_rates: dict[tuple[int, str], DenominationTokenRate] = {}
     symbol_candidates: dict[str, list[tuple[StablecoinRateTarget, DenominationTokenRate]]] = {}
 
-    for target in iter_stablecoin_rate_targets(data_dir):
+    for target in iter_stablecoin_rate_targets(data_dir, rate_table=rate_table):
         rate = _target_to_denomination_rate(target)
         for contract_key in target.contract_addresses:
             contract_rates[contract_key] = rate
@@ -919,7 +993,7 @@ def build_stablecoin_rate_lookups(data_dir: Path = STABLECOINS_DATA_DIR) -> tupl
     return contract_rates, symbol_rates
 
 
-def apply_coingecko_mapping_file(data_dir: Path, mapping_path: Path, progress_bar: bool = False) -> int:
+def apply_coingecko_mapping_file(data_dir: Path, mapping_path: Path, progress_bar: bool = False, rate_table: StablecoinRateTable | None = None) -> int:
     """Apply explicit CoinGecko id mappings to stablecoin YAML files.
 
     The mapping JSON shape is intentionally simple:
@@ -938,7 +1012,13 @@ def apply_coingecko_mapping_file(data_dir: Path, mapping_path: Path, progress_ba
     Top-level keys are stablecoin slugs. For multi-entry files, the nested key
     can be the entry name or a numeric entry index encoded as a string. Standard
     files may use ``"default"``.
+
+    Mappings are curated data and always go to the YAML files. With a sidecar
+    rate table, the table is updated too, so that ids the refresh cleared
+    or rewrote there do not shadow the mapping.
     """
+    rate_table = rate_table or get_default_stablecoin_rate_table()
+    table_updates: dict[tuple[str, int | None], dict[str, str]] = {}
     if not mapping_path.exists():
         raise FileNotFoundError(f"CoinGecko mapping file does not exist: {mapping_path}")
 
@@ -957,13 +1037,18 @@ def apply_coingecko_mapping_file(data_dir: Path, mapping_path: Path, progress_ba
                 mapping = slug_mapping.get(entry.get("name")) or slug_mapping.get(str(entry_index))
                 if isinstance(mapping, dict):
                     _update_yaml_entry_fields(yaml_path, entry_index, _mapping_update(mapping))
+                    table_updates[(yaml_path.name, entry_index)] = _format_rate_table_fields(_mapping_update(mapping))
                     changed += 1
         else:
             mapping = slug_mapping.get("default") or slug_mapping.get(data.get("name")) or slug_mapping
             if isinstance(mapping, dict) and mapping.get("coingecko_id"):
                 _update_yaml_entry_fields(yaml_path, None, _mapping_update(mapping))
+                table_updates[(yaml_path.name, None)] = _format_rate_table_fields(_mapping_update(mapping))
                 changed += 1
 
+    if rate_table is not None:
+        rate_table.update(table_updates)
+
     return changed
 
 
@@ -1324,7 +1409,16 @@ def _progress(items: Sequence[T] | Iterator[T], enabled: bool, desc: str, unit:
         yield from items
 
 
-def _apply_refresh_updates(updates: dict[tuple[Path, int | None], dict[str, Any]], summary: StablecoinRateRefreshSummary, progress_bar: bool = False) -> StablecoinRateRefreshSummary:
+def _apply_refresh_updates(
+    updates: dict[tuple[Path, int | None], dict[str, Any]],
+    summary: StablecoinRateRefreshSummary,
+    progress_bar: bool = False,
+    rate_table: StablecoinRateTable | None = None,
+) -> StablecoinRateRefreshSummary:
+    if rate_table is not None:
+        summary.rate_table_entries_updated = rate_table.update({(yaml_path.name, entry_index): _format_rate_table_fields(fields) for (yaml_path, entry_index), fields in updates.items()})
+        return summary
+
     updated_paths: set[Path] = set()
     for (yaml_path, entry_index), fields in _progress(list(updates.items()), progress_bar, "Writing stablecoin YAML", "entry"):
         if fields:
@@ -1334,6 +1428,61 @@ def _apply_refresh_updates(updates: dict[tuple[Path, int | None], dict[str, Any]
     return summary
 
 
+def _format_rate_table_fields(fields: dict[str, Any]) -> dict[str, str]:
+    """Format fields as the strings a YAML round trip through :py:func:`_update_yaml_entry_fields` gives."""
+    formatted = {}
+    for key, value in fields.items():
+        if value is None or value == "":
+            formatted[key] = ""
+        elif isinstance(value, datetime.datetime):
+            formatted[key] = _format_datetime(value)
+        elif isinstance(value, datetime.date):
+            formatted[key] = value.isoformat()
+        elif isinstance(value, float):
+            formatted[key] = f"{value:.12g}"
+        else:
+            formatted[key] = str(value)
+    return formatted
+
+
+def _batch_coingecko_ids(
+    ids: Sequence[str],
+    max_ids: int = COINGECKO_SIMPLE_PRICE_MAX_IDS,
+    max_length: int = COINGECKO_SIMPLE_PRICE_MAX_IDS_LENGTH,
+) -> list[list[str]]:
+    """Pack coin ids into as few simple price requests as the limits allow."""
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    length = 0
+    for coin_id in ids:
+        added_length = len(coin_id) + (1 if batch else 0)
+        if batch and (len(batch) >= max_ids or length + added_length > max_length):
+            batches.append(batch)
+            batch, length, added_length = [], 0, len(coin_id)
+        batch.append(coin_id)
+        length += added_length
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class _RequestPacer:
+    """Space request starts evenly across threads."""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
 def _mapping_update(mapping: dict[str, Any]) -> dict[str, Any]:
     coingecko_id = _clean_coingecko_id(mapping.get("coingecko_id"))
     return {
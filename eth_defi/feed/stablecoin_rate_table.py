@@ -0,0 +1,198 @@
+"""Sidecar table for refreshed stablecoin rates.
+
+:py:func:`~eth_defi.feed.stablecoin_rate.refresh_stablecoin_rates` stores the
+latest CoinGecko rate, fetch timestamps and failure markers of each entry.
+Written into the stablecoin YAML files, every daily refresh rewrites
+most of the ``eth_defi/data/stablecoins`` tree: one read-modify-write per
+entry, a large diff, and the parsed YAML caches of
+:py:mod:`eth_defi.metadata_bundle` go stale.
+
+:py:class:`StablecoinRateTable` keeps the same fields in one SQLite file instead.
+
+- A refresh writes all updated entries in one transaction, however many YAML files there are
+- :py:func:`~eth_defi.stablecoin_metadata.read_stablecoin_metadata` joins the table rows
+  over the YAML data, so the rate lookups, depeg lookups and metadata exports see
+  the refreshed values as if they were in the YAML files
+- The YAML files keep the curated metadata and the last rates committed to the repository
+
+Enable the table by setting ``STABLECOIN_RATE_TABLE_PATH`` to a file path,
+or to ``default`` for :py:data:`DEFAULT_STABLECOIN_RATE_TABLE_PATH`:
+
+.. code-block:: shell
+
+    export STABLECOIN_RATE_TABLE_PATH=default
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+
+from eth_defi.disk_cache import DEFAULT_CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+#: Default table location
+DEFAULT_STABLECOIN_RATE_TABLE_PATH = DEFAULT_CACHE_ROOT / "stablecoin-rates.sqlite"
+
+#: Environment variable enabling the table
+STABLECOIN_RATE_TABLE_ENV = "STABLECOIN_RATE_TABLE_PATH"
+
+#: Entry index stored for single-entry YAML files, as SQLite primary keys cannot be ``NULL``
+_NO_ENTRY_INDEX = -1
+
+#: Table key: YAML file name and entry index, ``None`` for single-entry files
+RateTableKey = tuple[str, int | None]
+
+
+class StablecoinRateTable:
+    """Stablecoin rate fields by YAML entry.
+
+    Values are stored as the strings the YAML files would hold,
+    so joined entries parse the same way as YAML written ones.
+
+    Thread safe.
+    """
+
+    def __init__(self, path: Path):
+        """
+        :param path:
+            SQLite file. Created if it does not exist.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self._rows: dict[RateTableKey, dict[str, str]] | None = None
+        self._rows_version: tuple[int, int] | None = None
+        con = self._connect()
+        try:
+            with con:
+                con.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS stablecoin_rates (
+                        yaml_file TEXT NOT NULL,
+                        entry_index INTEGER NOT NULL,
+                        fields TEXT NOT NULL,
+                        PRIMARY KEY (yaml_file, entry_index)
+                    )
+                    """
+                )
+        finally:
+            con.close()
+
+    def __repr__(self):
+        return f"<StablecoinRateTable {self.path}>"
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _get_version(self) -> tuple[int, int]:
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self) -> dict[RateTableKey, dict[str, str]]:
+        """Read all rows.
+
+        Cached until the file changes.
+
+        :return:
+            Fields by ``(yaml_file, entry_index)``
+        """
+        with self.lock:
+            version = self._get_version()
+            if self._rows is None or self._rows_version != version:
+                con = self._connect()
+                try:
+                    rows = con.execute("SELECT yaml_file, entry_index, fields FROM stablecoin_rates").fetchall()
+                finally:
+                    con.close()
+                self._rows = {(yaml_file, None if entry_index == _NO_ENTRY_INDEX else entry_index): json.loads(fields) for yaml_file, entry_index, fields in rows}
+                self._rows_version = version
+            return self._rows
+
+    def update(self, updates: dict[RateTableKey, dict[str, str]]) -> int:
+        """Merge updated fields into the table in one transaction.
+
+        Fields not in an update keep their old values.
+
+        :param updates:
+            Fields by ``(yaml_file, entry_index)``.
+
+        :return:
+            Number of entries updated
+        """
+        params = [(yaml_file, _NO_ENTRY_INDEX if entry_index is None else entry_index, json.dumps(fields, sort_keys=True)) for (yaml_file, entry_index), fields in updates.items() if fields]
+        if not params:
+            return 0
+        with self.lock:
+            con = self._connect()
+            try:
+                with con:
+                    con.executemany(
+                        """
+                        INSERT INTO stablecoin_rates (yaml_file, entry_index, fields) VALUES (?, ?, ?)
+                        ON CONFLICT (yaml_file, entry_index) DO UPDATE SET fields = json_patch(fields, excluded.fields)
+                        """,
+                        params,
+                    )
+            finally:
+                con.close()
+            self._rows = None
+        logger.info("Updated %d entries in %s", len(params), self.path)
+        return len(params)
+
+    def join(self, yaml_path: Path, data: dict) -> dict:
+        """Overlay table fields on parsed stablecoin YAML data.
+
+        :param data:
+            Output of :py:func:`~eth_defi.stablecoin_metadata.parse_stablecoin_yaml`, modified in place.
+
+        :return:
+            ``data``
+        """
+        rows = self.read()
+        if not rows:
+            return data
+        if "entries" in data:
+            for entry_index, entry in enumerate(data["entries"]):
+                _join_entry(entry, rows.get((yaml_path.name, entry_index)))
+        else:
+            _join_entry(data, rows.get((yaml_path.name, None)))
+        return data
+
+
+def _join_entry(entry: dict, fields: dict[str, str] | None):
+    if not fields:
+        return
+    for key, value in fields.items():
+        if key == "links.coingecko":
+            # Like the YAML writer, only set inside an existing links block
+            if isinstance(entry.get("links"), dict):
+                entry["links"]["coingecko"] = value
+        else:
+            entry[key] = value
+
+
+_default_table: StablecoinRateTable | None = None
+_default_table_lock = threading.Lock()
+
+
+def get_default_stablecoin_rate_table() -> StablecoinRateTable | None:
+    """Get the process-wide table configured with ``STABLECOIN_RATE_TABLE_PATH``.
+
+    :return:
+        ``None`` if ``STABLECOIN_RATE_TABLE_PATH`` is not set
+    """
+    global _default_table
+
+    value = os.environ.get(STABLECOIN_RATE_TABLE_ENV)
+    if not value:
+        return None
+
+    path = DEFAULT_STABLECOIN_RATE_TABLE_PATH if value == "default" else Path(value).expanduser()
+    with _default_table_lock:
+        if _default_table is None or _default_table.path != path:
+            _default_table = StablecoinRateTable(path)
+        return _default_table
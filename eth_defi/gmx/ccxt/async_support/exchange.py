@@ -40,6 +40,7 @@ from eth_defi.gmx.ccxt.exchange import (
     _resolve_reduce_only_size_delta_usd,
 )
 from eth_defi.gmx.ccxt.properties import describe_gmx
+from eth_defi.gmx.ccxt.ticker_candles import TICKER_CANDLE_TIMEFRAME, apply_ticker_stats, get_ticker_candle_cache
 from eth_defi.gmx.ccxt.validation import _validate_ohlcv_data_sufficiency
 from eth_defi.gmx.api import GMXAPI
 from eth_defi.gmx.config import GMXConfig
@@ -1606,6 +1607,9 @@ class GMX(Exchange):
     async def fetch_ticker(self, symbol: str, params: dict | None = None) -> dict:
         """Fetch ticker for a single market.
 
+        24h open, high and low come from the rolling hourly candle cache shared
+        with the sync exchange, see :py:mod:`eth_defi.gmx.ccxt.ticker_candles`.
+
         :param symbol: Market symbol (e.g., "ETH/USD")
         :param params: Additional parameters
         :returns: Ticker dictionary with price and stats
@@ -1614,27 +1618,65 @@ class GMX(Exchange):
         await self.load_markets()
 
         market = self.market(symbol)
-        token_symbol = market["id"]
+        ticker_by_token = await self._fetch_ticker_data_by_token()
+        ticker_data = ticker_by_token.get(market["id"])
+        if not ticker_data:
+            raise ExchangeError(f"Ticker data not found for {symbol}")
 
-        # Fetch from GMX API
+        ticker = self._parse_ticker_data(symbol, ticker_data)
+        await self._apply_ticker_candles({symbol: ticker})
+        return ticker
+
+    async def fetch_tickers(self, symbols: list[str] | None = None, params: dict | None = None) -> dict:
+        """Fetch tickers for multiple markets.
+
+        All tickers come from a single ``/prices/tickers`` request.
+        Candles are only fetched for markets whose cached 24h window is out of date.
+
+        :param symbols: List of symbols (if None, fetch all)
+        :param params: Additional parameters
+        :returns: Dictionary mapping symbols to tickers
+        """
+        await self._ensure_session()
+        await self.load_markets()
+
+        if symbols is None:
+            symbols = list(self.markets.keys())
+
+        ticker_by_token = await self._fetch_ticker_data_by_token()
+
+        # Build result dict, skipping markets without ticker data
+        tickers = {}
+        for symbol in symbols:
+            try:
+                market = self.market(symbol)
+            except Exception:
+                continue
+            ticker_data = ticker_by_token.get(market["id"])
+            if ticker_data:
+                tickers[symbol] = self._parse_ticker_data(symbol, ticker_data)
+
+        await self._apply_ticker_candles(tickers)
+        return tickers
+
+    async def _fetch_ticker_data_by_token(self) -> dict[str, dict]:
+        """Fetch raw GMX tickers keyed by token symbol."""
         data = await async_make_gmx_api_request(
             chain=self.chain,
             endpoint="/prices/tickers",
             session=self.session,
         )
-
-        # Find ticker for this token
-        ticker_data = None
+        ticker_by_token = {}
         if isinstance(data, list):
             for item in data:
-                if item.get("tokenSymbol") == token_symbol:
-                    ticker_data = item
-                    break
+                ticker_by_token.setdefault(item.get("tokenSymbol"), item)
+        return ticker_by_token
 
-        if not ticker_data:
-            raise ExchangeError(f"Ticker data not found for {symbol}")
+    def _parse_ticker_data(self, symbol: str, ticker_data: dict) -> dict:
+        """Convert a raw GMX ticker to CCXT format.
 
-        # Parse to CCXT format
+        High and low are the current min/max prices until candle statistics are applied.
+        """
         min_price = float(ticker_data.get("minPrice", 0)) / 10**PRECISION
         max_price = float(ticker_data.get("maxPrice", 0)) / 10**PRECISION
         last = (min_price + max_price) / 2
@@ -1654,29 +1696,33 @@ class GMX(Exchange):
             "info": ticker_data,
         }
 
-    async def fetch_tickers(self, symbols: list[str] | None = None, params: dict | None = None) -> dict:
-        """Fetch tickers for multiple markets concurrently.
+    async def _apply_ticker_candles(self, tickers: dict[str, dict]):
+        """Set 24h open, high and low of tickers from the rolling candle cache.
 
-        :param symbols: List of symbols (if None, fetch all)
-        :param params: Additional parameters
-        :returns: Dictionary mapping symbols to tickers
+        :param tickers: Parsed tickers by symbol, modified in place
         """
-        await self.load_markets()
-
-        if symbols is None:
-            symbols = list(self.markets.keys())
-
-        # Fetch all concurrently
-        tasks = [self.fetch_ticker(symbol, params) for symbol in symbols]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Build result dict, filtering out errors
-        tickers = {}
-        for symbol, result in zip(symbols, results):
-            if not isinstance(result, Exception):
-                tickers[symbol] = result
+        if not tickers:
+            return
 
-        return tickers
+        cache = get_ticker_candle_cache(self.chain)
+        now = self.milliseconds()
+        fetch_limits = {}
+        for symbol in tickers:
+            limit = cache.get_fetch_limit(symbol, now)
+            if limit is not None:
+                fetch_limits[symbol] = limit
+
+        if fetch_limits:
+            tasks = [self.fetch_ohlcv(symbol, TICKER_CANDLE_TIMEFRAME, limit=limit) for symbol, limit in fetch_limits.items()]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for symbol, ohlcv in zip(fetch_limits, results):
+                if isinstance(ohlcv, Exception):
+                    logger.debug("Failed to fetch OHLCV for %s: %s", symbol, ohlcv)
+                elif ohlcv:
+                    cache.update(symbol, ohlcv, now)
+
+        for symbol, ticker in tickers.items():
+            apply_ticker_stats(ticker, cache.get_stats(symbol, now, ticker["last"]))
 
     async def fetch_apy(
         self,
@@ -51,6 +51,7 @@ from eth_defi.gmx.ccxt.cancel_helpers import (
 )
 from eth_defi.gmx.ccxt.order_key_cache import OrderKeyCache, OrderKeyRecord
 from eth_defi.gmx.ccxt.properties import describe_gmx
+from eth_defi.gmx.ccxt.ticker_candles import TICKER_CANDLE_TIMEFRAME, apply_ticker_stats, get_ticker_candle_cache
 from eth_defi.gmx.ccxt.validation import _validate_ohlcv_data_sufficiency
 from eth_defi.gmx.config import GMXConfig
 from eth_defi.gmx.symbols import DEPRECATED_MARKET_TOKENS, SYMBOL_NORMALISE
@@ -100,8 +101,8 @@ from eth_defi.gmx.trading import GMXTrading
 from eth_defi.gmx.ccxt._position_metrics import safe_liquidation_price
 from eth_defi.gmx.utils import convert_raw_price_to_usd
 from eth_defi.hotwallet import HotWallet
-from eth_defi.provider.fallback import ExtraValueError, get_fallback_provider
-from eth_defi.provider.log_block_range import get_logs_max_block_range
+from eth_defi.provider.fallback import get_fallback_provider
+from eth_defi.provider.log_block_range import get_logs_max_block_range, read_logs_planned
 from eth_defi.provider.multi_provider import create_multi_provider_web3
 from eth_defi.event_reader.multicall_batcher import get_multicall_contract
 from eth_defi.gmx.lagoon.wallet import LagoonGMXTradingWallet
@@ -119,46 +120,36 @@ _GMX_ORDER_TYPE_NAMES: dict[int, str] = {
 
 
 def _get_logs_adaptive(web3, address: str, from_block: int, to_block: int) -> list:
-    """Fetch eth_getLogs, splitting into smaller sub-ranges when the log-count limit is exceeded.
+    """Fetch eth_getLogs, splitting into smaller sub-ranges when the provider rejects the window.
 
     Some RPC providers (e.g. Alchemy) cap the number of log *entries* per query at 10,000
     regardless of the block range.  When the GMX EventEmitter is busy a single 10,000-block
     chunk can contain more than 10,000 events, causing the provider to return an error instead
     of truncating results.
 
-    This helper catches that error and recursively bisects the block range until each
-    sub-range fits within the provider limit.
+    Windows are sized by :py:data:`~eth_defi.provider.log_block_range.DEFAULT_LOG_RANGE_PLANNER`,
+    which remembers the EventEmitter log density and the provider limits between calls,
+    so later scans do not hit the same errors again. Windows are not split below
+    :py:data:`~eth_defi.gmx.constants._MIN_LOG_CHUNK_BLOCKS` blocks.
 
     :param web3: Web3 instance.
     :param address: Contract address to filter logs by.
     :param from_block: Start block (inclusive).
     :param to_block: End block (inclusive).
     :returns: Combined list of log entries across all sub-ranges.
-    :raises ExtraValueError: Re-raised when the range is already at the minimum and still overflows.
+    :raises ExtraValueError: Re-raised when a minimum size window still overflows, or the error is not about the range.
     """
-    try:
-        return web3.eth.get_logs(
-            {
-                "address": address,
-                "fromBlock": from_block,
-                "toBlock": to_block,
-            }
-        )
-    except ExtraValueError as exc:
-        payload = exc.args[0] if exc.args else {}
-        msg = payload.get("message", "") if isinstance(payload, dict) else str(payload)
-        if "exceeds limit" in msg and to_block > from_block and (to_block - from_block) >= _MIN_LOG_CHUNK_BLOCKS:
-            mid = (from_block + to_block) // 2
-            logger.debug(
-                "Log count exceeded for blocks %d-%d, bisecting at block %d",
-                from_block,
-                to_block,
-                mid,
-            )
-            left = _get_logs_adaptive(web3, address, from_block, mid)
-            right = _get_logs_adaptive(web3, address, mid + 1, to_block)
-            return left + right
-        raise
+    logs = []
+    for _, _, window_logs in read_logs_planned(
+        web3,
+        from_block,
+        to_block,
+        fetch=lambda start, end: web3.eth.get_logs({"address": address, "fromBlock": start, "toBlock": end}),
+        filter_key=("gmx-event-emitter", address.lower()),
+        min_block_range=_MIN_LOG_CHUNK_BLOCKS,
+    ):
+        logs.extend(window_logs)
+    return logs
 
 
 def _scan_logs_chunked_for_trade_action(
@@ -3970,24 +3961,8 @@ class GMX(ExchangeCompatible):
                     str(e),
                 )
 
-        # Calculate 24h high/low from recent OHLCV (last 24 hours of 1h candles)
-        try:
-            since = self.milliseconds() - (24 * 60 * 60 * 1000)  # 24 hours ago
-            ohlcv = self.fetch_ohlcv(symbol, "1h", since=since, limit=24)
-
-            if ohlcv:
-                # Extract highs and lows
-                highs = [candle[2] for candle in ohlcv]  # Index 2 is high
-                lows = [candle[3] for candle in ohlcv]  # Index 3 is low
-
-                result["high"] = max(highs) if highs else None
-                result["low"] = min(lows) if lows else None
-
-                # Also get open from first candle
-                result["open"] = ohlcv[0][1] if ohlcv else None  # Index 1 is open
-        except Exception:
-            # If OHLCV fetch fails, leave high/low as None
-            pass
+        # Calculate 24h high/low from the rolling hourly candle cache
+        self._apply_ticker_candles({market["symbol"]: result})
 
         return result
 
@@ -4036,10 +4011,8 @@ class GMX(ExchangeCompatible):
         else:
             target_symbols = list(self.markets.keys())
 
-        # Parse ticker for each requested symbol (first pass - basic ticker data)
+        # Parse ticker for each requested symbol
         result = {}
-        symbols_needing_ohlcv = []
-        since = self.milliseconds() - (24 * 60 * 60 * 1000)
 
         for symbol in target_symbols:
             try:
@@ -4050,55 +4023,64 @@ class GMX(ExchangeCompatible):
                 if index_token_address in ticker_by_address:
                     ticker_data = ticker_by_address[index_token_address]
                     result[canonical_symbol] = self.parse_ticker(ticker_data, market)
-                    symbols_needing_ohlcv.append(canonical_symbol)
             except Exception:
                 pass
 
-        # Fetch OHLCV data in parallel for 24h high/low calculation
-        if symbols_needing_ohlcv:
-            max_workers = int(os.environ.get("MAX_WORKERS", "4"))
-            ohlcv_map = {}
+        # 24h high/low from the rolling hourly candle cache
+        self._apply_ticker_candles(result)
 
-            try:
-                with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols_needing_ohlcv))) as executor:
-                    future_to_symbol = {executor.submit(self._fetch_ohlcv_for_ticker, sym, since): sym for sym in symbols_needing_ohlcv}
+        return result
+
+    def _apply_ticker_candles(self, tickers: dict[str, dict]):
+        """Set 24h open, high and low of tickers from the rolling candle cache.
+
+        Candles are only fetched for symbols whose cached window is out of date,
+        see :py:class:`~eth_defi.gmx.ccxt.ticker_candles.TickerCandleCache`.
+        If a fetch fails, the ticker keeps its previous statistics or none.
+
+        :param tickers: Parsed tickers by symbol, modified in place
+        """
+        if not tickers:
+            return
+
+        cache = get_ticker_candle_cache(self.config.get_chain())
+        now = self.milliseconds()
+        fetch_limits = {}
+        for symbol in tickers:
+            limit = cache.get_fetch_limit(symbol, now)
+            if limit is not None:
+                fetch_limits[symbol] = limit
 
-                    for future in as_completed(future_to_symbol, timeout=60):
+        if fetch_limits:
+            max_workers = int(os.environ.get("MAX_WORKERS", "4"))
+            try:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(fetch_limits))) as executor:
+                    futures = [executor.submit(self._fetch_ohlcv_for_ticker, sym, limit) for sym, limit in fetch_limits.items()]
+                    for future in as_completed(futures, timeout=60):
                         symbol, ohlcv = future.result()
                         if ohlcv:
-                            ohlcv_map[symbol] = ohlcv
-
+                            cache.update(symbol, ohlcv, now)
             except Exception as e:
-                logger.warning("Parallel OHLCV fetch failed, falling back to sequential: %s", e)
-                for sym in symbols_needing_ohlcv:
-                    _, ohlcv = self._fetch_ohlcv_for_ticker(sym, since)
-                    if ohlcv:
-                        ohlcv_map[sym] = ohlcv
-
-            # Apply OHLCV data to tickers
-            for symbol, ohlcv in ohlcv_map.items():
-                if symbol in result and ohlcv:
-                    highs = [candle[2] for candle in ohlcv]
-                    lows = [candle[3] for candle in ohlcv]
-                    result[symbol]["high"] = max(highs) if highs else None
-                    result[symbol]["low"] = min(lows) if lows else None
-                    result[symbol]["open"] = ohlcv[0][1] if ohlcv else None
+                logger.warning("Parallel OHLCV fetch for tickers failed: %s", e)
 
-        return result
+        for symbol, ticker in tickers.items():
+            apply_ticker_stats(ticker, cache.get_stats(symbol, now, ticker.get("last")))
 
     def _fetch_ohlcv_for_ticker(
         self,
         symbol: str,
-        since: int,
+        limit: int,
     ) -> tuple[str, list | None]:
-        """Fetch 24h OHLCV data for a single ticker.
+        """Fetch the latest hourly candles of a ticker.
 
         :param symbol: Market symbol (e.g., "ETH/USDC:USDC")
-        :param since: Start timestamp in milliseconds
+        :param limit: How many of the latest candles to fetch
         :return: Tuple of (symbol, ohlcv_data) or (symbol, None) on error
         """
         try:
-            ohlcv = self.fetch_ohlcv(symbol, "1h", since=since, limit=24)
+            market = self.market(symbol)
+            response = self.api.get_candlesticks(market["id"], self.timeframes[TICKER_CANDLE_TIMEFRAME], limit=limit)
+            ohlcv = self.parse_ohlcvs(response.get("candles", []), market, TICKER_CANDLE_TIMEFRAME)
             return symbol, ohlcv
         except Exception as e:
             logger.debug("Failed to fetch OHLCV for %s: %s", symbol, e)
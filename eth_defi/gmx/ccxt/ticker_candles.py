@@ -0,0 +1,240 @@
+"""Rolling 24h candle cache for GMX tickers.
+
+GMX tickers do not carry 24h high, low or open, so
+:py:meth:`~eth_defi.gmx.ccxt.exchange.GMX.fetch_tickers` derives them from
+hourly candles.  Freqtrade polls tickers every few seconds, and fetching
+a full candle history for every market on every poll costs one request
+per market on top of the ticker request.
+
+:py:class:`TickerCandleCache` keeps the last 24 hours of hourly candles per
+symbol and only asks for candles when a new hour has started, or when the
+forming candle has not been refreshed for a while.  Between refreshes the
+ticker price is folded into the forming candle.  High and low over the
+window are kept in monotonic deques, so reading them is O(1).
+
+The cache is shared by the sync and async exchange classes through
+:py:func:`get_ticker_candle_cache`.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+#: Candle timeframe used for the 24h ticker statistics
+TICKER_CANDLE_TIMEFRAME = "1h"
+
+#: Length of one ticker candle
+TICKER_CANDLE_MS = 60 * 60 * 1000
+
+#: Ticker statistics window
+TICKER_WINDOW_MS = 24 * TICKER_CANDLE_MS
+
+#: Refetch the forming candle at least this often, so that moves between ticker polls are not missed
+DEFAULT_FORMING_CANDLE_REFRESH_MS = 15 * 60 * 1000
+
+
+@dataclass(slots=True)
+class TickerStats:
+    """24h statistics of a symbol."""
+
+    #: Open of the first candle in the window
+    open: float
+
+    #: Highest high in the window
+    high: float
+
+    #: Lowest low in the window
+    low: float
+
+    #: Volume summed over the window
+    volume: float
+
+
+@dataclass(slots=True)
+class RollingCandleWindow:
+    """Last 24h of candles of one symbol.
+
+    Candles are ``[timestamp_ms, open, high, low, close, volume]`` lists as
+    returned by ``fetch_ohlcv()``.
+    The newest candle is still forming and is kept apart from the closed
+    candles, as later fetches and price ticks change it.
+    """
+
+    #: Closed candles, oldest first
+    closed: deque = field(default_factory=deque)
+
+    #: Candidates for the window high, ``(timestamp, high)`` with decreasing highs
+    highs: deque = field(default_factory=deque)
+
+    #: Candidates for the window low, ``(timestamp, low)`` with increasing lows
+    lows: deque = field(default_factory=deque)
+
+    #: Sum of closed candle volumes
+    closed_volume: float = 0.0
+
+    #: The newest candle
+    forming: list | None = None
+
+    #: When the forming candle was last fetched, ms
+    refreshed_at: int = 0
+
+    def _close(self, candle: list):
+        timestamp, _, high, low, _, volume = candle
+        self.closed.append(candle)
+        self.closed_volume += volume
+        while self.highs and self.highs[-1][1] <= high:
+            self.highs.pop()
+        self.highs.append((timestamp, high))
+        while self.lows and self.lows[-1][1] >= low:
+            self.lows.pop()
+        self.lows.append((timestamp, low))
+
+    def add_candles(self, candles: list[list], now: int) -> int:
+        """Merge fetched candles.
+
+        Candles older than the forming candle are ignored.
+
+        :param now:
+            Fetch time, ms.
+
+        :return:
+            Number of new candles
+        """
+        added = 0
+        for candle in sorted(candles, key=lambda c: c[0]):
+            candle = list(candle)
+            if self.forming is None or candle[0] > self.forming[0]:
+                if self.forming is not None:
+                    self._close(self.forming)
+                self.forming = candle
+                added += 1
+            elif candle[0] == self.forming[0]:
+                self.forming = candle
+        self.refreshed_at = now
+        self.evict(now)
+        return added
+
+    def observe_price(self, price: float):
+        """Extend the forming candle high or low with a ticker price."""
+        if self.forming is None or not price:
+            return
+        self.forming[2] = max(self.forming[2], price)
+        self.forming[3] = min(self.forming[3], price)
+        self.forming[4] = price
+
+    def evict(self, now: int):
+        """Drop closed candles that fell out of the window."""
+        cutoff = now - TICKER_WINDOW_MS
+        while self.closed and self.closed[0][0] < cutoff:
+            candle = self.closed.popleft()
+            self.closed_volume -= candle[5]
+        while self.highs and self.highs[0][0] < cutoff:
+            self.highs.popleft()
+        while self.lows and self.lows[0][0] < cutoff:
+            self.lows.popleft()
+
+    def get_fetch_limit(self, now: int, forming_refresh_ms: int = DEFAULT_FORMING_CANDLE_REFRESH_MS) -> int | None:
+        """How many of the latest candles to fetch.
+
+        :return:
+            ``None`` if the cached window is up to date
+        """
+        full = TICKER_WINDOW_MS // TICKER_CANDLE_MS + 1
+        if self.forming is None:
+            return full
+        current_open = now - now % TICKER_CANDLE_MS
+        if current_open > self.forming[0]:
+            # One candle for each hour started since, plus the forming candle to close
+            return min(full, (current_open - self.forming[0]) // TICKER_CANDLE_MS + 1)
+        if now - self.refreshed_at >= forming_refresh_ms:
+            return 1
+        return None
+
+    def get_stats(self, now: int) -> TickerStats | None:
+        """24h open, high, low and volume.
+
+        :return:
+            ``None`` if there are no candles in the window
+        """
+        self.evict(now)
+        forming = self.forming
+        if forming is None or forming[0] < now - TICKER_WINDOW_MS:
+            return None
+        first = self.closed[0] if self.closed else forming
+        high = max(self.highs[0][1], forming[2]) if self.highs else forming[2]
+        low = min(self.lows[0][1], forming[3]) if self.lows else forming[3]
+        return TickerStats(open=first[1], high=high, low=low, volume=self.closed_volume + forming[5])
+
+
+class TickerCandleCache:
+    """Rolling candle windows by symbol.
+
+    Thread-safe, as the sync exchange fetches candles from a thread pool.
+    """
+
+    def __init__(self, forming_refresh_ms: int = DEFAULT_FORMING_CANDLE_REFRESH_MS):
+        """
+        :param forming_refresh_ms:
+            Refetch the forming candle when it is older than this.
+        """
+        self.forming_refresh_ms = forming_refresh_ms
+        self.windows: dict[str, RollingCandleWindow] = {}
+        self.lock = threading.Lock()
+
+    def get_fetch_limit(self, symbol: str, now: int) -> int | None:
+        """How many candles to fetch for a symbol, ``None`` if none."""
+        with self.lock:
+            window = self.windows.get(symbol)
+            if window is None:
+                return TICKER_WINDOW_MS // TICKER_CANDLE_MS + 1
+            return window.get_fetch_limit(now, self.forming_refresh_ms)
+
+    def update(self, symbol: str, candles: list[list], now: int) -> int:
+        """Merge fetched candles of a symbol.
+
+        :return:
+            Number of new candles
+        """
+        with self.lock:
+            window = self.windows.setdefault(symbol, RollingCandleWindow())
+            return window.add_candles(candles, now)
+
+    def get_stats(self, symbol: str, now: int, last_price: float | None = None) -> TickerStats | None:
+        """24h statistics of a symbol.
+
+        :param last_price:
+            Current ticker price, folded into the forming candle.
+        """
+        with self.lock:
+            window = self.windows.get(symbol)
+            if window is None:
+                return None
+            if last_price is not None:
+                window.observe_price(last_price)
+            return window.get_stats(now)
+
+
+_caches: dict[str, TickerCandleCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_ticker_candle_cache(chain: str) -> TickerCandleCache:
+    """Process-wide ticker candle cache of a chain.
+
+    :param chain:
+        GMX chain name, e.g. ``"arbitrum"``.
+    """
+    with _caches_lock:
+        cache = _caches.get(chain)
+        if cache is None:
+            cache = _caches[chain] = TickerCandleCache()
+        return cache
+
+
+def apply_ticker_stats(ticker: dict, stats: TickerStats | None):
+    """Set 24h open, high and low of a CCXT ticker."""
+    if stats is None:
+        return
+    ticker["open"] = stats.open
+    ticker["high"] = stats.high
+    ticker["low"] = stats.low
@@ -42,6 +42,7 @@ from eth_defi.grvt.vault import (
     fetch_vault_listing_graphql,
     fetch_vault_summary_history,
 )
+from eth_defi.perp_dex.duckdb_engine import upsert_rows
 from eth_defi.perp_dex.metrics import (
     PerpVaultIdentity,
     SourcePositionDataStatus,
@@ -287,19 +288,12 @@ class GRVTDailyMetricsDatabase:
         if not rows:
             return
 
-        self.con.executemany(
-            """
-            INSERT INTO vault_daily_prices (
-                vault_id, date, share_price, tvl, daily_return, written_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT (vault_id, date)
-            DO UPDATE SET
-                share_price = EXCLUDED.share_price,
-                tvl = EXCLUDED.tvl,
-                daily_return = EXCLUDED.daily_return,
-                written_at = EXCLUDED.written_at
-            """,
+        upsert_rows(
+            self.con,
+            "vault_daily_prices",
+            ("vault_id", "date", "share_price", "tvl", "daily_return", "written_at"),
             rows,
+            key_columns=("vault_id", "date"),
         )
 
     def get_all_daily_prices(self) -> pd.DataFrame:
@@ -37,6 +37,7 @@ from eth_defi.hibachi.vault import (
     fetch_vault_info,
     fetch_vault_performance,
 )
+from eth_defi.perp_dex.duckdb_engine import upsert_rows
 from eth_defi.perp_dex.metrics import (
     PerpVaultIdentity,
     SourcePositionDataStatus,
@@ -197,19 +198,12 @@ class HibachiDailyMetricsDatabase:
         if not rows:
             return
 
-        self.con.executemany(
-            """
-            INSERT INTO vault_daily_prices (
-                vault_id, date, per_share_price, tvl, daily_return, written_at
-            ) VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT (vault_id, date)
-            DO UPDATE SET
-                per_share_price = EXCLUDED.per_share_price,
-                tvl = EXCLUDED.tvl,
-                daily_return = EXCLUDED.daily_return,
-                written_at = EXCLUDED.written_at
-            """,
+        upsert_rows(
+            self.con,
+            "vault_daily_prices",
+            ("vault_id", "date", "per_share_price", "tvl", "daily_return", "written_at"),
             rows,
+            key_columns=("vault_id", "date"),
         )
 
     def get_all_daily_prices(self) -> pd.DataFrame:
@@ -9,9 +9,11 @@ The pipeline:
 
 1. Bulk-fetches all vaults from the stats-data API
 2. Filters by TVL and open status
-3. Fetches per-vault portfolio history via ``vaultDetails``
-4. Computes share prices from portfolio history
-5. Stores daily prices and metadata in DuckDB
+3. Optionally skips vaults that did not change since the last run,
+   see :py:mod:`~eth_defi.hyperliquid.daily_scan_planner`
+4. Fetches per-vault portfolio history via ``vaultDetails``
+5. Computes share prices from portfolio history
+6. Stores daily prices and metadata in DuckDB
 
 Example::
 
@@ -27,6 +29,7 @@ Example::
 
 import datetime
 import logging
+import time
 from dataclasses import dataclass
 from decimal import Decimal
 from pathlib import Path
@@ -40,6 +43,7 @@ from tqdm_loggable.auto import tqdm
 from eth_defi.compat import native_datetime_utc_now
 from eth_defi.hyperliquid.combined_analysis import _calculate_share_price, align_share_price_curve_to_anchor
 from eth_defi.hyperliquid.constants import HYPERCORE_CHAIN_ID, HYPERLIQUID_DAILY_METRICS_DATABASE
+from eth_defi.hyperliquid.daily_scan_planner import DEFAULT_MAX_STALENESS, VaultScanSnapshot, create_scan_snapshot, plan_daily_scan
 from eth_defi.hyperliquid.deposit import aggregate_daily_flows, fetch_vault_deposits
 from eth_defi.hyperliquid.perp_metrics import collect_hyperliquid_vault_observations
 from eth_defi.hyperliquid.session import HyperliquidSession
@@ -51,10 +55,54 @@ from eth_defi.hyperliquid.vault import (
     fetch_all_vaults,
 )
 from eth_defi.hyperliquid.vault_metrics_db import HyperliquidMetricsDatabaseBase
+from eth_defi.perp_dex.duckdb_engine import upsert_rows
 
 logger = logging.getLogger(__name__)
 
 
+#: Columns of :py:meth:`HyperliquidDailyPriceRow.as_db_tuple`
+DAILY_PRICE_COLUMNS = (
+    "vault_address",
+    "date",
+    "share_price",
+    "tvl",
+    "cumulative_pnl",
+    "cumulative_volume",
+    "daily_pnl",
+    "daily_return",
+    "follower_count",
+    "apr",
+    "is_closed",
+    "allow_deposits",
+    "leader_fraction",
+    "leader_commission",
+    "daily_deposit_count",
+    "daily_withdrawal_count",
+    "daily_deposit_usd",
+    "daily_withdrawal_usd",
+    "epoch_reset",
+    "data_source",
+    "written_at",
+)
+
+#: Sparse columns where ``None`` keeps the stored value on upsert
+DAILY_PRICE_COALESCE_COLUMNS = (
+    "cumulative_volume",
+    "follower_count",
+    "apr",
+    "is_closed",
+    "allow_deposits",
+    "leader_fraction",
+    "leader_commission",
+    "daily_deposit_count",
+    "daily_withdrawal_count",
+    "daily_deposit_usd",
+    "daily_withdrawal_usd",
+    "epoch_reset",
+    "data_source",
+)
+
+
 @dataclass(slots=True)
 class HyperliquidDailyPriceRow:
     """A single Hyperliquid daily price row ready for DuckDB upsert."""
@@ -455,6 +503,22 @@ class HyperliquidDailyMetricsDatabase(HyperliquidMetricsDatabaseBase):
         except duckdb.CatalogException:
             pass
 
+        # Bulk listing state at the last detail fetch, for delta scans.
+        # See eth_defi.hyperliquid.daily_scan_planner.
+        self.con.execute("""
+            CREATE TABLE IF NOT EXISTS vault_scan_state (
+                vault_address VARCHAR PRIMARY KEY,
+                tvl DOUBLE NOT NULL,
+                pnl_all_time DOUBLE,
+                is_closed BOOLEAN NOT NULL,
+                fetched_at TIMESTAMP NOT NULL,
+                fetch_ok BOOLEAN NOT NULL,
+                fetch_seconds DOUBLE,
+                fetch_count INTEGER NOT NULL,
+                total_fetch_seconds DOUBLE NOT NULL
+            )
+        """)
+
     def _write_tombstone_rows(self, vault_addresses: list[str]) -> int:
         """Write tombstone daily price rows for the given vault addresses.
 
@@ -540,44 +604,16 @@ class HyperliquidDailyMetricsDatabase(HyperliquidMetricsDatabaseBase):
         if not rows:
             return
 
-        db_rows = [r.as_db_tuple() for r in rows]
-
         # Thread safety: use a per-call cursor so concurrent worker
         # threads do not clobber each other's result sets on the
         # shared connection.  See ``HyperliquidMetricsDatabaseBase``.
-        self.con.cursor().executemany(
-            """
-            INSERT INTO vault_daily_prices (
-                vault_address, date, share_price, tvl, cumulative_pnl,
-                cumulative_volume, daily_pnl, daily_return, follower_count, apr,
-                is_closed, allow_deposits, leader_fraction, leader_commission,
-                daily_deposit_count, daily_withdrawal_count,
-                daily_deposit_usd, daily_withdrawal_usd, epoch_reset,
-                data_source, written_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT (vault_address, date)
-            DO UPDATE SET
-                share_price = EXCLUDED.share_price,
-                tvl = EXCLUDED.tvl,
-                cumulative_pnl = EXCLUDED.cumulative_pnl,
-                cumulative_volume = COALESCE(EXCLUDED.cumulative_volume, vault_daily_prices.cumulative_volume),
-                daily_pnl = EXCLUDED.daily_pnl,
-                daily_return = EXCLUDED.daily_return,
-                follower_count = COALESCE(EXCLUDED.follower_count, vault_daily_prices.follower_count),
-                apr = COALESCE(EXCLUDED.apr, vault_daily_prices.apr),
-                is_closed = COALESCE(EXCLUDED.is_closed, vault_daily_prices.is_closed),
-                allow_deposits = COALESCE(EXCLUDED.allow_deposits, vault_daily_prices.allow_deposits),
-                leader_fraction = COALESCE(EXCLUDED.leader_fraction, vault_daily_prices.leader_fraction),
-                leader_commission = COALESCE(EXCLUDED.leader_commission, vault_daily_prices.leader_commission),
-                daily_deposit_count = COALESCE(EXCLUDED.daily_deposit_count, vault_daily_prices.daily_deposit_count),
-                daily_withdrawal_count = COALESCE(EXCLUDED.daily_withdrawal_count, vault_daily_prices.daily_withdrawal_count),
-                daily_deposit_usd = COALESCE(EXCLUDED.daily_deposit_usd, vault_daily_prices.daily_deposit_usd),
-                daily_withdrawal_usd = COALESCE(EXCLUDED.daily_withdrawal_usd, vault_daily_prices.daily_withdrawal_usd),
-                epoch_reset = COALESCE(EXCLUDED.epoch_reset, vault_daily_prices.epoch_reset),
-                data_source = COALESCE(EXCLUDED.data_source, vault_daily_prices.data_source),
-                written_at = EXCLUDED.written_at
-            """,
-            db_rows,
+        upsert_rows(
+            self.con.cursor(),
+            "vault_daily_prices",
+            DAILY_PRICE_COLUMNS,
+            [r.as_db_tuple() for r in rows],
+            key_columns=("vault_address", "date"),
+            coalesce_columns=DAILY_PRICE_COALESCE_COLUMNS,
         )
 
     def get_all_daily_prices(self) -> pd.DataFrame:
@@ -751,6 +787,83 @@ class HyperliquidDailyMetricsDatabase(HyperliquidMetricsDatabaseBase):
         )
         return result
 
+    def record_vault_fetches(self, snapshots: list[VaultScanSnapshot]):
+        """Store the bulk listing state and fetch cost of vaults whose details we fetched.
+
+        :param snapshots:
+            One snapshot per fetched vault, see :py:func:`~eth_defi.hyperliquid.daily_scan_planner.create_scan_snapshot`.
+        """
+        if not snapshots:
+            return
+        self.con.cursor().executemany(
+            """
+            INSERT INTO vault_scan_state (
+                vault_address, tvl, pnl_all_time, is_closed, fetched_at,
+                fetch_ok, fetch_seconds, fetch_count, total_fetch_seconds
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, 1, COALESCE(?, 0))
+            ON CONFLICT (vault_address)
+            DO UPDATE SET
+                tvl = EXCLUDED.tvl,
+                pnl_all_time = EXCLUDED.pnl_all_time,
+                is_closed = EXCLUDED.is_closed,
+                fetched_at = EXCLUDED.fetched_at,
+                fetch_ok = EXCLUDED.fetch_ok,
+                fetch_seconds = EXCLUDED.fetch_seconds,
+                fetch_count = vault_scan_state.fetch_count + 1,
+                total_fetch_seconds = vault_scan_state.total_fetch_seconds + EXCLUDED.total_fetch_seconds
+            """,
+            [
+                (
+                    s.vault_address,
+                    s.tvl,
+                    s.pnl_all_time,
+                    s.is_closed,
+                    s.fetched_at,
+                    s.fetch_ok,
+                    s.fetch_seconds,
+                    s.fetch_seconds,
+                )
+                for s in snapshots
+            ],
+        )
+
+    def get_vault_scan_snapshots(self) -> dict[str, VaultScanSnapshot]:
+        """Get the last fetch snapshot of each vault.
+
+        :return:
+            Snapshots by lowercased vault address
+        """
+        rows = (
+            self.con.cursor()
+            .execute(
+                """
+            SELECT vault_address, tvl, pnl_all_time, is_closed, fetched_at, fetch_ok, fetch_seconds
+            FROM vault_scan_state
+            """
+            )
+            .fetchall()
+        )
+        return {
+            row[0]: VaultScanSnapshot(
+                vault_address=row[0],
+                tvl=row[1],
+                pnl_all_time=row[2],
+                is_closed=row[3],
+                fetched_at=row[4],
+                fetch_ok=row[5],
+                fetch_seconds=row[6],
+            )
+            for row in rows
+        }
+
+    def get_vault_scan_costs(self) -> pd.DataFrame:
+        """Get per-vault detail fetch counts and wall time, most expensive first.
+
+        :return:
+            DataFrame of the ``vault_scan_state`` table
+        """
+        return self.con.cursor().execute("SELECT * FROM vault_scan_state ORDER BY total_fetch_seconds DESC").df()
+
     def get_leader_fraction_history(self, vault_address: str) -> pd.DataFrame:
         """Get the recorded leader_fraction snapshots for a vault.
 
@@ -1319,9 +1432,15 @@ def _process_vault_worker(
     cutoff_date: datetime.date | None,
     timeout: float,
     flow_backfill_days: int,
-) -> bool:
-    """Worker function for parallel vault processing."""
-    return fetch_and_store_vault(
+) -> VaultScanSnapshot:
+    """Worker function for parallel vault processing.
+
+    :return:
+        Bulk listing state of the vault with the fetch outcome and wall time
+    """
+    fetched_at = native_datetime_utc_now()
+    started = time.perf_counter()
+    ok = fetch_and_store_vault(
         session,
         db,
         summary,
@@ -1329,6 +1448,7 @@ def _process_vault_worker(
         timeout=timeout,
         flow_backfill_days=flow_backfill_days,
     )
+    return create_scan_snapshot(summary, fetched_at=fetched_at, fetch_ok=ok, fetch_seconds=time.perf_counter() - started)
 
 
 def run_daily_scan(
@@ -1342,14 +1462,17 @@ def run_daily_scan(
     vault_addresses: list[str] | None = None,
     flow_backfill_days: int = 7,
     full_scan: bool = False,
+    delta_scan: bool = False,
+    max_staleness: datetime.timedelta = DEFAULT_MAX_STALENESS,
 ) -> HyperliquidDailyMetricsDatabase:
     """Run the daily Hyperliquid vault metrics scan.
 
     1. Bulk-fetches all vaults from stats-data API
     2. Filters by TVL and vault limit (or by explicit address list)
-    3. Fetches per-vault details and computes share prices
-    4. Fetches deposit/withdrawal events for flow metrics
-    5. Stores everything in DuckDB
+    3. With ``delta_scan``, drops vaults that did not change since their last fetch
+    4. Fetches per-vault details and computes share prices
+    5. Fetches deposit/withdrawal events for flow metrics
+    6. Stores everything in DuckDB
 
     :param session:
         HTTP session with rate limiting.
@@ -1386,6 +1509,13 @@ def run_daily_scan(
         but still have historical data worth keeping current.  The
         ``max_vaults`` limit still applies to cap total work.
         Ignored when ``vault_addresses`` is provided.
+    :param delta_scan:
+        Only fetch details of selected vaults that are new, changed in the
+        bulk listing, or not fetched yet today.  Vaults are still fetched at
+        least once per UTC day, so repeated runs during a day only touch
+        active vaults.  See :py:mod:`~eth_defi.hyperliquid.daily_scan_planner`.
+    :param max_staleness:
+        With ``delta_scan``, refetch unchanged vaults after this long.
     :return:
         The metrics database instance.
     """
@@ -1449,13 +1579,21 @@ def run_daily_scan(
         filtered.sort(key=lambda s: float(s.tvl), reverse=True)
         filtered = filtered[:max_vaults]
 
-    logger.info("Processing %d vaults", len(filtered))
+    if delta_scan:
+        plan = plan_daily_scan(filtered, db.get_vault_scan_snapshots(), max_staleness=max_staleness)
+        to_fetch = plan.fetch
+        logger.info("Delta scan: fetching %d of %d selected vaults, reasons %s", len(to_fetch), len(filtered), dict(plan.get_reason_counts()))
+    else:
+        to_fetch = filtered
+
+    logger.info("Processing %d vaults", len(to_fetch))
 
     # Fetch details and compute prices in parallel
     desc = "Fetching Hyperliquid vault details"
-    results = Parallel(n_jobs=max_workers, backend="threading")(delayed(_process_vault_worker)(session, db, summary, cutoff_date, timeout, flow_backfill_days) for summary in tqdm(filtered, desc=desc))
+    results = Parallel(n_jobs=max_workers, backend="threading")(delayed(_process_vault_worker)(session, db, summary, cutoff_date, timeout, flow_backfill_days) for summary in tqdm(to_fetch, desc=desc))
+    db.record_vault_fetches(results)
 
-    success_count = sum(results)
+    success_count = sum(r.fetch_ok for r in results)
     fail_count = len(results) - success_count
 
     position_attempts = collect_hyperliquid_vault_observations(
@@ -1467,9 +1605,10 @@ def run_daily_scan(
     )
 
     # Update TVL for existing metadata entries that were not fully processed.
-    # This prevents stale TVL values for vaults that dropped below min_tvl.
+    # This prevents stale TVL values for vaults that dropped below min_tvl,
+    # or were skipped by the delta scan.
     if vault_addresses is None:
-        processed_addresses = {s.vault_address.lower() for s in filtered}
+        processed_addresses = {s.vault_address.lower() for s in to_fetch}
         all_api_addresses = {s.vault_address.lower() for s in vault_summaries}
 
         stale_updates = []
@@ -1503,7 +1642,7 @@ def run_daily_scan(
 
     logger.info(
         "Daily scan complete. Processed %d vaults (%d successful, %d failed, %d position observation attempts) into %s",
-        len(filtered),
+        len(to_fetch),
         success_count,
         fail_count,
         position_attempts,
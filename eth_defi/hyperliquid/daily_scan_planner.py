@@ -0,0 +1,206 @@
+"""Change detection for the Hyperliquid daily vault scan.
+
+:py:func:`~eth_defi.hyperliquid.daily_metrics.run_daily_scan` fetches
+``vaultDetails`` and deposit events for every selected vault, even if
+nothing has happened in the vault since the previous run.
+The bulk stats-data listing already carries each vault's TVL, all-time PnL
+and deposit status, so we can compare it against what the vault looked
+like at its last detail fetch and skip idle vaults.
+
+A vault's details are fetched when:
+
+- It has never been fetched, or its last fetch failed
+- It has not been fetched today (UTC), so every vault still gets its daily bar,
+  or its last fetch is older than ``max_staleness``
+- Its TVL, all-time PnL or deposit status in the bulk listing changed since the last fetch
+
+Vaults to fetch are ordered by TVL, then by how long ago they were fetched,
+so the most valuable and most out of date vaults are refreshed first.
+
+Per-vault fetch wall time is recorded with the snapshot, see
+:py:meth:`~eth_defi.hyperliquid.daily_metrics.HyperliquidDailyMetricsDatabase.record_vault_fetches`.
+
+Example::
+
+    from eth_defi.hyperliquid.daily_scan_planner import plan_daily_scan
+
+    plan = plan_daily_scan(summaries, db.get_vault_scan_snapshots())
+    print(plan.get_reason_counts())
+    for summary in plan.fetch:
+        ...
+"""
+
+import datetime
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Literal
+
+from eth_defi.compat import native_datetime_utc_now
+from eth_defi.hyperliquid.vault import VaultSummary
+
+#: Why a vault was planned to be fetched or skipped
+ScanReason = Literal["new", "failed", "stale", "changed", "unchanged"]
+
+#: Relative TVL move we consider noise, 0.1%
+DEFAULT_TVL_TOLERANCE = 0.001
+
+#: Refetch every vault at least this often, even if the bulk listing does not change
+DEFAULT_MAX_STALENESS = datetime.timedelta(days=1)
+
+
+@dataclass(slots=True, frozen=True)
+class VaultScanSnapshot:
+    """What the bulk listing said about a vault when we last fetched its details."""
+
+    #: Lowercased vault address
+    vault_address: str
+
+    #: TVL in the bulk listing, USD
+    tvl: float
+
+    #: Last all-time PnL value in the bulk listing, USD
+    pnl_all_time: float | None
+
+    #: Deposits closed flag in the bulk listing
+    is_closed: bool
+
+    #: When the details were fetched, naive UTC
+    fetched_at: datetime.datetime
+
+    #: Did the detail fetch succeed
+    fetch_ok: bool
+
+    #: Wall clock seconds the detail fetch took
+    fetch_seconds: float | None = None
+
+
+@dataclass(slots=True)
+class DailyScanPlan:
+    """Vaults to fetch and skip in this run."""
+
+    #: Vaults whose details we fetch, in processing order
+    fetch: list[VaultSummary] = field(default_factory=list)
+
+    #: Vaults that did not change since their last fetch
+    skip: list[VaultSummary] = field(default_factory=list)
+
+    #: Why each vault was fetched or skipped, by lowercased address
+    reasons: dict[str, ScanReason] = field(default_factory=dict)
+
+    def get_reason_counts(self) -> Counter:
+        """How many vaults were planned for each reason."""
+        return Counter(self.reasons.values())
+
+
+def get_summary_pnl(summary: VaultSummary) -> float | None:
+    """Latest all-time PnL value from the bulk listing.
+
+    :return:
+        ``None`` if the listing does not carry PnL history for the vault
+    """
+    if not summary.pnl_all_time:
+        return None
+    return float(summary.pnl_all_time[-1])
+
+
+def create_scan_snapshot(
+    summary: VaultSummary,
+    fetched_at: datetime.datetime,
+    fetch_ok: bool,
+    fetch_seconds: float | None = None,
+) -> VaultScanSnapshot:
+    """Capture the bulk listing state of a vault after fetching its details."""
+    return VaultScanSnapshot(
+        vault_address=summary.vault_address.lower(),
+        tvl=float(summary.tvl),
+        pnl_all_time=get_summary_pnl(summary),
+        is_closed=summary.is_closed,
+        fetched_at=fetched_at,
+        fetch_ok=fetch_ok,
+        fetch_seconds=fetch_seconds,
+    )
+
+
+def has_summary_changed(
+    summary: VaultSummary,
+    snapshot: VaultScanSnapshot,
+    tvl_tolerance: float = DEFAULT_TVL_TOLERANCE,
+) -> bool:
+    """Has the vault moved since the snapshot was taken.
+
+    :param tvl_tolerance:
+        Relative TVL change to ignore.
+    """
+    if summary.is_closed != snapshot.is_closed:
+        return True
+
+    pnl = get_summary_pnl(summary)
+    if (pnl is None) != (snapshot.pnl_all_time is None):
+        return True
+    if pnl is not None and not math.isclose(pnl, snapshot.pnl_all_time, rel_tol=1e-9, abs_tol=0.01):
+        return True
+
+    tvl = float(summary.tvl)
+    return abs(tvl - snapshot.tvl) > tvl_tolerance * max(abs(snapshot.tvl), 1.0)
+
+
+def plan_daily_scan(
+    summaries: Iterable[VaultSummary],
+    snapshots: dict[str, VaultScanSnapshot],
+    now: datetime.datetime | None = None,
+    max_staleness: datetime.timedelta = DEFAULT_MAX_STALENESS,
+    tvl_tolerance: float = DEFAULT_TVL_TOLERANCE,
+) -> DailyScanPlan:
+    """Decide which vaults need their details fetched.
+
+    :param summaries:
+        Vaults selected for this run from the bulk listing.
+
+    :param snapshots:
+        Last fetch snapshots by lowercased vault address,
+        from :py:meth:`~eth_defi.hyperliquid.daily_metrics.HyperliquidDailyMetricsDatabase.get_vault_scan_snapshots`.
+
+    :param now:
+        Current naive UTC time. Defaults to wall clock.
+
+    :param max_staleness:
+        Refetch vaults last fetched longer ago than this, even if they did not change.
+
+    :param tvl_tolerance:
+        Relative TVL change we do not consider a change.
+
+    :return:
+        The plan, with vaults to fetch ordered by TVL and staleness
+    """
+    if now is None:
+        now = native_datetime_utc_now()
+
+    plan = DailyScanPlan()
+    for summary in summaries:
+        address = summary.vault_address.lower()
+        snapshot = snapshots.get(address)
+        if snapshot is None:
+            reason = "new"
+        elif not snapshot.fetch_ok:
+            reason = "failed"
+        elif snapshot.fetched_at.date() < now.date() or now - snapshot.fetched_at >= max_staleness:
+            reason = "stale"
+        elif has_summary_changed(summary, snapshot, tvl_tolerance):
+            reason = "changed"
+        else:
+            reason = "unchanged"
+
+        plan.reasons[address] = reason
+        if reason == "unchanged":
+            plan.skip.append(summary)
+        else:
+            plan.fetch.append(summary)
+
+    def _priority(summary: VaultSummary) -> tuple[float, datetime.datetime]:
+        snapshot = snapshots.get(summary.vault_address.lower())
+        fetched_at = snapshot.fetched_at if snapshot else datetime.datetime.min
+        return -float(summary.tvl), fetched_at
+
+    plan.fetch.sort(key=_priority)
+    return plan
@@ -60,6 +60,7 @@ from eth_defi.hyperliquid.vault import (
     fetch_all_vaults,
 )
 from eth_defi.hyperliquid.vault_metrics_db import HyperliquidMetricsDatabaseBase
+from eth_defi.perp_dex.duckdb_engine import upsert_rows
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +70,49 @@ logger = logging.getLogger(__name__)
 # ──────────────────────────────────────────────
 
 
+#: Columns of :py:meth:`HyperliquidHighFreqPriceRow.as_db_tuple`
+HIGH_FREQ_PRICE_COLUMNS = (
+    "vault_address",
+    "timestamp",
+    "share_price",
+    "tvl",
+    "cumulative_pnl",
+    "cumulative_volume",
+    "daily_pnl",
+    "daily_return",
+    "follower_count",
+    "apr",
+    "is_closed",
+    "allow_deposits",
+    "leader_fraction",
+    "leader_commission",
+    "deposit_count",
+    "withdrawal_count",
+    "deposit_usd",
+    "withdrawal_usd",
+    "epoch_reset",
+    "data_source",
+    "written_at",
+)
+
+#: Sparse columns where ``None`` keeps the stored value on upsert
+HIGH_FREQ_PRICE_COALESCE_COLUMNS = (
+    "cumulative_volume",
+    "follower_count",
+    "apr",
+    "is_closed",
+    "allow_deposits",
+    "leader_fraction",
+    "leader_commission",
+    "deposit_count",
+    "withdrawal_count",
+    "deposit_usd",
+    "withdrawal_usd",
+    "epoch_reset",
+    "data_source",
+)
+
+
 @dataclass(slots=True)
 class HyperliquidHighFreqPriceRow:
     """A single high-frequency price row ready for DuckDB upsert."""
@@ -201,44 +245,16 @@ class HyperliquidHighFreqMetricsDatabase(HyperliquidMetricsDatabaseBase):
         if not rows:
             return
 
-        db_rows = [r.as_db_tuple() for r in rows]
-
         # Thread safety: use a per-call cursor so concurrent worker
         # threads do not clobber each other's result sets on the
         # shared connection.  See ``HyperliquidMetricsDatabaseBase``.
-        self.con.cursor().executemany(
-            """
-            INSERT INTO vault_high_freq_prices (
-                vault_address, timestamp, share_price, tvl, cumulative_pnl,
-                cumulative_volume, daily_pnl, daily_return, follower_count, apr,
-                is_closed, allow_deposits, leader_fraction, leader_commission,
-                deposit_count, withdrawal_count,
-                deposit_usd, withdrawal_usd, epoch_reset,
-                data_source, written_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT (vault_address, timestamp)
-            DO UPDATE SET
-                share_price = EXCLUDED.share_price,
-                tvl = EXCLUDED.tvl,
-                cumulative_pnl = EXCLUDED.cumulative_pnl,
-                cumulative_volume = COALESCE(EXCLUDED.cumulative_volume, vault_high_freq_prices.cumulative_volume),
-                daily_pnl = EXCLUDED.daily_pnl,
-                daily_return = EXCLUDED.daily_return,
-                follower_count = COALESCE(EXCLUDED.follower_count, vault_high_freq_prices.follower_count),
-                apr = COALESCE(EXCLUDED.apr, vault_high_freq_prices.apr),
-                is_closed = COALESCE(EXCLUDED.is_closed, vault_high_freq_prices.is_closed),
-                allow_deposits = COALESCE(EXCLUDED.allow_deposits, vault_high_freq_prices.allow_deposits),
-                leader_fraction = COALESCE(EXCLUDED.leader_fraction, vault_high_freq_prices.leader_fraction),
-                leader_commission = COALESCE(EXCLUDED.leader_commission, vault_high_freq_prices.leader_commission),
-                deposit_count = COALESCE(EXCLUDED.deposit_count, vault_high_freq_prices.deposit_count),
-                withdrawal_count = COALESCE(EXCLUDED.withdrawal_count, vault_high_freq_prices.withdrawal_count),
-                deposit_usd = COALESCE(EXCLUDED.deposit_usd, vault_high_freq_prices.deposit_usd),
-                withdrawal_usd = COALESCE(EXCLUDED.withdrawal_usd, vault_high_freq_prices.withdrawal_usd),
-                epoch_reset = COALESCE(EXCLUDED.epoch_reset, vault_high_freq_prices.epoch_reset),
-                data_source = COALESCE(EXCLUDED.data_source, vault_high_freq_prices.data_source),
-                written_at = EXCLUDED.written_at
-            """,
-            db_rows,
+        upsert_rows(
+            self.con.cursor(),
+            "vault_high_freq_prices",
+            HIGH_FREQ_PRICE_COLUMNS,
+            [r.as_db_tuple() for r in rows],
+            key_columns=("vault_address", "timestamp"),
+            coalesce_columns=HIGH_FREQ_PRICE_COALESCE_COLUMNS,
         )
 
     def get_all_high_freq_prices(self) -> pd.DataFrame:
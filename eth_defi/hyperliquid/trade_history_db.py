@@ -58,6 +58,7 @@ from eth_defi.compat import native_datetime_utc_now
 from eth_defi.hyperliquid.position import Fill
 from eth_defi.hyperliquid.session import HyperliquidSession
 from eth_defi.hyperliquid.trade_history import FundingPayment
+from eth_defi.perp_dex.duckdb_engine import insert_new_rows
 
 logger = logging.getLogger(__name__)
 
@@ -531,16 +532,7 @@ class HyperliquidTradeHistoryDatabase:
             Number of rows actually inserted.
         """
         with self._db_lock:
-            before = self.con.execute("SELECT COUNT(*) FROM fills WHERE address = ?", [address]).fetchone()[0]
-            self.con.executemany(
-                """
-                INSERT OR IGNORE INTO fills (address, trade_id, ts, coin, side, sz, px, closed_pnl, start_position, fee, oid)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                rows,
-            )
-            after = self.con.execute("SELECT COUNT(*) FROM fills WHERE address = ?", [address]).fetchone()[0]
-        return after - before
+            return insert_new_rows(self.con, "fills", ("address", "trade_id", "ts", "coin", "side", "sz", "px", "closed_pnl", "start_position", "fee", "oid"), rows, key_columns=("address", "trade_id"))
 
     # ──────────────────────────────────────────────
     # Sync: funding
@@ -691,16 +683,7 @@ class HyperliquidTradeHistoryDatabase:
             Number of rows actually inserted.
         """
         with self._db_lock:
-            before = self.con.execute("SELECT COUNT(*) FROM funding WHERE address = ?", [address]).fetchone()[0]
-            self.con.executemany(
-                """
-                INSERT OR IGNORE INTO funding (address, ts, coin, usdc, sz, rate)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                rows,
-            )
-            after = self.con.execute("SELECT COUNT(*) FROM funding WHERE address = ?", [address]).fetchone()[0]
-        return after - before
+            return insert_new_rows(self.con, "funding", ("address", "ts", "coin", "usdc", "sz", "rate"), rows, key_columns=("address", "ts", "coin"))
 
     # ──────────────────────────────────────────────
     # Sync: ledger
@@ -846,16 +829,7 @@ class HyperliquidTradeHistoryDatabase:
             Number of rows actually inserted.
         """
         with self._db_lock:
-            before = self.con.execute("SELECT COUNT(*) FROM ledger WHERE address = ?", [address]).fetchone()[0]
-            self.con.executemany(
-                """
-                INSERT OR IGNORE INTO ledger (address, ts, event_type, usdc, vault)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                rows,
-            )
-            after = self.con.execute("SELECT COUNT(*) FROM ledger WHERE address = ?", [address]).fetchone()[0]
-        return after - before
+            return insert_new_rows(self.con, "ledger", ("address", "ts", "event_type", "usdc", "vault"), rows, key_columns=("address", "ts", "event_type"))
 
     # ──────────────────────────────────────────────
     # Sync: orchestrator
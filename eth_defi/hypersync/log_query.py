@@ -0,0 +1,656 @@
+"""Declarative Hypersync log queries with shared streams and an on-disk segment cache.
+
+Several subsystems fetch raw logs from Hypersync, each building its own
+``hypersync.Query``, stream loop and per-log decoding. This module gives them
+one engine:
+
+- Describe what you want as a :py:class:`LogQuerySpec`: a set of contract addresses,
+  a set of topics per topic position and an inclusive block range
+
+- :py:class:`HypersyncLogQueryEngine` merges specs with overlapping block ranges into
+  one stream with one ``LogSelection`` per spec, and routes the returned logs back
+  to each spec
+
+- Logs are returned as a :py:class:`pyarrow.Table` with :py:data:`LOG_TABLE_SCHEMA`.
+  :py:func:`decode_address_column`, :py:func:`decode_uint256_column` and :py:func:`decode_hex_column`
+  decode indexed addresses, ``uint256`` words and hex strings for the whole column at once,
+  instead of calling ``eth_abi`` or ``bytes.hex()`` per log
+
+- :py:class:`LogSegmentCache` stores fetched (chain, spec hash, block range) segments
+  as Parquet files, so repeated and overlapping scans only fetch blocks they have not seen.
+  Only blocks up to ``cacheable_until_block`` are cached, so a reorg cannot poison the cache.
+
+Example:
+
+.. code-block:: python
+
+    from eth_defi.hypersync.log_query import HypersyncLogQueryEngine, LogQuerySpec, create_log_segment_cache_from_env
+
+    engine = HypersyncLogQueryEngine(
+        hypersync_client,
+        chain_id=8453,
+        cache=create_log_segment_cache_from_env(),
+        cacheable_until_block=safe_block,
+    )
+    deposits, withdrawals = engine.fetch_many(
+        [
+            LogQuerySpec.create(addresses=vaults, topics=[[DEPOSIT_TOPIC0]], start_block=1, end_block=head),
+            LogQuerySpec.create(addresses=vaults, topics=[[WITHDRAW_TOPIC0]], start_block=1, end_block=head),
+        ]
+    )
+    owners = decode_address_column(deposits["topic2"])
+    assets = decode_uint256_column(deposits["data"], word_index=0)
+
+Enable the cache with ``HYPERSYNC_LOG_CACHE_PATH`` environment variable.
+:py:func:`fetch_log_cache_horizon` gives the ``chain_id`` and ``cacheable_until_block`` arguments from a Web3 connection.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from eth_defi.disk_cache import DEFAULT_CACHE_ROOT
+from eth_defi.event_reader.multicall_cache import DEFAULT_REORG_SAFETY_BLOCKS
+
+try:
+    import hypersync
+    from hypersync import BlockField, LogField
+
+    from eth_defi.hypersync.hypersync_timestamp import HypersyncFlaky, raise_if_recoverable_hypersync_flaky
+    from eth_defi.hypersync.session import open_hypersync_stream
+except ImportError:
+    hypersync = None
+
+
+logger = logging.getLogger(__name__)
+
+#: Default location of the log segment cache
+DEFAULT_LOG_SEGMENT_CACHE_PATH = DEFAULT_CACHE_ROOT / "hypersync-logs"
+
+#: Columns of fetched log tables.
+#:
+#: - Addresses and transaction hashes are lower-case hex strings
+#: - Topics are 32 bytes, null if the log has fewer topics
+#: - ``block_timestamp`` is UNIX seconds
+LOG_TABLE_SCHEMA = pa.schema(
+    [
+        ("block_number", pa.int64()),
+        ("block_timestamp", pa.int64()),
+        ("log_index", pa.int64()),
+        ("transaction_hash", pa.string()),
+        ("address", pa.string()),
+        ("topic0", pa.binary(32)),
+        ("topic1", pa.binary(32)),
+        ("topic2", pa.binary(32)),
+        ("topic3", pa.binary(32)),
+        ("data", pa.binary()),
+    ]
+)
+
+#: Topic columns in :py:data:`LOG_TABLE_SCHEMA`
+TOPIC_COLUMNS = ("topic0", "topic1", "topic2", "topic3")
+
+
+def _normalise_hex(value: str | bytes, length: int | None = None) -> str:
+    """Lower-case hex without ``0x``, left-padded to ``length`` characters."""
+    if isinstance(value, bytes):
+        value = value.hex()
+    value = value.lower()
+    if value.startswith("0x"):
+        value = value[2:]
+    if length is not None:
+        value = value.rjust(length, "0")
+    return value
+
+
+def _decode_int(value: int | str) -> int:
+    if isinstance(value, int):
+        return value
+    return int(value, 16)
+
+
+@dataclass(slots=True, frozen=True)
+class LogQuerySpec:
+    """What logs to fetch.
+
+    Use :py:meth:`create` to construct, so addresses and topics are normalised
+    and equal specs hash equal.
+    """
+
+    #: Lower-case, sorted contract addresses. Empty means any address.
+    addresses: tuple[str, ...]
+
+    #: Per topic position, lower-case ``0x``-prefixed 32 byte topics.
+    #: An empty tuple at a position matches any topic.
+    topics: tuple[tuple[str, ...], ...]
+
+    #: Inclusive first block
+    start_block: int
+
+    #: Inclusive last block
+    end_block: int
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        addresses: Iterable[str] = (),
+        topics: Iterable[Iterable[str | bytes]] = (),
+        start_block: int,
+        end_block: int,
+    ) -> "LogQuerySpec":
+        """Create a normalised spec.
+
+        :param addresses:
+            Contract addresses, any case.
+
+        :param topics:
+            Topic alternatives per position, as in ``eth_getLogs``.
+        """
+        assert start_block <= end_block, f"Bad block range: {start_block} - {end_block}"
+        topics = tuple(tuple(sorted({"0x" + _normalise_hex(t, 64) for t in position})) for position in topics)
+        assert len(topics) <= 4, f"At most four topic positions, got {len(topics)}"
+        return cls(
+            addresses=tuple(sorted({str(a).lower() for a in addresses})),
+            topics=topics,
+            start_block=start_block,
+            end_block=end_block,
+        )
+
+    @property
+    def spec_hash(self) -> str:
+        """Identify the address and topic filter, ignoring the block range."""
+        payload = "|".join([",".join(self.addresses)] + [",".join(position) for position in self.topics])
+        return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+    def with_range(self, start_block: int, end_block: int) -> "LogQuerySpec":
+        """Same filter over a different block range."""
+        return replace(self, start_block=start_block, end_block=end_block)
+
+    def create_log_selection(self) -> "hypersync.LogSelection":
+        """Hypersync log filter for this spec."""
+        kwargs = {}
+        if self.addresses:
+            kwargs["address"] = list(self.addresses)
+        if self.topics:
+            kwargs["topics"] = [list(position) for position in self.topics]
+        return hypersync.LogSelection(**kwargs)
+
+    def filter_table(self, table: pa.Table) -> pa.Table:
+        """Rows of a merged stream result matching this spec."""
+        mask = pc.and_(
+            pc.greater_equal(table["block_number"], self.start_block),
+            pc.less_equal(table["block_number"], self.end_block),
+        )
+        if self.addresses:
+            mask = pc.and_(mask, pc.is_in(table["address"], value_set=pa.array(self.addresses)))
+        for column, position in zip(TOPIC_COLUMNS, self.topics):
+            if position:
+                values = pa.array([bytes.fromhex(t[2:]) for t in position], type=pa.binary(32))
+                mask = pc.and_(mask, pc.fill_null(pc.is_in(table[column], value_set=values), False))
+        return table.filter(mask)
+
+
+def create_empty_log_table() -> pa.Table:
+    """Log table without rows."""
+    return LOG_TABLE_SCHEMA.empty_table()
+
+
+class _LogTableBuilder:
+    """Collect Hypersync responses into columns."""
+
+    def __init__(self):
+        self.columns = {name: [] for name in LOG_TABLE_SCHEMA.names}
+
+    def add_response(self, response):
+        block_timestamps = {_decode_int(block.number): _decode_int(block.timestamp) for block in response.data.blocks or [] if block.number is not None and block.timestamp is not None}
+        columns = self.columns
+        for log in response.data.logs or []:
+            block_number = _decode_int(log.block_number)
+            columns["block_number"].append(block_number)
+            columns["block_timestamp"].append(block_timestamps.get(block_number))
+            columns["log_index"].append(_decode_int(log.log_index))
+            columns["transaction_hash"].append(log.transaction_hash.lower())
+            columns["address"].append(log.address.lower())
+            topics = list(log.topics or [])
+            topics += [None] * (4 - len(topics))
+            for name, topic in zip(TOPIC_COLUMNS, topics):
+                columns[name].append(bytes.fromhex(_normalise_hex(topic, 64)) if topic is not None else None)
+            columns["data"].append(bytes.fromhex(_normalise_hex(log.data or "0x")))
+
+    def build(self) -> pa.Table:
+        return pa.table(self.columns, schema=LOG_TABLE_SCHEMA)
+
+
+def _sort_log_table(table: pa.Table) -> pa.Table:
+    return table.sort_by([("block_number", "ascending"), ("log_index", "ascending")])
+
+
+def _fixed_width_matrix(column: pa.Array | pa.ChunkedArray, word_index: int) -> np.ndarray:
+    """Take 32 byte word ``word_index`` of each value as an ``(n, 32)`` byte matrix.
+
+    Reads the Arrow buffers directly, no per-row Python.
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks() if column.num_chunks else pa.array([], type=column.type)
+    assert column.null_count == 0, f"Cannot decode null values, {column.null_count} nulls"
+
+    length = len(column)
+    if length == 0:
+        return np.zeros((0, 32), dtype=np.uint8)
+
+    if pa.types.is_fixed_size_binary(column.type):
+        width = column.type.byte_width
+        assert word_index == 0 and width == 32, f"Fixed-size column has one 32 byte word, got width {width} word {word_index}"
+        values = np.frombuffer(column.buffers()[1], dtype=np.uint8)
+        start = column.offset * width
+        return values[start : start + length * width].reshape(length, width)
+
+    assert pa.types.is_binary(column.type), f"Expected binary column, got {column.type}"
+    offsets = np.frombuffer(column.buffers()[1], dtype=np.int32)[column.offset : column.offset + length + 1]
+    values = np.frombuffer(column.buffers()[2], dtype=np.uint8)
+    starts = offsets[:-1] + 32 * word_index
+    short = starts + 32 > offsets[1:]
+    if short.any():
+        raise ValueError(f"{int(short.sum())} values are shorter than {32 * (word_index + 1)} bytes")
+    return values[starts[:, None] + np.arange(32)]
+
+
+def decode_address_column(column: pa.Array | pa.ChunkedArray) -> pa.Array:
+    """Decode right-aligned addresses from a topic or data column.
+
+    :param column:
+        ``topic1`` .. ``topic3`` of a log table, or a single-word ``data`` column.
+
+    :return:
+        Lower-case ``0x``-prefixed addresses. Use ``Web3.to_checksum_address``
+        on the handful of values you display.
+    """
+    matrix = _fixed_width_matrix(column, 0)
+    encoded = matrix[:, 12:].tobytes().hex()
+    return pa.array(["0x" + encoded[i : i + 40] for i in range(0, len(encoded), 40)], type=pa.string())
+
+
+def _matrix_to_limbs(matrix: np.ndarray) -> np.ndarray:
+    """Big-endian 32 byte words as four ``uint64`` limbs, most significant first."""
+    return np.ascontiguousarray(matrix).view(">u8").reshape(len(matrix), 4).astype(np.uint64)
+
+
+def decode_uint256_column(column: pa.Array | pa.ChunkedArray, word_index: int = 0) -> np.ndarray:
+    """Decode a ``uint256`` from each value of a topic or data column.
+
+    :param column:
+        A topic column, or the ``data`` column.
+
+    :param word_index:
+        Which 32 byte ABI word of ``data`` to decode.
+
+    :return:
+        Object array of exact Python integers
+    """
+    limbs = _matrix_to_limbs(_fixed_width_matrix(column, word_index)).astype(object)
+    return (limbs[:, 0] << 192) | (limbs[:, 1] << 128) | (limbs[:, 2] << 64) | limbs[:, 3]
+
+
+def decode_uint256_column_as_float(column: pa.Array | pa.ChunkedArray, word_index: int = 0, decimals: int = 0) -> np.ndarray:
+    """Decode ``uint256`` values to floats, e.g. token amounts for analytics.
+
+    Loses precision beyond 53 bits, like any float conversion.
+
+    :param decimals:
+        Divide by ``10 ** decimals``.
+
+    :return:
+        ``float64`` array
+    """
+    limbs = _matrix_to_limbs(_fixed_width_matrix(column, word_index)).astype(np.float64)
+    values = limbs @ np.array([2.0**192, 2.0**128, 2.0**64, 1.0])
+    return values / 10.0**decimals
+
+
+def decode_hex_column(column: pa.Array | pa.ChunkedArray) -> list[str | None]:
+    """Convert a topic or data column to ``0x``-prefixed hex strings.
+
+    Hex-encodes the value buffer of the column in one call and slices it,
+    instead of creating a ``bytes`` object per value.
+
+    :return:
+        Hex string per value, ``None`` for nulls
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks() if column.num_chunks else pa.array([], type=column.type)
+
+    length = len(column)
+    if length == 0:
+        return []
+
+    if pa.types.is_fixed_size_binary(column.type):
+        width = column.type.byte_width
+        start = column.offset * width
+        encoded = column.buffers()[1].to_pybytes()[start : start + length * width].hex()
+        bounds = np.arange(length + 1) * (2 * width)
+    else:
+        assert pa.types.is_binary(column.type), f"Expected binary column, got {column.type}"
+        offsets = np.frombuffer(column.buffers()[1], dtype=np.int32)[column.offset : column.offset + length + 1]
+        values = column.buffers()[2]
+        encoded = values.to_pybytes()[offsets[0] : offsets[-1]].hex() if values is not None else ""
+        bounds = 2 * (offsets - offsets[0])
+
+    bounds = bounds.tolist()
+    result = ["0x" + encoded[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    if column.null_count:
+        for i in np.flatnonzero(column.is_null().to_numpy(zero_copy_only=False)):
+            result[i] = None
+    return result
+
+
+class LogSegmentCache:
+    """Fetched log segments as Parquet files.
+
+    Layout is ``<path>/<chain id>/<spec hash>/<start block>-<end block>.parquet``,
+    so segments are append-only files that processes can share without locking.
+    """
+
+    def __init__(self, path: Path = DEFAULT_LOG_SEGMENT_CACHE_PATH):
+        assert isinstance(path, Path), f"Expected Path, got {type(path)}"
+        self.path = path
+
+    def __repr__(self):
+        return f"<LogSegmentCache {self.path}>"
+
+    def get_spec_path(self, chain_id: int, spec: LogQuerySpec) -> Path:
+        return self.path / str(chain_id) / spec.spec_hash
+
+    def _list_segments(self, chain_id: int, spec: LogQuerySpec) -> list[tuple[int, int, Path]]:
+        spec_path = self.get_spec_path(chain_id, spec)
+        if not spec_path.exists():
+            return []
+        segments = []
+        for file in spec_path.glob("*.parquet"):
+            start, end = file.stem.split("-")
+            segments.append((int(start), int(end), file))
+        return segments
+
+    def load(self, chain_id: int, spec: LogQuerySpec) -> tuple[pa.Table, int]:
+        """Read the cached prefix of a spec's block range.
+
+        :return:
+            Tuple (cached logs in the range, first block not covered by the cache)
+        """
+        segments = self._list_segments(chain_id, spec)
+        tables = []
+        cursor = spec.start_block
+        while cursor <= spec.end_block:
+            covering = [s for s in segments if s[0] <= cursor <= s[1]]
+            if not covering:
+                break
+            _, end, file = max(covering, key=lambda s: s[1])
+            # Overlapping segments: take only the blocks not read yet
+            segment_spec = spec.with_range(cursor, min(end, spec.end_block))
+            tables.append(segment_spec.filter_table(pq.read_table(file, schema=LOG_TABLE_SCHEMA)))
+            cursor = end + 1
+
+        if not tables:
+            return create_empty_log_table(), spec.start_block
+
+        return pa.concat_tables(tables), min(cursor, spec.end_block + 1)
+
+    def save(self, chain_id: int, spec: LogQuerySpec, table: pa.Table):
+        """Store all logs of ``spec`` in its block range."""
+        spec_path = self.get_spec_path(chain_id, spec)
+        spec_path.mkdir(parents=True, exist_ok=True)
+        file = spec_path / f"{spec.start_block:012d}-{spec.end_block:012d}.parquet"
+        # Write-then-rename so concurrent readers never see partial files
+        temp_file = file.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(table, temp_file, compression="zstd")
+        temp_file.replace(file)
+
+
+def create_log_segment_cache_from_env() -> LogSegmentCache | None:
+    """Create the log segment cache if enabled.
+
+    - ``HYPERSYNC_LOG_CACHE_PATH``: cache directory, or ``default`` for :py:data:`DEFAULT_LOG_SEGMENT_CACHE_PATH`
+
+    :return:
+        Cache, or ``None`` if ``HYPERSYNC_LOG_CACHE_PATH`` is not set.
+    """
+    path = os.environ.get("HYPERSYNC_LOG_CACHE_PATH", "").strip()
+    if not path:
+        return None
+
+    path = DEFAULT_LOG_SEGMENT_CACHE_PATH if path == "default" else Path(path).expanduser()
+    return LogSegmentCache(path)
+
+
+def fetch_log_cache_horizon(web3, reorg_safety_blocks: int = DEFAULT_REORG_SAFETY_BLOCKS) -> tuple[int, int]:
+    """Get the chain id and the highest block safe to cache.
+
+    Use the ``finalized`` block tag where the node supports it,
+    otherwise stay ``reorg_safety_blocks`` behind the tip.
+
+    :param web3:
+        Web3 connection to the chain of the Hypersync client.
+
+    :return:
+        Tuple (chain id, cacheable until block)
+    """
+    try:
+        block_number = web3.eth.get_block("finalized")["number"]
+    except Exception as e:
+        logger.info("Node does not support finalized block tag (%s), using %d blocks reorg safety", e, reorg_safety_blocks)
+        block_number = web3.eth.block_number - reorg_safety_blocks
+    return web3.eth.chain_id, block_number
+
+
+def group_log_query_specs(specs: Iterable[LogQuerySpec], max_merge_gap: int = 0) -> list[list[LogQuerySpec]]:
+    """Group specs whose block ranges overlap, so each group can share one stream.
+
+    :param max_merge_gap:
+        Also merge ranges separated by at most this many blocks.
+    """
+    groups = []
+    current_end = None
+    for spec in sorted(specs, key=lambda s: (s.start_block, s.end_block)):
+        if groups and spec.start_block <= current_end + 1 + max_merge_gap:
+            groups[-1].append(spec)
+            current_end = max(current_end, spec.end_block)
+        else:
+            groups.append([spec])
+            current_end = spec.end_block
+    return groups
+
+
+class HypersyncLogQueryEngine:
+    """Fetch logs for many :py:class:`LogQuerySpec` with shared streams and caching.
+
+    :param client:
+        Native or throttled Hypersync client.
+
+    :param chain_id:
+        Chain of the client. Needed only with a cache.
+
+    :param cache:
+        Optional segment cache.
+
+    :param cacheable_until_block:
+        Highest block that is final enough to cache. ``None`` disables writing the cache.
+
+    :param max_merge_gap:
+        Merge spec block ranges into one stream when they are this close.
+
+    :param recv_timeout:
+        Timeout for each stream receive.
+
+    :param attempts:
+        Attempts per merged stream on rate limits, pagination glitches and timeouts.
+
+    :param retry_sleep:
+        Backoff before the first retry, in seconds. Doubles on each retry.
+    """
+
+    def __init__(
+        self,
+        client,
+        chain_id: int | None = None,
+        *,
+        cache: LogSegmentCache | None = None,
+        cacheable_until_block: int | None = None,
+        max_merge_gap: int = 0,
+        recv_timeout: float = 90.0,
+        attempts: int = 5,
+        retry_sleep: float = 30.0,
+    ):
+        assert attempts > 0, "attempts must be at least 1"
+        assert cache is None or chain_id is not None, "chain_id is needed for caching"
+        self.client = client
+        self.chain_id = chain_id
+        self.cache = cache
+        self.cacheable_until_block = cacheable_until_block
+        self.max_merge_gap = max_merge_gap
+        self.recv_timeout = recv_timeout
+        self.attempts = attempts
+        self.retry_sleep = retry_sleep
+
+    def __repr__(self):
+        return f"<HypersyncLogQueryEngine chain {self.chain_id}, cache {self.cache}>"
+
+    async def _stream(self, specs: list[LogQuerySpec]) -> pa.Table:
+        """Fetch a group of specs with one Hypersync stream.
+
+        :raise HypersyncFlaky:
+            On recoverable stream errors
+        """
+        assert hypersync is not None, "hypersync package is required"
+        query = hypersync.Query(
+            from_block=min(s.start_block for s in specs),
+            # Hypersync uses an exclusive to_block.
+            to_block=max(s.end_block for s in specs) + 1,
+            logs=[s.create_log_selection() for s in specs],
+            field_selection=hypersync.FieldSelection(
+                block=[BlockField.NUMBER, BlockField.TIMESTAMP],
+                log=[
+                    LogField.BLOCK_NUMBER,
+                    LogField.LOG_INDEX,
+                    LogField.ADDRESS,
+                    LogField.TRANSACTION_HASH,
+                    LogField.TOPIC0,
+                    LogField.TOPIC1,
+                    LogField.TOPIC2,
+                    LogField.TOPIC3,
+                    LogField.DATA,
+                ],
+            ),
+        )
+
+        try:
+            receiver = await open_hypersync_stream(self.client, query)
+        except RuntimeError as e:
+            raise_if_recoverable_hypersync_flaky(e, "stream setup [log-query]")
+            raise
+
+        builder = _LogTableBuilder()
+        while True:
+            try:
+                response = await asyncio.wait_for(receiver.recv(), timeout=self.recv_timeout)
+            except asyncio.TimeoutError as e:
+                raise HypersyncFlaky(f"HyperSync stream timeout after {self.recv_timeout} seconds [log-query]") from e
+            except RuntimeError as e:
+                raise_if_recoverable_hypersync_flaky(e, "streaming [log-query]")
+                raise
+            if response is None:
+                break
+            builder.add_response(response)
+        return builder.build()
+
+    async def _stream_with_retries(self, specs: list[LogQuerySpec]) -> pa.Table:
+        for attempt in range(self.attempts):
+            try:
+                return await self._stream(specs)
+            except HypersyncFlaky as e:
+                logger.warning("Hypersync log query flaky on attempt %d/%d: %s", attempt + 1, self.attempts, e)
+                if attempt + 1 >= self.attempts:
+                    raise
+                backoff = self.retry_sleep * (2**attempt)
+                logger.info("Backing off %.0fs before log query retry %d/%d", backoff, attempt + 2, self.attempts)
+                await asyncio.sleep(backoff)
+
+    async def _fetch_group(self, specs: list[LogQuerySpec]) -> dict[LogQuerySpec, pa.Table]:
+        table = await self._stream_with_retries(specs)
+        logger.info("Fetched %d logs for %d merged log query specs, blocks %d - %d", table.num_rows, len(specs), min(s.start_block for s in specs), max(s.end_block for s in specs))
+        return {spec: spec.filter_table(table) for spec in specs}
+
+    def _save_cacheable(self, spec: LogQuerySpec, table: pa.Table):
+        if self.cache is None or self.cacheable_until_block is None:
+            return
+        end_block = min(spec.end_block, self.cacheable_until_block)
+        if end_block < spec.start_block:
+            return
+        cacheable = spec.with_range(spec.start_block, end_block)
+        self.cache.save(self.chain_id, cacheable, cacheable.filter_table(table))
+
+    async def fetch_many_async(self, specs: list[LogQuerySpec]) -> list[pa.Table]:
+        """Fetch logs for each spec.
+
+        :return:
+            One table per spec, in the same order, sorted by ``(block_number, log_index)``
+        """
+        cached = {}
+        remaining = {}
+        for spec in set(specs):
+            if self.cache is not None:
+                table, next_block = self.cache.load(self.chain_id, spec)
+            else:
+                table, next_block = create_empty_log_table(), spec.start_block
+            cached[spec] = table
+            if next_block <= spec.end_block:
+                remaining[spec] = spec.with_range(next_block, spec.end_block)
+
+        groups = group_log_query_specs(set(remaining.values()), self.max_merge_gap)
+        fetched = {}
+        for result in await asyncio.gather(*[self._fetch_group(group) for group in groups]):
+            fetched.update(result)
+
+        results = {}
+        for spec in set(specs):
+            table = cached[spec]
+            if spec in remaining:
+                new_table = fetched[remaining[spec]]
+                self._save_cacheable(remaining[spec], new_table)
+                table = pa.concat_tables([table, new_table])
+            results[spec] = _sort_log_table(table)
+
+        return [results[spec] for spec in specs]
+
+    async def fetch_async(self, spec: LogQuerySpec) -> pa.Table:
+        """Fetch logs for one spec."""
+        (table,) = await self.fetch_many_async([spec])
+        return table
+
+    def fetch_many(self, specs: list[LogQuerySpec]) -> list[pa.Table]:
+        """Synchronous :py:meth:`fetch_many_async`.
+
+        Runs in a helper thread if called from inside an event loop.
+        """
+        coroutine = self.fetch_many_async(specs)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    def fetch(self, spec: LogQuerySpec) -> pa.Table:
+        """Synchronous :py:meth:`fetch_async`."""
+        (table,) = self.fetch_many([spec])
+        return table
@@ -0,0 +1,56 @@
+"""Deferred module loading for heavy optional subsystems.
+
+- Scanner entry points import dozens of protocol modules, but a single run
+  usually touches only a few of them
+- :py:func:`lazy_import_module` returns a module object that executes
+  the module only on the first attribute access
+- Measure the effect with :py:mod:`eth_defi.testing.import_time`
+
+Example:
+
+.. code-block:: python
+
+    from eth_defi.lazy_import import lazy_import_module
+
+    # Plotly, Matplotlib and ffn are loaded only when the export runs
+    top_vaults_json = lazy_import_module("eth_defi.vault.top_vaults_json")
+
+
+    def export():
+        return top_vaults_json.main()
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import_module(name: str) -> ModuleType:
+    """Import a module on its first attribute access.
+
+    - If the module is already imported, return it as is
+    - Import errors of missing modules are raised immediately,
+      errors of the module body on the first attribute access
+    - Attributes set before loading, like ``monkeypatch.setattr()``,
+      survive the load
+
+    :param name:
+        Full dotted module name.
+
+    :return:
+        Module, possibly not yet executed
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
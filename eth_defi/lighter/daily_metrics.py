@@ -48,6 +48,7 @@ from eth_defi.lighter.vault import (
     fetch_pool_detail,
     pool_detail_to_daily_dataframe,
 )
+from eth_defi.perp_dex.duckdb_engine import upsert_rows
 from eth_defi.perp_dex.storage import initialise_perp_vault_observation_schema
 
 logger = logging.getLogger(__name__)
@@ -176,6 +177,51 @@ class LighterDailyPriceRow:
         )
 
 
+#: ``pool_daily_prices`` columns written by :py:meth:`LighterDailyMetricsDatabase.upsert_daily_prices`
+POOL_DAILY_PRICE_COLUMNS = (
+    "deployment",
+    "account_index",
+    "date",
+    "share_price",
+    "tvl",
+    "daily_return",
+    "annual_percentage_yield",
+    "total_shares",
+    "cumulative_pool_inflow",
+    "cumulative_pool_outflow",
+    "written_at",
+    "cumulative_account_inflow",
+    "cumulative_account_outflow",
+    "cumulative_spot_inflow",
+    "cumulative_spot_outflow",
+    "cumulative_staking_inflow",
+    "cumulative_staking_outflow",
+    "trade_pnl",
+    "trade_spot_pnl",
+    "pool_pnl",
+    "staking_pnl",
+    "volume",
+)
+
+#: Source accounting columns, where a rescan without the value keeps the stored one
+POOL_DAILY_PRICE_COALESCE_COLUMNS = (
+    "total_shares",
+    "cumulative_pool_inflow",
+    "cumulative_pool_outflow",
+    "cumulative_account_inflow",
+    "cumulative_account_outflow",
+    "cumulative_spot_inflow",
+    "cumulative_spot_outflow",
+    "cumulative_staking_inflow",
+    "cumulative_staking_outflow",
+    "trade_pnl",
+    "trade_spot_pnl",
+    "pool_pnl",
+    "staking_pnl",
+    "volume",
+)
+
+
 def _normalise_daily_price_row(
     row: LighterDailyPriceRow | tuple[object, ...],
 ) -> tuple[object, ...]:
@@ -619,41 +665,13 @@ class LighterDailyMetricsDatabase:
         if not normalised_rows:
             return
 
-        self.con.executemany(
-            """
-            INSERT INTO pool_daily_prices (
-                deployment, account_index, date, share_price, tvl,
-                daily_return, annual_percentage_yield, total_shares,
-                cumulative_pool_inflow, cumulative_pool_outflow, written_at,
-                cumulative_account_inflow, cumulative_account_outflow,
-                cumulative_spot_inflow, cumulative_spot_outflow,
-                cumulative_staking_inflow, cumulative_staking_outflow,
-                trade_pnl, trade_spot_pnl, pool_pnl, staking_pnl, volume
-            ) VALUES (
-                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-            )
-            ON CONFLICT (deployment, account_index, date) DO UPDATE SET
-                share_price = excluded.share_price,
-                tvl = excluded.tvl,
-                daily_return = excluded.daily_return,
-                annual_percentage_yield = excluded.annual_percentage_yield,
-                total_shares = COALESCE(excluded.total_shares, pool_daily_prices.total_shares),
-                cumulative_pool_inflow = COALESCE(excluded.cumulative_pool_inflow, pool_daily_prices.cumulative_pool_inflow),
-                cumulative_pool_outflow = COALESCE(excluded.cumulative_pool_outflow, pool_daily_prices.cumulative_pool_outflow),
-                written_at = excluded.written_at,
-                cumulative_account_inflow = COALESCE(excluded.cumulative_account_inflow, pool_daily_prices.cumulative_account_inflow),
-                cumulative_account_outflow = COALESCE(excluded.cumulative_account_outflow, pool_daily_prices.cumulative_account_outflow),
-                cumulative_spot_inflow = COALESCE(excluded.cumulative_spot_inflow, pool_daily_prices.cumulative_spot_inflow),
-                cumulative_spot_outflow = COALESCE(excluded.cumulative_spot_outflow, pool_daily_prices.cumulative_spot_outflow),
-                cumulative_staking_inflow = COALESCE(excluded.cumulative_staking_inflow, pool_daily_prices.cumulative_staking_inflow),
-                cumulative_staking_outflow = COALESCE(excluded.cumulative_staking_outflow, pool_daily_prices.cumulative_staking_outflow),
-                trade_pnl = COALESCE(excluded.trade_pnl, pool_daily_prices.trade_pnl),
-                trade_spot_pnl = COALESCE(excluded.trade_spot_pnl, pool_daily_prices.trade_spot_pnl),
-                pool_pnl = COALESCE(excluded.pool_pnl, pool_daily_prices.pool_pnl),
-                staking_pnl = COALESCE(excluded.staking_pnl, pool_daily_prices.staking_pnl),
-                volume = COALESCE(excluded.volume, pool_daily_prices.volume)
-            """,
+        upsert_rows(
+            self.con,
+            "pool_daily_prices",
+            POOL_DAILY_PRICE_COLUMNS,
             [(deployment, *row) for row in normalised_rows],
+            key_columns=("deployment", "account_index", "date"),
+            coalesce_columns=POOL_DAILY_PRICE_COALESCE_COLUMNS,
         )
 
     def insert_pool_snapshot(
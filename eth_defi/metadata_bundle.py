@@ -0,0 +1,301 @@
+"""Precompiled bundle of the metadata YAML trees.
+
+``eth_defi/data`` holds hundreds of stablecoin, feeder and vault protocol YAML files.
+StrictYAML parsing is slow, a few seconds for the stablecoin tree alone, and
+:py:func:`~eth_defi.stablecoin_metadata.load_all_stablecoin_metadata`,
+:py:func:`~eth_defi.feed.stablecoin_rate.build_stablecoin_rate_lookups`,
+:py:func:`~eth_defi.vault.curator.load_curator_map` and friends parse the same
+files again in every process and loky worker.
+
+- :py:func:`build_metadata_bundle` parses every tree in :py:data:`METADATA_TREES` once,
+  in parallel, with the same StrictYAML schema the loaders use, and writes
+  the parsed data as msgpack into a single file
+- :py:class:`MetadataBundle` memory-maps the file and decodes single files on demand
+- Entries are keyed by the BLAKE2 hash of the YAML content, so an edited file,
+  e.g. by the stablecoin rate updater, is parsed from YAML until the bundle is rebuilt
+
+Loaders read through :py:func:`read_metadata_yaml`. Building the bundle spawns
+worker processes, so it is never built implicitly. Build it once after installing
+or updating the package, then enable it by setting ``METADATA_BUNDLE_PATH``
+to the file path, or to ``default`` for :py:data:`DEFAULT_METADATA_BUNDLE_PATH`.
+If the file does not exist, the YAML files are parsed as usual.
+
+.. code-block:: shell
+
+    export METADATA_BUNDLE_PATH=default
+    python -m eth_defi.metadata_bundle
+
+Example:
+
+.. code-block:: python
+
+    from eth_defi.metadata_bundle import build_metadata_bundle, MetadataBundle
+
+    bundle = MetadataBundle(build_metadata_bundle(Path("/tmp/metadata-bundle.bin")))
+    print(bundle)
+"""
+
+import hashlib
+import importlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import msgpack
+
+from eth_defi.disk_cache import DEFAULT_CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+#: Where the bundled metadata YAML trees live
+METADATA_ROOT = Path(__file__).resolve().parent / "data"
+
+#: Default bundle location
+DEFAULT_METADATA_BUNDLE_PATH = DEFAULT_CACHE_ROOT / "metadata-bundle.bin"
+
+#: File magic and format version
+METADATA_BUNDLE_MAGIC = b"EDFMETA1"
+
+#: Magic, directory length
+_HEADER = struct.Struct("<8sQ")
+
+#: YAML trees in the bundle.
+#:
+#: Kind -> (glob relative to :py:data:`METADATA_ROOT`, parser as ``module:function``).
+#: A parser takes the YAML text and returns the parsed data.
+METADATA_TREES = {
+    "stablecoin": ("stablecoins/*.yaml", "eth_defi.stablecoin_metadata:parse_stablecoin_yaml"),
+    "protocol": ("vaults/metadata/*.yaml", "eth_defi.vault.protocol_metadata:parse_protocol_yaml"),
+    "feeder": ("feeds/**/*.yaml", "eth_defi.feed.sources:parse_feeder_yaml"),
+}
+
+
+def _hash_content(content: bytes) -> bytes:
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+
+def _get_parser(kind: str) -> Callable[[str], dict]:
+    module_name, function_name = METADATA_TREES[kind][1].split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _compile_metadata_files(kind: str, root: Path, paths: list[Path]) -> list[tuple]:
+    parse = _get_parser(kind)
+    compiled = []
+    for path in paths:
+        content = path.read_bytes()
+        try:
+            packed = msgpack.packb(parse(content.decode()), use_bin_type=True)
+        except Exception as e:
+            # Broken files are left to the loaders to report
+            logger.warning("Not bundling %s: %s", path, e)
+            continue
+        compiled.append((kind, path.relative_to(root).as_posix(), _hash_content(content), packed))
+    return compiled
+
+
+def build_metadata_bundle(
+    output_path: Path,
+    root: Path = METADATA_ROOT,
+    max_workers: int | None = None,
+) -> Path:
+    """Parse the metadata YAML trees into a bundle file.
+
+    - Files are parsed in parallel worker processes
+    - Files that fail to parse or validate are left out of the bundle
+    - Written atomically: concurrent builders and readers see either the old or the new file
+
+    :param output_path:
+        Bundle file to write.
+
+    :param root:
+        Directory holding the trees of :py:data:`METADATA_TREES`.
+
+    :param max_workers:
+        Worker processes. ``1`` parses in this process.
+
+    :return:
+        ``output_path``
+    """
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    batches = []
+    for kind, (pattern, _) in METADATA_TREES.items():
+        paths = sorted(root.glob(pattern))
+        batch_count = max_workers * 2
+        batches += [(kind, paths[i::batch_count]) for i in range(batch_count) if paths[i::batch_count]]
+
+    if max_workers == 1:
+        compiled = [_compile_metadata_files(kind, root, paths) for kind, paths in batches]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            compiled = list(executor.map(_compile_metadata_files, [kind for kind, _ in batches], [root] * len(batches), [paths for _, paths in batches]))
+
+    entries = {}
+    payload = bytearray()
+    for kind, fname, content_hash, packed in (item for result in compiled for item in result):
+        entries[f"{kind}:{fname}"] = (content_hash, len(payload), len(packed))
+        payload += packed
+
+    directory = msgpack.packb(entries, use_bin_type=True)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=output_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(METADATA_BUNDLE_MAGIC, len(directory)))
+            f.write(directory)
+            f.write(payload)
+        os.replace(tmp_name, output_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+    logger.info("Built metadata bundle %s: %d files, %d bytes", output_path, len(entries), output_path.stat().st_size)
+    return output_path
+
+
+class MetadataBundle:
+    """Memory-mapped metadata bundle.
+
+    Thread safe for reading.
+
+    :param path:
+        File written by :py:func:`build_metadata_bundle`.
+
+    :param root:
+        Source tree the bundle was built from.
+    """
+
+    def __init__(self, path: Path, root: Path = METADATA_ROOT):
+        self.path = Path(path)
+        self.root = root.resolve()
+        with open(self.path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, directory_length = _HEADER.unpack_from(self.mmap, 0)
+        if magic != METADATA_BUNDLE_MAGIC:
+            raise ValueError(f"Not a metadata bundle, or an old format: {self.path}")
+        self.payload_offset = _HEADER.size + directory_length
+
+        #: ``kind:fname`` -> (content hash, offset, length)
+        self.entries: dict[str, list] = msgpack.unpackb(self.mmap[_HEADER.size : self.payload_offset], use_list=True)
+
+    def __repr__(self):
+        return f"<MetadataBundle {self.path}, {len(self.entries)} files>"
+
+    def close(self):
+        self.mmap.close()
+
+    def get(self, kind: str, yaml_path: Path, content: bytes) -> dict | None:
+        """Get the parsed data of a YAML file.
+
+        :param kind:
+            Tree kind in :py:data:`METADATA_TREES`.
+
+        :param content:
+            Current file content, checked against the bundled hash.
+
+        :return:
+            A fresh copy of the parsed data,
+            or ``None`` if the file is not bundled or changed since bundling
+        """
+        try:
+            fname = yaml_path.resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        entry = self.entries.get(f"{kind}:{fname}")
+        if entry is None:
+            return None
+        content_hash, offset, length = entry
+        if content_hash != _hash_content(content):
+            return None
+        start = self.payload_offset + offset
+        return msgpack.unpackb(self.mmap[start : start + length])
+
+
+_default_bundle: MetadataBundle | None = None
+_default_bundle_path: Path | None = None
+_default_bundle_lock = threading.Lock()
+_missing_bundle_paths: set[Path] = set()
+
+
+def get_metadata_bundle_path() -> Path | None:
+    """Get the bundle file configured with ``METADATA_BUNDLE_PATH``.
+
+    :return:
+        ``None`` if ``METADATA_BUNDLE_PATH`` is not set
+    """
+    value = os.environ.get("METADATA_BUNDLE_PATH")
+    if not value:
+        return None
+    return DEFAULT_METADATA_BUNDLE_PATH if value == "default" else Path(value).expanduser()
+
+
+def get_default_metadata_bundle() -> MetadataBundle | None:
+    """Get the process-wide bundle configured with ``METADATA_BUNDLE_PATH``.
+
+    - Opened once per process
+    - Never built here, see :py:func:`main`
+
+    :return:
+        ``None`` if ``METADATA_BUNDLE_PATH`` is not set, or the bundle has not been built
+    """
+    global _default_bundle, _default_bundle_path
+
+    path = get_metadata_bundle_path()
+    if path is None:
+        return None
+
+    with _default_bundle_lock:
+        if _default_bundle is not None and _default_bundle_path == path:
+            return _default_bundle
+        if not path.exists():
+            if path not in _missing_bundle_paths:
+                logger.warning("Metadata bundle %s not built, parsing YAML files. Build it with: python -m eth_defi.metadata_bundle", path)
+                _missing_bundle_paths.add(path)
+            return None
+        _default_bundle = MetadataBundle(path)
+        _default_bundle_path = path
+        return _default_bundle
+
+
+def read_metadata_yaml(yaml_path: Path, kind: str, parse: Callable[[str], dict]) -> dict:
+    """Read a metadata YAML file, from the bundle if it is enabled and up to date.
+
+    :param kind:
+        Tree kind in :py:data:`METADATA_TREES`.
+
+    :param parse:
+        Parser used when the file is not in the bundle.
+
+    :return:
+        Parsed data, same as ``parse(yaml_path.read_text())``
+    """
+    content = yaml_path.read_bytes()
+    bundle = get_default_metadata_bundle()
+    if bundle is not None:
+        data = bundle.get(kind, yaml_path, content)
+        if data is not None:
+            return data
+    return parse(content.decode())
+
+
+def main():
+    """Build the bundle at ``METADATA_BUNDLE_PATH``, or :py:data:`DEFAULT_METADATA_BUNDLE_PATH` if not set."""
+    from eth_defi.utils import setup_console_logging  # noqa: PLC0415
+
+    setup_console_logging(default_log_level=os.environ.get("LOG_LEVEL", "info"))
+    path = get_metadata_bundle_path() or DEFAULT_METADATA_BUNDLE_PATH
+    build_metadata_bundle(path)
+    print(f"Metadata bundle written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""Shared DuckDB time-series storage helpers for perp DEX metric databases.
+
+The per-protocol metric databases (Hyperliquid, GRVT, Hibachi, Lighter, ApeX, Derive)
+each own their DuckDB file and schema.  This module collects the storage
+mechanics they share, so that each database does not hand-roll them:
+
+- :py:func:`upsert_rows` and :py:func:`upsert_arrow` write a whole batch
+  with a single ``INSERT ... SELECT ... ON CONFLICT`` over a registered Arrow
+  table.  ``executemany()`` runs one statement per row and dominates the
+  scan wall time for vaults with long histories.
+- :py:func:`insert_new_rows` does the same for ``INSERT OR IGNORE`` style
+  appends, where stored rows are never updated.
+- :py:func:`replace_rows` deletes and inserts a batch for tables without
+  a primary key.
+
+Example::
+
+    from eth_defi.perp_dex.duckdb_engine import upsert_rows
+
+    upsert_rows(
+        con.cursor(),
+        "vault_daily_prices",
+        ["vault_id", "date", "share_price", "tvl"],
+        rows,
+        key_columns=["vault_id", "date"],
+        coalesce_columns=["tvl"],
+    )
+"""
+
+import logging
+import uuid
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+
+import duckdb
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+
+#: DuckDB column types we map explicitly to Arrow.
+#:
+#: Other types are left to Arrow type inference and DuckDB casts on insert.
+DUCKDB_ARROW_TYPES = {
+    "VARCHAR": pa.string(),
+    "DATE": pa.date32(),
+    "TIMESTAMP": pa.timestamp("us"),
+    "DOUBLE": pa.float64(),
+    "FLOAT": pa.float32(),
+    "BIGINT": pa.int64(),
+    "INTEGER": pa.int32(),
+    "SMALLINT": pa.int16(),
+    "TINYINT": pa.int8(),
+    "BOOLEAN": pa.bool_(),
+}
+
+
+def get_column_types(con: duckdb.DuckDBPyConnection, table: str) -> dict[str, str]:
+    """Get DuckDB column types of a table.
+
+    :return:
+        Column name to DuckDB type name, in table order
+    """
+    rows = con.execute(
+        "SELECT column_name, data_type FROM information_schema.columns WHERE table_catalog = current_database() AND table_name = ? ORDER BY ordinal_position",
+        [table],
+    ).fetchall()
+    return dict(rows)
+
+
+def rows_to_arrow(
+    rows: Sequence[tuple],
+    columns: Sequence[str],
+    column_types: dict[str, str] | None = None,
+) -> pa.Table:
+    """Convert row tuples to an Arrow table column by column.
+
+    :param column_types:
+        DuckDB types from :py:func:`get_column_types`.
+        Columns with a type in :py:data:`DUCKDB_ARROW_TYPES` are converted
+        to the matching Arrow type, so e.g. ``int`` TVL values end up as
+        ``DOUBLE`` and all-``None`` columns keep their type.
+        ``Decimal`` values in floating point columns are converted with ``float()``,
+        as DuckDB does for ``executemany()`` parameters.
+    """
+    column_types = column_types or {}
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+    assert len(values) == len(columns), f"Rows have {len(values)} columns, expected {len(columns)}: {columns}"
+    arrays = []
+    for name, column in zip(columns, values):
+        arrow_type = DUCKDB_ARROW_TYPES.get(column_types.get(name, ""))
+        try:
+            arrays.append(pa.array(column, type=arrow_type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            if arrow_type is None or not pa.types.is_floating(arrow_type):
+                raise
+            arrays.append(pa.array([None if v is None else float(v) for v in column], type=arrow_type))
+    return pa.Table.from_arrays(arrays, names=list(columns))
+
+
+def merge_duplicate_keys(
+    rows: Sequence[tuple],
+    columns: Sequence[str],
+    key_columns: Sequence[str],
+    coalesce_columns: Iterable[str] = (),
+    keep_first: bool = False,
+) -> list[tuple]:
+    """Collapse rows with the same key, as row-by-row upserts would.
+
+    A single ``ON CONFLICT`` statement cannot update the same row twice,
+    so repeated keys in a batch are merged first: later rows win, except that
+    ``None`` in a coalesced column keeps the earlier value.
+
+    :param keep_first:
+        The first row of each key wins, as with ``INSERT OR IGNORE``.
+
+    :return:
+        Rows in first-seen key order
+    """
+    key_idx = [columns.index(c) for c in key_columns]
+    coalesce_idx = [columns.index(c) for c in coalesce_columns]
+    merged: dict[tuple, tuple] = {}
+    for row in rows:
+        key = tuple(row[i] for i in key_idx)
+        previous = merged.get(key)
+        if previous is not None and keep_first:
+            continue
+        if previous is not None and coalesce_idx:
+            row = list(row)
+            for i in coalesce_idx:
+                if row[i] is None:
+                    row[i] = previous[i]
+            row = tuple(row)
+        merged[key] = row
+    return list(merged.values())
+
+
+@contextmanager
+def _registered(con: duckdb.DuckDBPyConnection, data: pa.Table) -> Iterator[str]:
+    view_name = f"_batch_{uuid.uuid4().hex}"
+    con.register(view_name, data)
+    try:
+        yield view_name
+    finally:
+        con.unregister(view_name)
+
+
+def upsert_arrow(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    data: pa.Table,
+    key_columns: Sequence[str],
+    coalesce_columns: Iterable[str] = (),
+) -> int:
+    """Insert or update a batch of rows from an Arrow table.
+
+    All non-key columns are overwritten on conflict, except ``coalesce_columns``
+    where a ``NULL`` in the batch keeps the stored value.
+
+    :param con:
+        Connection or cursor.  Pass ``con.cursor()`` when called from worker threads.
+
+    :param data:
+        Batch with column names matching the table.
+        Keys must be unique within the batch, see :py:func:`merge_duplicate_keys`.
+
+    :return:
+        Number of rows written
+    """
+    if data.num_rows == 0:
+        return 0
+
+    columns = data.column_names
+    coalesce_columns = set(coalesce_columns)
+    assignments = []
+    for column in columns:
+        if column in key_columns:
+            continue
+        if column in coalesce_columns:
+            assignments.append(f"{column} = COALESCE(EXCLUDED.{column}, {table}.{column})")
+        else:
+            assignments.append(f"{column} = EXCLUDED.{column}")
+
+    column_list = ", ".join(columns)
+    if assignments:
+        conflict = f"DO UPDATE SET {', '.join(assignments)}"
+    else:
+        conflict = "DO NOTHING"
+
+    with _registered(con, data) as view_name:
+        con.execute(f"""
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM {view_name}
+            ON CONFLICT ({", ".join(key_columns)}) {conflict}
+        """)
+    return data.num_rows
+
+
+def upsert_rows(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[tuple],
+    key_columns: Sequence[str],
+    coalesce_columns: Iterable[str] = (),
+) -> int:
+    """Insert or update row tuples as one Arrow batch.
+
+    Drop-in replacement for an ``executemany()`` upsert with the same
+    ``ON CONFLICT`` semantics, see :py:func:`upsert_arrow`.
+
+    :param columns:
+        Column names of the tuple fields.
+
+    :return:
+        Number of unique rows written
+    """
+    if not rows:
+        return 0
+    coalesce_columns = tuple(coalesce_columns)
+    rows = merge_duplicate_keys(rows, columns, key_columns, coalesce_columns)
+    data = rows_to_arrow(rows, columns, get_column_types(con, table))
+    return upsert_arrow(con, table, data, key_columns, coalesce_columns)
+
+
+def insert_new_rows(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    columns: Sequence[str],
+    rows: Sequence[tuple],
+    key_columns: Sequence[str],
+) -> int:
+    """Insert row tuples as one Arrow batch, skipping keys already stored.
+
+    Drop-in replacement for an ``INSERT OR IGNORE`` ``executemany()``:
+    stored rows are kept, and within the batch the first row of a key wins.
+
+    :param key_columns:
+        Primary key of the table.
+
+    :return:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    rows = merge_duplicate_keys(rows, columns, key_columns, keep_first=True)
+    data = rows_to_arrow(rows, columns, get_column_types(con, table))
+    column_list = ", ".join(columns)
+    with _registered(con, data) as view_name:
+        inserted = con.execute(f"""
+            INSERT INTO {table} ({column_list})
+            SELECT {column_list} FROM {view_name}
+            ON CONFLICT ({", ".join(key_columns)}) DO NOTHING
+        """).fetchone()[0]
+    return inserted
+
+
+def replace_rows(
+    con: duckdb.DuckDBPyConnection,
+    table: str,
+    columns: Sequence[str] | None,
+    rows: Sequence[tuple],
+    key_columns: Sequence[str],
+) -> int:
+    """Replace stored rows with the same key values with a batch of row tuples.
+
+    For tables without a primary key, where an upsert is a ``DELETE``
+    followed by an ``INSERT``.  Both statements run over one Arrow batch.
+    Wrap the call in a transaction to make it atomic.
+
+    :param columns:
+        Column names of the tuple fields.
+        ``None`` for all table columns in table order, like ``INSERT INTO table VALUES``.
+
+    :param key_columns:
+        Columns that identify the rows to replace.
+
+    :return:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    column_types = get_column_types(con, table)
+    if columns is None:
+        columns = list(column_types)
+    data = rows_to_arrow(rows, columns, column_types)
+    column_list = ", ".join(columns)
+    with _registered(con, data) as view_name:
+        match = " AND ".join(f"{table}.{column} IS NOT DISTINCT FROM {view_name}.{column}" for column in key_columns)
+        con.execute(f"DELETE FROM {table} USING {view_name} WHERE {match}")
+        con.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {view_name}")
+    return data.num_rows
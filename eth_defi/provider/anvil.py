@@ -1957,10 +1957,12 @@ def find_erc20_balance_slot(
     token_address: HexAddress | str,
     holder_address: HexAddress | str,
 ) -> int:
-    """Find the ERC-20 ``balanceOf`` mapping storage slot by brute force.
+    """Find the ERC-20 ``balanceOf`` mapping storage slot.
 
-    Tries slots 0-19 using Anvil snapshots, which covers all common
-    ERC-20 implementations (OpenZeppelin, Solmate, USDC proxy, etc.).
+    Reads the storage keys ``balanceOf`` touches with ``eth_createAccessList``
+    and matches them against Solidity, Vyper, Solady and ERC-7201 layouts,
+    falling back to brute forcing slots 0-19.
+    See :py:mod:`eth_defi.provider.balance_slot`.
 
     .. note::
 
@@ -1977,46 +1979,19 @@ def find_erc20_balance_slot(
         Address whose balance slot to find.
 
     :return:
-        Storage slot number (0-19).
+        Storage slot number of the Solidity ``mapping(address => uint256)``.
 
     :raises RuntimeError:
-        If no matching slot is found in the first 20 slots.
+        If no matching slot is found, or the token keeps balances in
+        another layout. Use :py:func:`~eth_defi.provider.balance_slot.get_balance_slot_layout`
+        for Vyper, Solady, ERC-7201 and struct member balances.
     """
-    erc20_abi = [
-        {
-            "constant": True,
-            "inputs": [{"name": "", "type": "address"}],
-            "name": "balanceOf",
-            "outputs": [{"name": "", "type": "uint256"}],
-            "type": "function",
-        }
-    ]
-    token = web3.eth.contract(
-        address=Web3.to_checksum_address(token_address),
-        abi=erc20_abi,
-    )
-    test_amount = 10**18
+    from eth_defi.provider.balance_slot import BalanceSlotKind, get_balance_slot_layout  # noqa: PLC0415
 
-    for slot in range(20):
-        snap = web3.provider.make_request("evm_snapshot", [])["result"]
-        key = Web3.solidity_keccak(
-            ["uint256", "uint256"],
-            [int(holder_address, 16), slot],
-        )
-        web3.provider.make_request(
-            "anvil_setStorageAt",
-            [
-                Web3.to_checksum_address(token_address),
-                "0x" + key.hex(),
-                "0x" + test_amount.to_bytes(32, "big").hex(),
-            ],
-        )
-        bal = token.functions.balanceOf(Web3.to_checksum_address(holder_address)).call()
-        web3.provider.make_request("evm_revert", [snap])
-        if bal == test_amount:
-            return slot
-
-    raise RuntimeError(f"Could not find balance slot for token {token_address}")
+    layout = get_balance_slot_layout(web3, token_address, holder_address)
+    if layout.kind != BalanceSlotKind.solidity or layout.offset != 0:
+        raise RuntimeError(f"Token {token_address} keeps balances in {layout}, not in a plain mapping slot, use get_balance_slot_layout()")
+    return layout.slot
 
 
 def fund_erc20_on_anvil(
@@ -2027,9 +2002,11 @@ def fund_erc20_on_anvil(
 ) -> int:
     """Fund an address with ERC-20 tokens by directly setting Anvil storage.
 
-    Auto-detects the ``balanceOf`` mapping slot using
-    :func:`find_erc20_balance_slot`, then writes the amount directly
-    to the token's storage.
+    Auto-detects the ``balanceOf`` storage layout using
+    :func:`~eth_defi.provider.balance_slot.get_balance_slot_layout`, then writes the amount directly
+    to the token's storage. The layout is memoised per token code hash, and persisted
+    across runs when ``ERC20_BALANCE_SLOT_CACHE_PATH`` is set,
+    so funding a known token costs a code hash lookup and one ``anvil_setStorageAt``.
 
     Example — mint 1000 USDC on an Arbitrum Anvil fork:
 
@@ -2070,29 +2047,28 @@ def fund_erc20_on_anvil(
         Token amount in raw wei.
 
     :return:
-        The storage slot that was written to.
+        The storage key that was written to.
     """
-    slot = find_erc20_balance_slot(web3, token_address, recipient)
+    from eth_defi.provider.balance_slot import get_balance_slot_layout  # noqa: PLC0415
+
+    layout = get_balance_slot_layout(web3, token_address, recipient)
+    storage_key = layout.get_storage_key(recipient)
     web3.provider.make_request(
         "anvil_setStorageAt",
         [
             Web3.to_checksum_address(token_address),
-            "0x"
-            + Web3.solidity_keccak(
-                ["uint256", "uint256"],
-                [int(recipient, 16), slot],
-            ).hex(),
+            "0x" + storage_key.to_bytes(32, "big").hex(),
             "0x" + amount.to_bytes(32, "big").hex(),
         ],
     )
     logger.info(
-        "Funded %s with %d tokens (wei) at %s via storage slot %d",
+        "Funded %s with %d tokens (wei) at %s via storage layout %s",
         recipient,
         amount,
         token_address,
-        slot,
+        layout,
     )
-    return slot
+    return storage_key
 
 
 # Backwards compatibility
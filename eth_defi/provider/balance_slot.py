@@ -0,0 +1,334 @@
+"""ERC-20 balance storage slot discovery for Anvil forks.
+
+:py:func:`~eth_defi.provider.anvil.fund_erc20_on_anvil` mints test tokens by writing
+the holder's balance directly to token storage. For that we need to know where the
+token keeps balances. Instead of brute forcing mapping slots with a
+snapshot/write/read/revert cycle per candidate, we
+
+- Ask the node which storage keys ``balanceOf(holder)`` reads with ``eth_createAccessList``,
+  see :py:func:`fetch_balance_of_storage_keys`
+
+- Match the keys against known layouts locally, see :py:func:`derive_balance_slot_layouts`:
+
+  - Solidity ``mapping(address => uint256)`` at any of the first slots, also inside a struct
+  - Solidity ``mapping(address => struct)`` where the balance is a struct member
+  - Vyper ``HashMap[address, uint256]``
+  - Solady ``ERC20`` with its balance slot seed
+  - ERC-7201 namespaced storage, e.g. OpenZeppelin upgradeable v5 ``ERC20``
+
+- Verify the match with one snapshot write and read, and fall back to the old
+  brute force only if nothing matches
+
+The result is a :py:class:`BalanceSlotLayout`, which does not depend on the holder.
+It is memoised in-process and can be persisted in :py:class:`BalanceSlotCache`,
+keyed by (chain, token code hash). Proxies are keyed by their implementation code,
+so an upgraded token is discovered again.
+
+Enable the persistent cache with ``ERC20_BALANCE_SLOT_CACHE_PATH`` environment variable.
+"""
+
+import enum
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from eth_typing import HexAddress
+from web3 import Web3
+
+from eth_defi.disk_cache import DEFAULT_CACHE_ROOT
+from eth_defi.provider.code_hash import fetch_runtime_code_hashes
+
+logger = logging.getLogger(__name__)
+
+#: Default location of the balance slot cache
+DEFAULT_BALANCE_SLOT_CACHE_PATH = DEFAULT_CACHE_ROOT / "erc20-balance-slot" / "balance-slots.sqlite"
+
+#: ``balanceOf(address)`` selector
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+
+#: Solady ``ERC20._BALANCE_SLOT_SEED``
+SOLADY_BALANCE_SLOT_SEED = 0x87A211A2
+
+#: How many plain mapping slots to match against
+MAX_MAPPING_SLOT = 256
+
+#: How far a balance can be from the mapping key, for balances inside structs
+MAX_STRUCT_OFFSET = 8
+
+#: Slots tried by the brute force fallback
+BRUTE_FORCE_SLOTS = 20
+
+#: Balance written when verifying a layout
+_PROBE_AMOUNT = 10**18 + 7
+
+
+def get_erc7201_slot(namespace: str) -> int:
+    """ERC-7201 namespaced storage base slot.
+
+    ``keccak256(abi.encode(uint256(keccak256(namespace)) - 1)) & ~bytes32(uint256(0xff))``
+    """
+    inner = int.from_bytes(Web3.keccak(text=namespace), "big") - 1
+    return int.from_bytes(Web3.keccak(inner.to_bytes(32, "big")), "big") & ~0xFF
+
+
+#: ERC-7201 namespaces whose first member is the balance mapping
+ERC7201_BALANCE_NAMESPACES = {
+    "openzeppelin.storage.ERC20": get_erc7201_slot("openzeppelin.storage.ERC20"),
+}
+
+
+class BalanceSlotKind(enum.Enum):
+    """How a token derives the storage key of a holder's balance."""
+
+    #: ``keccak256(abi.encode(holder, slot))``
+    solidity = "solidity"
+
+    #: ``keccak256(abi.encode(slot, holder))``
+    vyper = "vyper"
+
+    #: ``keccak256(abi.encodePacked(holder, uint96(seed)))``
+    solady = "solady"
+
+
+@dataclass(slots=True, frozen=True)
+class BalanceSlotLayout:
+    """Where a token stores balances, independent of the holder."""
+
+    kind: BalanceSlotKind
+
+    #: Mapping slot, ERC-7201 base slot or Solady seed
+    slot: int
+
+    #: Offset added to the mapping key, when the balance is a struct member
+    offset: int = 0
+
+    def get_storage_key(self, holder: HexAddress | str) -> int:
+        """Storage key of the balance of ``holder``."""
+        holder_bytes = bytes.fromhex(Web3.to_checksum_address(holder)[2:])
+        match self.kind:
+            case BalanceSlotKind.solidity:
+                preimage = holder_bytes.rjust(32, b"\x00") + self.slot.to_bytes(32, "big")
+            case BalanceSlotKind.vyper:
+                preimage = self.slot.to_bytes(32, "big") + holder_bytes.rjust(32, b"\x00")
+            case BalanceSlotKind.solady:
+                preimage = holder_bytes + self.slot.to_bytes(12, "big")
+        return (int.from_bytes(Web3.keccak(preimage), "big") + self.offset) % 2**256
+
+
+def _get_candidate_layouts() -> list[BalanceSlotLayout]:
+    layouts = [BalanceSlotLayout(BalanceSlotKind.solidity, slot) for slot in range(MAX_MAPPING_SLOT)]
+    layouts += [BalanceSlotLayout(BalanceSlotKind.vyper, slot) for slot in range(MAX_MAPPING_SLOT)]
+    layouts += [BalanceSlotLayout(BalanceSlotKind.solidity, slot) for slot in ERC7201_BALANCE_NAMESPACES.values()]
+    layouts.append(BalanceSlotLayout(BalanceSlotKind.solady, SOLADY_BALANCE_SLOT_SEED))
+    return layouts
+
+
+def derive_balance_slot_layouts(holder: HexAddress | str, storage_keys: list[int]) -> list[BalanceSlotLayout]:
+    """Match storage keys read by ``balanceOf(holder)`` against known layouts.
+
+    Pure computation: a few hundred keccaks, no RPC.
+
+    :param storage_keys:
+        Keys the call read, e.g. from :py:func:`fetch_balance_of_storage_keys`.
+
+    :return:
+        Matching layouts, most likely first. Usually exactly one.
+    """
+    by_key = {}
+    for layout in _get_candidate_layouts():
+        by_key.setdefault(layout.get_storage_key(holder), layout)
+
+    matches = []
+    for offset in range(MAX_STRUCT_OFFSET):
+        for key in storage_keys:
+            layout = by_key.get((key - offset) % 2**256)
+            if layout is not None:
+                matches.append(BalanceSlotLayout(layout.kind, layout.slot, offset))
+    return matches
+
+
+def _encode_balance_of(holder: HexAddress | str) -> str:
+    return "0x" + (BALANCE_OF_SELECTOR + bytes.fromhex(Web3.to_checksum_address(holder)[2:]).rjust(32, b"\x00")).hex()
+
+
+def fetch_balance_of_storage_keys(web3: Web3, token_address: HexAddress | str, holder: HexAddress | str) -> list[int]:
+    """Storage keys of the token contract read by ``balanceOf(holder)``.
+
+    Uses ``eth_createAccessList``, which Anvil and most nodes support.
+    Reads through ``delegatecall`` land in the proxy's storage, so proxies work as well.
+    """
+    token_address = Web3.to_checksum_address(token_address)
+    response = web3.provider.make_request(
+        "eth_createAccessList",
+        [{"to": token_address, "data": _encode_balance_of(holder)}, "latest"],
+    )
+    if "result" not in response:
+        raise RuntimeError(f"eth_createAccessList failed for {token_address}: {response.get('error')}")
+
+    keys = []
+    for entry in response["result"]["accessList"]:
+        if entry["address"].lower() == token_address.lower():
+            keys += [int(key, 16) for key in entry["storageKeys"]]
+    return keys
+
+
+def _fetch_balance(web3: Web3, token_address: HexAddress, holder: HexAddress | str) -> int:
+    response = web3.provider.make_request("eth_call", [{"to": token_address, "data": _encode_balance_of(holder)}, "latest"])
+    result = response.get("result")
+    if not result or result == "0x":
+        raise RuntimeError(f"balanceOf() failed on {token_address}: {response.get('error')}")
+    return int(result, 16)
+
+
+def verify_balance_slot_layout(web3: Web3, token_address: HexAddress | str, holder: HexAddress | str, layout: BalanceSlotLayout) -> bool:
+    """Write a balance through the layout inside a snapshot and read it back with ``balanceOf``."""
+    token_address = Web3.to_checksum_address(token_address)
+    snapshot = web3.provider.make_request("evm_snapshot", [])["result"]
+    try:
+        web3.provider.make_request(
+            "anvil_setStorageAt",
+            [token_address, "0x" + layout.get_storage_key(holder).to_bytes(32, "big").hex(), "0x" + _PROBE_AMOUNT.to_bytes(32, "big").hex()],
+        )
+        return _fetch_balance(web3, token_address, holder) == _PROBE_AMOUNT
+    finally:
+        web3.provider.make_request("evm_revert", [snapshot])
+
+
+def discover_balance_slot_layout(web3: Web3, token_address: HexAddress | str, holder: HexAddress | str) -> BalanceSlotLayout:
+    """Find the balance layout of a token on an Anvil fork.
+
+    :raise RuntimeError:
+        If neither the access list match nor the brute force finds a working layout.
+    """
+    candidates = derive_balance_slot_layouts(holder, fetch_balance_of_storage_keys(web3, token_address, holder))
+    for layout in candidates:
+        if verify_balance_slot_layout(web3, token_address, holder, layout):
+            return layout
+
+    logger.info("No known balance layout matched the access list of %s, brute forcing", token_address)
+    for slot in range(BRUTE_FORCE_SLOTS):
+        for kind in (BalanceSlotKind.solidity, BalanceSlotKind.vyper):
+            layout = BalanceSlotLayout(kind, slot)
+            if verify_balance_slot_layout(web3, token_address, holder, layout):
+                return layout
+
+    raise RuntimeError(f"Could not find balance slot for token {token_address}")
+
+
+def fetch_token_code_hash(web3: Web3, token_address: HexAddress | str) -> bytes:
+    """Code identity of a token, following proxies to the implementation."""
+    token_address = Web3.to_checksum_address(token_address)
+    code_hashes = fetch_runtime_code_hashes(web3, [token_address], "latest")
+    assert token_address in code_hashes, f"No contract at {token_address}"
+    return code_hashes[token_address]
+
+
+class BalanceSlotCache:
+    """SQLite store of discovered balance layouts keyed by (chain, token code hash).
+
+    Safe to share between processes and xdist workers; each operation opens its own connection.
+    """
+
+    def __init__(self, path: Path = DEFAULT_BALANCE_SLOT_CACHE_PATH):
+        assert isinstance(path, Path), f"Expected Path, got {type(path)}"
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS balance_slot (
+                    chain_id INTEGER NOT NULL,
+                    code_hash BLOB NOT NULL,
+                    kind TEXT NOT NULL,
+                    slot TEXT NOT NULL,
+                    offset INTEGER NOT NULL,
+                    PRIMARY KEY (chain_id, code_hash)
+                )
+                """
+            )
+
+    def __repr__(self):
+        return f"<BalanceSlotCache {self.path}>"
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=60)
+
+    def get(self, chain_id: int, code_hash: bytes) -> BalanceSlotLayout | None:
+        with self._connect() as connection:
+            row = connection.execute("SELECT kind, slot, offset FROM balance_slot WHERE chain_id = ? AND code_hash = ?", (chain_id, code_hash)).fetchone()
+        if row is None:
+            return None
+        kind, slot, offset = row
+        # Slots can be 256-bit ERC-7201 bases, which do not fit SQLite INTEGER
+        return BalanceSlotLayout(BalanceSlotKind(kind), int(slot), offset)
+
+    def put(self, chain_id: int, code_hash: bytes, layout: BalanceSlotLayout):
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO balance_slot (chain_id, code_hash, kind, slot, offset) VALUES (?, ?, ?, ?, ?)",
+                (chain_id, code_hash, layout.kind.value, str(layout.slot), layout.offset),
+            )
+
+
+def create_balance_slot_cache_from_env() -> BalanceSlotCache | None:
+    """Create the persistent balance slot cache if enabled.
+
+    - ``ERC20_BALANCE_SLOT_CACHE_PATH``: SQLite file, or ``default`` for :py:data:`DEFAULT_BALANCE_SLOT_CACHE_PATH`
+
+    :return:
+        Cache, or ``None`` if ``ERC20_BALANCE_SLOT_CACHE_PATH`` is not set.
+    """
+    path = os.environ.get("ERC20_BALANCE_SLOT_CACHE_PATH", "").strip()
+    if not path:
+        return None
+
+    path = DEFAULT_BALANCE_SLOT_CACHE_PATH if path == "default" else Path(path).expanduser()
+    return BalanceSlotCache(path)
+
+
+#: In-process memo (chain id, token code hash) -> layout
+#:
+#: Keyed by code, not address: on Anvil, different test tokens
+#: are deployed at the same deterministic addresses.
+_layout_memo: dict[tuple[int, bytes], BalanceSlotLayout] = {}
+
+
+def get_balance_slot_layout(
+    web3: Web3,
+    token_address: HexAddress | str,
+    holder: HexAddress | str,
+    cache: BalanceSlotCache | None = None,
+) -> BalanceSlotLayout:
+    """Get the balance layout of a token, discovering it on the first use.
+
+    Lookup order: in-process memo, then ``cache``, then :py:func:`discover_balance_slot_layout`.
+
+    :param holder:
+        Any address; used only if the layout needs to be discovered.
+
+    :param cache:
+        Persistent cache. Defaults to :py:func:`create_balance_slot_cache_from_env`.
+    """
+    chain_id = web3.eth.chain_id
+    code_hash = fetch_token_code_hash(web3, token_address)
+    memo_key = (chain_id, code_hash)
+    layout = _layout_memo.get(memo_key)
+    if layout is not None:
+        return layout
+
+    if cache is None:
+        cache = create_balance_slot_cache_from_env()
+
+    if cache is not None:
+        layout = cache.get(chain_id, code_hash)
+
+    if layout is None:
+        layout = discover_balance_slot_layout(web3, token_address, holder)
+        logger.info("Discovered balance layout %s for token %s", layout, token_address)
+        if cache is not None:
+            cache.put(chain_id, code_hash, layout)
+
+    _layout_memo[memo_key] = layout
+    return layout
@@ -0,0 +1,176 @@
+"""Runtime code identity of contracts, following proxies.
+
+Factory-deployed contracts share their runtime code, either directly or
+behind a proxy pointing to the same implementation. Caches keyed by what a
+contract's code does, like vault probe results or ERC-20 balance layouts,
+use the code hash from :py:func:`fetch_runtime_code_hashes` as the key.
+
+- EIP-1167 minimal proxies are decoded from their code
+- EIP-1967 proxies are resolved from the implementation slot, or the beacon slot
+  and the beacon's ``implementation()``
+
+The lookups are sent as JSON-RPC batches, so hashing thousands of contracts
+costs a few round trips per :py:data:`BATCH_SIZE` contracts, not one or more per contract.
+"""
+
+import logging
+from collections.abc import Iterable
+from typing import Any
+
+from eth_typing import HexAddress
+from web3 import Web3
+from web3.types import BlockIdentifier
+
+logger = logging.getLogger(__name__)
+
+#: ``bytes32(uint256(keccak256("eip1967.proxy.implementation")) - 1)``
+EIP_1967_IMPLEMENTATION_SLOT = 0x360894A13BA1A3210667C828492DB98DCA3E2076CC3735A920A3CA505D382BBC
+
+#: ``bytes32(uint256(keccak256("eip1967.proxy.beacon")) - 1)``
+EIP_1967_BEACON_SLOT = 0xA3F0AD74E5423AEBFD80D3EF4346578335A9A72AEAEE59FF6CB3582B35133D50
+
+#: EIP-1167 minimal proxy runtime code is ``prefix + implementation address + suffix``
+EIP_1167_PREFIX = bytes.fromhex("363d3d373d3d3d363d73")
+
+#: See :py:data:`EIP_1167_PREFIX`
+EIP_1167_SUFFIX = bytes.fromhex("5af43d82803e903d91602b57fd5bf3")
+
+#: Only look up proxy slots for contracts smaller than this.
+#:
+#: Proxies are a few kilobytes at most, full implementations are not,
+#: so we save the storage reads for non-proxy contracts.
+MAX_PROXY_CODE_SIZE = 4096
+
+#: ``IBeacon.implementation()`` selector
+BEACON_IMPLEMENTATION_SELECTOR = bytes.fromhex("5c60da1b")
+
+#: JSON-RPC requests per batch
+BATCH_SIZE = 100
+
+
+def _get_batch_provider(web3: Web3):
+    # FallbackProvider and friends do not batch themselves, use their current backend
+    get_active_provider = getattr(web3.provider, "get_active_provider", None)
+    return get_active_provider() if get_active_provider is not None else web3.provider
+
+
+def make_batch_requests(web3: Web3, requests: list[tuple[str, list]], batch_size: int = BATCH_SIZE) -> list[Any]:
+    """Send raw JSON-RPC requests in batches.
+
+    Falls back to one request at a time through ``web3.provider``, with its retries,
+    if the provider does not support batching or rejects the batch.
+
+    :param requests:
+        List of (method, params).
+
+    :return:
+        Raw result of each request, ``None`` for failed requests
+    """
+    provider = _get_batch_provider(web3)
+    results = []
+    for i in range(0, len(requests), batch_size):
+        chunk = requests[i : i + batch_size]
+        try:
+            responses = provider.make_batch_request(chunk)
+        except NotImplementedError:
+            responses = None
+        except Exception as e:  # noqa: BLE001
+            logger.info("JSON-RPC batch of %d requests failed, sending one by one: %s", len(chunk), e)
+            responses = None
+
+        if not isinstance(responses, list) or len(responses) != len(chunk):
+            responses = [web3.provider.make_request(method, params) for method, params in chunk]
+
+        results += [response.get("result") for response in responses]
+    return results
+
+
+def _to_block_param(block_identifier: BlockIdentifier) -> str:
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    if isinstance(block_identifier, bytes):
+        return "0x" + block_identifier.hex()
+    return block_identifier
+
+
+def _to_bytes(value: str | None) -> bytes:
+    if not value or value == "0x":
+        return b""
+    return bytes.fromhex(value[2:])
+
+
+def _decode_address_word(value: str | None) -> HexAddress | None:
+    raw = _to_bytes(value)
+    if len(raw) != 32 or int.from_bytes(raw, "big") == 0:
+        return None
+    return Web3.to_checksum_address(raw[-20:])
+
+
+def decode_minimal_proxy(code: bytes) -> HexAddress | None:
+    """Get the implementation of an EIP-1167 minimal proxy from its runtime code."""
+    if len(code) == 45 and code.startswith(EIP_1167_PREFIX) and code.endswith(EIP_1167_SUFFIX):
+        return Web3.to_checksum_address(code[len(EIP_1167_PREFIX) : len(EIP_1167_PREFIX) + 20])
+    return None
+
+
+def fetch_runtime_code_hashes(
+    web3: Web3,
+    addresses: Iterable[HexAddress],
+    block_identifier: BlockIdentifier,
+) -> dict[HexAddress, bytes]:
+    """Get the code identity of contracts.
+
+    - For proxies, the identity is the runtime code hash of the implementation
+    - For other contracts, the identity is their own runtime code hash
+
+    Runs at most five batched stages: code, implementation slots, beacon slots,
+    beacon implementations and implementation code.
+
+    :return:
+        Address -> keccak of runtime code. Addresses without code are left out.
+    """
+    block = _to_block_param(block_identifier)
+    addresses = list(addresses)
+
+    codes = {}
+    raw_codes = make_batch_requests(web3, [("eth_getCode", [Web3.to_checksum_address(a), block]) for a in addresses])
+    for address, raw in zip(addresses, raw_codes):
+        code = _to_bytes(raw)
+        if code:
+            codes[address] = code
+
+    implementations: dict[HexAddress, HexAddress] = {}
+    for address, code in codes.items():
+        implementation = decode_minimal_proxy(code)
+        if implementation is not None:
+            implementations[address] = implementation
+
+    # EIP-1967 implementation slot of small contracts
+    candidates = [a for a, code in codes.items() if a not in implementations and len(code) < MAX_PROXY_CODE_SIZE]
+    slots = make_batch_requests(web3, [("eth_getStorageAt", [Web3.to_checksum_address(a), hex(EIP_1967_IMPLEMENTATION_SLOT), block]) for a in candidates])
+    for address, value in zip(candidates, slots):
+        implementation = _decode_address_word(value)
+        if implementation is not None:
+            implementations[address] = implementation
+
+    # EIP-1967 beacon slot of the rest
+    candidates = [a for a in candidates if a not in implementations]
+    slots = make_batch_requests(web3, [("eth_getStorageAt", [Web3.to_checksum_address(a), hex(EIP_1967_BEACON_SLOT), block]) for a in candidates])
+    beacons = {a: beacon for a, beacon in ((a, _decode_address_word(v)) for a, v in zip(candidates, slots)) if beacon is not None}
+    unique_beacons = list(set(beacons.values()))
+    beacon_results = make_batch_requests(web3, [("eth_call", [{"to": beacon, "data": "0x" + BEACON_IMPLEMENTATION_SELECTOR.hex()}, block]) for beacon in unique_beacons])
+    beacon_implementations = dict(zip(unique_beacons, map(_decode_address_word, beacon_results)))
+    for address, beacon in beacons.items():
+        if beacon_implementations[beacon] is not None:
+            implementations[address] = beacon_implementations[beacon]
+
+    unique_implementations = list(set(implementations.values()))
+    implementation_codes = make_batch_requests(web3, [("eth_getCode", [i, block]) for i in unique_implementations])
+    implementation_hashes = {i: bytes(Web3.keccak(code)) if (code := _to_bytes(raw)) else None for i, raw in zip(unique_implementations, implementation_codes)}
+
+    code_hashes = {}
+    for address, code in codes.items():
+        implementation_hash = implementation_hashes.get(implementations.get(address))
+        # Uninitialised or self-destructed implementation, fall back to the proxy code
+        code_hashes[address] = implementation_hash if implementation_hash is not None else bytes(Web3.keccak(code))
+    return code_hashes
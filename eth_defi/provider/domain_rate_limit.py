@@ -0,0 +1,420 @@
+"""Cross-process JSON-RPC token buckets keyed by provider domain.
+
+Scanner workers (loky subprocesses, threads, the parent process) all share
+the same paid RPC quota, but before this module each of them throttled
+itself: :py:class:`~eth_defi.provider.fallback.FallbackProvider` backed off
+with exponential sleeps and
+:py:class:`~eth_defi.event_reader.multicall_batcher.MultiprocessMulticallReader`
+slept a fixed minute after an HTTP 429.  The combined request rate therefore
+oscillated between bursting into 429 errors and idling.
+
+:py:class:`DomainRateLimiter` keeps one token bucket per provider domain
+(e.g. ``arb-mainnet.g.alchemy.com``) in a small SQLite database below
+``~/.tradingstrategy``.  Every process opening the same file shares the same
+budget:
+
+- Smooth pacing: a request reserves a token and sleeps until its own slot,
+  so concurrent workers are spaced ``1 / requests_per_second`` apart instead
+  of polling a full bucket.
+
+- Burst credits: an idle bucket accumulates up to ``burst`` tokens which are
+  spent without waiting.
+
+- ``Retry-After`` feedback: a throttled response empties the bucket and blocks
+  the domain for the server-advertised duration, for all processes.
+
+The table uses the ``ratelimit_`` prefix and the
+:py:data:`~eth_defi.rate_limit.SQLITE_RATE_LIMIT_DATABASE_FILENAME` file name,
+so :py:func:`eth_defi.rate_limit.clear_sqlite_rate_limit_databases` resets it
+on scanner start like the other throttlers.
+
+Limits are configured with the ``RPC_RATE_LIMITS`` environment variable,
+a comma-separated list of ``domain=requests_per_second[:burst]`` entries.
+A configured domain matches itself and its subdomains:
+
+.. code-block:: shell
+
+    export RPC_RATE_LIMITS="alchemy.com=25:50,quiknode.pro=10"
+
+Usage:
+
+.. code-block:: python
+
+    from eth_defi.provider.domain_rate_limit import create_domain_rate_limiter_from_env
+
+    limiter = create_domain_rate_limiter_from_env()
+    if limiter:
+        limiter.acquire("arb-mainnet.g.alchemy.com")
+"""
+
+import datetime
+import email.utils
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Mapping
+
+from eth_defi.rate_limit import SQLITE_RATE_LIMIT_DATABASE_FILENAME, TRADING_STRATEGY_STATE_DIRECTORY
+
+logger = logging.getLogger(__name__)
+
+#: Default SQLite database shared by all processes throttling JSON-RPC calls.
+DEFAULT_DOMAIN_RATE_LIMIT_DATABASE = TRADING_STRATEGY_STATE_DIRECTORY / "rpc" / SQLITE_RATE_LIMIT_DATABASE_FILENAME
+
+#: Environment variable holding ``domain=rps[:burst]`` entries.
+RPC_RATE_LIMITS_ENV = "RPC_RATE_LIMITS"
+
+#: Environment variable overriding :py:data:`DEFAULT_DOMAIN_RATE_LIMIT_DATABASE`.
+RPC_RATE_LIMIT_DATABASE_ENV = "RPC_RATE_LIMIT_DATABASE"
+
+#: How long we block a domain after HTTP 429 when the server did not send ``Retry-After``.
+DEFAULT_THROTTLED_COOLDOWN = 5.0
+
+
+@dataclass(slots=True, frozen=True)
+class TokenBucketConfig:
+    """Rate limit of one provider domain."""
+
+    #: Sustained refill rate
+    requests_per_second: float
+
+    #: Bucket capacity: how many requests an idle domain may fire without waiting
+    burst: float
+
+    def __post_init__(self):
+        assert self.requests_per_second > 0, f"requests_per_second must be positive: {self.requests_per_second}"
+        assert self.burst >= 1, f"burst must be at least one request: {self.burst}"
+
+
+def parse_rate_limit_config(value: str) -> dict[str, TokenBucketConfig]:
+    """Parse ``RPC_RATE_LIMITS`` configuration.
+
+    Example: ``alchemy.com=25:50,quiknode.pro=10``.  When the burst is omitted,
+    it defaults to one second worth of requests.
+
+    :param value:
+        Comma or whitespace separated ``domain=rps[:burst]`` entries.
+
+    :return:
+        Domain -> bucket configuration
+
+    :raises ValueError:
+        If an entry cannot be parsed.
+    """
+    limits = {}
+    for entry in value.replace(",", " ").split():
+        domain, sep, rate = entry.partition("=")
+        if not sep or not domain or not rate:
+            raise ValueError(f"{RPC_RATE_LIMITS_ENV}: bad entry {entry!r}, expected domain=rps[:burst]")
+        rps_str, _, burst_str = rate.partition(":")
+        try:
+            rps = float(rps_str)
+            burst = float(burst_str) if burst_str else max(rps, 1.0)
+        except ValueError:
+            raise ValueError(f"{RPC_RATE_LIMITS_ENV}: bad numbers in entry {entry!r}") from None
+        limits[domain.strip().lower()] = TokenBucketConfig(requests_per_second=rps, burst=burst)
+    return limits
+
+
+def parse_retry_after(headers: Mapping[str, str] | None, now: float | None = None) -> float | None:
+    """Read HTTP ``Retry-After`` header as seconds.
+
+    Both the delta-seconds and the HTTP-date forms are supported.
+
+    :param headers:
+        Response headers. Lookup is case-insensitive.
+
+    :param now:
+        UNIX timestamp used to convert HTTP-date to a delay.
+
+    :return:
+        Seconds to wait, or ``None`` if the header is missing or garbled.
+    """
+    if not headers:
+        return None
+
+    value = None
+    for key, header_value in headers.items():
+        if key.lower() == "retry-after":
+            value = str(header_value).strip()
+            break
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+
+    now = time.time() if now is None else now
+    return max(retry_at.timestamp() - now, 0.0)
+
+
+class DomainRateLimiter:
+    """Token bucket per provider domain shared across processes via SQLite.
+
+    Each :py:meth:`acquire` runs one short ``BEGIN IMMEDIATE`` transaction,
+    which serialises bucket updates between processes.  Tokens may go negative:
+    a caller reserves its slot and then sleeps outside the transaction, so
+    waiting callers are paced instead of racing for the next free token.
+
+    Domains without a configured limit are not throttled.
+    Subdomains matching the same configured key share one bucket,
+    as they usually share one account quota.
+
+    Each thread keeps its own SQLite connection, opened on first use
+    and closed with :py:meth:`close`.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, TokenBucketConfig],
+        db_path: Path = DEFAULT_DOMAIN_RATE_LIMIT_DATABASE,
+        default_limit: TokenBucketConfig | None = None,
+        time_function: Callable[[], float] = time.time,
+        sleep_function: Callable[[float], None] = time.sleep,
+    ):
+        """
+        :param limits:
+            Domain -> limit. A key matches the domain itself and its subdomains.
+
+        :param db_path:
+            SQLite file shared by all cooperating processes.
+
+        :param default_limit:
+            Limit for domains that do not match any key.
+            If not given, such domains are not throttled.
+
+        :param time_function:
+            Wall-clock source.
+
+            Must be comparable across processes, so use UNIX time, not monotonic clock.
+
+        :param sleep_function:
+            Sleep implementation, overridable for tests.
+        """
+        self.limits = {k.lower(): v for k, v in limits.items()}
+        self.db_path = db_path
+        self.default_limit = default_limit
+        self.time_function = time_function
+        self.sleep_function = sleep_function
+
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ratelimit_token_bucket (
+                domain TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                blocked_until REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+
+    def __repr__(self):
+        return f"<DomainRateLimiter {self.db_path}, {len(self.limits)} domains>"
+
+    def __getstate__(self) -> dict:
+        # SQLite connections and thread locals cannot cross process boundaries
+        state = self.__dict__.copy()
+        del state["_local"]
+        del state["_connections_lock"]
+        state["_connections"] = []
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._connections_lock = threading.Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazily open one connection per thread and process."""
+        local = self._local
+        if getattr(local, "connection", None) is None or local.pid != os.getpid():
+            # isolation_level=None: we manage BEGIN IMMEDIATE ourselves
+            connection = sqlite3.connect(self.db_path, timeout=60, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            local.connection = connection
+            local.pid = os.getpid()
+            with self._connections_lock:
+                self._connections.append(connection)
+        return local.connection
+
+    def close(self):
+        """Close the connections of all threads of this process."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def get_bucket(self, domain: str) -> tuple[str, TokenBucketConfig] | None:
+        """Resolve the bucket of a domain.
+
+        The longest matching configured suffix wins.
+
+        :return:
+            Tuple (bucket key, limit), where the key is the matched configured domain,
+            or the domain itself for :py:attr:`default_limit`. ``None`` if not throttled.
+        """
+        domain = domain.lower()
+        best = None
+        for key, config in self.limits.items():
+            if domain == key or domain.endswith("." + key):
+                if best is None or len(key) > len(best[0]):
+                    best = (key, config)
+        if best:
+            return best
+        if self.default_limit is not None:
+            return domain, self.default_limit
+        return None
+
+    def get_limit(self, domain: str) -> TokenBucketConfig | None:
+        """Resolve the bucket configuration for a domain.
+
+        See :py:meth:`get_bucket`.
+        """
+        bucket = self.get_bucket(domain)
+        return bucket[1] if bucket else None
+
+    def reserve(self, domain: str, cost: float = 1.0) -> float:
+        """Take tokens from the domain bucket.
+
+        The tokens are taken even if the bucket runs into debt,
+        and the caller must wait the returned delay before sending its request.
+
+        :return:
+            Seconds the caller must wait. Zero if burst credits were available.
+        """
+        bucket = self.get_bucket(domain)
+        if bucket is None:
+            return 0.0
+        key, config = bucket
+
+        now = self.time_function()
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT tokens, updated_at, blocked_until FROM ratelimit_token_bucket WHERE domain = ?", (key,)).fetchone()
+            if row is None:
+                tokens, updated_at, blocked_until = config.burst, now, 0.0
+            else:
+                tokens, updated_at, blocked_until = row
+
+            # Refill only from the moment the block has lifted
+            refill_from = max(updated_at, blocked_until)
+            if now > refill_from:
+                tokens = min(config.burst, tokens + (now - refill_from) * config.requests_per_second)
+
+            # Debt is paid back at the refill rate after the block lifts
+            tokens -= cost
+            delay = max(0.0, refill_from - now) + max(0.0, -tokens / config.requests_per_second)
+
+            connection.execute(
+                "INSERT OR REPLACE INTO ratelimit_token_bucket (domain, tokens, updated_at, blocked_until) VALUES (?, ?, ?, ?)",
+                (key, tokens, max(now, updated_at), blocked_until),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        return delay
+
+    def acquire(self, domain: str, cost: float = 1.0, reason: str = "") -> float:
+        """Wait until we are allowed to make a request to a domain.
+
+        :param domain:
+            Provider domain, see :py:func:`eth_defi.utils.get_url_domain`.
+
+        :param cost:
+            How many tokens the request consumes.
+
+        :param reason:
+            Logged when we need to wait.
+
+        :return:
+            Seconds slept.
+        """
+        delay = self.reserve(domain, cost)
+        if delay > 0:
+            if delay > 1.0:
+                logger.info("RPC throttle: waiting %.2fs for %s [%s]", delay, domain, reason)
+            self.sleep_function(delay)
+        return delay
+
+    def report_throttled(self, domain: str, retry_after: float | None = None) -> float:
+        """Tell all processes that the provider throttled us.
+
+        Empties the domain bucket and blocks it until the advertised
+        ``Retry-After`` has passed.
+
+        :param retry_after:
+            Seconds from the ``Retry-After`` header, see :py:func:`parse_retry_after`.
+            If not given, use :py:data:`DEFAULT_THROTTLED_COOLDOWN`.
+
+        :return:
+            The cooldown applied, in seconds.
+        """
+        bucket = self.get_bucket(domain)
+        if bucket is None:
+            return 0.0
+        key, _ = bucket
+
+        cooldown = DEFAULT_THROTTLED_COOLDOWN if retry_after is None else retry_after
+        now = self.time_function()
+        blocked_until = now + cooldown
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT blocked_until FROM ratelimit_token_bucket WHERE domain = ?", (key,)).fetchone()
+            if row is not None:
+                blocked_until = max(blocked_until, row[0])
+            connection.execute(
+                "INSERT OR REPLACE INTO ratelimit_token_bucket (domain, tokens, updated_at, blocked_until) VALUES (?, 0, ?, ?)",
+                (key, now, blocked_until),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        logger.warning("RPC provider %s throttled us, blocking all workers for %.1fs", domain, blocked_until - now)
+        return blocked_until - now
+
+
+def create_domain_rate_limiter_from_env(env: Mapping[str, str] | None = None) -> DomainRateLimiter | None:
+    """Create a shared limiter from ``RPC_RATE_LIMITS``.
+
+    :param env:
+        Environment to read. Defaults to :py:data:`os.environ`.
+
+    :return:
+        Limiter, or ``None`` if ``RPC_RATE_LIMITS`` is not set.
+    """
+    env = os.environ if env is None else env
+    config = env.get(RPC_RATE_LIMITS_ENV, "").strip()
+    if not config:
+        return None
+
+    db_path_str = env.get(RPC_RATE_LIMIT_DATABASE_ENV, "").strip()
+    db_path = Path(db_path_str).expanduser() if db_path_str else DEFAULT_DOMAIN_RATE_LIMIT_DATABASE
+    return DomainRateLimiter(parse_rate_limit_config(config), db_path=db_path)
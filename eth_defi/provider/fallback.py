@@ -17,6 +17,7 @@ from web3.types import RPCEndpoint, RPCResponse
 
 from eth_defi.event_reader.fast_json_rpc import get_last_headers
 from eth_defi.middleware import DEFAULT_RETRYABLE_EXCEPTIONS, DEFAULT_RETRYABLE_HTTP_STATUS_CODES, DEFAULT_RETRYABLE_RPC_ERROR_CODES, ProbablyNodeHasNoBlock, SomeCrappyRPCProviderException, is_retryable_http_exception
+from eth_defi.provider.domain_rate_limit import DomainRateLimiter, parse_retry_after
 from eth_defi.provider.named import BaseNamedProvider, NamedProvider, get_provider_name
 from eth_defi.provider.rpc_failure import classify_rpc_failure
 from eth_defi.provider.rpcdb import RPCRequestStats, normalise_rpc_error
@@ -119,6 +120,7 @@ class FallbackProvider(BaseNamedProvider):
         state_missing_switch_over_delay: float = 12.0,
         switchover_noisiness=logging.WARNING,
         rpc_request_stats: RPCRequestStats | None = None,
+        rate_limiter: DomainRateLimiter | None = None,
     ):
         """
         :param providers:
@@ -155,6 +157,14 @@ class FallbackProvider(BaseNamedProvider):
 
             See code comments for details.
 
+        :param rate_limiter:
+            Cross-process token buckets keyed by provider domain.
+
+            If given, every physical request waits for its slot, and HTTP 429
+            ``Retry-After`` is shared with all other workers instead of
+            sleeping the exponential backoff.
+            See :py:mod:`eth_defi.provider.domain_rate_limit`.
+
         """
 
         super().__init__()
@@ -164,6 +174,9 @@ class FallbackProvider(BaseNamedProvider):
         #: Optional physical request accounting accumulator.
         self.rpc_request_stats = rpc_request_stats
 
+        #: Optional cross-process per-domain throttling
+        self.rate_limiter = rate_limiter
+
         #: Provider domains cached before any request attempts.
         #:
         #: Custom Web3 providers are not required to expose ``endpoint_uri``.
@@ -251,6 +264,25 @@ class FallbackProvider(BaseNamedProvider):
             error_code, error_message = normalise_rpc_error(error)
             self.rpc_request_stats.record_error(self._get_rpc_provider_domain(provider), error_code, error_message)
 
+    def _report_throttled(self, provider: NamedProvider, error: BaseException) -> bool:
+        """Pass HTTP 429 to the shared rate limiter.
+
+        :return:
+            True if the shared limiter now handles waiting for this provider.
+        """
+        if self.rate_limiter is None:
+            return False
+
+        if not (isinstance(error, HTTPError) and error.response is not None and error.response.status_code == 429):
+            return False
+
+        domain = self._get_rpc_provider_domain(provider)
+        if self.rate_limiter.get_limit(domain) is None:
+            return False
+
+        self.rate_limiter.report_throttled(domain, parse_retry_after(error.response.headers))
+        return True
+
     def __repr__(self):
         names = [get_provider_name(p) for p in self.providers]
         return f"<Fallback provider {', '.join(names)}>"
@@ -488,6 +520,16 @@ class FallbackProvider(BaseNamedProvider):
         except IndexError as e:
             raise IndexProvider(f"Currently active provider index {self.currently_active_provider} is out of range for configured providers {len(self.providers)}") from e
 
+    def get_active_provider_domain(self) -> str:
+        """Get the domain of the currently active provider.
+
+        Used as the key of the shared rate limit, see :py:mod:`eth_defi.provider.domain_rate_limit`.
+
+        :return:
+            Hostname with an optional non-default port.
+        """
+        return self._get_rpc_provider_domain(self.get_active_provider())
+
     def get_provider_context_for_log(self, provider: NamedProvider) -> dict[str, Any]:
         """Get provider diagnostics suitable for warning logs.
 
@@ -564,6 +606,8 @@ class FallbackProvider(BaseNamedProvider):
         current_sleep = self.sleep
         for i in range(self.retries + 1):
             provider = self.get_active_provider()
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self._get_rpc_provider_domain(provider), reason=str(method))
             self._record_rpc_call(provider, str(method))
             error_recorded = False
             try:
@@ -630,6 +674,9 @@ class FallbackProvider(BaseNamedProvider):
                     method=method,
                     params=params,
                 ):
+                    # Share throttling with other workers; the next acquire() waits out Retry-After
+                    throttled = self._report_throttled(provider, e)
+
                     if self.has_multiple_providers():
                         self.switch_provider()
 
@@ -651,8 +698,9 @@ class FallbackProvider(BaseNamedProvider):
                                 i + 1,
                                 self.retries,
                             )
-                        time.sleep(current_sleep)
-                        current_sleep *= self.backoff
+                        if not throttled:
+                            time.sleep(current_sleep)
+                            current_sleep *= self.backoff
                         self.retry_count += 1
                         self.api_retry_counts[self.currently_active_provider][method] += 1
                         continue
@@ -1,9 +1,45 @@
-"""How long log queries are split into smaller batches per RPC provider."""
+"""How long log queries are split into smaller batches per RPC provider.
+
+- :py:func:`get_logs_max_block_range` gives a static starting point per provider
+
+- :py:class:`LogRangePlanner` learns each provider's block range and result count
+  limits from its errors, and sizes each ``eth_getLogs`` window from the log density
+  seen earlier for the same (chain, filter): bisect on "too many results",
+  grow over sparse ranges
+
+- :py:func:`read_logs_planned` drives a scan with a planner, retrying
+  rejected windows with a smaller range
+
+Example:
+
+.. code-block:: python
+
+    from eth_defi.provider.log_block_range import read_logs_planned
+
+    for start, end, logs in read_logs_planned(
+        web3,
+        start_block,
+        end_block,
+        fetch=lambda s, e: web3.eth.get_logs({"address": emitter, "fromBlock": s, "toBlock": e}),
+        filter_key=("event-emitter", emitter),
+    ):
+        ...
+"""
+
+import enum
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterator
+from dataclasses import dataclass
 
 from web3 import Web3
 
 from eth_defi.provider.named import get_provider_name
 
+logger = logging.getLogger(__name__)
+
 
 def get_logs_max_block_range(web3: Web3) -> int:
     """Get how many blocks is the max batch size in eth_getLogs for this RPC provider.
@@ -19,3 +55,330 @@ def get_logs_max_block_range(web3: Web3) -> int:
 
     # Default to 10k blocks
     return 10_000
+
+
+class LogRangeErrorKind(enum.Enum):
+    """Why a provider rejected an ``eth_getLogs`` window."""
+
+    #: Too many logs in the window, or the query timed out on the node
+    too_many_results = "too_many_results"
+
+    #: The block range is wider than the provider allows
+    range_too_large = "range_too_large"
+
+
+#: Message fragments of "too many results" errors across providers.
+#:
+#: Keep these specific: a match makes the planner bisect and lowers
+#: the density estimate shared by all scans of the filter.
+_TOO_MANY_RESULTS_PATTERNS = (
+    # geth, Infura, Ankr: "query returned more than 10000 results"
+    "query returned more than",
+    "too many results",
+    "too many logs",
+    # Alchemy: "Log response size exceeded"
+    "response size exceeded",
+    # Alchemy, GMX EventEmitter scans: "Query exceeds limit of 10000 results"
+    "exceeds limit",
+    # QuickNode: "eth_getLogs query exceeds max results"
+    "exceeds max results",
+    "query timeout",
+)
+
+#: Message fragments of "block range too wide" errors across providers
+_RANGE_TOO_LARGE_PATTERNS = (
+    "block range too",
+    "block range limit",
+    "maximum block range",
+    "range too",
+    "range is too",
+    "range exceeds",
+    "ranges over",
+    "limited to a",
+    "maximum range",
+    "too many blocks",
+)
+
+#: Message fragments of errors about the window end, not its size.
+#:
+#: Alchemy: "block range extends beyond current head block".
+#: A smaller window starting at the same block does not help, so these are not retried.
+_BEYOND_HEAD_PATTERNS = (
+    "beyond current head",
+    "beyond head",
+    "head block",
+    "future block",
+)
+
+#: Alchemy and others suggest a working window as ``[0x..., 0x...]``
+_SUGGESTED_RANGE_RE = re.compile(r"\[(0x[0-9a-fA-F]+),\s*(0x[0-9a-fA-F]+)\]")
+
+#: Range limits spelled in the message: ``10,000 range``, ``2K block range``, ``block range: 5000``,
+#: ``over 2000 blocks``, ``maximum is set to 2048``
+_RANGE_LIMIT_RES = (
+    re.compile(r"(\d[\d,]*)\s*(k)?\s*(?:-?\s*blocks?)?\s*range"),
+    re.compile(r"range(?:\s+(?:is|of|limit))?\s*[:=]?\s*(\d[\d,]*)\s*(k)?"),
+    re.compile(r"over\s+(\d[\d,]*)\s*(k)?\s*blocks"),
+    re.compile(r"maximum(?:\s+is)?(?:\s+set\s+to)?\s*[:=]?\s*(\d[\d,]*)\s*(k)?"),
+)
+
+
+def _iterate_exception_messages(error: BaseException) -> Iterator[str]:
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        for arg in error.args:
+            if isinstance(arg, dict):
+                yield str(arg.get("message", arg))
+            else:
+                yield str(arg)
+        error = error.__cause__ or error.__context__
+
+
+def _parse_range_limit(message: str) -> int | None:
+    for pattern in _RANGE_LIMIT_RES:
+        match = pattern.search(message)
+        if match:
+            value = int(match.group(1).replace(",", ""))
+            return value * 1000 if match.group(2) else value
+    return None
+
+
+def classify_get_logs_error(error: BaseException, span: int) -> tuple[LogRangeErrorKind | None, int | None]:
+    """Classify an ``eth_getLogs`` failure.
+
+    Follows the exception chain, so wrapped errors like
+    :py:class:`~eth_defi.event_reader.reader.ReadingLogsFailed` are understood.
+
+    :param span:
+        Number of blocks in the rejected window.
+
+    :return:
+        Tuple (error kind or ``None`` if not a range problem, suggested maximum window in blocks if the provider told)
+    """
+    for message in _iterate_exception_messages(error):
+        lowered = message.lower()
+
+        if any(p in lowered for p in _BEYOND_HEAD_PATTERNS):
+            return None, None
+
+        suggested = _SUGGESTED_RANGE_RE.search(message)
+        if suggested:
+            blocks = int(suggested.group(2), 16) - int(suggested.group(1), 16) + 1
+            return LogRangeErrorKind.too_many_results, max(1, min(blocks, span - 1))
+
+        if any(p in lowered for p in _RANGE_TOO_LARGE_PATTERNS):
+            limit = _parse_range_limit(lowered)
+            return LogRangeErrorKind.range_too_large, (limit if limit and limit < span else None)
+
+        if any(p in lowered for p in _TOO_MANY_RESULTS_PATTERNS):
+            return LogRangeErrorKind.too_many_results, None
+
+    return None, None
+
+
+@dataclass(slots=True)
+class ProviderLogLimits:
+    """What a provider has told us about its ``eth_getLogs`` limits."""
+
+    #: Widest window known to be rejected minus one, or the limit it announced
+    max_block_range: int | None = None
+
+    #: Widest window known to succeed
+    largest_success: int = 0
+
+    #: :py:func:`time.monotonic` when :py:attr:`max_block_range` was last lowered
+    learned_at: float = 0.0
+
+
+class LogRangePlanner:
+    """Size ``eth_getLogs`` windows per provider and per (chain, filter).
+
+    Thread safe: one planner can be shared by all reader threads, so what one
+    thread learns about a provider applies to all.
+
+    :param initial_block_range:
+        First window for a provider without known limits.
+        Defaults to :py:func:`get_logs_max_block_range`.
+
+    :param target_results:
+        Aim for this many logs per window. Well below the usual
+        10,000 log caps, so an estimate off by a few times still fits.
+
+    :param max_growth:
+        Grow a window at most this many times per step over sparse ranges.
+
+    :param max_block_range:
+        Never plan wider windows than this.
+
+    :param limit_ttl:
+        Forget a provider's learnt limits after this many seconds,
+        so a temporary error or a raised plan limit does not shrink windows forever.
+    """
+
+    def __init__(
+        self,
+        initial_block_range: int | None = None,
+        target_results: int = 2_000,
+        max_growth: float = 4.0,
+        max_block_range: int = 1_000_000,
+        limit_ttl: float = 3600.0,
+    ):
+        self.initial_block_range = initial_block_range
+        self.target_results = target_results
+        self.max_growth = max_growth
+        self.max_block_range = max_block_range
+        self.limit_ttl = limit_ttl
+
+        #: Provider name -> learned limits
+        self.limits: dict[str, ProviderLogLimits] = {}
+
+        #: (chain id, filter key) -> logs per block, exponential moving average
+        self.density: dict[tuple[int, Hashable], float] = {}
+
+        #: (provider name, chain id, filter key) -> last planned window
+        self.last_window: dict[tuple[str, int, Hashable], int] = {}
+
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<LogRangePlanner {len(self.limits)} providers, {len(self.density)} filters>"
+
+    def _get_limits(self, provider: str) -> ProviderLogLimits:
+        # Call with the lock held
+        limits = self.limits.get(provider)
+        if limits is None or (limits.max_block_range is not None and time.monotonic() - limits.learned_at > self.limit_ttl):
+            limits = self.limits[provider] = ProviderLogLimits()
+        return limits
+
+    def plan(self, provider: str, chain_id: int, filter_key: Hashable, remaining: int, default_block_range: int = 10_000) -> int:
+        """How many blocks to ask for next.
+
+        :param remaining:
+            Blocks left in the scan.
+
+        :param default_block_range:
+            Starting window when nothing is known.
+        """
+        with self.lock:
+            limits = self._get_limits(provider)
+            previous = self.last_window.get((provider, chain_id, filter_key))
+            density = self.density.get((chain_id, filter_key))
+
+            if density is not None:
+                window = self.target_results / max(density, 1e-9)
+                if previous is not None:
+                    window = min(window, previous * self.max_growth)
+            elif previous is not None:
+                window = previous
+            else:
+                window = self.initial_block_range or default_block_range
+
+            window = min(int(window), self.max_block_range, remaining)
+            if limits.max_block_range is not None:
+                window = min(window, limits.max_block_range)
+            return max(1, window)
+
+    def record_success(self, provider: str, chain_id: int, filter_key: Hashable, blocks: int, results: int):
+        """Update density and provider limits after a successful window."""
+        with self.lock:
+            limits = self._get_limits(provider)
+            limits.largest_success = max(limits.largest_success, blocks)
+
+            key = (chain_id, filter_key)
+            observed = results / blocks
+            previous = self.density.get(key)
+            self.density[key] = observed if previous is None else 0.7 * previous + 0.3 * observed
+            self.last_window[(provider, chain_id, filter_key)] = blocks
+
+    def record_failure(self, provider: str, chain_id: int, filter_key: Hashable, blocks: int, error: BaseException) -> bool:
+        """Learn from a rejected window.
+
+        :return:
+            ``True`` if the window should be retried smaller, ``False`` if the error is not about ranges
+        """
+        kind, suggested = classify_get_logs_error(error, blocks)
+        if kind is None or blocks <= 1:
+            return False
+
+        with self.lock:
+            window_key = (provider, chain_id, filter_key)
+            if kind == LogRangeErrorKind.range_too_large:
+                limits = self._get_limits(provider)
+                if limits.largest_success >= blocks:
+                    # A window this wide worked before, the provider has lowered its limit since
+                    limits.largest_success = 0
+                new_max = suggested or max(limits.largest_success, blocks // 2, 1)
+                # Always below the rejected window
+                new_max = min(new_max, blocks - 1)
+                limits.max_block_range = new_max if limits.max_block_range is None else min(limits.max_block_range, new_max)
+                limits.learned_at = time.monotonic()
+                self.last_window[window_key] = limits.max_block_range
+            else:
+                # Bisect, and make the density estimate say the window was at least this full
+                window = suggested or max(1, blocks // 2)
+                self.last_window[window_key] = window
+                density_key = (chain_id, filter_key)
+                self.density[density_key] = max(self.density.get(density_key, 0.0), self.target_results / window)
+
+            logger.info("eth_getLogs window of %d blocks rejected by %s (%s), next window %d blocks", blocks, provider, kind.value, self.last_window[window_key])
+        return True
+
+
+#: Process-wide planner, so limits learnt by one scan help the next
+DEFAULT_LOG_RANGE_PLANNER = LogRangePlanner()
+
+
+def read_logs_planned(
+    web3: Web3,
+    start_block: int,
+    end_block: int,
+    fetch: Callable[[int, int], list],
+    filter_key: Hashable,
+    planner: LogRangePlanner | None = None,
+    min_block_range: int = 1,
+    max_retries: int = 50,
+) -> Iterator[tuple[int, int, list]]:
+    """Scan a block range in planner-sized windows.
+
+    :param fetch:
+        ``fetch(start_block, end_block)`` returning logs, inclusive range.
+
+    :param filter_key:
+        Identifies the address and topic filter for the density history.
+
+    :param planner:
+        Defaults to :py:data:`DEFAULT_LOG_RANGE_PLANNER`.
+
+    :param min_block_range:
+        Never plan windows smaller than this, and re-raise errors
+        of windows this small instead of splitting them further.
+
+    :param max_retries:
+        Re-raise the error after this many rejected windows in a row.
+
+    :return:
+        Iterator of (window start, window end, logs), in block order
+    """
+    planner = planner or DEFAULT_LOG_RANGE_PLANNER
+    provider = get_provider_name(web3.provider)
+    chain_id = web3.eth.chain_id
+    default_block_range = get_logs_max_block_range(web3)
+
+    cursor = start_block
+    failures = 0
+    while cursor <= end_block:
+        remaining = end_block - cursor + 1
+        window = max(planner.plan(provider, chain_id, filter_key, remaining, default_block_range), min(min_block_range, remaining))
+        last = cursor + window - 1
+        try:
+            logs = fetch(cursor, last)
+        except Exception as e:
+            failures += 1
+            if failures <= max_retries and window > min_block_range and planner.record_failure(provider, chain_id, filter_key, window, e):
+                continue
+            raise
+        failures = 0
+        planner.record_success(provider, chain_id, filter_key, window, len(logs))
+        yield cursor, last, logs
+        cursor = last + 1
@@ -18,6 +18,7 @@ from eth_defi.event_reader.fast_json_rpc import patch_provider, patch_web3
 from eth_defi.middleware import static_call_cache_middleware
 from eth_defi.provider.anvil import _get_anvil_launch_metadata, is_anvil
 from eth_defi.provider.broken_provider import set_block_tip_latency
+from eth_defi.provider.domain_rate_limit import create_domain_rate_limiter_from_env
 from eth_defi.provider.fallback import ChainIdMismatch, FallbackProvider
 from eth_defi.provider.mev_blocker import MEVBlockerProvider
 from eth_defi.provider.named import NamedProvider, get_provider_name
@@ -182,6 +183,10 @@ def create_multi_provider_web3(
 
     - HTTP providers have middleware cleared and chain middleware installed
 
+    - When ``RPC_RATE_LIMITS`` environment variable is set, requests are paced
+      per provider domain with token buckets shared by all processes,
+      see :py:mod:`eth_defi.provider.domain_rate_limit`
+
     The configuration line is a whitespace separated list of URLs (spaces, newlines, etc.)
     using mini configuration language.
 
@@ -363,6 +368,7 @@ def create_multi_provider_web3(
         switchover_noisiness=switchover_noisiness,
         retries=retries,
         rpc_request_stats=rpc_request_stats,
+        rate_limiter=create_domain_rate_limiter_from_env(),
     )
 
     # Verify all call providers report the same chain ID before proceeding.
@@ -8,6 +8,7 @@ from plotly.colors import qualitative
 from plotly.graph_objects import Figure
 
 from eth_defi.chain import get_chain_name
+from eth_defi.research.wide_returns import calculate_rolling_window_returns, lookup_wide_values, pivot_vault_values
 
 CHART_BENCHMARK_COUNT: int = 10
 
@@ -192,22 +193,15 @@ def calculate_rolling_returns(
         # All vaults
         df = returns_df
 
-    def _calc_returns(df):
-        # Calculate rolling returns
-
-        df["rolling_1m_returns"] = df["share_price"].transform(
-            _calculate_rolling_returns_from_prices,
-            rolling_period=rolling_period,
-        )
-
-        # df["rolling_1m_returns_annualized"] = ((1 + df["rolling_1m_returns"] / 100) ** 12 - 1) * 100
-        return df
-
-    df = df.groupby("id").apply(_calc_returns, include_groups=False)
-    df = df.reset_index()
-
     if len(df) == 0:
-        return df
+        return df.reset_index()
+
+    # Calculate rolling returns for all vaults at once,
+    # rows ordered by vault id like with groupby()
+    wide_rolling = calculate_rolling_window_returns(pivot_vault_values(df, "share_price"), rolling_period)
+    df = df.assign(rolling_1m_returns=lookup_wide_values(wide_rolling, df.index, df["id"]) * 100)
+    df = df.sort_values("id", kind="stable").reset_index()
+    df.insert(0, "id", df.pop("id"))
 
     # When vault launches it has usually near-infinite APY
     # Cap it here so charts are readable
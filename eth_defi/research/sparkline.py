@@ -2,70 +2,58 @@
 
 - Sparkline is a mini price chart, popularised by CoinMarketCap
 - Charts contain share price and TVL
+- For bulk exports, see the Matplotlib-free renderer in :py:mod:`eth_defi.research.sparkline_vector`
 """
 
-import gzip
 import warnings
 from io import BytesIO
+from typing import TYPE_CHECKING
 
-import matplotlib
 import numpy as np
 import pandas as pd
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-
-from eth_defi.cloudflare_r2 import calculate_bytes_digest, create_r2_client, upload_bytes_to_r2
+from eth_defi.cloudflare_r2_uploader import get_shared_r2_uploader
+from eth_defi.research.sparkline_vector import filter_finite_share_prices as _filter_finite_share_prices
+from eth_defi.research.vault_price_store import VaultPriceStore
 from eth_defi.research.wrangle_vault_prices import forward_fill_vault
 from eth_defi.vault.base import VaultSpec
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
-def _filter_finite_share_prices(vault_prices_df: pd.DataFrame) -> pd.DataFrame:
-    """Return chart data with only finite, float share prices.
-
-    PyArrow-backed parquet data can expose ``share_price`` as a nullable or
-    object-backed pandas series. Matplotlib compares y-axis bounds internally,
-    so passing ``pd.NA`` through causes ``TypeError: boolean value of NA is
-    ambiguous``.
 
-    :param vault_prices_df:
-        Single-vault price data with a ``share_price`` column.
+def _get_pyplot():
+    """Load Matplotlib on the first render, not when the exports importing this module load."""
+    import matplotlib  # noqa: PLC0415
 
-    :return:
-        Copy of the input rows whose share prices are finite Python floats.
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt  # noqa: PLC0415
 
-    :raise ValueError:
-        If the vault has no finite share-price observations to render.
-    """
-    numeric_prices = pd.to_numeric(vault_prices_df["share_price"], errors="coerce")
-    numeric_values = numeric_prices.to_numpy(dtype=float, na_value=np.nan)
-    finite_mask = np.isfinite(numeric_values)
-    if not finite_mask.any():
-        message = "Cannot render sparkline without finite share prices"
-        raise ValueError(message)
-
-    filtered = vault_prices_df.iloc[finite_mask].copy()
-    filtered["share_price"] = numeric_values[finite_mask]
-    return filtered
+    return plt
 
 
 def extract_vault_price_data(
     spec: VaultSpec,
-    prices_df: pd.DataFrame,
+    prices_df: pd.DataFrame | VaultPriceStore,
 ) -> pd.DataFrame:
     """Extract price data for a specific vault from a DataFrame.
 
     :param spec:
         chain-vault address identifier
     :param prices_df:
-        DataFrame containing price data
+        DataFrame containing price data,
+        or a :py:class:`~eth_defi.research.vault_price_store.VaultPriceStore` to slice without scanning all rows
     :return:
         Filtered DataFrame for the specified vault
     """
     assert isinstance(spec, VaultSpec), f"spec must be VaultSpec: {type(spec)}"
 
     # Filter data for the specific vault
-    vault_data = prices_df.loc[(prices_df["chain"] == spec.chain_id) & (prices_df["address"] == spec.vault_address)]
+    if isinstance(prices_df, VaultPriceStore):
+        vault_id = spec.as_string_id()
+        vault_data = prices_df.get_vault_prices(vault_id) if vault_id in prices_df else pd.DataFrame()
+    else:
+        vault_data = prices_df.loc[(prices_df["chain"] == spec.chain_id) & (prices_df["address"] == spec.vault_address)]
 
     assert len(vault_data) > 0, f"No data for vault: {spec}"
 
@@ -77,7 +65,7 @@ def render_sparkline_simple(
     width: int = 256,
     height: int = 64,
     ffill=True,
-) -> plt.Figure:
+) -> "Figure":
     """Render a sparkline chart for a single vault.
 
     :param spec:
@@ -98,6 +86,7 @@ def render_sparkline_simple(
 
     # Convert pixels to inches (matplotlib uses inches)
     dpi = 100
+    plt = _get_pyplot()
     fig = plt.figure(figsize=(width / dpi, height / dpi), dpi=dpi)
     fig.patch.set_facecolor("black")
 
@@ -139,7 +128,7 @@ def render_sparkline_gradient(
     bg_color="#282827",
     line_width: int = 2,
     margin_ratio=50,
-) -> plt.Figure:
+) -> "Figure":
     """Render a sparkline chart with green-to-black gradient fill."""
 
     vault_data = vault_prices_df
@@ -150,6 +139,7 @@ def render_sparkline_gradient(
     vault_data = _filter_finite_share_prices(vault_data)
 
     dpi = 100
+    plt = _get_pyplot()
     fig = plt.figure(figsize=(width / dpi, height / dpi), dpi=dpi)
     fig.patch.set_facecolor(bg_color)
 
@@ -213,14 +203,14 @@ def render_sparkline_gradient(
 
 
 def export_sparkline_as_png(
-    fig: plt.Figure,
+    fig: "Figure",
 ) -> bytes:
     """Render a sparkline chart and return as PNG bytes."""
 
     # Create a BytesIO buffer to save the PNG
     buffer = BytesIO()
     fig.savefig(buffer, format="png", dpi=100, transparent=False)
-    plt.close(fig)
+    _get_pyplot().close(fig)
 
     # Get the PNG bytes
     buffer.seek(0)
@@ -230,14 +220,14 @@ def export_sparkline_as_png(
 
 
 def export_sparkline_as_svg(
-    fig: plt.Figure,
+    fig: "Figure",
 ) -> bytes:
     """Render a sparkline chart and return as SVG bytes."""
 
     # Create a BytesIO buffer to save the SVG
     buffer = BytesIO()
     fig.savefig(buffer, format="svg", transparent=True)
-    plt.close(fig)
+    _get_pyplot().close(fig)
 
     # Get the SVG bytes
     buffer.seek(0)
@@ -260,6 +250,8 @@ def upload_to_r2_compressed(  # noqa: PLR0917, FBT001, FBT002
 
     - Exported to the frontend listings
     - Compress SVGs with gzip
+    - Uploads through a process-wide :py:class:`~eth_defi.cloudflare_r2_uploader.R2Uploader`,
+      so calls share one client and the upload manifest, see :py:mod:`eth_defi.cloudflare_r2_uploader`
 
     :param payload: The bytes data to upload.
     :param bucket_name: The name of the R2 bucket.
@@ -271,19 +263,17 @@ def upload_to_r2_compressed(  # noqa: PLR0917, FBT001, FBT002
     :param skip_if_current: Skip upload if the remote object already matches the local source payload.
     :return: ``True`` if uploaded, ``False`` if skipped as unchanged.
     """
-    s3_client = create_r2_client(
+    uploader = get_shared_r2_uploader(
         endpoint_url=endpoint_url,
         access_key_id=access_key_id,
         secret_access_key=secret_access_key,
+        bucket_name=bucket_name,
     )
 
-    return upload_bytes_to_r2(
-        s3_client=s3_client,
-        payload=gzip.compress(payload, mtime=0),
-        bucket_name=bucket_name,
-        object_name=object_name,
+    return uploader.upload_bytes(
+        object_name,
+        payload,
         content_type=content_type,
-        content_encoding="gzip",
+        encoding="gzip",
         skip_if_current=skip_if_current,
-        source_digest=calculate_bytes_digest(payload),
     )
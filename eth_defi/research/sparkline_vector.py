@@ -0,0 +1,276 @@
+"""Matplotlib-free sparkline renderer.
+
+:py:func:`eth_defi.research.sparkline.render_sparkline_gradient` creates a full
+Matplotlib figure per image, which costs tens of milliseconds and a lot of memory
+per chart when rendering thousands of vaults. A sparkline is just a line and a
+gradient-filled area, so here we
+
+- Downsample the series with NumPy to at most a few points per pixel column,
+  see :py:func:`downsample_series`
+- Write the SVG path strings directly, see :py:func:`render_sparkline_svg`
+- Rasterise the PNG with Pillow, without pyplot, see :py:func:`render_sparkline_png`
+
+The look follows :py:func:`~eth_defi.research.sparkline.render_sparkline_gradient`:
+a green line with a green-to-background gradient under it, and a top and bottom margin.
+
+Each image carries a digest of its input series and render parameters,
+see :py:func:`calculate_sparkline_digest`. The export script stores it in
+R2 object metadata, so unchanged sparklines are neither re-rendered nor re-uploaded.
+"""
+
+import hashlib
+import io
+import json
+
+import numpy as np
+import pandas as pd
+
+from eth_defi.research.wrangle_vault_prices import forward_fill_vault
+
+#: Bump when the output of the renderer changes, to force re-rendering all sparklines
+SPARKLINE_RENDERER_VERSION = 1
+
+
+def filter_finite_share_prices(vault_prices_df: pd.DataFrame) -> pd.DataFrame:
+    """Return chart data with only finite, float share prices.
+
+    PyArrow-backed parquet data can expose ``share_price`` as a nullable or
+    object-backed pandas series. Matplotlib compares y-axis bounds internally,
+    so passing ``pd.NA`` through causes ``TypeError: boolean value of NA is
+    ambiguous``.
+
+    :param vault_prices_df:
+        Single-vault price data with a ``share_price`` column.
+
+    :return:
+        Copy of the input rows whose share prices are finite Python floats.
+
+    :raise ValueError:
+        If the vault has no finite share-price observations to render.
+    """
+    numeric_prices = pd.to_numeric(vault_prices_df["share_price"], errors="coerce")
+    numeric_values = numeric_prices.to_numpy(dtype=float, na_value=np.nan)
+    finite_mask = np.isfinite(numeric_values)
+    if not finite_mask.any():
+        message = "Cannot render sparkline without finite share prices"
+        raise ValueError(message)
+
+    filtered = vault_prices_df.iloc[finite_mask].copy()
+    filtered["share_price"] = numeric_values[finite_mask]
+    return filtered
+
+
+def prepare_sparkline_series(
+    vault_prices_df: pd.DataFrame,
+    ffill=True,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Extract the plotted share price series.
+
+    :return:
+        Tuple (x as int64 nanoseconds, y as float64 share price)
+    """
+    if ffill:
+        vault_prices_df = forward_fill_vault(vault_prices_df)
+
+    vault_prices_df = filter_finite_share_prices(vault_prices_df)
+    x = vault_prices_df.index.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    y = vault_prices_df["share_price"].to_numpy(dtype=np.float64)
+    return x, y
+
+
+def calculate_sparkline_digest(x: np.ndarray, y: np.ndarray, **render_kwargs) -> str:
+    """Digest of what goes into a sparkline image.
+
+    :param x:
+        Timestamps from :py:func:`prepare_sparkline_series`.
+
+    :param y:
+        Share prices from :py:func:`prepare_sparkline_series`.
+
+    :param render_kwargs:
+        Size, colours and other parameters affecting the output.
+
+    :return:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"version": SPARKLINE_RENDERER_VERSION, **render_kwargs}, sort_keys=True).encode())
+    digest.update(np.ascontiguousarray(x, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def downsample_series(x: np.ndarray, y: np.ndarray, buckets: int) -> tuple[np.ndarray, np.ndarray]:
+    """Reduce a series to the first, minimum, maximum and last point of each bucket.
+
+    Keeps the visual envelope of the line while drawing at most four points per pixel column.
+    Series short enough are returned as is.
+
+    :param buckets:
+        Number of equal width x buckets, usually the image width in pixels.
+    """
+    if len(x) <= buckets * 4:
+        return x, y
+
+    bucket = np.minimum(((x - x[0]) * buckets // max(x[-1] - x[0], 1)), buckets - 1)
+    boundaries = np.flatnonzero(np.diff(bucket)) + 1
+    starts = np.concatenate([[0], boundaries])
+    ends = np.concatenate([boundaries, [len(x)]]) - 1
+    argmins = np.array([s + np.argmin(y[s : e + 1]) for s, e in zip(starts, ends)])
+    argmaxs = np.array([s + np.argmax(y[s : e + 1]) for s, e in zip(starts, ends)])
+
+    indices = np.unique(np.concatenate([starts, ends, argmins, argmaxs]))
+    return x[indices], y[indices]
+
+
+def _project(
+    x: np.ndarray,
+    y: np.ndarray,
+    width: int,
+    height: int,
+    margin_ratio: float,
+) -> tuple[np.ndarray, np.ndarray, float]:
+    """Map data to pixel coordinates, y growing down.
+
+    :return:
+        Tuple (px, py, py of the minimum value, where the gradient area ends)
+    """
+    x, y = downsample_series(x, y, width)
+
+    x_span = x[-1] - x[0]
+    px = (x - x[0]) / x_span * width if x_span > 0 else np.full(len(x), width / 2)
+
+    y_min, y_max = y.min(), y.max()
+    y_range = y_max - y_min
+    if y_range == 0:
+        # Flat line in the middle
+        return px, np.full(len(y), height / 2), height / 2
+
+    y_margin = y_range * margin_ratio / height
+    low, high = y_min - y_margin, y_max + y_margin
+    py = (high - y) / (high - low) * height
+    baseline = (high - y_min) / (high - low) * height
+    return px, py, baseline
+
+
+def _format_path(px: np.ndarray, py: np.ndarray) -> str:
+    return "M" + "L".join(f"{a:.2f},{b:.2f}" for a, b in zip(px, py))
+
+
+def render_sparkline_svg(
+    x: np.ndarray,
+    y: np.ndarray,
+    width: int = 100,
+    height: int = 25,
+    line_color="#00ff88",
+    gradient_color="#22B452",
+    bg_color="#282827",
+    line_width: float = 1,
+    margin_ratio: float = 4,
+    digest: str | None = None,
+) -> bytes:
+    """Render a sparkline as a standalone SVG document.
+
+    The background is transparent, like :py:func:`~eth_defi.research.sparkline.export_sparkline_as_svg`.
+
+    :param x:
+        Timestamps from :py:func:`prepare_sparkline_series`.
+
+    :param y:
+        Share prices from :py:func:`prepare_sparkline_series`.
+
+    :param margin_ratio:
+        Margin above and below the line, as ``margin_ratio / height``
+        of the value range, like in
+        :py:func:`~eth_defi.research.sparkline.render_sparkline_gradient`.
+
+    :param digest:
+        Input digest to embed as ``data-source-sha256`` attribute.
+
+    :return:
+        UTF-8 SVG bytes
+    """
+    px, py, baseline = _project(x, y, width, height, margin_ratio)
+    line = _format_path(px, py)
+    area = f"{line}L{px[-1]:.2f},{baseline:.2f}L{px[0]:.2f},{baseline:.2f}Z"
+    top = py.min()
+    # Unique gradient id, as the SVGs may be inlined on the same page
+    gradient_id = f"g{(digest or calculate_sparkline_digest(x, y))[:12]}"
+    digest_attr = f' data-source-sha256="{digest}"' if digest else ""
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}"{digest_attr}>',
+        f'<defs><linearGradient id="{gradient_id}" gradientUnits="userSpaceOnUse" x1="0" y1="{top:.2f}" x2="0" y2="{baseline:.2f}">',
+        f'<stop offset="0" stop-color="{gradient_color}"/><stop offset="1" stop-color="{bg_color}"/>',
+        "</linearGradient></defs>",
+        f'<path d="{area}" fill="url(#{gradient_id})" fill-opacity="0.4"/>',
+        f'<path d="{line}" fill="none" stroke="{line_color}" stroke-width="{line_width}" stroke-linejoin="round" stroke-linecap="round"/>',
+        "</svg>",
+    ]
+    return "".join(parts).encode("utf-8")
+
+
+def _hex_to_rgb(color: str) -> tuple[int, int, int]:
+    color = color.lstrip("#")
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+
+def render_sparkline_png(
+    x: np.ndarray,
+    y: np.ndarray,
+    width: int = 300,
+    height: int = 300,
+    line_color="#00ff88",
+    gradient_color="#22B452",
+    bg_color="#282827",
+    line_width: float = 2,
+    margin_ratio: float = 50,
+    digest: str | None = None,
+    supersample: int = 4,
+) -> bytes:
+    """Rasterise a sparkline to PNG with Pillow.
+
+    Only the coverage masks of the area and the line are drawn at ``supersample``
+    times the size and box-filtered down for anti-aliasing. Colours are
+    composited at the final size.
+
+    :param digest:
+        Input digest to embed as ``source-sha256`` PNG text chunk.
+
+    :return:
+        PNG bytes
+    """
+    # Pillow is installed with Matplotlib, which is in the data extra
+    from PIL import Image, ImageDraw, PngImagePlugin  # noqa: PLC0415
+
+    big_size = (width * supersample, height * supersample)
+    px, py, baseline = _project(x, y, big_size[0], big_size[1], margin_ratio * supersample)
+    points = list(zip(px.tolist(), py.tolist()))
+
+    bg_rgb = np.array(_hex_to_rgb(bg_color), dtype=np.float64)
+    gradient_rgb = np.array(_hex_to_rgb(gradient_color), dtype=np.float64)
+    image = Image.new("RGB", (width, height), _hex_to_rgb(bg_color))
+
+    top = py.min() / supersample
+    bottom = baseline / supersample
+    if bottom > top:
+        # Vertical gradient from the gradient colour at the top of the line to
+        # the background colour at the baseline, blended with alpha 0.4
+        t = np.clip((np.arange(height) + 0.5 - top) / (bottom - top), 0, 1)[:, None]
+        blended = bg_rgb * 0.6 + (gradient_rgb * (1 - t) + bg_rgb * t) * 0.4
+        gradient = Image.fromarray(blended.astype(np.uint8)[:, None, :], "RGB").resize((width, height), Image.Resampling.NEAREST)
+        area_mask = Image.new("L", big_size, 0)
+        ImageDraw.Draw(area_mask).polygon(points + [(px[-1], baseline), (px[0], baseline)], fill=255)
+        image.paste(gradient, (0, 0), area_mask.reduce(supersample))
+
+    line_mask = Image.new("L", big_size, 0)
+    ImageDraw.Draw(line_mask).line(points, fill=255, width=max(1, round(line_width * supersample)), joint="curve")
+    image.paste(_hex_to_rgb(line_color), (0, 0, width, height), line_mask.reduce(supersample))
+
+    png_info = PngImagePlugin.PngInfo()
+    if digest:
+        png_info.add_text("source-sha256", digest)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", pnginfo=png_info)
+    return buffer.getvalue()
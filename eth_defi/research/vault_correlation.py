@@ -4,17 +4,13 @@ from collections import Counter
 
 import pandas as pd
 
+from eth_defi.research.wide_returns import calculate_returns_correlation, compound_resampled_returns, pivot_vault_values
 from eth_defi.vault.flag import is_flagged_vault
 
 import plotly.graph_objects as go
 from plotly.graph_objects import Figure
 
 
-def _resample_returns(group, period="1D"):
-    returns = group["returns_1h"]
-    return (1 + returns).resample(period).prod() - 1
-
-
 def choose_vaults_for_correlation_comparison(
     lifetime_data_filtered_df: pd.DataFrame,
     min_nav=50_000,
@@ -66,8 +62,9 @@ def visualise_vault_returns_correlation(
 
     included_ids = selected_lifetime_data_df["id"].tolist()
 
-    # Creates MultiIndex (id, timestamp) series
-    returns_1d = returns_df.groupby("id").apply(_resample_returns, include_groups=False)
+    # Timestamp x vault id matrix of daily returns
+    returns_df = returns_df[returns_df["id"].isin(included_ids)]
+    returns_1d = compound_resampled_returns(pivot_vault_values(returns_df, "returns_1h"), "1D")
 
     # Vault name -> daily returns as a column
     returns_data = {}
@@ -77,15 +74,14 @@ def visualise_vault_returns_correlation(
     for id in included_ids:
         row = selected_lifetime_data_df.loc[id]
         name = row["name"]
-        try:
-            returns_data[name] = returns_1d.loc[id]
-        except KeyError as e:
-            raise RuntimeError(f"The returns data did not have series for vault id {id}, name {name}. Full vault row is {row}") from e
+        if id not in returns_1d.columns:
+            raise RuntimeError(f"The returns data did not have series for vault id {id}, name {name}. Full vault row is {row}")
+        returns_data[name] = returns_1d[id]
 
     returns_df = pd.DataFrame(returns_data)
 
     # Calculate correlation matrix
-    correlation_matrix = returns_df.corr()
+    correlation_matrix = calculate_returns_correlation(returns_df)
 
     # Create heatmap using Plotly
     fig = go.Figure(data=go.Heatmap(z=correlation_matrix.values, x=correlation_matrix.columns, y=correlation_matrix.index, colorscale="RdBu", zmid=0, text=correlation_matrix.round(2).values, texttemplate="%{text}", textfont={"size": 10}, hoverongaps=False))
@@ -33,6 +33,8 @@ from eth_defi.erc_4626.vault_protocol.morpho.flag_analytics import MorphoFlagAna
 from eth_defi.feed.stablecoin_rate import DenominationTokenRate, StablecoinRateFeeder
 from eth_defi.perp_dex.export import build_perp_dex_other_data
 from eth_defi.research.value_table import format_grouped_series_as_multi_column_grid, format_series_as_multi_column_grid
+from eth_defi.research.vault_price_store import VaultPriceStore
+from eth_defi.research.wide_returns import resample_vault_prices
 from eth_defi.research.wrangle_vault_prices import forward_fill_vault
 from eth_defi.token import is_stablecoin_like, normalise_token_symbol
 from eth_defi.vault.base import VaultSpec, WithdrawalPeriod
@@ -3125,7 +3127,7 @@ class VaultReport:
 
 def analyse_vault(
     vault_db: VaultDatabase,
-    prices_df: pd.DataFrame,
+    prices_df: pd.DataFrame | VaultPriceStore,
     spec: VaultSpec,
     returns_col: str = "returns_1h",
     logger=print,
@@ -3143,6 +3145,9 @@ def analyse_vault(
 
         Can be be in any time frame.
 
+        Pass a :py:class:`~eth_defi.research.vault_price_store.VaultPriceStore`
+        to slice the vault's rows without scanning all rows.
+
     :param id:
         Vault chain + address to analyse, e.g. "1-0x1234567890abcdef1234567890abcdef12345678"
 
@@ -3169,7 +3174,12 @@ def analyse_vault(
     subtitle = f"{vault_metadata['Symbol']} / {vault_metadata['Denomination']} {vault_metadata['Address']} on {chain_name}, on {vault_metadata['Protocol']} protocol"
 
     # Use cleaned returns data and resample it to something useful
-    vault_df = returns_df.loc[returns_df["id"] == id]
+    if isinstance(returns_df, VaultPriceStore):
+        if id not in returns_df:
+            return None
+        vault_df = returns_df.get_vault_prices(id)
+    else:
+        vault_df = returns_df.loc[returns_df["id"] == id]
 
     vault_df = forward_fill_vault(vault_df)
 
@@ -3568,64 +3578,28 @@ def cross_check_data(
 
 
 def calculate_daily_returns_for_all_vaults(df_work: pd.DataFrame) -> pd.DataFrame:
-    """Calculate daily returns for each vault in isolation"""
-
-    # Group by chain and address, then resample and forward fill
+    """Calculate daily returns for each vault in isolation
 
+    See :py:func:`eth_defi.research.wide_returns.resample_vault_prices`.
+    """
     df_work = df_work.set_index("timestamp")
-
-    result_dfs = []
-    for (chain_val, addr_val), group in df_work.groupby(["chain", "address"]):
-        # Resample this group to daily frequency and forward fill
-        resampled = group.resample("D").last()
-
-        # Calculate daily returns
-        resampled["daily_returns"] = resampled["share_price"].pct_change(fill_method=None).fillna(0)
-
-        # Add back the groupby keys as they'll be dropped during resampling
-        resampled["chain"] = chain_val
-        resampled["address"] = addr_val
-
-        result_dfs.append(resampled)
-
-    # Concatenate all the processed groups
-    df_result = pd.concat(result_dfs)
-
-    return df_result
+    return resample_vault_prices(df_work, "D", returns_column="daily_returns")
 
 
 def calculate_hourly_returns_for_all_vaults(df_work: pd.DataFrame) -> pd.DataFrame:
-    """Calculate hourly returns for each vault in isolation"""
-
-    # Group by chain and address, then resample and forward fill
+    """Calculate hourly returns for each vault in isolation
 
+    See :py:func:`eth_defi.research.wide_returns.resample_vault_prices`.
+    """
     assert isinstance(df_work, pd.DataFrame)
     assert isinstance(df_work.index, pd.DatetimeIndex), "DataFrame index must be a DatetimeIndex"
-
-    result_dfs = []
-    for (chain_val, addr_val), group in df_work.groupby(["chain", "address"]):
-        # Resample this group to daily frequency and forward fill
-        resampled = group.resample("D").last()
-
-        # Calculate daily returns
-        resampled["returns_1h"] = resampled["share_price"].pct_change(fill_method=None).fillna(0)
-
-        # Add back the groupby keys as they'll be dropped during resampling
-        resampled["chain"] = chain_val
-        resampled["address"] = addr_val
-
-        result_dfs.append(resampled)
-
-    # Concatenate all the processed groups
-    df_result = pd.concat(result_dfs)
-
-    return df_result
+    return resample_vault_prices(df_work, "D", returns_column="returns_1h")
 
 
 def display_vault_chart_and_tearsheet(
     vault_spec: VaultSpec,
     vault_db: VaultDatabase,
-    prices_df: pd.DataFrame,
+    prices_df: pd.DataFrame | VaultPriceStore,
     render=True,
 ):
     """Render a chart and tearsheet for a single vault.
@@ -0,0 +1,268 @@
+"""Vault price data indexed by vault id.
+
+Notebooks and export scripts pick a single vault from the price data of all vaults
+with a boolean mask like ``prices_df["id"] == vault_id``, which scans every row
+for every vault.
+
+:py:class:`VaultPriceStore` keeps the cleaned price data sorted by vault id and timestamp
+in an uncompressed Arrow IPC file next to the Parquet file, with a sidecar index
+of the row range of each vault:
+
+- A vault's rows are a zero-copy slice of the table, found with a dict lookup
+- A time window is a binary search within the vault's rows
+- The file is memory-mapped, so worker processes reading the same store share
+  the pages, and pickling a store only pickles its path
+- The store is rebuilt when the Parquet file changes
+
+Example:
+
+.. code-block:: python
+
+    from eth_defi.research.vault_price_store import VaultPriceStore
+
+    store = VaultPriceStore.open(data_dir / "cleaned-vault-prices-1h.parquet")
+    vault_prices_df = store.get_vault_prices("1-0x...", start=pd.Timestamp("2026-01-01"))
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+#: Vault id column, ``chain id-address``
+ID_COLUMN = "id"
+
+#: Timestamp column
+TIMESTAMP_COLUMN = "timestamp"
+
+#: Rows per record batch in the store file
+STORE_BATCH_ROWS = 1_000_000
+
+#: Index Parquet schema metadata key for the source file size and modification time
+SOURCE_FINGERPRINT_KEY = b"source_fingerprint"
+
+
+def get_vault_price_store_paths(source_path: Path) -> tuple[Path, Path]:
+    """Get the store and index file paths for a price Parquet file.
+
+    :return:
+        ``(store path, index path)``, e.g. ``cleaned-vault-prices-1h.arrow``
+        and ``cleaned-vault-prices-1h.index.parquet``
+    """
+    store_path = Path(source_path).with_suffix(".arrow")
+    return store_path, store_path.with_suffix(".index.parquet")
+
+
+def _get_source_fingerprint(source_path: Path) -> str:
+    stat = source_path.stat()
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def _is_sorted(table: pa.Table) -> bool:
+    # Sorted by id, then timestamp
+    if table.num_rows < 2:
+        return True
+    ids = table[ID_COLUMN].combine_chunks()
+    timestamps = table[TIMESTAMP_COLUMN].combine_chunks()
+    prev_ids, next_ids = ids.slice(0, len(ids) - 1), ids.slice(1)
+    ordered = pc.or_(
+        pc.greater(next_ids, prev_ids),
+        pc.and_(pc.equal(next_ids, prev_ids), pc.greater_equal(timestamps.slice(1), timestamps.slice(0, len(timestamps) - 1))),
+    )
+    return pc.all(ordered).as_py() is True
+
+
+def _sort_table(table: pa.Table) -> pa.Table:
+    if table[ID_COLUMN].null_count:
+        raise ValueError(f"Price data has rows without {ID_COLUMN}")
+    if not _is_sorted(table):
+        table = table.sort_by([(ID_COLUMN, "ascending"), (TIMESTAMP_COLUMN, "ascending")])
+    return table
+
+
+def _build_index_table(table: pa.Table) -> pa.Table:
+    # Row range of each vault in a table sorted by id
+    runs = pc.run_end_encode(table[ID_COLUMN].combine_chunks())
+    ends = runs.run_ends.to_numpy().astype("int64")
+    offsets = np.r_[0, ends[:-1]].astype("int64")
+    return pa.table({ID_COLUMN: runs.values, "offset": offsets, "length": ends - offsets})
+
+
+def _write_atomic(path: Path, write):
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(temp_name)
+        os.replace(temp_name, path)
+    except BaseException:
+        if os.path.exists(temp_name):
+            os.unlink(temp_name)
+        raise
+
+
+def build_vault_price_store(source_path: Path) -> Path:
+    """Write the store and index files for a price Parquet file.
+
+    :param source_path:
+        Price data with ``id`` and ``timestamp`` columns,
+        e.g. ``cleaned-vault-prices-1h.parquet``.
+
+    :return:
+        Store path
+    """
+    source_path = Path(source_path)
+    store_path, index_path = get_vault_price_store_paths(source_path)
+    fingerprint = _get_source_fingerprint(source_path)
+
+    table = _sort_table(pq.read_table(source_path))
+    index_table = _build_index_table(table)
+    index_table = index_table.replace_schema_metadata({SOURCE_FINGERPRINT_KEY: fingerprint.encode(), b"num_rows": str(table.num_rows).encode()})
+
+    def _write_store(path: str):
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=STORE_BATCH_ROWS)
+
+    # Index last, so a complete index always points to a complete store
+    _write_atomic(store_path, _write_store)
+    _write_atomic(index_path, lambda path: pq.write_table(index_table, path))
+
+    logger.info("Built vault price store %s, %d rows, %d vaults", store_path, table.num_rows, index_table.num_rows)
+    return store_path
+
+
+class VaultPriceStore:
+    """Per-vault access to price data sorted by vault id and timestamp.
+
+    - Use :py:meth:`open` for the memory-mapped store of a Parquet file
+    - Use :py:meth:`from_dataframe` for price data already in memory
+    """
+
+    def __init__(self, table: pa.Table, index: dict[str, tuple[int, int]], path: Path | None = None):
+        """
+        :param table:
+            Price data sorted by vault id and timestamp.
+
+        :param index:
+            Vault id -> ``(offset, length)`` of its rows.
+
+        :param path:
+            Memory-mapped store file, if any.
+        """
+        #: Price data of all vaults
+        self.table = table
+        #: Vault id -> (first row, row count)
+        self.index = index
+        self.path = path
+
+    def __repr__(self):
+        return f"<VaultPriceStore {self.path or 'in-memory'}, {self.table.num_rows:,} rows, {len(self.index):,} vaults>"
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, vault_id: str) -> bool:
+        return vault_id in self.index
+
+    def __getstate__(self):
+        # Worker processes map the same file instead of receiving a copy of the data
+        if self.path is not None:
+            return {"path": self.path}
+        return self.__dict__
+
+    def __setstate__(self, state):
+        if "table" in state:
+            self.__dict__.update(state)
+        else:
+            store = VaultPriceStore.read(state["path"])
+            self.__dict__.update(store.__dict__)
+
+    @classmethod
+    def from_table(cls, table: pa.Table) -> "VaultPriceStore":
+        """Create an in-memory store, sorting the table if needed."""
+        table = _sort_table(table)
+        index_table = _build_index_table(table)
+        return cls(table, _read_index(index_table))
+
+    @classmethod
+    def from_dataframe(cls, prices_df: pd.DataFrame) -> "VaultPriceStore":
+        """Create an in-memory store from a price DataFrame indexed by timestamp."""
+        return cls.from_table(pa.Table.from_pandas(prices_df))
+
+    @classmethod
+    def read(cls, store_path: Path) -> "VaultPriceStore":
+        """Memory-map a store written by :py:func:`build_vault_price_store`."""
+        store_path = Path(store_path)
+        index_table = pq.read_table(store_path.with_suffix(".index.parquet"))
+        table = pa.ipc.open_file(pa.memory_map(str(store_path), "r")).read_all()
+        expected_rows = int(index_table.schema.metadata[b"num_rows"])
+        assert table.num_rows == expected_rows, f"Store {store_path} has {table.num_rows:,} rows, index expects {expected_rows:,}"
+        return cls(table, _read_index(index_table), path=store_path)
+
+    @classmethod
+    def open(cls, source_path: Path) -> "VaultPriceStore":
+        """Open the store of a price Parquet file, building it if it is missing or out of date."""
+        source_path = Path(source_path)
+        store_path, index_path = get_vault_price_store_paths(source_path)
+        fingerprint = _get_source_fingerprint(source_path)
+        if not store_path.exists() or not index_path.exists() or pq.read_schema(index_path).metadata.get(SOURCE_FINGERPRINT_KEY) != fingerprint.encode():
+            logger.info("Vault price store for %s missing or out of date, building", source_path)
+            build_vault_price_store(source_path)
+        return cls.read(store_path)
+
+    @property
+    def vault_ids(self) -> list[str]:
+        """Vault ids in the store, sorted."""
+        return list(self.index)
+
+    def get_vault_table(
+        self,
+        vault_id: str,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> pa.Table:
+        """Get the rows of a vault as a zero-copy slice.
+
+        :param start:
+            Include rows at or after this time.
+
+        :param end:
+            Include rows before this time.
+
+        :raise KeyError:
+            No data for the vault
+        """
+        offset, length = self.index[vault_id]
+        if start is not None or end is not None:
+            timestamps = self.table[TIMESTAMP_COLUMN].slice(offset, length).to_numpy()
+            first = np.searchsorted(timestamps, pd.Timestamp(start).to_datetime64(), side="left") if start is not None else 0
+            last = np.searchsorted(timestamps, pd.Timestamp(end).to_datetime64(), side="left") if end is not None else length
+            offset, length = offset + first, max(last - first, 0)
+        return self.table.slice(offset, length)
+
+    def get_vault_prices(
+        self,
+        vault_id: str,
+        start: pd.Timestamp | None = None,
+        end: pd.Timestamp | None = None,
+    ) -> pd.DataFrame:
+        """Get the rows of a vault as a DataFrame indexed by timestamp.
+
+        See :py:meth:`get_vault_table`.
+        """
+        df = self.get_vault_table(vault_id, start, end).to_pandas()
+        if not isinstance(df.index, pd.DatetimeIndex):
+            df = df.set_index(TIMESTAMP_COLUMN)
+        return df
+
+
+def _read_index(index_table: pa.Table) -> dict[str, tuple[int, int]]:
+    ids = index_table[ID_COLUMN].to_pylist()
+    return dict(zip(ids, zip(index_table["offset"].to_pylist(), index_table["length"].to_pylist())))
@@ -0,0 +1,255 @@
+"""Vectorised resampling, rolling returns and correlation for many vaults.
+
+The research helpers used to loop over vaults with ``groupby()``, resampling
+each vault and running rolling windows with a Python callback per window.
+With thousands of vaults this takes minutes in the notebooks and
+in the post-processing step.  The functions here do the same work
+in a few array operations over all vaults:
+
+- :py:func:`resample_vault_prices` resamples long-format price data of all
+  vaults in one ``groupby()`` aggregation and calculates per-bar returns
+- :py:func:`pivot_vault_values` pivots a column into a wide float64 matrix,
+  timestamps × vault ids, where missing observations are NaN
+- :py:func:`calculate_rolling_window_returns`, :py:func:`compound_resampled_returns`
+  and :py:func:`calculate_returns_correlation` work on the wide matrix with
+  NumPy, treating NaN as a missing observation of that vault
+
+A wide matrix of hourly data for every vault does not fit in memory,
+so pivot daily data, or hourly data of a selected set of vaults.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+
+def resample_vault_prices(
+    df_work: pd.DataFrame,
+    freq: str = "D",
+    returns_column: str = "returns_1h",
+    price_column: str = "share_price",
+    group_columns: tuple[str, ...] = ("chain", "address"),
+) -> pd.DataFrame:
+    """Resample price data of all vaults and calculate returns.
+
+    Gives the same result as resampling each vault with ``resample(freq).last()``
+    and calculating ``pct_change(fill_method=None).fillna(0)`` of the share price:
+
+    - One row per vault and bar, from the first to the last bar of the vault
+    - Column values are the last non-null value in the bar by time, NaN for bars without data.
+      Input that is not sorted by time is sorted first, keeping the order of rows with equal timestamps
+    - Rows are sorted by the group columns, then time
+
+    :param df_work:
+        Long-format price data of many vaults with a DatetimeIndex.
+        Sorting it by time beforehand saves a copy.
+
+    :param freq:
+        Fixed bar length, like ``"D"`` or ``"h"``.
+
+    :param returns_column:
+        Column to write the returns to.
+
+    :param group_columns:
+        Columns identifying a vault.
+
+    :return:
+        Resampled data with the same columns and the returns column, indexed by bar.
+    """
+    assert isinstance(df_work.index, pd.DatetimeIndex), "DataFrame index must be a DatetimeIndex"
+
+    # groupby().last() picks by row order, resample().last() by time
+    if not df_work.index.is_monotonic_increasing:
+        df_work = df_work.sort_index(kind="stable")
+
+    keys = list(group_columns)
+    index_name = df_work.index.name
+    step = pd.Timedelta(to_offset(freq).nanos, unit="ns")
+
+    bars = df_work.index.floor(step).rename("__bar")
+    resampled = df_work.groupby(keys + [bars], sort=True).last()
+
+    # Add the empty bars between each vault's first and last bar
+    vault_index = resampled.index.droplevel(-1)
+    bar_values = resampled.index.get_level_values(-1)
+    vault_codes, vaults = vault_index.factorize()
+    starts = np.flatnonzero(np.r_[True, vault_codes[1:] != vault_codes[:-1]])
+    ends = np.r_[starts[1:], len(vault_codes)] - 1
+    counts = np.asarray((bar_values[ends] - bar_values[starts]) // step) + 1
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    full_bars = (bar_values[starts].repeat(counts) + offsets * step).as_unit(bar_values.unit)
+    full_vaults = vaults.repeat(counts)
+    if isinstance(full_vaults, pd.MultiIndex):
+        vault_levels = [full_vaults.get_level_values(level) for level in range(full_vaults.nlevels)]
+    else:
+        vault_levels = [full_vaults]
+    resampled = resampled.reindex(pd.MultiIndex.from_arrays(vault_levels + [full_bars], names=keys + [index_name]))
+
+    prices = resampled[price_column].to_numpy(dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = prices[1:] / prices[:-1] - 1
+    returns = np.r_[np.nan, returns]
+    # First bar of each vault
+    returns[np.cumsum(counts) - counts] = np.nan
+
+    resampled = resampled.reset_index(level=keys)
+    resampled[returns_column] = np.nan_to_num(returns, nan=0.0, posinf=np.inf, neginf=-np.inf)
+
+    columns = list(df_work.columns)
+    if returns_column not in columns:
+        columns.append(returns_column)
+    return resampled[columns]
+
+
+def pivot_vault_values(
+    df: pd.DataFrame,
+    value_column: str,
+    id_column: str = "id",
+) -> pd.DataFrame:
+    """Pivot a column of long-format vault data to a wide float64 matrix.
+
+    :param df:
+        Long-format data of many vaults with a DatetimeIndex.
+        For duplicate timestamps of a vault, the last row is used.
+
+    :return:
+        DataFrame indexed by sorted timestamps, with a column per vault id
+    """
+    assert isinstance(df.index, pd.DatetimeIndex), "DataFrame index must be a DatetimeIndex"
+    index_name = df.index.name or "timestamp"
+    long = pd.DataFrame(
+        {
+            index_name: df.index,
+            id_column: df[id_column].to_numpy(),
+            value_column: df[value_column].to_numpy(dtype="float64"),
+        }
+    )
+    long = long.drop_duplicates([index_name, id_column], keep="last")
+    wide = long.pivot(index=index_name, columns=id_column, values=value_column)
+    return wide.sort_index()
+
+
+def lookup_wide_values(
+    wide: pd.DataFrame,
+    index: pd.DatetimeIndex,
+    ids: pd.Series,
+) -> np.ndarray:
+    """Read wide matrix values for long-format rows.
+
+    :param index:
+        Timestamps of the rows.
+
+    :param ids:
+        Vault ids of the rows.
+
+    :return:
+        Value for each row
+    """
+    row_positions = wide.index.get_indexer(index)
+    column_positions = wide.columns.get_indexer(ids)
+    assert (row_positions >= 0).all() and (column_positions >= 0).all(), "Rows missing from the wide matrix"
+    return wide.to_numpy(dtype="float64")[row_positions, column_positions]
+
+
+def calculate_rolling_window_returns(
+    wide_prices: pd.DataFrame,
+    window: pd.Timedelta,
+) -> pd.DataFrame:
+    """Calculate rolling returns over a time window for every vault.
+
+    For each observation, the return since the vault's first observation
+    in the window ``(timestamp - window, timestamp]``, like
+    ``prices.rolling(window, min_periods=1).apply(lambda w: w.iloc[-1] / w.iloc[0] - 1)``
+    for each vault.
+
+    :param wide_prices:
+        Wide share price matrix from :py:func:`pivot_vault_values`.
+
+    :param window:
+        Rolling window length.
+
+    :return:
+        Returns as fractions, NaN where the vault has no observation
+    """
+    assert wide_prices.index.is_monotonic_increasing, "Wide matrix index must be sorted"
+    values = wide_prices.to_numpy(dtype="float64")
+    row_count = len(values)
+    rows = np.arange(row_count)[:, None]
+    valid = ~np.isnan(values)
+
+    # First row of each window
+    window_starts = wide_prices.index.searchsorted(wide_prices.index - window, side="right")
+
+    # For each row and vault, the first row at or after it with an observation
+    next_valid = np.where(valid, rows, row_count)
+    next_valid = np.minimum.accumulate(next_valid[::-1], axis=0)[::-1]
+
+    first_rows = next_valid[window_starts]
+    first_values = values[np.minimum(first_rows, row_count - 1), np.arange(values.shape[1])]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.where(valid & (first_rows <= rows), values / first_values - 1, np.nan)
+    return pd.DataFrame(returns, index=wide_prices.index, columns=wide_prices.columns)
+
+
+def compound_resampled_returns(
+    wide_returns: pd.DataFrame,
+    freq: str = "1D",
+) -> pd.DataFrame:
+    """Compound returns to a longer bar for every vault.
+
+    Like ``(1 + returns).resample(freq).prod() - 1`` for each vault:
+    bars without returns between a vault's first and last bar have zero return,
+    bars outside that range are NaN.
+
+    :param wide_returns:
+        Wide returns matrix from :py:func:`pivot_vault_values`.
+
+    :return:
+        Compounded returns per bar
+    """
+    growth = (1 + wide_returns).resample(freq).prod(min_count=1)
+    observed = growth.notna()
+    inside = observed.cummax() & observed[::-1].cummax()[::-1]
+    growth = growth.mask(inside & ~observed, 1.0)
+    return growth - 1
+
+
+def calculate_returns_correlation(
+    wide_returns: pd.DataFrame,
+    min_periods: int = 1,
+) -> pd.DataFrame:
+    """Pearson correlation of vault returns, using the bars both vaults have.
+
+    Same as :py:meth:`pandas.DataFrame.corr`, but with matrix products
+    over masked data instead of a loop over vault pairs.
+
+    :param wide_returns:
+        Wide returns matrix.
+
+    :param min_periods:
+        Minimum common bars for a pair, NaN below this.
+
+    :return:
+        Correlation matrix, vaults × vaults
+    """
+    values = wide_returns.to_numpy(dtype="float64")
+    mask = ~np.isnan(values)
+    # Centre first for numerical stability, correlation does not depend on the shift
+    with np.errstate(invalid="ignore"):
+        centred = values - np.nanmean(values, axis=0) if len(values) else values
+    x = np.where(mask, centred, 0.0)
+    m = mask.astype("float64")
+
+    count = m.T @ m
+    sum_a = x.T @ m
+    sum_b = sum_a.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = x.T @ x - sum_a * sum_b / count
+        squares = (x * x).T @ m
+        var_a = squares - sum_a * sum_a / count
+        var_b = squares.T - sum_b * sum_b / count
+        correlation = cov / np.sqrt(var_a * var_b)
+
+    correlation = np.clip(correlation, -1.0, 1.0)
+    correlation[(count < max(min_periods, 2)) | (var_a <= 0) | (var_b <= 0)] = np.nan
+    return pd.DataFrame(correlation, index=wide_returns.columns, columns=wide_returns.columns)
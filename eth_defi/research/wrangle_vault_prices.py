@@ -20,7 +20,7 @@ import tempfile
 import warnings
 from bisect import bisect_right
 from pathlib import Path
-from typing import Callable, TypedDict
+from typing import Callable, Iterable, TypedDict
 
 import numpy as np
 import pandas as pd
@@ -29,6 +29,7 @@ import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from eth_typing import HexAddress
 from IPython.display import display
+from joblib import Parallel, delayed
 from tqdm_loggable.auto import tqdm
 
 from eth_defi.chain import get_chain_name
@@ -421,6 +422,9 @@ class CleanedVaultPriceRow(TypedDict, total=False):
     daily_withdrawal_usd: float
 
 
+#: Target price rows per worker shard in :py:func:`clean_vault_prices_parallel`
+DEFAULT_CLEANING_SHARD_ROWS = 2_000_000
+
 #: For manual debugging, we process these vaults first
 PRIORITY_SORT_IDS = [
     "8453-0x0d877dc7c8fa3ad980dfdb18b48ec9f8768359c4",
@@ -1391,7 +1395,9 @@ def approximate_hypercore_share_prices_from_pnl_nav(  # noqa: PLR0914
     prices_df.iloc[:, share_price_col] = clean_share_prices
     prices_df["hypercore_repair_status"] = repair_statuses
     if synthetic_supplies is not None:
-        prices_df["total_supply"] = synthetic_supplies
+        # Write in place like the share price, so the column dtype does not depend
+        # on whether the frame also holds EVM vaults, see clean_vault_prices_parallel()
+        prices_df.iloc[:, prices_df.columns.get_loc("total_supply")] = synthetic_supplies
 
     logger(f"Approximated Hypercore economic share prices for {affected_vaults:,} vaults using {checkpoint_count:,} four-hour PnL/NAV checkpoints; carried {carried_count:,} non-performance rows, repaired {lag_repaired_count:,} delayed NAV confirmations, deferred {missing_count:,} missing-input rows and {deferred_outlier_count:,} uncorroborated losses, capped {clipped_count:,} gains and recorded {wipe_out_count:,} terminal wipe-outs")
     return prices_df
@@ -1817,65 +1823,24 @@ def sort_and_index_vault_prices(
     return prices_df
 
 
-def process_raw_vault_scan_data(
-    rows: dict[VaultSpec, VaultRow] | VaultDatabase,
+def clean_vault_prices(
+    rows: dict[VaultSpec, VaultRow] | None,
     prices_df: pd.DataFrame,
     logger=print,
     display: Callable = lambda x: None,
     diagnose_vault_id: str | None = None,
 ) -> pd.DataFrame:
-    """Preprocess vault data for further analysis.
+    """Run the per-vault cleaning stages of :py:func:`process_raw_vault_scan_data`.
 
-    - Assign unique names to vaults
-    - Add denormalised vault data to prices DataFrame
-    - Filter out non-stablecoin vaults
-    - Calculate returns, rolling metrics
+    - Every stage operates on each vault id independently,
+      so this can be run on any set of whole vault histories
 
     :param rows:
-        Metadata rows from vault database
+        Metadata rows from vault database. Not used by the current stages.
 
-    :param logger:
-        Notebook / console printer function
-
-    :param display:
-        Display Pandas DataFrame function
+    :param prices_df:
+        Sorted, timestamp-indexed stablecoin vault price rows
     """
-
-    prices_df = ensure_vault_state_columns(prices_df)
-    prices_df = derive_deposit_closed_reason(prices_df)
-
-    assign_unique_names(rows, prices_df, logger)
-
-    missing_ids = check_missing_metadata(rows, prices_df["id"], prices_df, logger)
-    if missing_ids:
-        before_count = len(prices_df)
-        prices_df = prices_df[~prices_df["id"].isin(missing_ids)]
-        logger(f"Dropped {before_count - len(prices_df):,} price rows for {len(missing_ids):,} vaults without metadata")
-
-    prices_df = add_denormalised_vault_data(rows, prices_df, logger)
-
-    if diagnose_vault_id:
-        vault_prices_df = prices_df[prices_df["id"] == diagnose_vault_id]
-        logger("After add_denormalised_vault_data():")
-        display(vault_prices_df)
-
-    # ``read_parquet(dtype_backend="pyarrow")`` may return a
-    # ``timestamp[ms][pyarrow]`` Series. Pandas then creates a generic Index,
-    # even though the values are datetimes, and the chronological processing
-    # below correctly rejects it. Materialise the canonical DatetimeIndex
-    # representation before indexing. This was surfaced by the initial shared
-    # chain scan for Lighter Ethereum and Lighter Robinhood.
-    prices_df["timestamp"] = pd.to_datetime(prices_df["timestamp"])
-    prices_df = prices_df.set_index("timestamp")
-
-    prices_df = sort_and_index_vault_prices(prices_df, PRIORITY_SORT_IDS)
-    prices_df = filter_vaults_by_stablecoin(rows, prices_df, logger)
-    if prices_df.empty:
-        logger("No stablecoin-nominated price rows remain; skipping return and TVL cleaning")
-        return prices_df
-    # Disabled as low and does not result to any savings
-    # prices_df = filter_unneeded_row(prices_df, logger)
-
     prices_df = remove_inactive_lead_time(prices_df, logger)
 
     # Hypercore's share price is a reconstructed PnL/NAV performance index.
@@ -1940,6 +1905,157 @@ def process_raw_vault_scan_data(
         prices_df,
         logger,
     )
+    return prices_df
+
+
+def partition_vault_prices(
+    prices_df: pd.DataFrame,
+    shard_rows: int = DEFAULT_CLEANING_SHARD_ROWS,
+) -> Iterable[pd.DataFrame]:
+    """Split price rows to shards of whole vault histories.
+
+    - Shards are contiguous row slices, so concatenating the shards
+      restores the original row order
+    - Each shard holds at least one vault and roughly ``shard_rows`` rows
+
+    :param prices_df:
+        Price rows grouped by vault id, as after :py:func:`sort_and_index_vault_prices`
+    """
+    ids = prices_df["id"].to_numpy()
+    # Row positions where a new vault history begins
+    boundaries = np.flatnonzero(ids[1:] != ids[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    assert len(pd.unique(ids)) == len(starts), "Price rows must be grouped by vault id"
+
+    shard_start = 0
+    for vault_start in starts[1:]:
+        if vault_start - shard_start >= shard_rows:
+            yield prices_df.iloc[shard_start:vault_start]
+            shard_start = vault_start
+    if shard_start < len(prices_df):
+        yield prices_df.iloc[shard_start:]
+
+
+def _clean_vault_price_shard(prices_df: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    """Worker process entry point for :py:func:`clean_vault_prices_parallel`.
+
+    :return:
+        Cleaned shard and log messages, relayed by the parent process
+    """
+    messages = []
+    cleaned = clean_vault_prices(None, prices_df.copy(), logger=messages.append)
+    return cleaned, messages
+
+
+def clean_vault_prices_parallel(
+    prices_df: pd.DataFrame,
+    logger=print,
+    max_workers: int = 4,
+    shard_rows: int = DEFAULT_CLEANING_SHARD_ROWS,
+) -> pd.DataFrame:
+    """Run :py:func:`clean_vault_prices` over vault shards in a process pool.
+
+    - Peak worker memory is bounded by ``shard_rows``
+    - The output is identical to the single process run,
+      as all stages work on each vault history independently
+
+    :param prices_df:
+        Sorted, timestamp-indexed stablecoin vault price rows
+
+    :param max_workers:
+        Number of worker processes
+    """
+    shards = partition_vault_prices(prices_df, shard_rows)
+    worker_processor = Parallel(n_jobs=max_workers, backend="loky", return_as="generator")
+    cleaned_shards = []
+    for cleaned, messages in worker_processor(delayed(_clean_vault_price_shard)(shard) for shard in shards):
+        for message in messages:
+            logger(message)
+        cleaned_shards.append(cleaned)
+
+    logger(f"Cleaned {len(prices_df):,} price rows in {len(cleaned_shards):,} shards using {max_workers} workers")
+    return pd.concat(cleaned_shards)
+
+
+def process_raw_vault_scan_data(
+    rows: dict[VaultSpec, VaultRow] | VaultDatabase,
+    prices_df: pd.DataFrame,
+    logger=print,
+    display: Callable = lambda x: None,
+    diagnose_vault_id: str | None = None,
+    max_workers: int | None = None,
+    shard_rows: int = DEFAULT_CLEANING_SHARD_ROWS,
+) -> pd.DataFrame:
+    """Preprocess vault data for further analysis.
+
+    - Assign unique names to vaults
+    - Add denormalised vault data to prices DataFrame
+    - Filter out non-stablecoin vaults
+    - Calculate returns, rolling metrics
+
+    :param rows:
+        Metadata rows from vault database
+
+    :param logger:
+        Notebook / console printer function
+
+    :param display:
+        Display Pandas DataFrame function
+
+    :param max_workers:
+        Run the per-vault cleaning stages in this many worker processes,
+        see :py:func:`clean_vault_prices_parallel`.
+
+        ``None`` falls back to the ``VAULT_CLEANING_MAX_WORKERS`` env var, then to 1.
+        Vault diagnostics always run in a single process.
+
+    :param shard_rows:
+        Target price rows per worker shard
+    """
+
+    prices_df = ensure_vault_state_columns(prices_df)
+    prices_df = derive_deposit_closed_reason(prices_df)
+
+    assign_unique_names(rows, prices_df, logger)
+
+    missing_ids = check_missing_metadata(rows, prices_df["id"], prices_df, logger)
+    if missing_ids:
+        before_count = len(prices_df)
+        prices_df = prices_df[~prices_df["id"].isin(missing_ids)]
+        logger(f"Dropped {before_count - len(prices_df):,} price rows for {len(missing_ids):,} vaults without metadata")
+
+    prices_df = add_denormalised_vault_data(rows, prices_df, logger)
+
+    if diagnose_vault_id:
+        vault_prices_df = prices_df[prices_df["id"] == diagnose_vault_id]
+        logger("After add_denormalised_vault_data():")
+        display(vault_prices_df)
+
+    # ``read_parquet(dtype_backend="pyarrow")`` may return a
+    # ``timestamp[ms][pyarrow]`` Series. Pandas then creates a generic Index,
+    # even though the values are datetimes, and the chronological processing
+    # below correctly rejects it. Materialise the canonical DatetimeIndex
+    # representation before indexing. This was surfaced by the initial shared
+    # chain scan for Lighter Ethereum and Lighter Robinhood.
+    prices_df["timestamp"] = pd.to_datetime(prices_df["timestamp"])
+    prices_df = prices_df.set_index("timestamp")
+
+    prices_df = sort_and_index_vault_prices(prices_df, PRIORITY_SORT_IDS)
+    prices_df = filter_vaults_by_stablecoin(rows, prices_df, logger)
+    if prices_df.empty:
+        logger("No stablecoin-nominated price rows remain; skipping return and TVL cleaning")
+        return prices_df
+    # Disabled as low and does not result to any savings
+    # prices_df = filter_unneeded_row(prices_df, logger)
+
+    if max_workers is None:
+        max_workers = int(os.environ.get("VAULT_CLEANING_MAX_WORKERS", "1"))
+
+    if max_workers > 1 and not diagnose_vault_id:
+        prices_df = clean_vault_prices_parallel(prices_df, logger, max_workers=max_workers, shard_rows=shard_rows)
+    else:
+        prices_df = clean_vault_prices(rows, prices_df, logger=logger, display=display, diagnose_vault_id=diagnose_vault_id)
+
     registered_perp_vaults = build_registered_perp_vault_index(prices_df)
     prices_df = finalise_perp_metric_columns(prices_df, registered_perp_vaults)
     return prices_df
@@ -2009,6 +2125,7 @@ def generate_cleaned_vault_datasets(
     logger=print,
     display=display,
     diagnose_vault_id: str | None = None,
+    max_workers: int | None = None,
 ):
     """A command line script entry point to take raw scanned vault price data and clean it up to a format that can be analysed.
 
@@ -2022,6 +2139,9 @@ def generate_cleaned_vault_datasets(
 
         Drops non-stablecoin vaults. The cleaning is currently applicable
         for stable vaults only.
+
+    :param max_workers:
+        Worker processes for per-vault cleaning, see :py:func:`process_raw_vault_scan_data`
     """
 
     assert vault_db_path.exists()
@@ -2054,6 +2174,7 @@ def generate_cleaned_vault_datasets(
         logger,
         display=display,
         diagnose_vault_id=diagnose_vault_id,
+        max_workers=max_workers,
     )
     logger(f"We have {len(enhanced_prices_df):,} price rows in the cleaned prices DataFrame before settlement annotation")
     enhanced_prices_df = merge_vault_settlements_into_cleaned_prices(enhanced_prices_df, settlement_db_path=settlement_db_path)
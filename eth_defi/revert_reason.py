@@ -9,17 +9,9 @@ Further reading
 import logging
 import pprint
 import re
+import sys
 from typing import Union
 
-try:
-    from eth_tester.exceptions import TransactionFailed
-except ImportError:
-    # New Web3.py versions got rid of this?
-    # Mock here
-    class TransactionFailed(Exception):
-        pass
-
-
 from hexbytes import HexBytes
 from web3 import Web3
 from web3.exceptions import ContractLogicError
@@ -29,6 +21,16 @@ from eth_defi.abi import get_transaction_data_field
 logger = logging.getLogger(__name__)
 
 
+def get_eth_tester_errors() -> tuple[type[Exception], ...]:
+    """EthereumTester transaction failure, if the tester backend is in use.
+
+    Importing ``eth_tester`` takes more than half a second.
+    Its exceptions can be raised only if something imported it already.
+    """
+    module = sys.modules.get("eth_tester.exceptions")
+    return (module.TransactionFailed,) if module is not None else ()
+
+
 class TransactionReverted(Exception):
     """Python exception to signal a transaction error with a good revert reason.
 
@@ -233,7 +235,7 @@ def fetch_transaction_revert_reason(
     except ContractLogicError as e:
         # Web3 6.0
         return e.args[0]
-    except TransactionFailed as e:
+    except get_eth_tester_errors() as e:
         # Ethereum Tester
         return e.args[0]
 
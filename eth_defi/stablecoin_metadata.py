@@ -202,6 +202,8 @@ from typing import Any, TypedDict
 
 from strictyaml import load
 
+from eth_defi.feed.stablecoin_rate_table import StablecoinRateTable, get_default_stablecoin_rate_table
+from eth_defi.metadata_bundle import read_metadata_yaml
 from eth_defi.types import ISODateString, ISODateTimeString
 
 logger = logging.getLogger(__name__)
@@ -617,18 +619,36 @@ class StablecoinMetadata(TypedDict):
     depegged_at: ISODateTimeString | None
 
 
-def read_stablecoin_metadata(yaml_path: Path) -> dict:
+def parse_stablecoin_yaml(yaml_content: str) -> dict:
+    """Parse stablecoin metadata YAML text.
+
+    :return:
+        Parsed YAML as a dictionary
+    """
+    return load(yaml_content).data
+
+
+def read_stablecoin_metadata(yaml_path: Path, rate_table: StablecoinRateTable | None = None) -> dict:
     """Read and parse a stablecoin metadata YAML file.
 
+    Served from :py:mod:`eth_defi.metadata_bundle` when enabled.
+
     :param yaml_path:
         Path to the YAML file
 
+    :param rate_table:
+        Join refreshed rate fields from this table.
+        Defaults to the table enabled with ``STABLECOIN_RATE_TABLE_PATH``,
+        see :py:mod:`eth_defi.feed.stablecoin_rate_table`.
+
     :return:
         Parsed YAML as a dictionary
     """
-    yaml_content = yaml_path.read_text()
-    parsed = load(yaml_content)
-    return parsed.data
+    data = read_metadata_yaml(yaml_path, "stablecoin", parse_stablecoin_yaml)
+    rate_table = rate_table or get_default_stablecoin_rate_table()
+    if rate_table is not None:
+        rate_table.join(yaml_path, data)
+    return data
 
 
 #: In-process cache of loaded metadata
@@ -181,9 +181,9 @@ relaunched, turning "the rest of this group is doomed" into "one fork restarts".
   loudly instead of silently papering over the problem.
 - **Recycling resets EVM state.** A relaunched fork is a *fresh* fork: any
   post-launch deployment or mutation a test group relied on is gone. That is safe
-  for the read-only characterisation tests this pool currently serves (see the
-  warning at the end of this docstring), but a mutating shared-fork user must
-  re-establish its baseline rather than assume continuity.
+  for read-only tests and for :meth:`AnvilForkPool.lease`, which takes a new
+  baseline snapshot on a relaunched fork (see "Mutating tests" below); any other
+  mutating shared-fork user must re-establish its baseline rather than assume continuity.
 
 Bounded provider retries — fail fast, never re-hammer a dead provider
 ---------------------------------------------------------------------
@@ -270,29 +270,60 @@ Design notes:
   configurable ``launch_anvil``, so differing hardfork / gas / unlocked-account /
   tracing options must not collide on one cached process.
 
-.. warning::
-
-    **Proof-of-concept, gated on CI.** The repository documents that repeated
-    snapshot/revert cycles on a long-lived, module/session-scoped fork can
-    degrade Anvil responsiveness and hang CI under ``pytest-xdist`` (see the
-    ``AnvilSnapshotState`` docstring in :mod:`eth_defi.provider.anvil`). The
-    initial proof-of-concept only shares forks between **read-only** tests, which
-    do not mutate fork state and therefore need no snapshot/revert between tests.
-    Mutating tests that share a fork must additionally reset it with
-    :func:`eth_defi.testing.evm_snapshot_fixture.evm_snapshot_revert` or
-    :func:`eth_defi.provider.anvil.reset_anvil_snapshot`; that path is not yet
-    wired here, pending a bounded CI run that proves no xdist hang.
+Mutating tests — snapshot-recycling leases
+------------------------------------------
+
+Read-only tests share a fork with :meth:`AnvilForkPool.get_web3`. Mutating
+tests use :meth:`AnvilForkPool.lease` instead, so they share the same warm fork
+without seeing each other's writes:
+
+1. The first lease of a fork takes an ``evm_snapshot`` with
+   :func:`~eth_defi.provider.anvil.create_anvil_snapshot_state` and records a
+   :class:`ForkStateFingerprint`: the latest block number and hash plus the
+   balance, nonce and code hash of the accounts the test suite cares about.
+2. When the lease ends, the fork is reverted with
+   :func:`~eth_defi.provider.anvil.reset_anvil_snapshot` and the fingerprint is
+   taken again.
+3. A failed revert or a fingerprint mismatch means the fork cannot be trusted
+   to be at the baseline. It is disposed with :class:`DirtyForkRecycledWarning`
+   and the next lease gets a fresh fork — never a silently dirty one.
+4. After :data:`POOL_MAX_LEASES_PER_FORK` cycles the fork is recycled
+   proactively. This bounds the Anvil responsiveness degradation after many
+   revert cycles, documented in the ``AnvilSnapshotState`` docstring in
+   :mod:`eth_defi.provider.anvil`.
+
+A mutating module replaces its function-scoped fork with:
+
+.. code-block:: python
+
+    @pytest.fixture()
+    def web3(anvil_fork_pool: AnvilForkPool) -> Iterator[Web3]:
+        # Mutating test: shares one warm fork per xdist worker and reverts it after each test
+        with anvil_fork_pool.lease(JSON_RPC_ETHEREUM, ETHEREUM_MIDNIGHT_BLOCK, fingerprint_addresses=[USDC_WHALE]) as web3:
+            yield web3
+
+The same ``xdist_group`` marker rule applies. Fixtures that deploy contracts on
+top of the fork must stay function-scoped inside the lease, because the revert
+removes them.
+
+.. note::
+
+    ``evm_revert`` does not rewind Anvil's time offset, see
+    :func:`~eth_defi.testing.evm_snapshot_fixture.evm_snapshot_revert`.
+    Tests asserting exact block timestamps must set them themselves.
 """
 
+import contextlib
 import dataclasses
 import logging
 import warnings
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 import requests
 from web3 import Web3
 
-from eth_defi.provider.anvil import AnvilLaunch, fork_network_anvil
+from eth_defi.provider.anvil import AnvilLaunch, AnvilSnapshotState, create_anvil_snapshot_state, fork_network_anvil, reset_anvil_snapshot
 from eth_defi.provider.multi_provider import create_multi_provider_web3
 from eth_defi.provider.rpc_proxy import RPCProxy, RPCProxyConfig
 from eth_defi.utils import get_url_domain
@@ -371,6 +402,85 @@ class WedgedForkRecycledWarning(UserWarning):
     """
 
 
+#: Recycle a leased fork after this many snapshot/revert cycles.
+#:
+#: Anvil responsiveness degrades after many revert cycles on a long-lived fork
+#: (see the ``AnvilSnapshotState`` docstring in :mod:`eth_defi.provider.anvil`).
+#: A relaunch with a warm RPC cache costs seconds, so cap the cycles well before that.
+POOL_MAX_LEASES_PER_FORK: int = 100
+
+
+class DirtyForkRecycledWarning(UserWarning):
+    """Warn that a leased fork did not return to its baseline and was relaunched.
+
+    Raised when ``evm_revert`` fails or the :class:`ForkStateFingerprint` after
+    the revert differs from the one taken at the first lease. The next test gets
+    a fresh fork, so it is not a test failure, but a test that keeps triggering
+    it pays a cold fork every time and should be looked at.
+    """
+
+
+@dataclasses.dataclass(slots=True, frozen=True)
+class ForkStateFingerprint:
+    """Cheap summary of a fork's state, compared before and after a lease.
+
+    The latest block hash changes with any mined transaction. The accounts
+    catch state written by ``anvil_set*`` cheat calls, which do not mine a block.
+    """
+
+    #: Latest block number
+    block_number: int
+
+    #: Latest block hash
+    block_hash: bytes
+
+    #: (address, balance, nonce, code hash) of each fingerprinted account
+    accounts: tuple[tuple[str, int, int, bytes], ...]
+
+
+def fetch_fork_fingerprint(web3: Web3, addresses: Iterable[str] = ()) -> ForkStateFingerprint:
+    """Take a :class:`ForkStateFingerprint` of a fork.
+
+    :param addresses:
+        Accounts whose balance, nonce and code to include, e.g. whales and
+        contracts the test suite mutates with cheat calls.
+    """
+    block = web3.eth.get_block("latest")
+    accounts = []
+    for address in addresses:
+        address = Web3.to_checksum_address(address)
+        code = web3.eth.get_code(address)
+        accounts.append((address, web3.eth.get_balance(address), web3.eth.get_transaction_count(address), bytes(Web3.keccak(code))))
+    return ForkStateFingerprint(
+        block_number=block["number"],
+        block_hash=bytes(block["hash"]),
+        accounts=tuple(accounts),
+    )
+
+
+@dataclasses.dataclass(slots=True)
+class _ForkLeaseBaseline:
+    """Snapshot and fingerprint a leased fork is reverted to."""
+
+    #: The fork this baseline was taken on; a relaunched fork needs a new one
+    launch: AnvilLaunch
+
+    #: Reusable snapshot, re-taken after every revert
+    snapshot: AnvilSnapshotState
+
+    #: Accounts included in the fingerprint
+    fingerprint_addresses: tuple[str, ...]
+
+    #: State at the first lease
+    fingerprint: ForkStateFingerprint
+
+    #: Completed leases
+    leases: int = 0
+
+    #: A lease is open
+    active: bool = False
+
+
 def is_fork_alive(launch: AnvilLaunch, timeout: float = POOL_LIVENESS_TIMEOUT) -> bool:
     """Check that a pooled Anvil fork still answers JSON-RPC promptly.
 
@@ -466,13 +576,16 @@ class AnvilForkPool:
     launch configuration and reused for every caller (on the same xdist worker)
     that requests it. Call :meth:`close_all` once to tear every launch down.
 
-    Intended for **read-only** fork tests in its current form; see the module
-    warning for the mutating-test caveat.
+    Read-only tests use :meth:`get_web3`, mutating tests :meth:`lease`.
+    See the module docstring.
     """
 
     #: Cached launches keyed by (rpc_url, fork_block_number, sorted launch kwargs).
     launches: dict[tuple, AnvilLaunch] = dataclasses.field(default_factory=dict)
 
+    #: Snapshot baselines of leased forks, same keys as :attr:`launches`.
+    baselines: dict[tuple, _ForkLeaseBaseline] = dataclasses.field(default_factory=dict)
+
     def get_launch(
         self,
         rpc_url: str,
@@ -527,8 +640,8 @@ class AnvilForkPool:
             logger.warning("%s", message)
             self._dispose(key, launch)
             # NOTE: the replacement is a *fresh* fork with clean EVM state. Safe
-            # for the read-only tests this pool serves; a mutating sharer would
-            # have to re-establish its baseline.
+            # for read-only tests, and lease() notices the new launch and takes a
+            # new baseline snapshot.
 
         launch = self._launch(rpc_url, fork_block_number, **launch_kwargs)
         self.launches[key] = launch
@@ -581,6 +694,7 @@ class AnvilForkPool:
         # caller is handed the same dead launch and the group fails anyway,
         # which is the exact failure this method exists to prevent.
         self.launches.pop(key, None)
+        self.baselines.pop(key, None)
         try:
             launch.close(log_level=logging.ERROR)
         except Exception as e:  # noqa: BLE001 - a wedged process can fail to close in many ways
@@ -638,6 +752,109 @@ class AnvilForkPool:
             hint=f"forking upstream provider(s): {_redacted_upstream(rpc_url)}",
         )
 
+    @contextlib.contextmanager
+    def lease(
+        self,
+        rpc_url: str,
+        fork_block_number: int,
+        *,
+        fingerprint_addresses: Iterable[str] = (),
+        max_leases: int = POOL_MAX_LEASES_PER_FORK,
+        web3_retries: int = POOL_WEB3_RETRIES,
+        web3_http_timeout: tuple[float, float] = POOL_WEB3_HTTP_TIMEOUT,
+        **launch_kwargs: Any,
+    ) -> Iterator[Web3]:
+        """Lend a shared fork to a mutating test and revert it afterwards.
+
+        See the "Mutating tests" section of the module docstring.
+
+        :param rpc_url:
+            Upstream archive JSON-RPC URL to fork from.
+
+        :param fork_block_number:
+            Fixed block to fork at.
+
+        :param fingerprint_addresses:
+            Accounts included in the :class:`ForkStateFingerprint`.
+            Fixed by the first lease of a fork.
+
+        :param max_leases:
+            Relaunch the fork after this many leases.
+
+        :param web3_retries:
+            See :meth:`get_web3`.
+
+        :param web3_http_timeout:
+            See :meth:`get_web3`.
+
+        :param launch_kwargs:
+            Additional ``fork_network_anvil`` arguments (part of the cache key).
+
+        :return:
+            Context manager yielding a :class:`web3.Web3` connected to the fork.
+        """
+        key = (rpc_url, fork_block_number, _freeze(launch_kwargs))
+        web3 = self.get_web3(
+            rpc_url,
+            fork_block_number,
+            web3_retries=web3_retries,
+            web3_http_timeout=web3_http_timeout,
+            **launch_kwargs,
+        )
+        launch = self.launches[key]
+
+        baseline = self.baselines.get(key)
+        if baseline is None or baseline.launch is not launch:
+            addresses = tuple(Web3.to_checksum_address(a) for a in fingerprint_addresses)
+            baseline = _ForkLeaseBaseline(
+                launch=launch,
+                snapshot=create_anvil_snapshot_state(web3),
+                fingerprint_addresses=addresses,
+                fingerprint=fetch_fork_fingerprint(web3, addresses),
+            )
+            self.baselines[key] = baseline
+
+        # A nested lease would revert the outer test's state underneath it
+        assert not baseline.active, f"Fork for block {fork_block_number} is already leased"
+        baseline.active = True
+        try:
+            yield web3
+        finally:
+            baseline.active = False
+            baseline.leases += 1
+            self._return_lease(key, baseline, web3, max_leases)
+
+    def _return_lease(self, key: tuple, baseline: _ForkLeaseBaseline, web3: Web3, max_leases: int) -> None:
+        """Revert a leased fork and recycle it if it is not back at its baseline.
+
+        :param key:
+            Registry key of the leased launch.
+
+        :param baseline:
+            Snapshot and fingerprint taken at the first lease.
+
+        :param web3:
+            Web3 the lease was served with.
+
+        :param max_leases:
+            Relaunch after this many leases even if the fork is clean.
+        """
+        try:
+            reset_anvil_snapshot(web3, baseline.snapshot)
+            fingerprint = fetch_fork_fingerprint(web3, baseline.fingerprint_addresses)
+            problem = None if fingerprint == baseline.fingerprint else f"state fingerprint changed from {baseline.fingerprint} to {fingerprint}"
+        except Exception as e:  # noqa: BLE001 - any failure to revert means the fork cannot be trusted
+            problem = f"revert failed: {e}"
+
+        if problem is not None:
+            message = f"Leased Anvil fork at {baseline.launch.json_rpc_url} did not return to its baseline ({problem}) — disposing it."
+            warnings.warn(message, DirtyForkRecycledWarning, stacklevel=3)
+            logger.warning("%s", message)
+            self._dispose(key, baseline.launch)
+        elif baseline.leases >= max_leases:
+            logger.info("Recycling leased Anvil fork %s after %d leases", baseline.launch.json_rpc_url, baseline.leases)
+            self._dispose(key, baseline.launch)
+
     def close_all(self) -> None:
         """Tear down every launched Anvil process.
 
@@ -646,6 +863,7 @@ class AnvilForkPool:
         """
         launches = list(self.launches.values())
         self.launches.clear()
+        self.baselines.clear()
         errors: list[BaseException] = []
         for launch in launches:
             try:
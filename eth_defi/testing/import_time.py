@@ -0,0 +1,186 @@
+"""Import time profiling for scanner entry points.
+
+- Run ``python -X importtime`` for each entry point in a fresh interpreter
+- Report wall time, peak memory, and which top-level packages the time goes to
+- Used by the import budget regression test, ``tests/test_import_time.py``
+
+Run from the command line:
+
+.. code-block:: shell
+
+    python -m eth_defi.testing.import_time eth_defi.vault.scan_all_chains eth_defi.hyperliquid.daily_metrics
+
+Or from Python:
+
+.. code-block:: python
+
+    from eth_defi.testing.import_time import measure_import_time
+
+    report = measure_import_time("eth_defi.vault.scan_all_chains")
+    print(report.format())
+"""
+
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+#: One line of ``-X importtime`` output: ``import time:  self [us] | cumulative | imported package``
+_IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+#: Measured in the child interpreter, printed on the last line of stdout
+_MEASURE_CODE = """
+import resource, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# Linux reports kilobytes, macOS bytes
+rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+print(f"{{elapsed}} {{rss_mb}}")
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class ImportTimeEntry:
+    """One imported module in ``-X importtime`` output."""
+
+    #: Full dotted module name
+    module: str
+
+    #: Time spent in this module body, microseconds
+    self_us: int
+
+    #: Time including the modules it imported first, microseconds
+    cumulative_us: int
+
+    #: Nesting level, 0 for modules imported by the entry point statement itself
+    depth: int
+
+
+@dataclass(slots=True)
+class ImportTimeReport:
+    """Import cost of one entry point."""
+
+    #: Module that was imported
+    entry_point: str
+
+    #: Wall clock time of the import statement, seconds
+    seconds: float
+
+    #: Peak resident memory of the interpreter after the import, megabytes
+    peak_rss_mb: float
+
+    #: All modules loaded by the import, in ``-X importtime`` order
+    entries: list[ImportTimeEntry] = field(default_factory=list)
+
+    def get_package_totals(self) -> dict[str, float]:
+        """Self time summed per top-level package, seconds, largest first."""
+        totals = defaultdict(int)
+        for entry in self.entries:
+            totals[entry.module.split(".")[0]] += entry.self_us
+        return {name: us / 1_000_000 for name, us in sorted(totals.items(), key=lambda item: -item[1])}
+
+    def get_loaded_modules(self) -> set[str]:
+        """Names of all modules the import loaded."""
+        return {entry.module for entry in self.entries}
+
+    def get_import_chain(self, module: str) -> list[str]:
+        """Who imported a module first: ``[module, parent, grandparent, ..., entry point]``.
+
+        Empty list if the module was not loaded.
+        """
+        for i, entry in enumerate(self.entries):
+            if entry.module == module:
+                chain = [module]
+                depth = entry.depth
+                # Parents are printed after their children, with smaller indent
+                for parent in self.entries[i + 1 :]:
+                    if parent.depth < depth:
+                        chain.append(parent.module)
+                        depth = parent.depth
+                return chain
+        return []
+
+    def format(self, top: int = 15) -> str:
+        """Human readable report."""
+        lines = [f"{self.entry_point}: {self.seconds:.2f} s, peak RSS {self.peak_rss_mb:,.0f} MB, {len(self.entries):,} modules"]
+        for name, seconds in list(self.get_package_totals().items())[:top]:
+            lines.append(f"    {name:<40} {seconds:.3f} s")
+        return "\n".join(lines)
+
+
+def parse_import_time(output: str) -> list[ImportTimeEntry]:
+    """Parse ``python -X importtime`` stderr.
+
+    Lines that are not import time records are ignored.
+    """
+    entries = []
+    for line in output.splitlines():
+        match = _IMPORT_TIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(
+                ImportTimeEntry(
+                    module=module,
+                    self_us=int(self_us),
+                    cumulative_us=int(cumulative_us),
+                    depth=(len(indent) - 1) // 2,
+                )
+            )
+    return entries
+
+
+def measure_import_time(
+    entry_point: str,
+    python: str = sys.executable,
+    repeats: int = 1,
+    timeout: float = 120.0,
+) -> ImportTimeReport:
+    """Measure importing a module in a fresh interpreter.
+
+    :param entry_point:
+        Dotted module name.
+
+    :param python:
+        Interpreter to use.
+
+    :param repeats:
+        Run this many times and keep the fastest, to filter out disk cache and scheduling noise.
+
+    :raise RuntimeError:
+        If the import fails.
+    """
+    best = None
+    for _ in range(repeats):
+        result = subprocess.run(
+            [python, "-X", "importtime", "-c", _MEASURE_CODE.format(module=entry_point)],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {entry_point} failed:\n{result.stderr[-4000:]}")
+        seconds, peak_rss_mb = (float(value) for value in result.stdout.strip().splitlines()[-1].split())
+        report = ImportTimeReport(
+            entry_point=entry_point,
+            seconds=seconds,
+            peak_rss_mb=peak_rss_mb,
+            entries=parse_import_time(result.stderr),
+        )
+        if best is None or report.seconds < best.seconds:
+            best = report
+    return best
+
+
+def main(argv: list[str] | None = None):
+    """Print import time reports for entry points given on the command line."""
+    entry_points = (argv if argv is not None else sys.argv[1:]) or ["eth_defi.vault.scan_all_chains"]
+    for entry_point in entry_points:
+        print(measure_import_time(entry_point, repeats=3).format())
+        print()
+
+
+if __name__ == "__main__":
+    main()
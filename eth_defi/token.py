@@ -9,7 +9,6 @@ import datetime
 import json
 import logging
 import os
-import warnings
 from collections import OrderedDict, defaultdict
 from dataclasses import asdict, dataclass, field
 from decimal import Decimal
@@ -18,35 +17,22 @@ from pathlib import Path
 from typing import Any, Iterable, Optional, TypeAlias, TypedDict, Union
 
 import cachetools
-from web3.contract.contract import ContractFunction, ContractFunctions
-
-from eth_defi.compat import native_datetime_utc_now
-from eth_defi.event_reader.conversion import convert_int256_bytes_to_int, convert_solidity_bytes_to_string
-from eth_defi.event_reader.multicall_batcher import EncodedCall, EncodedCallResult, read_multicall_chunked
-from eth_defi.event_reader.web3factory import Web3Factory
-from eth_defi.provider.named import get_provider_name
-from eth_defi.sqlite_cache import PersistentKeyValueStore
-
-with warnings.catch_warnings():
-    # DeprecationWarning: pkg_resources is deprecated as an API. See https://setuptools.pypa.io/en/latest/pkg_resources.html
-    warnings.simplefilter("ignore")
-    try:
-        from eth_tester.exceptions import TransactionFailed
-    except ImportError:
-        # New Web3.py versions got rid of this?
-        # Mock here
-        class TransactionFailed(Exception):
-            pass
-
-
 from eth_typing import HexAddress
 from requests.exceptions import ReadTimeout
 from web3 import Web3
 from web3.contract import Contract
+from web3.contract.contract import ContractFunction, ContractFunctions
 from web3.exceptions import BadFunctionCallOutput, ContractLogicError
 
 from eth_defi.abi import get_deployed_contract
+from eth_defi.compat import native_datetime_utc_now
 from eth_defi.deploy import deploy_contract
+from eth_defi.event_reader.conversion import convert_int256_bytes_to_int, convert_solidity_bytes_to_string
+from eth_defi.event_reader.multicall_batcher import EncodedCall, EncodedCallResult, read_multicall_chunked
+from eth_defi.event_reader.web3factory import Web3Factory
+from eth_defi.provider.named import get_provider_name
+from eth_defi.revert_reason import get_eth_tester_errors
+from eth_defi.sqlite_cache import PersistentKeyValueStore
 from eth_defi.utils import sanitise_string
 
 logger = logging.getLogger(__name__)
@@ -54,7 +40,13 @@ logger = logging.getLogger(__name__)
 #: List of exceptions JSON-RPC provider can through when ERC-20 field look-up fails
 #: TODO: Add exceptios from real HTTPS/WSS providers
 #: `ValueError` is raised by Ganache
-_call_missing_exceptions = (TransactionFailed, BadFunctionCallOutput, ValueError, ContractLogicError)
+_call_missing_exceptions = (BadFunctionCallOutput, ValueError, ContractLogicError)
+
+
+def _get_call_missing_exceptions() -> tuple[type[Exception], ...]:
+    # EthereumTester TransactionFailed only when the tester is loaded, see get_eth_tester_errors()
+    return _call_missing_exceptions + get_eth_tester_errors()
+
 
 #: By default we cache 1024 token details using LRU in the process memory.
 #:
@@ -210,7 +202,6 @@ from eth_defi.stablecoin_metadata import (  # noqa: E402
     normalise_token_symbol,
 )
 
-
 #: Some test accounts with funded USDC for Anvil mainnet forking
 #:
 #: TBD: In theory we can find ERC-20 balance slots and write value there with Anvil, but
@@ -663,7 +654,7 @@ def fetch_erc20_details(
         # and we need to manually clean up these all the time
         provider_name = get_provider_name(web3.provider)
         raise TokenDetailError(f"Token {token_address} timeout reading on chain {chain_id}: {e}, provider {provider_name}") from e
-    except _call_missing_exceptions as e:
+    except _get_call_missing_exceptions() as e:
         if raise_on_error:
             raise TokenDetailError(f"Token {token_address} missing symbol on chain {chain_id}: {e}") from e
         symbol = None
@@ -692,7 +683,7 @@ def fetch_erc20_details(
                 raise
             else:
                 name = None
-    except _call_missing_exceptions as e:
+    except _get_call_missing_exceptions() as e:
         if raise_on_error:
             raise TokenDetailError(f"Token {token_address} missing name: {e}") from e
         name = None
@@ -705,14 +696,14 @@ def fetch_erc20_details(
 
     try:
         decimals = erc_20.functions.decimals().call()
-    except _call_missing_exceptions as e:
+    except _get_call_missing_exceptions() as e:
         if raise_on_error:
             raise TokenDetailError(f"Token {token_address} missing decimals") from e
         decimals = 0
 
     try:
         supply = erc_20.functions.totalSupply().call()
-    except _call_missing_exceptions as e:
+    except _get_call_missing_exceptions() as e:
         if raise_on_error:
             raise TokenDetailError(f"Token {token_address} missing totalSupply") from e
         supply = None
@@ -162,6 +162,7 @@ from eth_defi.tokenised_fund.spiko.constants import EUTBL_TOKEN_ADDRESS, USTBL_T
 from eth_defi.tokenised_fund.sygnum.constants import FILQ_CURATOR_SLUG, SYGNUM_PRODUCTS_BY_CHAIN
 from eth_defi.tokenised_fund.wisdomtree.constants import WTGXX_ETHEREUM
 from eth_defi.types import ISODateString
+from eth_defi.vault.name_matcher import WordBoundaryMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -629,6 +630,12 @@ _cached_curator_map: dict[str, CuratorInfo] | None = None
 #: In-process cache for :py:func:`_build_matching_patterns`.
 _cached_patterns: list[tuple[re.Pattern, str]] | None = None
 
+#: In-process cache for :py:func:`_build_name_matcher`.
+_cached_name_matcher: tuple[WordBoundaryMatcher, list[str]] | None = None
+
+#: In-process cache for :py:func:`_build_protocol_manager_index`.
+_cached_protocol_manager_index: dict[tuple[str, str], str] | None = None
+
 
 def _load_curator_yaml(yaml_path: Path) -> CuratorInfo:
     """Load a single curator YAML file into a :py:class:`CuratorInfo`.
@@ -716,27 +723,18 @@ def load_curator_map() -> dict[str, CuratorInfo]:
     return result
 
 
-def _build_matching_patterns() -> list[tuple[re.Pattern, str]]:
-    """Build word-boundary regex patterns for curator name matching.
+def _get_pattern_texts() -> list[tuple[str, str]]:
+    """Curator name patterns in matching priority order.
 
     Combines each curator's YAML ``name`` field with any extra
-    patterns from :py:data:`CURATOR_NAME_PATTERNS`.  Patterns are
-    sorted by length descending so that longer (more specific)
-    patterns match first, preventing ambiguous short matches.
+    patterns from :py:data:`CURATOR_NAME_PATTERNS`.
 
     :return:
-        List of ``(compiled_regex, curator_slug)`` pairs, longest
-        pattern first.
+        List of ``(pattern_text, curator_slug)`` pairs. Sponsor
+        patterns come last, longer patterns first within each group.
     """
-    global _cached_patterns  # noqa: PLW0603
-
-    if _cached_patterns is not None:
-        return _cached_patterns
-
-    curator_map = load_curator_map()
     raw_pairs: list[tuple[str, str]] = []
-
-    for slug, info in curator_map.items():
+    for slug, info in load_curator_map().items():
         # Always include the YAML name
         raw_pairs.append((info["name"], slug))
         # Include any supplementary patterns
@@ -746,9 +744,28 @@ def _build_matching_patterns() -> list[tuple[re.Pattern, str]]:
     # Sponsor patterns are matched last, while longer patterns win within each
     # group.
     raw_pairs.sort(key=lambda pair: (pair[1] in SPONSOR_CURATOR_SLUGS, -len(pair[0])))
+    return raw_pairs
+
+
+def _build_matching_patterns() -> list[tuple[re.Pattern, str]]:
+    """Build word-boundary regex patterns for curator name matching.
+
+    Patterns are sorted by length descending so that longer (more specific)
+    patterns match first, preventing ambiguous short matches.
+    :py:func:`identify_curator` uses the equivalent single-pass
+    :py:func:`_build_name_matcher`; the regexes are kept as the reference.
+
+    :return:
+        List of ``(compiled_regex, curator_slug)`` pairs, longest
+        pattern first.
+    """
+    global _cached_patterns  # noqa: PLW0603
+
+    if _cached_patterns is not None:
+        return _cached_patterns
 
     patterns = []
-    for pattern_text, slug in raw_pairs:
+    for pattern_text, slug in _get_pattern_texts():
         regex = re.compile(r"\b" + re.escape(pattern_text) + r"\b", re.IGNORECASE)
         patterns.append((regex, slug))
 
@@ -756,6 +773,49 @@ def _build_matching_patterns() -> list[tuple[re.Pattern, str]]:
     return patterns
 
 
+def _build_name_matcher() -> tuple[WordBoundaryMatcher, list[str]]:
+    """Build a single-pass matcher over the curator name patterns.
+
+    Same patterns and priority order as :py:func:`_build_matching_patterns`:
+    sponsors last, longer patterns first.
+
+    :return:
+        Tuple ``(matcher, slugs)`` where ``slugs[i]`` is the curator
+        of phrase ``i``.
+    """
+    global _cached_name_matcher  # noqa: PLW0603
+
+    if _cached_name_matcher is not None:
+        return _cached_name_matcher
+
+    pairs = _get_pattern_texts()
+    matcher = WordBoundaryMatcher([pattern_text for pattern_text, _ in pairs])
+    _cached_name_matcher = (matcher, [slug for _, slug in pairs])
+    return _cached_name_matcher
+
+
+def _build_protocol_manager_index() -> dict[tuple[str, str], str]:
+    """Index curator slugs by ``(protocol slug, casefolded manager name)``.
+
+    When two curators list the same value, the first one in
+    :py:func:`load_curator_map` order wins.
+    """
+    global _cached_protocol_manager_index  # noqa: PLW0603
+
+    if _cached_protocol_manager_index is not None:
+        return _cached_protocol_manager_index
+
+    index: dict[tuple[str, str], str] = {}
+    for slug, info in load_curator_map().items():
+        for protocol_slug, raw_values in info["protocol_manager_names"].items():
+            values = (raw_values,) if isinstance(raw_values, str) else raw_values
+            for value in values:
+                index.setdefault((protocol_slug, value.casefold()), slug)
+
+    _cached_protocol_manager_index = index
+    return index
+
+
 def _identify_curator_by_protocol_manager_name(protocol_slug: str, manager_name: str | None) -> str | None:
     """Identify curator from an exact protocol-specific manager metadata field.
 
@@ -779,13 +839,10 @@ def _identify_curator_by_protocol_manager_name(protocol_slug: str, manager_name:
     if protocol_slug in {"lagoon-finance", "upshift"}:
         manager_names = tuple(name.strip() for name in manager_name.split(",") if name.strip())
 
+    index = _build_protocol_manager_index()
     for manager_name in manager_names:
-        manager_name_lower = manager_name.casefold()
-        for slug, info in load_curator_map().items():
-            raw_values = info["protocol_manager_names"].get(protocol_slug, ())
-            values = (raw_values,) if isinstance(raw_values, str) else raw_values
-            if any(value.casefold() == manager_name_lower for value in values):
-                return slug
+        if slug := index.get((protocol_slug, manager_name.casefold())):
+            return slug
     return None
 
 
@@ -824,6 +881,42 @@ def _identify_curator_by_patterns(
     return None
 
 
+def _identify_curator_by_name(
+    haystack: str | None,
+    *,
+    include_slugs: set[str] | None = None,
+    exclude_slugs: set[str] | None = None,
+) -> str | None:
+    """Identify a curator by name patterns in a single pass.
+
+    Gives the same result as :py:func:`_identify_curator_by_patterns`
+    over :py:func:`_build_matching_patterns`, but scans the text once
+    instead of once per pattern.
+
+    :param haystack:
+        Text to match, or ``None``/empty string to skip.
+    :param include_slugs:
+        When given, only these curator slugs are considered.
+    :param exclude_slugs:
+        When given, these curator slugs are ignored.
+    :return:
+        Matching curator slug, or ``None`` if no pattern matched.
+    """
+    if not haystack:
+        return None
+
+    matcher, slugs = _build_name_matcher()
+    for idx in sorted(matcher.find_all(haystack)):
+        slug = slugs[idx]
+        if include_slugs is not None and slug not in include_slugs:
+            continue
+        if exclude_slugs is not None and slug in exclude_slugs:
+            continue
+        return slug
+
+    return None
+
+
 def _identify_curator_by_address(chain_id: int, vault_address: str | None) -> str | None:
     """Identify a curator from an exact vault address override.
 
@@ -945,17 +1038,16 @@ def identify_curator(  # noqa: PLR0917
             return "grvt"
 
     # 7. Exact protocol-specific manager name mapping from offchain APIs.
-    patterns = _build_matching_patterns()
     if manager_slug := _identify_curator_by_protocol_manager_name(protocol_slug, manager_name):
         return manager_slug
 
     # 8. Ordinary vault-name fuzzy matching. Protocol-bound curators must have
     #    already matched by protocol slug and cannot be inferred from an asset.
-    if vault_slug := _identify_curator_by_patterns(vault_name, patterns, exclude_slugs=PROTOCOL_BOUND_CURATOR_SLUGS):
+    if vault_slug := _identify_curator_by_name(vault_name, exclude_slugs=PROTOCOL_BOUND_CURATOR_SLUGS):
         return vault_slug
 
     # 9. Legacy fuzzy matching against manager name for native marketplaces like GRVT.
-    if manager_slug := _identify_curator_by_patterns(manager_name, patterns, exclude_slugs=PROTOCOL_BOUND_CURATOR_SLUGS):
+    if manager_slug := _identify_curator_by_name(manager_name, exclude_slugs=PROTOCOL_BOUND_CURATOR_SLUGS):
         return manager_slug
 
     return None
@@ -11,7 +11,8 @@ from pathlib import Path
 
 from tqdm_loggable.auto import tqdm
 
-from eth_defi.cloudflare_r2 import copy_r2_object_daily_backup, create_r2_client, upload_file_to_r2
+from eth_defi.cloudflare_r2 import copy_r2_object_daily_backup, create_r2_client
+from eth_defi.cloudflare_r2_uploader import R2_MULTIPART_CONCURRENCY, R2_UPLOADER_MAX_WORKERS, R2Uploader, get_default_r2_upload_manifest
 from eth_defi.core3.constants import resolve_core3_database_path
 from eth_defi.currency_api.constants import CURRENCY_API_DATABASE
 from eth_defi.xerberus.constants import resolve_xerberus_database_path
@@ -93,9 +94,13 @@ def upload_files_to_r2(  # noqa: PLR0917
     secret_access_key: str,
     key_prefix: str = "",
     public_url: str = "",
+    max_workers: int = R2_UPLOADER_MAX_WORKERS,
 ) -> int:
     """Upload a list of files to R2 bucket, excluding tmp* files.
 
+    Files are uploaded in parallel with :py:class:`~eth_defi.cloudflare_r2_uploader.R2Uploader`,
+    large files in multipart uploads.
+
     :param file_paths:
         List of file paths to upload.
     :param bucket_name:
@@ -110,6 +115,8 @@ def upload_files_to_r2(  # noqa: PLR0917
         Prefix for S3 keys, e.g. ``test-`` for test uploads.
     :param public_url:
         Public base URL for logging final download URLs.
+    :param max_workers:
+        Parallel file uploads.
     :return:
         Number of files uploaded.
     """
@@ -137,41 +144,34 @@ def upload_files_to_r2(  # noqa: PLR0917
         endpoint_url=endpoint_url,
         access_key_id=access_key_id,
         secret_access_key=secret_access_key,
+        max_pool_connections=max_workers * R2_MULTIPART_CONCURRENCY,
     )
 
     uploaded_count = 0
     skipped_count = 0
 
-    for file_path in files_to_upload:
+    total_size = sum(file_path.stat().st_size for file_path in files_to_upload)
+    with (
+        R2Uploader(s3_client, bucket_name, manifest=get_default_r2_upload_manifest(), max_workers=max_workers) as uploader,
+        tqdm(total=total_size, unit="B", unit_scale=True, desc=f"Uploading {len(files_to_upload)} files to {bucket_name}") as progress_bar,
+    ):
         # Data file exports intentionally use flat object keys so Core3 sits
         # next to the vault parquet/pickle files consumed by downstream jobs.
-        s3_key = f"{key_prefix}{file_path.name}"
-        file_size = file_path.stat().st_size
-
-        with tqdm(total=file_size, unit="B", unit_scale=True, desc=f"Uploading {s3_key}") as progress_bar:
-
-            def upload_callback(bytes_amount: int) -> None:
-                progress_bar.update(bytes_amount)
-
-            uploaded = upload_file_to_r2(
-                s3_client=s3_client,
-                file_path=file_path,
-                bucket_name=bucket_name,
-                object_name=s3_key,
-                skip_if_current=True,
-                callback=upload_callback,
-            )
-
-        if uploaded:
-            uploaded_count += 1
-            logger.info("Uploaded %s to s3://%s/%s", file_path, bucket_name, s3_key)
-        else:
-            skipped_count += 1
-            logger.info("Skipped unchanged file %s for s3://%s/%s", file_path, bucket_name, s3_key)
-
-        if public_url and uploaded:
-            final_url = f"{public_url.rstrip('/')}/{s3_key}"
-            print(f"  -> {final_url}")
+        futures = {file_path: uploader.submit_file(file_path, f"{key_prefix}{file_path.name}", callback=progress_bar.update) for file_path in files_to_upload}
+
+        for file_path, future in futures.items():
+            s3_key = f"{key_prefix}{file_path.name}"
+            uploaded = future.result()
+            if uploaded:
+                uploaded_count += 1
+                logger.info("Uploaded %s to s3://%s/%s", file_path, bucket_name, s3_key)
+            else:
+                skipped_count += 1
+                logger.info("Skipped unchanged file %s for s3://%s/%s", file_path, bucket_name, s3_key)
+
+            if public_url and uploaded:
+                final_url = f"{public_url.rstrip('/')}/{s3_key}"
+                print(f"  -> {final_url}")
 
     logger.info(
         "Data file upload summary for bucket %s: %d uploaded, %d skipped unchanged",
@@ -10,13 +10,12 @@ import eth_abi
 from eth_typing import HexAddress
 from web3 import Web3
 
-from eth_defi.utils import from_unix_timestamp
-
 try:
     import hypersync
-    from hypersync import BlockField, LogField
+    import pyarrow as pa
+    import pyarrow.compute as pc
 
-    from eth_defi.hypersync.session import open_hypersync_stream
+    from eth_defi.hypersync.log_query import TOPIC_COLUMNS, HypersyncLogQueryEngine, LogQuerySpec, create_log_segment_cache_from_env, decode_hex_column, fetch_log_cache_horizon
 except ImportError:
     hypersync = None
 
@@ -177,6 +176,8 @@ async def _fetch_vault_flow_logs_hypersync_async(
     start_block: int,
     end_block: int,
     recv_timeout: float = 90.0,
+    chain_id: int | None = None,
+    cacheable_until_block: int | None = None,
 ) -> list[IndexedVaultFlowLog]:
     """Fetch raw vault request logs with Hypersync.
 
@@ -198,6 +199,12 @@ async def _fetch_vault_flow_logs_hypersync_async(
     :param recv_timeout:
         Timeout for each stream receive.
 
+    :param chain_id:
+        Chain of the client, see :py:func:`_fetch_vault_flow_logs_for_addresses_hypersync_async`.
+
+    :param cacheable_until_block:
+        Highest block safe to cache.
+
     :return:
         Raw logs sorted by ``(block_number, log_index)``.
     """
@@ -208,6 +215,8 @@ async def _fetch_vault_flow_logs_hypersync_async(
         start_block=start_block,
         end_block=end_block,
         recv_timeout=recv_timeout,
+        chain_id=chain_id,
+        cacheable_until_block=cacheable_until_block,
     )
 
 
@@ -219,6 +228,8 @@ async def _fetch_vault_flow_logs_for_addresses_hypersync_async(
     start_block: int,
     end_block: int,
     recv_timeout: float = 90.0,
+    chain_id: int | None = None,
+    cacheable_until_block: int | None = None,
 ) -> list[IndexedVaultFlowLog]:
     """Fetch raw vault request logs for multiple vaults with Hypersync.
 
@@ -240,6 +251,16 @@ async def _fetch_vault_flow_logs_for_addresses_hypersync_async(
     :param recv_timeout:
         Timeout for each stream receive.
 
+    :param chain_id:
+        Chain of the client.
+
+        If given, logs are read through the segment cache
+        enabled by ``HYPERSYNC_LOG_CACHE_PATH``, see :py:func:`~eth_defi.hypersync.log_query.create_log_segment_cache_from_env`.
+
+    :param cacheable_until_block:
+        Highest block safe to cache, see :py:func:`~eth_defi.hypersync.log_query.fetch_log_cache_horizon`.
+        ``None`` reads the cache, but does not write it.
+
     :return:
         Raw logs sorted by ``(block_number, log_index)``.
     """
@@ -247,57 +268,47 @@ async def _fetch_vault_flow_logs_for_addresses_hypersync_async(
     assert start_block <= end_block, f"Bad block range: {start_block} - {end_block}"
     assert vault_addresses, "Vault address list cannot be empty"
 
-    query = hypersync.Query(
-        from_block=start_block,
-        # Hypersync uses an exclusive to_block.
-        to_block=end_block + 1,
-        logs=[
-            hypersync.LogSelection(
-                address=[str(address).lower() for address in vault_addresses],
-                topics=[topic0_list],
-            )
-        ],
-        field_selection=hypersync.FieldSelection(
-            block=[BlockField.NUMBER, BlockField.TIMESTAMP],
-            log=[
-                LogField.BLOCK_NUMBER,
-                LogField.LOG_INDEX,
-                LogField.ADDRESS,
-                LogField.TRANSACTION_HASH,
-                LogField.TOPIC0,
-                LogField.TOPIC1,
-                LogField.TOPIC2,
-                LogField.TOPIC3,
-                LogField.DATA,
-            ],
-        ),
+    spec = LogQuerySpec.create(
+        addresses=vault_addresses,
+        topics=[topic0_list],
+        start_block=start_block,
+        end_block=end_block,
     )
-
-    receiver = await open_hypersync_stream(hypersync_client, query)
-    events: list[IndexedVaultFlowLog] = []
-    while True:
-        res = await asyncio.wait_for(receiver.recv(), timeout=recv_timeout)
-        if res is None:
-            break
-
-        block_timestamps = {int(block.number): from_unix_timestamp(decode_hypersync_int(block.timestamp)) for block in res.data.blocks or [] if block.number is not None and block.timestamp is not None}
-
-        for log in res.data.logs or []:
-            block_number = decode_hypersync_int(log.block_number)
-            events.append(
-                IndexedVaultFlowLog(
-                    address=Web3.to_checksum_address(log.address),
-                    topics=log.topics,
-                    data=log.data or "0x",
-                    block_number=block_number,
-                    block_timestamp=block_timestamps.get(block_number),
-                    transaction_hash=log.transaction_hash,
-                    log_index=decode_hypersync_int(log.log_index),
-                )
-            )
-
-    events.sort(key=lambda e: (e.block_number, e.log_index))
-    return events
+    engine = HypersyncLogQueryEngine(
+        hypersync_client,
+        chain_id,
+        cache=create_log_segment_cache_from_env() if chain_id is not None else None,
+        cacheable_until_block=cacheable_until_block,
+        recv_timeout=recv_timeout,
+    )
+    table = await engine.fetch_async(spec)
+
+    # Convert whole columns, not row dicts
+    addresses = table["address"].to_pylist()
+    checksummed = {address: Web3.to_checksum_address(address) for address in set(addresses)}
+    topics = list(zip(*[decode_hex_column(table[name]) for name in TOPIC_COLUMNS]))
+    timestamps = pc.cast(table["block_timestamp"], pa.timestamp("s")).to_pylist()
+
+    return [
+        IndexedVaultFlowLog(
+            address=checksummed[address],
+            topics=list(log_topics),
+            data=data,
+            block_number=block_number,
+            block_timestamp=timestamp,
+            transaction_hash=transaction_hash,
+            log_index=log_index,
+        )
+        for address, log_topics, data, block_number, timestamp, transaction_hash, log_index in zip(
+            addresses,
+            topics,
+            decode_hex_column(table["data"]),
+            table["block_number"].to_pylist(),
+            timestamps,
+            table["transaction_hash"].to_pylist(),
+            table["log_index"].to_pylist(),
+        )
+    ]
 
 
 def decode_hypersync_int(value: int | str) -> int:
@@ -386,6 +397,7 @@ def fetch_vault_flow_logs_hypersync(
     topic0_list: list[str],
     start_block: int,
     end_block: int,
+    web3: Web3 | None = None,
 ) -> list[IndexedVaultFlowLog]:
     """Fetch raw vault request logs with Hypersync.
 
@@ -407,6 +419,9 @@ def fetch_vault_flow_logs_hypersync(
     :param end_block:
         Inclusive end block.
 
+    :param web3:
+        Web3 connection for the vault chain, to use the Hypersync log segment cache.
+
     :return:
         Raw logs sorted by ``(block_number, log_index)``.
     """
@@ -416,6 +431,7 @@ def fetch_vault_flow_logs_hypersync(
         topic0_list=topic0_list,
         start_block=start_block,
         end_block=end_block,
+        web3=web3,
     )
 
 
@@ -426,6 +442,7 @@ def fetch_vault_flow_logs_for_addresses_hypersync(
     topic0_list: list[str],
     start_block: int,
     end_block: int,
+    web3: Web3 | None = None,
 ) -> list[IndexedVaultFlowLog]:
     """Fetch raw vault request logs for multiple vaults with Hypersync.
 
@@ -447,15 +464,27 @@ def fetch_vault_flow_logs_for_addresses_hypersync(
     :param end_block:
         Inclusive end block.
 
+    :param web3:
+        Web3 connection for the vault chain.
+
+        If given and ``HYPERSYNC_LOG_CACHE_PATH`` is set, finalised blocks
+        are read from and written to the Hypersync log segment cache.
+
     :return:
         Raw logs sorted by ``(block_number, log_index)``.
     """
+    chain_id = cacheable_until_block = None
+    if web3 is not None and create_log_segment_cache_from_env() is not None:
+        chain_id, cacheable_until_block = fetch_log_cache_horizon(web3)
+
     coroutine = _fetch_vault_flow_logs_for_addresses_hypersync_async(
         hypersync_client=hypersync_client,
         vault_addresses=vault_addresses,
         topic0_list=topic0_list,
         start_block=start_block,
         end_block=end_block,
+        chain_id=chain_id,
+        cacheable_until_block=cacheable_until_block,
     )
     return run_vault_flow_log_fetch(coroutine)
 
@@ -39,14 +39,14 @@ from eth_defi.compat import native_datetime_utc_now
 from eth_defi.erc_4626.vault import VaultReaderState
 from eth_defi.erc_4626.warmup import warmup_vault_reader
 from eth_defi.event_reader.multicall_batcher import BatchCallState, EncodedCall, EncodedCallResult, get_multicall_contract, read_multicall_historical, read_multicall_historical_stateful
+from eth_defi.event_reader.multicall_cache import MulticallResultCache
 from eth_defi.event_reader.timestamp_cache import DEFAULT_TIMESTAMP_CACHE_FOLDER
 from eth_defi.event_reader.web3factory import Web3Factory
 from eth_defi.middleware import ProbablyNodeHasNoBlock
 from eth_defi.provider.broken_provider import get_almost_latest_block_number
 from eth_defi.provider.rpcdb import RPCRequestStats
 from eth_defi.token import TokenDetails, TokenDiskCache, fetch_erc20_details
-from eth_defi.utils import chunked
-from eth_defi.vault.base import VaultBase, VaultHistoricalRead, VaultHistoricalReader, VaultSpec, verify_parquet_file
+from eth_defi.vault.base import VaultBase, VaultHistoricalRead, VaultHistoricalReadBatchBuilder, VaultHistoricalReader, VaultSpec, verify_parquet_file
 from eth_defi.vault.risk import BROKEN_VAULT_CONTRACTS
 from eth_defi.version_info import stamp_parquet_schema_metadata
 
@@ -197,10 +197,14 @@ class VaultHistoricalReadMulticaller:
         hypersync_client: "hypersync.HypersyncClient | None" = None,
         timestamp_cache_file: Path = DEFAULT_TIMESTAMP_CACHE_FOLDER,
         rpc_request_stats: RPCRequestStats | None = None,
+        multicall_cache: MulticallResultCache | None = None,
     ):
         """
         :param supported_quote_tokens:
             Allows us to validate vaults against list of supported tokens
+
+        :param multicall_cache:
+            Persistent cache for finalised block multicall results
         """
 
         if supported_quote_tokens is not None:
@@ -213,6 +217,7 @@ class VaultHistoricalReadMulticaller:
         self.hypersync_client = hypersync_client
         self.timestamp_cache_file = timestamp_cache_file
         self.rpc_request_stats = rpc_request_stats
+        self.multicall_cache = multicall_cache
 
         if token_cache is None:
             token_cache = TokenDiskCache()
@@ -584,6 +589,7 @@ class VaultHistoricalReadMulticaller:
             hypersync_client=self.hypersync_client,
             timestamp_cache_file=self.timestamp_cache_file,
             rpc_request_stats=self.rpc_request_stats,
+            multicall_cache=self.multicall_cache,
         ):
             total_combined_results += 1
 
@@ -685,6 +691,7 @@ def scan_historical_prices_to_parquet(
     timestamp_cache_file=DEFAULT_TIMESTAMP_CACHE_FOLDER,
     vault_addresses: set[str] | None = None,
     rpc_request_stats: RPCRequestStats | None = None,
+    multicall_cache: MulticallResultCache | None = None,
 ) -> ParquetScanResult:
     """Scan all historical vault share prices of vaults and save them in to Parquet file.
 
@@ -744,7 +751,10 @@ def scan_historical_prices_to_parquet(
         timestamps.
 
     :param chunk_size:
-        How many rows to write to the Parquet file in one buffer.
+        How many rows to write to the Parquet file in one row group.
+
+        Together with the streamed rewrite of existing rows,
+        this bounds the memory use of the scan.
 
     :param max_workers:
         Number of subprocesses to use for multicall
@@ -766,12 +776,19 @@ def scan_historical_prices_to_parquet(
     :param rpc_request_stats:
         Optional phase accumulator for physical JSON-RPC request accounting.
 
+    :param multicall_cache:
+        Persistent cache of multicall results at finalised blocks.
+
+        Re-running a crashed scan, or rewriting a subset of vaults,
+        reads the already fetched blocks from the disk instead of the RPC.
+        The finalised block horizon is refreshed from ``web3`` before the scan.
+
     :return:
         Scan report.
     """
 
     import pyarrow as pa
-    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
     import pyarrow.parquet as pq
 
     stateful = reader_states is not None
@@ -834,6 +851,10 @@ def scan_historical_prices_to_parquet(
             end_block=end_block,
         )
 
+    if multicall_cache is not None:
+        finalised_block = multicall_cache.update_finalised_block(web3)
+        logger.info("Using multicall result cache %s for blocks up to %s", multicall_cache.path, f"{finalised_block:,}")
+
     reader = VaultHistoricalReadMulticaller(
         web3factory,
         supported_quote_tokens=None,
@@ -844,6 +865,7 @@ def scan_historical_prices_to_parquet(
         hypersync_client=hypersync_client,
         timestamp_cache_file=timestamp_cache_file,
         rpc_request_stats=rpc_request_stats,
+        multicall_cache=multicall_cache,
     )
 
     reader_func = read_multicall_historical_stateful if stateful else read_multicall_historical
@@ -888,50 +910,31 @@ def scan_historical_prices_to_parquet(
     rows_written_by_vault: dict[str, int] = defaultdict(int)
     price_rows_written_by_vault: dict[str, int] = defaultdict(int)
 
-    # Convert VaultHistoricalRead objects to exportable dicts for Parquet
-    def converter(entries_iter: Iterable[VaultHistoricalRead]) -> Iterable[dict]:
-        for entry in entries_iter:
-            vault_address = entry.vault.vault_address.lower()
-            rows_written_by_vault[vault_address] += 1
-            if entry.share_price is not None:
-                price_rows_written_by_vault[vault_address] += 1
-            yield entry.export()
-
-    converted_iter = converter(entries_iter)
-
     # Always use the current canonical schema so new columns are not silently dropped
     canonical_schema = VaultHistoricalRead.to_pyarrow_schema()
 
+    # Stream the existing rows through a dataset scanner instead of loading the whole table,
+    # so rewriting a large multichain file runs in a fixed memory budget
     if output_fname.exists():
-        logger.info("Reading existing Parquet file %s", output_fname)
-        existing_table = pq.read_table(output_fname)
-        existing_table = VaultHistoricalRead.migrate_parquet_schema(existing_table)
+        logger.info("Scanning existing Parquet file %s", output_fname)
+        existing_dataset = ds.dataset(output_fname, format="parquet")
     else:
         logger.info("Creating Parquet from the scratch %s", output_fname)
-        existing_table = None
+        existing_dataset = None
 
-    if existing_table is not None:
-        logger.info(
-            "Detected existing file %s with %d rows",
-            output_fname,
-            len(existing_table),
-        )
+    if existing_dataset is not None:
         # Clear existing entries for this chain
         # When vault_addresses is set, only delete rows for those specific vaults
         # to preserve other vaults' data
-        mask = pc.and_(
-            pc.equal(existing_table["chain"], chain_id),
-            pc.greater_equal(existing_table["block_number"], start_block),
-        )
+        delete_expr = (ds.field("chain") == chain_id) & (ds.field("block_number") >= start_block)
         if vault_addresses:
-            address_mask = pc.is_in(existing_table["address"], pa.array(list(vault_addresses)))
-            mask = pc.and_(mask, address_mask)
-        all_row_count = len(existing_table)
-        rows_deleted = pc.sum(mask).as_py() or 0
-        existing_table = existing_table.filter(pc.invert(mask))
-        existing_row_count = existing_table.num_rows
+            delete_expr = delete_expr & ds.field("address").isin(list(vault_addresses))
+        keep_expr = ~delete_expr
+        all_row_count = existing_dataset.count_rows()
+        rows_deleted = existing_dataset.count_rows(filter=delete_expr)
+        existing_row_count = existing_dataset.count_rows(filter=keep_expr)
         logger.info(
-            "Removed existing %d rows out of %d rows for chain %d from the vault time-series data, existing table has %d rows",
+            "Removing existing %d rows out of %d rows for chain %d from the vault time-series data, existing table has %d rows",
             rows_deleted,
             all_row_count,
             chain_id,
@@ -940,7 +943,7 @@ def scan_historical_prices_to_parquet(
         existing = True
     else:
         logger.info("No existing table, no removed rows")
-        existing_table = None
+        keep_expr = None
         rows_deleted = 0
         existing = False
         existing_row_count = 0
@@ -948,9 +951,9 @@ def scan_historical_prices_to_parquet(
     # Build a unified writer schema: canonical columns + any extra columns
     # from native protocol merges (e.g. account_pnl, leader_fraction).
     # This preserves native protocol data when the EVM scanner rewrites the file.
-    if existing_table is not None:
+    if existing_dataset is not None:
         canonical_names = set(canonical_schema.names)
-        extra_fields = [f for f in existing_table.schema if f.name not in canonical_names]
+        extra_fields = [f for f in existing_dataset.schema if f.name not in canonical_names and f.name not in VaultHistoricalRead._LEGACY_COLUMNS]
         writer_schema = canonical_schema
         for field in extra_fields:
             writer_schema = writer_schema.append(field)
@@ -961,8 +964,8 @@ def scan_historical_prices_to_parquet(
     # combining native-only fields so every rewrite refreshes the provenance.
     writer_schema = stamp_parquet_schema_metadata(writer_schema)
 
-    if existing_table is not None:
-        existing_table = existing_table.replace_schema_metadata(writer_schema.metadata)
+    # Reads go straight to typed column buffers, one Parquet row group per chunk
+    batch_builder = VaultHistoricalReadBatchBuilder(chunk_size, writer_schema)
 
     # Perform atomic update of the prices Parquet file.
     #
@@ -981,8 +984,12 @@ def scan_historical_prices_to_parquet(
     try:
         # Initialize ParquetWriter with the unified schema
         writer = pq.ParquetWriter(temp_fname, writer_schema, compression=compression)
-        if existing_table is not None:
-            writer.write_table(existing_table)
+        if existing_dataset is not None:
+            for batch in existing_dataset.to_batches(filter=keep_expr):
+                if batch.num_rows == 0:
+                    continue
+                existing_batch = VaultHistoricalRead.migrate_parquet_schema(pa.Table.from_batches([batch]))
+                writer.write_table(existing_batch.select(writer_schema.names).cast(writer_schema))
 
         rows_written = 0
 
@@ -1001,22 +1008,23 @@ def scan_historical_prices_to_parquet(
 
         chunks_done = 0
         written_at = native_datetime_utc_now()
-        for chunk in chunked(converted_iter, chunk_size):
-            logger.debug(f"Processing Parquet chunk {chunks_done:,}, rows written so far {rows_written:,}")
-            table = pa.Table.from_pylist(chunk, schema=canonical_schema)
-            # Stamp all rows in this batch with the same write timestamp
-            table = table.set_column(
-                table.schema.get_field_index("written_at"),
-                "written_at",
-                pa.array([written_at] * len(table), type=pa.timestamp("ms")),
-            )
-            # Pad with null columns for any extra native protocol fields
-            # so new EVM rows match the unified writer schema
-            for field in writer_schema:
-                if field.name not in table.schema.names:
-                    table = table.append_column(field, pa.nulls(len(table), type=field.type))
-            writer.write_table(table)
-            rows_written += len(chunk)
+        for entry in entries_iter:
+            vault_address = entry.vault.vault_address.lower()
+            rows_written_by_vault[vault_address] += 1
+            if entry.share_price is not None:
+                price_rows_written_by_vault[vault_address] += 1
+
+            batch_builder.append(entry)
+            if batch_builder.is_full():
+                logger.debug(f"Processing Parquet chunk {chunks_done:,}, rows written so far {rows_written:,}")
+                # Stamp all rows in this batch with the same write timestamp
+                writer.write_batch(batch_builder.flush(written_at))
+                rows_written += chunk_size
+                chunks_done += 1
+
+        if len(batch_builder):
+            rows_written += len(batch_builder)
+            writer.write_batch(batch_builder.flush(written_at))
             chunks_done += 1
 
         # Close the writer to finalise the file, then flush to disk
@@ -0,0 +1,336 @@
+"""Streaming JSON writer for vault exports.
+
+The top vaults export used to validate the whole output document with
+a recursive Python walk, run a second :py:func:`json.dumps` over it as
+a strict check, and then write it with ``json.dump(indent=2)``, which
+falls back to the pure-Python encoder.  For tens of thousands of vault
+records this was most of the export step's CPU time.
+
+:py:class:`JSONStreamWriter` writes a JSON object member by member and
+container members element by element:
+
+- Each element is encoded once with :py:mod:`orjson`, which also checks the types
+- Non-finite floats, which orjson would silently write as ``null``, are rejected
+- Elements orjson cannot encode, such as integers beyond 64 bits, are encoded
+  with :py:mod:`json` if they are valid strict JSON
+- The output is laid out exactly as ``json.dump(obj, indent=2, ensure_ascii=False)``,
+  apart from the float exponent formatting (``1e-5`` instead of ``1e-05``)
+- Files ending with ``.gz`` or ``.zst`` are compressed as they are written
+- The file is replaced atomically when the writer closes without errors.
+  :py:func:`write_json_streams` replaces several files only after all of them were encoded.
+
+Example:
+
+.. code-block:: python
+
+    with JSONStreamWriter(Path("top-vaults.json.zst")) as writer:
+        writer.write_value("generated_at", "2026-01-01T00:00:00")
+        writer.write_array("vaults", iter_vault_records())
+"""
+
+import gzip
+import json
+import math
+import os
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import orjson
+import zstandard
+
+#: orjson options: pretty printing, and leave everything outside plain JSON types to the strict check
+_ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS
+
+#: File suffix -> compression
+JSON_STREAM_COMPRESSIONS = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+
+#: Zstandard level for ``.zst`` output
+JSON_STREAM_ZSTD_LEVEL = 3
+
+#: Gzip level for ``.gz`` output
+JSON_STREAM_GZIP_LEVEL = 6
+
+
+def find_non_serializable_paths(obj, path=None, results=None):
+    """
+    Recursively traverses a Python object (dict or list) and collects paths to non-serializable values or invalid keys.
+
+    Args:
+        obj: The object to check (dict, list, or nested combination).
+        path: Current path (list of keys/indices; internal use).
+        results: List to collect issues (internal use).
+
+    Returns:
+        List of tuples: (path_list, issue_description) for each problem found.
+        Empty list if everything is serializable.
+    """
+    if path is None:
+        path = []
+    if results is None:
+        results = []
+
+    # Valid primitive types
+    if isinstance(obj, (str, int, float, bool, type(None))):
+        return results
+
+    # Handle lists: recurse on each element
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            new_path = path + [i]
+            find_non_serializable_paths(item, new_path, results)
+
+    # Handle dicts: check keys are strings, then recurse on values
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            if not isinstance(key, str):
+                results.append((path + [key], f"Non-string key: {type(key).__name__}"))
+            new_path = path + [key]
+            find_non_serializable_paths(value, new_path, results)
+
+    # Anything else is non-serializable
+    else:
+        results.append((path, f"Non-serializable type: {type(obj).__name__}"))
+
+    return results
+
+
+def _find_non_finite(value) -> list | None:
+    # Path to the first NaN or infinity, reversed, or None
+    value_type = type(value)
+    if value_type is float:
+        return None if math.isfinite(value) else []
+    if value_type is dict:
+        for key, item in value.items():
+            found = _find_non_finite(item)
+            if found is not None:
+                found.append(key)
+                return found
+    elif value_type is list or value_type is tuple:
+        # orjson writes tuples as arrays
+        for idx, item in enumerate(value):
+            found = _find_non_finite(item)
+            if found is not None:
+                found.append(idx)
+                return found
+    elif isinstance(value, float):
+        return None if math.isfinite(value) else []
+    return None
+
+
+def _format_path(path: Iterable) -> str:
+    return " -> ".join(str(p) for p in path)
+
+
+def encode_json_value(value: Any, name: str = "", depth: int = 0) -> bytes:
+    """Encode a value as strict, indented JSON.
+
+    :param name:
+        Path of the value, for error messages.
+
+    :param depth:
+        Nesting depth of the value in the document, for indentation.
+
+    :raise ValueError:
+        The value has types JSON cannot represent, non-string keys, or NaN or infinite floats.
+    """
+    try:
+        encoded = orjson.dumps(value, option=_ORJSON_OPTIONS)
+    except TypeError as e:
+        issues = find_non_serializable_paths(value, [name] if name else [])
+        if issues:
+            details = "; ".join(f"{_format_path(path)}: {issue}" for path, issue in issues[:10])
+            raise ValueError(f"Non-serializable values found; aborting JSON export: {details}") from e
+        # Valid JSON orjson does not support, e.g. integers beyond 64 bits
+        encoded = json.dumps(value, indent=2, ensure_ascii=False, allow_nan=False).encode("utf-8")
+    else:
+        non_finite = _find_non_finite(value)
+        if non_finite is not None:
+            path = ([name] if name else []) + non_finite[::-1]
+            raise ValueError(f"Non-finite float found; aborting JSON export: {_format_path(path)}")
+
+    if depth:
+        # JSON strings cannot contain raw newlines, so this only touches the layout
+        encoded = encoded.replace(b"\n", b"\n" + b"  " * depth)
+    return encoded
+
+
+def _open_compressed(raw: BinaryIO, compression: str | None) -> BinaryIO:
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=JSON_STREAM_GZIP_LEVEL, mtime=0)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=JSON_STREAM_ZSTD_LEVEL).stream_writer(raw, closefd=False)
+    return raw
+
+
+class JSONStreamWriter:
+    """Write a JSON object incrementally.
+
+    Use as a context manager.  Members are written in call order.
+    """
+
+    def __init__(self, path: Path, defer_replace: bool = False):
+        """
+        :param path:
+            Output file. ``.gz`` and ``.zst`` files are compressed.
+
+        :param defer_replace:
+            Keep the output in the temporary file after the writer closes,
+            until :py:meth:`replace` or :py:meth:`discard` is called.
+        """
+        self.path = Path(path)
+        self.defer_replace = defer_replace
+        self.compression = JSON_STREAM_COMPRESSIONS.get(self.path.suffix)
+        self.members = 0
+        self.raw: BinaryIO | None = None
+        self.stream: BinaryIO | None = None
+        self.temp_path: Path | None = None
+
+    def __repr__(self):
+        return f"<JSONStreamWriter {self.path}, {self.members} members>"
+
+    def __enter__(self) -> "JSONStreamWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        self.temp_path = Path(temp_name)
+        self.raw = os.fdopen(fd, "wb")
+        self.stream = _open_compressed(self.raw, self.compression)
+        self.stream.write(b"{")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self.stream.write(b"\n}" if self.members else b"}")
+            if self.stream is not self.raw:
+                self.stream.close()
+            self.raw.close()
+            if exc_type is None and not self.defer_replace:
+                self.replace()
+        finally:
+            if exc_type is not None or not self.defer_replace:
+                self.discard()
+
+    def replace(self):
+        """Move the written temporary file over the output file."""
+        os.replace(self.temp_path, self.path)
+
+    def discard(self):
+        """Delete the temporary file, if still there."""
+        if self.temp_path is not None and self.temp_path.exists():
+            self.temp_path.unlink()
+
+    def _write_key(self, key: str):
+        if not isinstance(key, str):
+            raise ValueError(f"Non-string key: {key!r}")
+        self.stream.write(b",\n  " if self.members else b"\n  ")
+        self.stream.write(orjson.dumps(key))
+        self.stream.write(b": ")
+        self.members += 1
+
+    def write_value(self, key: str, value: Any):
+        """Write a member encoded in one piece."""
+        self._write_key(key)
+        self.stream.write(encode_json_value(value, key, depth=1))
+
+    def write_array(self, key: str, items: Iterable[Any]) -> int:
+        """Write an array member, encoding one element at a time.
+
+        :param items:
+            Elements. Can be a generator, consumed as the elements are written.
+
+        :return:
+            Number of elements written
+        """
+        self._write_key(key)
+        count = 0
+        for count, item in enumerate(items, start=1):
+            self.stream.write(b"[\n    " if count == 1 else b",\n    ")
+            self.stream.write(encode_json_value(item, f"{key} -> {count - 1}", depth=2))
+        self.stream.write(b"\n  ]" if count else b"[]")
+        return count
+
+    def write_object(self, key: str, items: Iterable[tuple[str, Any]]) -> int:
+        """Write an object member, encoding one member at a time.
+
+        :param items:
+            ``(key, value)`` pairs. Can be a generator.
+
+        :return:
+            Number of members written
+        """
+        self._write_key(key)
+        count = 0
+        for count, (item_key, item) in enumerate(items, start=1):
+            if not isinstance(item_key, str):
+                raise ValueError(f"Non-string key: {key} -> {item_key!r}")
+            self.stream.write(b"{\n    " if count == 1 else b",\n    ")
+            self.stream.write(orjson.dumps(item_key))
+            self.stream.write(b": ")
+            self.stream.write(encode_json_value(item, f"{key} -> {item_key}", depth=2))
+        self.stream.write(b"\n  }" if count else b"{}")
+        return count
+
+
+def release_list_items(items: list) -> Iterator:
+    """Yield the items of a list, removing them from the list.
+
+    Pass this as a document member to :py:func:`write_json_streams`,
+    so each item can be freed once it has been encoded, instead of every
+    item staying alive until the whole document is written.
+
+    :param items:
+        List to consume. Empty when the generator is exhausted.
+    """
+    items.reverse()
+    while items:
+        yield items.pop()
+
+
+def _write_document(writer: JSONStreamWriter, document: dict):
+    for key, value in document.items():
+        if type(value) is list or isinstance(value, Iterator):
+            writer.write_array(key, value)
+        elif type(value) is dict:
+            writer.write_object(key, value.items())
+        else:
+            writer.write_value(key, value)
+
+
+def write_json_stream(path: Path, document: dict):
+    """Write a JSON document, encoding top-level arrays and objects element by element.
+
+    Top-level iterators, like generators, are consumed and written as arrays.
+
+    Gives the same layout as ``json.dump(document, f, indent=2, ensure_ascii=False, allow_nan=False)``,
+    see :py:class:`JSONStreamWriter`.
+    """
+    with JSONStreamWriter(path) as writer:
+        _write_document(writer, document)
+
+
+def write_json_streams(documents: Iterable[tuple[Path, dict]]):
+    """Write several JSON documents that must stay consistent with each other.
+
+    All documents are encoded to temporary files first. The output files are
+    replaced only if every document was valid, otherwise none of them is touched.
+
+    :param documents:
+        ``(path, document)`` pairs, see :py:func:`write_json_stream`.
+    """
+    writers = []
+    try:
+        for path, document in documents:
+            writer = JSONStreamWriter(path, defer_replace=True)
+            writers.append(writer)
+            with writer:
+                _write_document(writer, document)
+        for writer in writers:
+            writer.replace()
+    finally:
+        for writer in writers:
+            writer.discard()
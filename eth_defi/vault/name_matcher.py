@@ -0,0 +1,150 @@
+"""Single-pass word-boundary phrase matching.
+
+Curator identification checks every vault name against a few hundred
+curator names and aliases.  Running one ``\\bphrase\\b`` regex per phrase
+scans the name hundreds of times, and scanning vault databases
+with tens of thousands of vaults spends most of its time here.
+
+:py:class:`WordBoundaryMatcher` compiles all phrases into one
+`Aho-Corasick`_ automaton and finds every occurrence in one pass
+over the text.
+
+- Matching is case-insensitive with word boundaries, giving the same
+  results as ``re.compile(r"\\b" + re.escape(phrase) + r"\\b", re.IGNORECASE)``
+- Phrases have a priority, their position in the phrase list,
+  and :py:meth:`WordBoundaryMatcher.find_first` returns the
+  highest priority hit, like a loop over the regexes in list order
+- Non-ASCII text and phrases fall back to the regexes, so Unicode
+  case folding and word characters behave exactly as in :py:mod:`re`
+
+.. _Aho-Corasick: https://en.wikipedia.org/wiki/Aho%E2%80%93Corasick_algorithm
+"""
+
+import re
+from collections import deque
+from collections.abc import Callable, Sequence
+
+
+def _is_word_char(c: str) -> bool:
+    # Same as \w for ASCII
+    return c.isalnum() or c == "_"
+
+
+def _is_boundary(text: str, pos: int, text_length: int) -> bool:
+    # Same as \b: a word character on exactly one side of pos
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < text_length and _is_word_char(text[pos])
+    return before != after
+
+
+class WordBoundaryMatcher:
+    """Find phrases in text in one pass.
+
+    Example:
+
+    .. code-block:: python
+
+        matcher = WordBoundaryMatcher(["Steakhouse Financial", "Steakhouse", "RE7"])
+        assert matcher.find_first("Steakhouse Financial USDC") == 0
+        assert matcher.find_first("re7 WETH") == 2
+        assert matcher.find_first("Steakhouses") is None
+    """
+
+    def __init__(self, phrases: Sequence[str]):
+        """
+        :param phrases:
+            Phrases in priority order, highest first.
+        """
+        self.phrases = list(phrases)
+
+        #: Phrase regexes, by phrase index, used for non-ASCII matching
+        self.regexes = [re.compile(r"\b" + re.escape(phrase) + r"\b", re.IGNORECASE) for phrase in self.phrases]
+
+        #: Indices of non-ASCII phrases, always matched with regexes
+        self.regex_only = [idx for idx, phrase in enumerate(self.phrases) if not phrase.isascii()]
+
+        # Trie over the lowercased phrases: transitions, failure links,
+        # and (phrase index, phrase length) outputs per node
+        self.transitions: list[dict[str, int]] = [{}]
+        self.outputs: list[list[tuple[int, int]]] = [[]]
+        for idx, phrase in enumerate(self.phrases):
+            if not phrase or not phrase.isascii():
+                continue
+            node = 0
+            for c in phrase.lower():
+                next_node = self.transitions[node].get(c)
+                if next_node is None:
+                    next_node = len(self.transitions)
+                    self.transitions[node][c] = next_node
+                    self.transitions.append({})
+                    self.outputs.append([])
+                node = next_node
+            self.outputs[node].append((idx, len(phrase)))
+
+        self.fail = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self.transitions[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and c not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.transitions[fallback].get(c, 0)
+                self.fail[child] = target if target != child else 0
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def __repr__(self):
+        return f"<WordBoundaryMatcher {len(self.phrases)} phrases, {len(self.transitions)} states>"
+
+    def find_all(self, text: str) -> set[int]:
+        """Find all phrases in a text.
+
+        :return:
+            Indices of the phrases found with word boundaries
+        """
+        if not text:
+            return set()
+
+        if not text.isascii():
+            return {idx for idx, regex in enumerate(self.regexes) if regex.search(text)}
+
+        found = set()
+        transitions = self.transitions
+        fail = self.fail
+        outputs = self.outputs
+        lowered = text.lower()
+        text_length = len(text)
+        node = 0
+        for pos, c in enumerate(lowered):
+            while node and c not in transitions[node]:
+                node = fail[node]
+            node = transitions[node].get(c, 0)
+            if not outputs[node]:
+                continue
+            end = pos + 1
+            for idx, length in outputs[node]:
+                if _is_boundary(text, end - length, text_length) and _is_boundary(text, end, text_length):
+                    found.add(idx)
+
+        for idx in self.regex_only:
+            if self.regexes[idx].search(text):
+                found.add(idx)
+
+        return found
+
+    def find_first(self, text: str | None, accept: Callable[[int], bool] | None = None) -> int | None:
+        """Find the highest priority phrase in a text.
+
+        :param accept:
+            Only consider phrase indices for which this returns ``True``.
+
+        :return:
+            Phrase index, or ``None`` if no phrase matched
+        """
+        if not text:
+            return None
+        found = self.find_all(text)
+        if accept is not None:
+            found = [idx for idx in found if accept(idx)]
+        return min(found, default=None)
@@ -33,6 +33,7 @@ from eth_defi.hyperliquid.constants import HYPERCORE_CHAIN_ID, HYPERLIQUID_DAILY
 from eth_defi.hyperliquid.daily_metrics import HyperliquidDailyMetricsDatabase
 from eth_defi.hyperliquid.high_freq_metrics import HyperliquidHighFreqMetricsDatabase
 from eth_defi.hyperliquid.vault_data_export import build_hypercore_prices_dataframe
+from eth_defi.lazy_import import lazy_import_module
 from eth_defi.lighter.constants import LIGHTER_DAILY_METRICS_DATABASE, LIGHTER_DEPLOYMENTS, LIGHTER_LEGACY_ROBINHOOD_CHAIN_ID, LIGHTER_ROBINHOOD
 from eth_defi.lighter.daily_metrics import LighterDailyMetricsDatabase
 from eth_defi.lighter.vault_data_export import build_raw_prices_dataframe as build_lighter_prices_dataframe
@@ -41,10 +42,12 @@ from eth_defi.perp_dex.adapter import PerpDexCapability, PerpDexCapabilityRegist
 from eth_defi.perp_dex.parquet import attach_perp_metrics_to_price_rows, derive_perp_vault_metric_snapshots
 from eth_defi.perp_dex.storage import read_perp_vault_observations
 from eth_defi.research.wrangle_vault_prices import generate_cleaned_vault_datasets
-from eth_defi.vault import top_vaults_json
 from eth_defi.vault.base import VaultHistoricalRead
 from eth_defi.vault.vaultdb import DEFAULT_UNCLEANED_PRICE_DATABASE, get_pipeline_data_dir
 
+#: Top vaults export pulls in Plotly, Matplotlib and ffn, load it only when the export step runs
+top_vaults_json = lazy_import_module("eth_defi.vault.top_vaults_json")
+
 #: Required env vars for the top-vaults JSON R2 upload.
 #: See :py:func:`validate_top_vaults_config`.
 _R2_TOP_VAULTS_REQUIRED_ENV_VARS = (
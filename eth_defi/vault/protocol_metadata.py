@@ -11,6 +11,8 @@ from typing import TypedDict
 
 from strictyaml import load
 
+from eth_defi.metadata_bundle import read_metadata_yaml
+
 logger = logging.getLogger(__name__)
 
 
@@ -127,18 +129,27 @@ class VaultProtocolMetadata(TypedDict):
     logos: VaultProtocolLogos
 
 
+def parse_protocol_yaml(yaml_content: str) -> dict:
+    """Parse protocol metadata YAML text.
+
+    :return:
+        Parsed YAML as a dictionary
+    """
+    return load(yaml_content).data
+
+
 def read_protocol_metadata(yaml_path: Path) -> dict:
     """Read and parse a protocol metadata YAML file.
 
+    Served from :py:mod:`eth_defi.metadata_bundle` when enabled.
+
     :param yaml_path:
         Path to the YAML file
 
     :return:
         Parsed YAML as a dictionary
     """
-    yaml_content = yaml_path.read_text()
-    parsed = load(yaml_content)
-    return parsed.data
+    return read_metadata_yaml(yaml_path, "protocol", parse_protocol_yaml)
 
 
 def get_available_logos(slug: str) -> dict[str, bool]:
@@ -16,7 +16,8 @@ import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 
-from eth_defi.cloudflare_r2 import create_r2_client, upload_file_to_r2
+from eth_defi.cloudflare_r2 import create_r2_client
+from eth_defi.cloudflare_r2_uploader import R2Uploader, get_default_r2_upload_manifest
 from eth_defi.vault.vaultdb import get_pipeline_data_dir
 from eth_defi.version_info import stamp_parquet_schema_metadata
 
@@ -206,20 +207,15 @@ def export_sample_files_to_r2(
         secret_access_key=secret_access_key,
     )
 
-    for file_path in sample_files:
-        s3_key = f"{upload_prefix}{file_path.name}"
-        uploaded = upload_file_to_r2(
-            s3_client=s3_client,
-            file_path=file_path,
-            bucket_name=bucket_name,
-            object_name=s3_key,
-            skip_if_current=True,
-        )
-        if uploaded:
-            logger.info("Uploaded %s to s3://%s/%s", file_path, bucket_name, s3_key)
-        else:
-            logger.info("Skipped unchanged %s for s3://%s/%s", file_path, bucket_name, s3_key)
-
-        if public_url and uploaded:
-            final_url = f"{public_url.rstrip('/')}/{s3_key}"
-            print(f"  -> {final_url}")
+    with R2Uploader(s3_client, bucket_name, manifest=get_default_r2_upload_manifest()) as uploader:
+        futures = {file_path: uploader.submit_file(file_path, f"{upload_prefix}{file_path.name}") for file_path in sample_files}
+
+        for file_path, future in futures.items():
+            s3_key = f"{upload_prefix}{file_path.name}"
+            if future.result():
+                logger.info("Uploaded %s to s3://%s/%s", file_path, bucket_name, s3_key)
+                if public_url:
+                    final_url = f"{public_url.rstrip('/')}/{s3_key}"
+                    print(f"  -> {final_url}")
+            else:
+                logger.info("Skipped unchanged %s for s3://%s/%s", file_path, bucket_name, s3_key)
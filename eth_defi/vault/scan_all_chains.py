@@ -73,6 +73,7 @@ from eth_defi.erc_4626.lead_scan_core import scan_leads
 from eth_defi.erc_4626.settlement_scan import (
     fetch_and_store_vault_settlements_for_chain,
 )
+from eth_defi.event_reader.multicall_cache import create_multicall_result_cache_from_env
 from eth_defi.feed.database import resolve_feed_database_path
 from eth_defi.grvt.daily_metrics import run_daily_scan as grvt_run_daily_scan
 from eth_defi.grvt.vault_data_export import merge_into_vault_database as grvt_merge_vault_db
@@ -838,6 +839,7 @@ def scan_prices_for_chain(
             hypersync_client=hypersync_config.hypersync_client,
             rpc_request_stats=stats,
             vault_addresses={vault.address.lower() for vault in vaults},
+            multicall_cache=create_multicall_result_cache_from_env(),
         )
 
         # Save reader states atomically to avoid corruption on interruption
@@ -1315,6 +1317,9 @@ def scan_hypercore_fn(
 ) -> ChainResult:
     """Scan Hyperliquid native (Hypercore) vaults via REST API.
 
+    Set ``HYPERCORE_DELTA_SCAN=true`` to fetch details only for vaults that changed
+    since the previous scan cycle, see :py:mod:`eth_defi.hyperliquid.daily_scan_planner`.
+
     :param max_workers:
         Number of parallel workers for fetching vault details.
     :param db_path:
@@ -1332,6 +1337,7 @@ def scan_hypercore_fn(
             session=session,
             db_path=db_path or HYPERLIQUID_DAILY_METRICS_DATABASE,
             max_workers=max_workers,
+            delta_scan=os.environ.get("HYPERCORE_DELTA_SCAN", "false").lower() == "true",
         ),
         vault_db_path=vault_db_path,
     )
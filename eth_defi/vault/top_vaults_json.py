@@ -11,6 +11,8 @@ Features:
 - Normalizes column keys into snake_case.
 - Uses column-wise .map(parse_value) to comply with modern pandas.
 - Uses allow_nan=False to guarantee strict JSON validity.
+- Streams the vault records to the output file one at a time with orjson,
+  compressed if ``OUTPUT_JSON`` ends with ``.gz`` or ``.zst``, see :py:mod:`eth_defi.vault.json_stream`.
 
 To test out:
 
@@ -38,7 +40,6 @@ from dataclasses import dataclass
 from pathlib import Path
 
 import pandas as pd
-from atomicwrites import atomic_write
 
 from eth_defi.compat import native_datetime_utc_now
 from eth_defi.core3.constants import CORE3_DATABASE_PATH
@@ -58,6 +59,7 @@ from eth_defi.token import is_stablecoin_like
 # Import core TradingStrategy / eth_defi modules
 from eth_defi.vault.base import VaultSpec  # noqa: F401
 from eth_defi.vault.curator_export import build_curators_for_export
+from eth_defi.vault.json_stream import find_non_serializable_paths, release_list_items, write_json_stream, write_json_streams
 from eth_defi.vault.risk import VaultTechnicalRisk
 from eth_defi.vault.vaultdb import VaultDatabase, get_pipeline_data_dir
 from eth_defi.version_info import VersionInfo
@@ -388,14 +390,14 @@ def load_sticky_export_state(path: Path, now: datetime.datetime) -> dict:
 def save_sticky_export_state(state: dict, path: Path) -> None:
     """Atomically write sticky export state.
 
+    Validated and written one vault entry at a time, see :py:mod:`eth_defi.vault.json_stream`.
+
     :param state:
         State mapping.
     :param path:
         Destination path.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with atomic_write(str(path), mode="w", overwrite=True, encoding="utf-8") as f:
-        json.dump(state, f, indent=2, ensure_ascii=False, allow_nan=False)
+    write_json_stream(path, state)
 
 
 def build_export_metadata(version_info: VersionInfo | None = None) -> dict:
@@ -415,49 +417,6 @@ def build_export_metadata(version_info: VersionInfo | None = None) -> dict:
     }
 
 
-def find_non_serializable_paths(obj, path=None, results=None):
-    """
-    Recursively traverses a Python object (dict or list) and collects paths to non-serializable values or invalid keys.
-
-    Args:
-        obj: The object to check (dict, list, or nested combination).
-        path: Current path (list of keys/indices; internal use).
-        results: List to collect issues (internal use).
-
-    Returns:
-        List of tuples: (path_list, issue_description) for each problem found.
-        Empty list if everything is serializable.
-    """
-    if path is None:
-        path = []
-    if results is None:
-        results = []
-
-    # Valid primitive types
-    if isinstance(obj, (str, int, float, bool, type(None))):
-        return results
-
-    # Handle lists: recurse on each element
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            new_path = path + [i]
-            find_non_serializable_paths(item, new_path, results)
-
-    # Handle dicts: check keys are strings, then recurse on values
-    elif isinstance(obj, dict):
-        for key, value in obj.items():
-            if not isinstance(key, str):
-                results.append((path + [key], f"Non-string key: {type(key).__name__}"))
-            new_path = path + [key]
-            find_non_serializable_paths(value, new_path, results)
-
-    # Anything else is non-serializable
-    else:
-        results.append((path, f"Non-serializable type: {type(obj).__name__}"))
-
-    return results
-
-
 def is_blacklisted_risk_value(value) -> bool:
     """Check if a row or exported record risk means hard blacklist.
 
@@ -982,6 +941,11 @@ def main(
         falling back to ``DB_PATH`` (used by the feed collector),
         then :py:data:`~eth_defi.feed.database.DEFAULT_VAULT_POST_DATABASE`.
         The database is only opened if the resolved file exists on disk.
+
+    :return:
+        The export document without the vault rows. ``vaults`` is an empty list,
+        as the rows are released while they are written,
+        see :py:func:`~eth_defi.vault.json_stream.release_list_items`.
     """
     defaults = _resolve_defaults_from_env()
     if data_dir is None:
@@ -1154,7 +1118,7 @@ def main(
         "core3_protocols": core3_protocols,
         "xerberus_protocols": xerberus_protocols,
         "curators": curators_export,
-        "vaults": vaults,
+        "vaults": release_list_items(vaults),  # type: ignore[typeddict-item]
     }
     # Optional coverage stats: not on VaultMetricsExport TypedDict (extra key for consumers).
     output_data["xerberus_stats"] = xerberus_stats  # type: ignore[typeddict-unknown-key]
@@ -1164,15 +1128,20 @@ def main(
     # timestamp and build provenance available for incident investigation.
     sticky_result.state["metadata"] = export_metadata
 
-    validate_strict_json_serialisable(output_data)
-    validate_strict_json_serialisable(sticky_result.state)
-
-    # 7️⃣ Write to JSON file (strict mode)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with atomic_write(str(output_path), mode="w", overwrite=True, encoding="utf-8") as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False, allow_nan=False)
-
-    save_sticky_export_state(sticky_result.state, sticky_state_path)
+    # 7️⃣ Write to JSON file (strict mode).
+    # Each vault record is validated and encoded on its own with orjson,
+    # see eth_defi.vault.json_stream, and dropped from memory once written.
+    # A .gz or .zst output path is compressed.
+    # The export and the sticky state are both encoded before either file is replaced,
+    # so an invalid state cannot leave a new export next to the old state.
+    exported_count = len(vaults)
+    write_json_streams(
+        [
+            (output_path, output_data),
+            (sticky_state_path, sticky_result.state),
+        ]
+    )
+    output_data["vaults"] = []
     print(f"Sticky export state: loaded {sticky_result.stats.loaded_state_entries:,} vault entries from {sticky_state_path}")
     print(f"Current filter passed: {sticky_result.stats.current_filter_passed:,}")
     if sticky_result.stats.previous_current_filter_count is not None and sticky_result.stats.previous_current_filter_count > 0:
@@ -1188,7 +1157,7 @@ def main(
     print(f"Missing protocol slugs for sticky rows: {sticky_result.stats.missing_protocol_slugs:,}")
     print(f"Missing curator slugs for sticky rows: {sticky_result.stats.missing_curator_slugs:,}")
 
-    print(f"Exported {len(vaults):,} vault rows to {output_path}")
+    print(f"Exported {exported_count:,} vault rows to {output_path}")
     return output_data
 
 
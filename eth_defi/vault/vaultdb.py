@@ -284,9 +284,18 @@ class VaultDatabase:
 
             print(f"We have data for {vault_db.get_lead_count()} potential vaults")
 
+        :param path:
+            Pickle file or stream.
+
+            If the file name ends with ``.sqlite``, open the indexed store instead,
+            with rows loaded lazily. See :py:mod:`eth_defi.vault.vaultdb_store`.
         """
         try:
-            if isinstance(path, BufferedIOBase):
+            if isinstance(path, Path) and path.suffix == ".sqlite":
+                from eth_defi.vault.vaultdb_store import VaultMetadataStore
+
+                existing_db = VaultMetadataStore(path).open_database()
+            elif isinstance(path, BufferedIOBase):
                 existing_db = pickle.load(path)
             else:
                 existing_db = pickle.load(path.open("rb"))
@@ -295,7 +304,17 @@ class VaultDatabase:
         return existing_db
 
     def write(self, path: Path = DEFAULT_VAULT_DATABASE):
-        """Do an atomic write to avoid corrupted data."""
+        """Do an atomic write to avoid corrupted data.
+
+        If the file name ends with ``.sqlite``, write to the indexed store,
+        only upserting rows modified since :py:meth:`read`.
+        """
+
+        if path.suffix == ".sqlite":
+            from eth_defi.vault.vaultdb_store import VaultMetadataStore
+
+            VaultMetadataStore(path).write_database(self)
+            return
 
         with atomic_write(path, mode="wb", overwrite=True) as f:
             pickle.dump(self, f, protocol=4)
@@ -373,7 +392,7 @@ class VaultDatabase:
 
         Used for diagnostics.
         """
-        rows = {spec: value for spec, value in self.rows.items() if spec == vault_spec}
+        rows = {vault_spec: self.rows[vault_spec]} if vault_spec in self.rows else {}
         return VaultDatabase(
             rows=rows,
             leads={},
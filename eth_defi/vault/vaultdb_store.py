@@ -0,0 +1,371 @@
+"""Indexed SQLite store for the vault metadata database.
+
+:py:meth:`VaultDatabase.read() <eth_defi.vault.vaultdb.VaultDatabase.read>` unpickles
+every vault row, lead and detection object for every consumer, even when a
+post-processing step needs the name of a handful of vaults.
+:py:meth:`~eth_defi.vault.vaultdb.VaultDatabase.write` then re-pickles everything
+after each chain scan.
+
+This module stores the same data in a SQLite file, one record per vault row and lead:
+
+- Rows are pickled individually and loaded lazily on first access,
+  see :py:class:`LazyVaultRows`
+- Chain, protocol, name, symbol, denomination and NAV are stored as plain
+  columns with indexes, so listings can be read without unpickling anything,
+  see :py:meth:`VaultMetadataStore.read_columns`
+- Writes only upsert the rows loaded or assigned since the database was opened,
+  as callers commonly modify row dicts in place
+
+The :py:class:`~eth_defi.vault.vaultdb.VaultDatabase` class remains the API:
+``VaultDatabase.read()`` and ``VaultDatabase.write()`` dispatch to this store when the
+file name ends with ``.sqlite``, and the returned database object behaves like the pickled one.
+
+To migrate an existing pickle:
+
+.. code-block:: python
+
+    from eth_defi.vault.vaultdb import DEFAULT_VAULT_DATABASE
+    from eth_defi.vault.vaultdb_store import DEFAULT_VAULT_METADATA_STORE, migrate_vault_database_pickle
+
+    migrate_vault_database_pickle(DEFAULT_VAULT_DATABASE, DEFAULT_VAULT_METADATA_STORE)
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+from collections.abc import Iterator, MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from eth_defi.erc_4626.discovery_base import PotentialVaultMatch
+from eth_defi.vault.base import VaultSpec
+
+if TYPE_CHECKING:
+    from eth_defi.vault.vaultdb import VaultDatabase, VaultRow
+
+logger = logging.getLogger(__name__)
+
+#: Default location of the indexed vault metadata store,
+#: next to the legacy pickle
+DEFAULT_VAULT_METADATA_STORE = Path.home() / ".tradingstrategy" / "vaults" / "vault-metadata-db.sqlite"
+
+#: Scalar row fields copied to indexed columns.
+#:
+#: SQL column name -> :py:class:`~eth_defi.vault.vaultdb.VaultRow` key
+INDEXED_COLUMNS = {
+    "name": "Name",
+    "symbol": "Symbol",
+    "denomination": "Denomination",
+    "protocol": "Protocol",
+    "nav": "NAV",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vault_row (
+    chain_id INTEGER NOT NULL,
+    vault_address TEXT NOT NULL,
+    name TEXT,
+    symbol TEXT,
+    denomination TEXT,
+    protocol TEXT,
+    nav REAL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (chain_id, vault_address)
+);
+CREATE INDEX IF NOT EXISTS vault_row_protocol ON vault_row (protocol);
+CREATE TABLE IF NOT EXISTS vault_lead (
+    chain_id INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (chain_id, address)
+);
+CREATE TABLE IF NOT EXISTS scan_state (
+    chain_id INTEGER PRIMARY KEY,
+    last_scanned_block INTEGER NOT NULL
+);
+"""
+
+
+def _to_float(value) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_text(value) -> str | None:
+    return str(value) if value is not None else None
+
+
+class VaultMetadataStore:
+    """SQLite file holding vault rows, leads and per-chain scan state."""
+
+    def __init__(self, path: Path = DEFAULT_VAULT_METADATA_STORE):
+        assert isinstance(path, Path), f"Expected Path, got {type(path)}"
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._connection_pid: int | None = None
+
+    def __repr__(self):
+        return f"<VaultMetadataStore {self.path}>"
+
+    def __getstate__(self) -> dict:
+        # SQLite connections cannot cross process boundaries
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_connection_pid"] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Lazily open one connection per process."""
+        if self._connection is None or self._connection_pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Store connection, committing on success and rolling back on error."""
+        connection = self.connection
+        with connection:
+            yield connection
+
+    def get_specs(self, chain_id: int | None = None) -> list[VaultSpec]:
+        """List stored vault rows without loading them."""
+        with self._connect() as connection:
+            if chain_id is None:
+                rows = connection.execute("SELECT chain_id, vault_address FROM vault_row").fetchall()
+            else:
+                rows = connection.execute("SELECT chain_id, vault_address FROM vault_row WHERE chain_id = ?", (chain_id,)).fetchall()
+        return [VaultSpec(chain_id, address) for chain_id, address in rows]
+
+    def get_row(self, spec: VaultSpec) -> "VaultRow | None":
+        """Load a single vault row."""
+        with self._connect() as connection:
+            result = connection.execute(
+                "SELECT payload FROM vault_row WHERE chain_id = ? AND vault_address = ?",
+                (spec.chain_id, spec.vault_address),
+            ).fetchone()
+        return pickle.loads(result[0]) if result else None
+
+    def get_rows(self, chain_id: int | None = None, protocol: str | None = None) -> dict[VaultSpec, "VaultRow"]:
+        """Load vault rows, filtered by the indexed chain and protocol columns."""
+        query = "SELECT chain_id, vault_address, payload FROM vault_row WHERE 1 = 1"
+        params = []
+        if chain_id is not None:
+            query += " AND chain_id = ?"
+            params.append(chain_id)
+        if protocol is not None:
+            query += " AND protocol = ?"
+            params.append(protocol)
+        with self._connect() as connection:
+            result = connection.execute(query, params).fetchall()
+        return {VaultSpec(c, a): pickle.loads(payload) for c, a, payload in result}
+
+    def read_columns(self, chain_id: int | None = None, protocol: str | None = None) -> pd.DataFrame:
+        """Read the indexed scalar columns of vault rows, without unpickling row data.
+
+        :return:
+            DataFrame with ``chain_id``, ``vault_address`` and :py:data:`INDEXED_COLUMNS` columns
+        """
+        columns = ["chain_id", "vault_address", *INDEXED_COLUMNS.keys()]
+        query = f"SELECT {', '.join(columns)} FROM vault_row WHERE 1 = 1"
+        params = []
+        if chain_id is not None:
+            query += " AND chain_id = ?"
+            params.append(chain_id)
+        if protocol is not None:
+            query += " AND protocol = ?"
+            params.append(protocol)
+        with self._connect() as connection:
+            return pd.read_sql_query(query, connection, params=params)
+
+    def get_leads(self) -> dict[VaultSpec, PotentialVaultMatch]:
+        with self._connect() as connection:
+            result = connection.execute("SELECT chain_id, address, payload FROM vault_lead").fetchall()
+        return {VaultSpec(chain_id, address): pickle.loads(payload) for chain_id, address, payload in result}
+
+    def get_last_scanned_blocks(self) -> dict[int, int]:
+        with self._connect() as connection:
+            return dict(connection.execute("SELECT chain_id, last_scanned_block FROM scan_state").fetchall())
+
+    def upsert_rows(self, connection: sqlite3.Connection, rows: dict[VaultSpec, "VaultRow"]):
+        connection.executemany(
+            "INSERT OR REPLACE INTO vault_row (chain_id, vault_address, name, symbol, denomination, protocol, nav, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    spec.chain_id,
+                    spec.vault_address,
+                    _to_text(row.get("Name")),
+                    _to_text(row.get("Symbol")),
+                    _to_text(row.get("Denomination")),
+                    _to_text(row.get("Protocol")),
+                    _to_float(row.get("NAV")),
+                    pickle.dumps(row, protocol=4),
+                )
+                for spec, row in rows.items()
+            ],
+        )
+
+    def open_database(self) -> "VaultDatabase":
+        """Open the store as a :py:class:`~eth_defi.vault.vaultdb.VaultDatabase`.
+
+        Rows are loaded lazily; leads and scan state are loaded eagerly,
+        as the lead scanner needs them all.
+        """
+        from eth_defi.vault.vaultdb import VaultDatabase
+
+        return VaultDatabase(
+            rows=LazyVaultRows(self),
+            leads=self.get_leads(),
+            last_scanned_block=self.get_last_scanned_blocks(),
+        )
+
+    def write_database(self, vault_db: "VaultDatabase"):
+        """Persist a vault database in one transaction.
+
+        If the database was opened from this store, only rows loaded or assigned since are written.
+        """
+        rows = vault_db.rows
+        incremental = isinstance(rows, LazyVaultRows) and rows.store.path == self.path
+
+        with self._connect() as connection:
+            if incremental:
+                changed = rows.get_loaded_rows()
+                connection.executemany(
+                    "DELETE FROM vault_row WHERE chain_id = ? AND vault_address = ?",
+                    [(spec.chain_id, spec.vault_address) for spec in rows.deleted],
+                )
+            else:
+                changed = dict(rows.items())
+                connection.execute("DELETE FROM vault_row")
+
+            self.upsert_rows(connection, changed)
+
+            connection.execute("DELETE FROM vault_lead")
+            connection.executemany(
+                "INSERT INTO vault_lead (chain_id, address, payload) VALUES (?, ?, ?)",
+                [(spec.chain_id, spec.vault_address, pickle.dumps(lead, protocol=4)) for spec, lead in vault_db.leads.items()],
+            )
+            connection.execute("DELETE FROM scan_state")
+            connection.executemany(
+                "INSERT INTO scan_state (chain_id, last_scanned_block) VALUES (?, ?)",
+                list(vault_db.last_scanned_block.items()),
+            )
+
+        if incremental:
+            rows.mark_clean()
+
+        logger.info("Wrote %d vault rows, %d leads to %s", len(changed), len(vault_db.leads), self.path)
+
+
+class LazyVaultRows(MutableMapping):
+    """Vault rows mapping that unpickles each row on first access.
+
+    - Keys are listed from the store when opened
+    - Loaded rows are kept in memory
+    - Loaded, assigned and deleted keys are tracked for incremental writes
+    - Pickles as a plain ``dict``, so a database opened from the store
+      can still be written out in the legacy pickle format
+    """
+
+    def __init__(self, store: VaultMetadataStore):
+        self.store = store
+        self._keys = set(store.get_specs())
+        self._loaded: dict[VaultSpec, "VaultRow"] = {}
+        self.deleted: set[VaultSpec] = set()
+
+    def __repr__(self):
+        return f"<LazyVaultRows {len(self._keys)} rows, {len(self._loaded)} loaded, store {self.store.path}>"
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
+    def __getitem__(self, spec: VaultSpec) -> "VaultRow":
+        if spec not in self._keys:
+            raise KeyError(spec)
+        row = self._loaded.get(spec)
+        if row is None:
+            row = self.store.get_row(spec)
+            self._loaded[spec] = row
+        return row
+
+    def __setitem__(self, spec: VaultSpec, row: "VaultRow"):
+        self._keys.add(spec)
+        self._loaded[spec] = row
+        self.deleted.discard(spec)
+
+    def __delitem__(self, spec: VaultSpec):
+        self._keys.remove(spec)
+        self._loaded.pop(spec, None)
+        self.deleted.add(spec)
+
+    def __contains__(self, spec) -> bool:
+        return spec in self._keys
+
+    def __iter__(self) -> Iterator[VaultSpec]:
+        return iter(list(self._keys))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def items(self):
+        self.load_all()
+        return self._loaded.items()
+
+    def values(self):
+        self.load_all()
+        return self._loaded.values()
+
+    def load_all(self):
+        """Unpickle all rows not yet loaded in one query."""
+        if len(self._loaded) == len(self._keys):
+            return
+        for spec, row in self.store.get_rows().items():
+            if spec in self._keys and spec not in self._loaded:
+                self._loaded[spec] = row
+
+    def get_loaded_rows(self) -> dict[VaultSpec, "VaultRow"]:
+        """Rows that may have been modified since the store was opened."""
+        return dict(self._loaded)
+
+    def mark_clean(self):
+        """Forget deletions after a write.
+
+        Loaded rows are kept, as callers may still hold and modify them.
+        """
+        self.deleted.clear()
+
+
+def migrate_vault_database_pickle(
+    pickle_path: Path,
+    store_path: Path = DEFAULT_VAULT_METADATA_STORE,
+) -> VaultMetadataStore:
+    """One-shot migration of ``vault-metadata-db.pickle`` to the indexed store.
+
+    The pickle is left in place.
+
+    :return:
+        The populated store
+    """
+    from eth_defi.vault.vaultdb import VaultDatabase
+
+    vault_db = VaultDatabase.read(pickle_path)
+    store = VaultMetadataStore(store_path)
+    store.write_database(vault_db)
+    logger.info("Migrated %d vault rows and %d leads from %s to %s", len(vault_db.rows), len(vault_db.leads), pickle_path, store_path)
+    return store
@@ -0,0 +1,137 @@
+"""Benchmark single process vs. sharded multiprocess vault price cleaning.
+
+Runs :py:func:`eth_defi.research.wrangle_vault_prices.process_raw_vault_scan_data`
+on the uncleaned price parquet with different worker counts, each configuration
+in a fresh process, and reports wall time, peak RSS of the parent process and
+peak RSS of the largest worker. Also verifies the output matches the
+single process run.
+
+Nothing is written to the pipeline data directory.
+
+Run with the project's Poetry environment:
+
+.. code-block:: shell
+
+    poetry run python scripts/erc-4626/benchmark-clean-prices.py
+
+Environment variables:
+
+- ``VAULT_DB_PATH``: Vault metadata pickle. Defaults to the vault pipeline.
+- ``UNCLEANED_PARQUET_PATH``: Input parquet. Defaults to the vault pipeline.
+- ``BENCHMARK_WORKERS``: Comma-separated worker counts (default: ``1,4,8``).
+- ``BENCHMARK_SHARD_ROWS``: Rows per shard (default: :py:data:`~eth_defi.research.wrangle_vault_prices.DEFAULT_CLEANING_SHARD_ROWS`).
+"""
+
+import json
+import os
+import pickle
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from threading import Event, Thread
+
+import pandas as pd
+import psutil
+from tabulate import tabulate
+
+from eth_defi.research.wrangle_vault_prices import DEFAULT_CLEANING_SHARD_ROWS, process_raw_vault_scan_data
+from eth_defi.vault.vaultdb import DEFAULT_UNCLEANED_PRICE_DATABASE, DEFAULT_VAULT_DATABASE
+
+
+class _WorkerMemorySampler:
+    """Sample the largest RSS of any child process in a background thread.
+
+    Loky worker processes outlive the run, so ``RUSAGE_CHILDREN`` does not see them.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_rss = 0
+        self._stop_event = Event()
+        self._thread = Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        process = psutil.Process()
+        while not self._stop_event.wait(self.interval):
+            for child in process.children(recursive=True):
+                try:
+                    self.peak_rss = max(self.peak_rss, child.memory_info().rss)
+                except psutil.NoSuchProcess:
+                    pass
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop_event.set()
+        self._thread.join()
+
+
+def run_single(max_workers: int, output_path: Path) -> dict:
+    """Clean prices once in this process."""
+    vault_db_path = Path(os.environ.get("VAULT_DB_PATH", DEFAULT_VAULT_DATABASE)).expanduser()
+    price_path = Path(os.environ.get("UNCLEANED_PARQUET_PATH", DEFAULT_UNCLEANED_PRICE_DATABASE)).expanduser()
+    shard_rows = int(os.environ.get("BENCHMARK_SHARD_ROWS", DEFAULT_CLEANING_SHARD_ROWS))
+
+    vault_db = pickle.load(vault_db_path.open("rb"))
+    prices_df = pd.read_parquet(price_path, dtype_backend="pyarrow")
+
+    with _WorkerMemorySampler() as sampler:
+        started = time.perf_counter()
+        cleaned = process_raw_vault_scan_data(vault_db.rows, prices_df, logger=lambda x: None, max_workers=max_workers, shard_rows=shard_rows)
+        duration = time.perf_counter() - started
+
+    cleaned.to_pickle(output_path)
+
+    # ru_maxrss is kilobytes on Linux
+    return {
+        "Workers": max_workers,
+        "Rows": len(cleaned),
+        "Wall time (s)": round(duration, 1),
+        "Parent peak RSS (MiB)": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024,
+        "Worker peak RSS (MiB)": sampler.peak_rss // 1024**2,
+    }
+
+
+def main():
+    single_run = os.environ.get("BENCHMARK_SINGLE_RUN")
+    if single_run:
+        max_workers, output_path = single_run.split(",", 1)
+        print(json.dumps(run_single(int(max_workers), Path(output_path))))
+        return
+
+    worker_counts = [int(w) for w in os.environ.get("BENCHMARK_WORKERS", "1,4,8").split(",")]
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for max_workers in worker_counts:
+            output_path = Path(tmp) / f"cleaned-{max_workers}.pickle"
+            # Fresh interpreter per configuration, so peak RSS is not shared between runs
+            completed = subprocess.run(
+                [sys.executable, __file__],
+                env=os.environ | {"BENCHMARK_SINGLE_RUN": f"{max_workers},{output_path}"},
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+            cleaned = pd.read_pickle(output_path)
+            if baseline is None:
+                baseline = cleaned
+                result["Identical"] = "baseline"
+            else:
+                result["Identical"] = "yes" if cleaned.equals(baseline) else "NO"
+            results.append(result)
+            print(f"Workers {max_workers}: {result['Wall time (s)']} s")
+
+    print(tabulate(results, headers="keys", tablefmt="fancy_grid"))
+
+
+if __name__ == "__main__":
+    main()
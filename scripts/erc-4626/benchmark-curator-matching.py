@@ -0,0 +1,108 @@
+"""Benchmark curator name matching against the vault database.
+
+Runs the curator name matching of :py:func:`eth_defi.vault.curator.identify_curator`
+for every vault in the vault metadata database, with both
+
+- the original per-pattern regex loop (:py:func:`eth_defi.vault.curator._identify_curator_by_patterns`), and
+- the single-pass Aho-Corasick matcher (:py:func:`eth_defi.vault.curator._identify_curator_by_name`)
+
+and checks that they give the same curator for every vault name and manager name.
+
+Experiment results (2026-10-18)
+---------------------------------
+
+306 curator name patterns.  The vault metadata database was not available
+on the benchmark machine, so the run used ``SYNTHETIC_NAMES=20000``:
+half of the names are plain asset and strategy words, half embed one or two
+curator names with punctuation and casing variations.
+
+The regex loop took 131 µs per name and the single-pass matcher 6.5 µs per name,
+a 20x reduction in CPU time.  Both gave the same result for every name.
+Names with non-ASCII characters fall back to the regexes and run at the old speed.
+
+Conclusion: use the single-pass matcher in ``identify_curator()``.  Re-run this
+script with the production vault database after large curator YAML changes.
+
+.. code-block:: shell
+
+    poetry run python scripts/erc-4626/benchmark-curator-matching.py
+
+Environment variables:
+
+- ``VAULT_DB_PATH``: Vault metadata database pickle. Defaults to :py:data:`eth_defi.vault.vaultdb.DEFAULT_VAULT_DATABASE`.
+- ``SYNTHETIC_NAMES``: Generate this many synthetic names instead of reading the vault database.
+"""
+
+import os
+import random
+import time
+from pathlib import Path
+
+from tabulate import tabulate
+
+from eth_defi.vault.curator import PROTOCOL_BOUND_CURATOR_SLUGS, _build_matching_patterns, _build_name_matcher, _get_pattern_texts, _identify_curator_by_name, _identify_curator_by_patterns
+from eth_defi.vault.vaultdb import DEFAULT_VAULT_DATABASE, VaultDatabase
+
+#: Filler words for synthetic names
+SYNTHETIC_WORDS = ["USDC", "WETH", "Vault", "Prime", "Core", "Yield", "Boosted", "Lending", "Market", "Stable", "Delta", "Neutral", "Strategy"]
+
+#: Punctuation and suffixes around curator names in synthetic names
+SYNTHETIC_DECORATIONS = ["", " USDC", "USDC ", "x", "_", "-", "(", ")", " Prime"]
+
+
+def read_names() -> list[str]:
+    """Vault names and manager names to match."""
+    synthetic_count = int(os.environ.get("SYNTHETIC_NAMES", "0"))
+    if synthetic_count:
+        rng = random.Random(0)
+        pattern_texts = [pattern_text for pattern_text, _ in _get_pattern_texts()]
+        names = []
+        for _ in range(synthetic_count):
+            if rng.random() < 0.5:
+                names.append(" ".join(rng.choice(SYNTHETIC_WORDS) for _ in range(rng.randint(1, 5))))
+            else:
+                curator_names = (rng.choice(SYNTHETIC_DECORATIONS) + rng.choice(pattern_texts) + rng.choice(SYNTHETIC_DECORATIONS) for _ in range(rng.randint(1, 2)))
+                names.append(" ".join(curator_names) + " USDC Vault")
+        return names
+
+    vault_db = VaultDatabase.read(Path(os.environ.get("VAULT_DB_PATH", DEFAULT_VAULT_DATABASE)).expanduser())
+    names = []
+    for row in vault_db.values():
+        names.append(row.get("Name") or "")
+        names.append(row.get("_manager_name") or "")
+    return [name for name in names if name]
+
+
+def main():
+    names = read_names()
+    patterns = _build_matching_patterns()
+    matcher, _ = _build_name_matcher()
+    print(f"Matching {len(names):,} names against {matcher}")
+
+    start = time.perf_counter()
+    expected = [_identify_curator_by_patterns(name, patterns, exclude_slugs=PROTOCOL_BOUND_CURATOR_SLUGS) for name in names]
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    got = [_identify_curator_by_name(name, exclude_slugs=PROTOCOL_BOUND_CURATOR_SLUGS) for name in names]
+    matcher_time = time.perf_counter() - start
+
+    mismatches = [(name, a, b) for name, a, b in zip(names, expected, got) if a != b]
+
+    table = [
+        ["Regex loop", f"{regex_time:.3f}", f"{regex_time / len(names) * 1e6:.1f}"],
+        ["Single-pass matcher", f"{matcher_time:.3f}", f"{matcher_time / len(names) * 1e6:.1f}"],
+    ]
+    print(tabulate(table, headers=["Implementation", "Total (s)", "Per name (µs)"]))
+    print(f"Names with a curator: {sum(slug is not None for slug in expected):,}")
+    print(f"Speedup: {regex_time / matcher_time:.1f}x")
+
+    if mismatches:
+        for name, a, b in mismatches[:20]:
+            print(f"Mismatch: {name!r}: regex {a}, matcher {b}")
+        raise AssertionError(f"{len(mismatches)} mismatches")
+    print("All names match")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 """Export all sparklines to Cloudflare R2.
 
 - Run after cleaned prices 1h is generated
+- Rendered with the Matplotlib-free :py:mod:`eth_defi.research.sparkline_vector`
+- Each object stores a digest of its input price series in R2 metadata,
+  so sparklines whose data did not change are neither re-rendered nor re-uploaded
 
 Example:
 
@@ -8,18 +11,31 @@ Example:
 
     python scripts/erc-4626/export-sparklines.py
 
+Environment variables:
+
+- ``MAX_WORKERS``: Parallel upload threads (default: 20)
+- ``FORCE_SPARKLINES``: Set to re-render and re-upload everything
+- ``R2_UPLOAD_MANIFEST_PATH``: Upload manifest, skips the head request of unchanged sparklines,
+  see :py:mod:`eth_defi.cloudflare_r2_uploader`
+
+Per-vault prices are sliced from the memory-mapped store next to the cleaned prices,
+see :py:mod:`eth_defi.research.vault_price_store`.
 """
 
-import gzip
 import os
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow.compute as pc
 from joblib import Parallel, delayed
 from tqdm_loggable.auto import tqdm
 
-from eth_defi.research.sparkline import export_sparkline_as_png, export_sparkline_as_svg, render_sparkline_gradient
+from eth_defi.cloudflare_r2 import R2SourceDigest, create_r2_client
+from eth_defi.cloudflare_r2_uploader import R2Uploader, get_default_r2_upload_manifest
+from eth_defi.research.sparkline_vector import calculate_sparkline_digest, prepare_sparkline_series, render_sparkline_png, render_sparkline_svg
+from eth_defi.research.vault_price_store import VaultPriceStore
 from eth_defi.token import is_stablecoin_like
 from eth_defi.utils import setup_console_logging
 from eth_defi.vault.vaultdb import VaultDatabase, get_pipeline_data_dir
@@ -57,12 +73,51 @@ def resolve_sparkline_peak_tvl_threshold(vault_row: dict) -> int:
     return MIN_PEAK_TVL
 
 
+#: Small SVG sparkline for listings, large PNG sparkline for Twitter Summary Cards.
+#:
+#: Extension -> (content type, renderer, render parameters)
+SPARKLINE_VARIANTS = {
+    "svg": ("image/svg+xml", render_sparkline_svg, {"width": 100, "height": 25, "line_width": 1, "margin_ratio": 4}),
+    "png": ("image/png", render_sparkline_png, {"width": 300, "height": 300, "line_width": 2, "margin_ratio": 50}),
+}
+
+
 @dataclass
-class RenderData:
+class SparklineJob:
+    """One sparkline image to export."""
+
     vault_id: str
-    svg_bytes: bytes
-    content_type: str
     extension: str
+    x: np.ndarray
+    y: np.ndarray
+
+    #: Digest of the input series and render parameters, stored in R2 metadata
+    source_digest: R2SourceDigest
+
+    @property
+    def object_name(self) -> str:
+        return f"sparkline-90d-{self.vault_id}.{self.extension}"
+
+    def render(self) -> bytes:
+        _, renderer, kwargs = SPARKLINE_VARIANTS[self.extension]
+        return renderer(self.x, self.y, digest=self.source_digest.sha256, **kwargs)
+
+
+def create_sparkline_jobs(vault_id: str, vault_prices_df: pd.DataFrame) -> list[SparklineJob]:
+    """Create export jobs for all variants of one vault.
+
+    :raise ValueError:
+        Vault has no finite share prices.
+    """
+    x, y = prepare_sparkline_series(vault_prices_df)
+    jobs = []
+    for extension, (_, _, kwargs) in SPARKLINE_VARIANTS.items():
+        digest = R2SourceDigest(
+            sha256=calculate_sparkline_digest(x, y, extension=extension, **kwargs),
+            size=x.nbytes + y.nbytes,
+        )
+        jobs.append(SparklineJob(vault_id=vault_id, extension=extension, x=x, y=y, source_digest=digest))
+    return jobs
 
 
 def get_included_vault_ids(
@@ -106,7 +161,9 @@ def main():
 
     data_dir = get_pipeline_data_dir()
     vault_db = VaultDatabase.read(data_dir / "vault-metadata-db.pickle")
-    prices_df = pd.read_parquet(data_dir / "cleaned-vault-prices-1h.parquet")
+    # Memory-mapped prices sorted by vault, sliced per vault below
+    store = VaultPriceStore.open(data_dir / "cleaned-vault-prices-1h.parquet")
+    prices_df = store.table.select(["id", "total_assets"]).to_pandas()
 
     # Select entries with peak TVL threshold - uses single aggregation pass
     included_ids = get_included_vault_ids(vault_db, prices_df)
@@ -116,109 +173,73 @@ def main():
 
     # Export last 90 days
 
-    last_day = prices_df.index.max()
-
-    prices_df = prices_df[prices_df.index >= (last_day - pd.Timedelta(days=90))]
-    prices_df = prices_df.reset_index().set_index(["id", "timestamp"]).sort_index()
+    last_day = pd.Timestamp(pc.max(store.table["timestamp"]).as_py())
+    start = last_day - pd.Timedelta(days=90)
 
-    # Pre-extract per-vault DataFrames so workers receive small data, not the full prices_df
+    # Pre-extract per-vault DataFrames
     vault_data_items = []
     for row in vault_rows:
         detection_data = row["_detection_data"]
         spec = detection_data.get_spec()
         vault_id = spec.as_string_id()
-        try:
-            vault_prices_df = prices_df.loc[vault_id]
-        except KeyError:
+        if vault_id not in store:
+            continue
+        vault_prices_df = store.get_vault_prices(vault_id, start=start)[["share_price", "total_assets"]]
+        if len(vault_prices_df) == 0:
             continue
         # Resample to daily data points once
-        vault_prices_df = vault_prices_df.resample("D").last()[["share_price", "total_assets"]]
+        vault_prices_df = vault_prices_df.resample("D").last()
         vault_data_items.append((vault_id, vault_prices_df))
 
-    logger.info("Rendering sparklines for %s vaults with %s workers", len(vault_data_items), max_workers)
-
-    # Render both SVG and PNG for a single vault - uses Agg backend, safe in worker processes
-    def _render_vault(vault_id: str, vault_prices_df: pd.DataFrame) -> list[RenderData]:
-        results = []
-
+    jobs = []
+    for vault_id, vault_prices_df in vault_data_items:
         try:
-            # Small SVG sparkline for listings
-            fig_svg = render_sparkline_gradient(
-                vault_prices_df,
-                width=100,
-                height=25,
-                line_width=1,
-                margin_ratio=4,
-            )
-            svg_bytes = export_sparkline_as_svg(fig_svg)
-            results.append(
-                RenderData(
-                    vault_id=vault_id,
-                    svg_bytes=svg_bytes,
-                    content_type="image/svg+xml",
-                    extension="svg",
-                )
-            )
-
-            # Large PNG sparkline for Twitter Summary Cards
-            fig_png = render_sparkline_gradient(
-                vault_prices_df,
-                width=300,
-                height=300,
-            )
-            png_bytes = export_sparkline_as_png(fig_png)
-            results.append(
-                RenderData(
-                    vault_id=vault_id,
-                    svg_bytes=png_bytes,
-                    content_type="image/png",
-                    extension="png",
-                )
-            )
+            jobs += create_sparkline_jobs(vault_id, vault_prices_df)
         except ValueError as e:
             logger.warning("Skipping sparkline for vault %s: %s", vault_id, e)
 
-        return results
-
-    # Parallelise rendering across processes - each gets its own matplotlib instance
-    render_tasks = (delayed(_render_vault)(vid, df) for vid, df in vault_data_items)
-    render_results = Parallel(n_jobs=max_workers, prefer="processes")(tqdm(render_tasks, total=len(vault_data_items), desc="Rendering sparklines"))
-    render_data = [item for sublist in render_results for item in sublist]
-
-    logger.info("Uploading %s sparkline images to R2", len(render_data))
-
     # Create boto3 client once, reuse for all uploads.
     # Set max_pool_connections to match worker count so urllib3
     # doesn't discard connections under concurrent thread load.
-    import boto3
-    from botocore.config import Config
-    from botocore.exceptions import ClientError
-
-    s3_client = boto3.client(
-        "s3",
+    s3_client = create_r2_client(
         endpoint_url=endpoint_url,
-        aws_access_key_id=access_key_id,
-        aws_secret_access_key=secret_access_key,
-        region_name="auto",
-        config=Config(max_pool_connections=max_workers),
+        access_key_id=access_key_id,
+        secret_access_key=secret_access_key,
+        max_pool_connections=max_workers,
     )
 
-    def _upload_row(render_data: RenderData):
-        object_name = f"sparkline-90d-{render_data.vault_id}.{render_data.extension}"
-        try:
-            s3_client.put_object(
-                Bucket=bucket_name,
-                Key=object_name,
-                Body=gzip.compress(render_data.svg_bytes),
-                ContentType=render_data.content_type,
-                ContentEncoding="gzip",
+    with R2Uploader(s3_client, bucket_name, manifest=get_default_r2_upload_manifest(), max_workers=max_workers) as uploader:
+
+        def _is_current(job: SparklineJob) -> bool:
+            content_type, _, _ = SPARKLINE_VARIANTS[job.extension]
+            return uploader.is_current(job.object_name, job.source_digest, content_type=content_type, encoding="gzip")
+
+        if not os.environ.get("FORCE_SPARKLINES"):
+            # Manifest hits are local, misses need a head request,
+            # which is I/O bound, check in parallel using threads
+            check_tasks = (delayed(_is_current)(job) for job in jobs)
+            current = Parallel(n_jobs=max_workers, prefer="threads")(tqdm(check_tasks, total=len(jobs), desc="Checking existing sparklines"))
+            jobs = [job for job, is_current in zip(jobs, current) if not is_current]
+
+        logger.info("Rendering and uploading %s changed sparkline images to R2", len(jobs))
+
+        # Rendering takes a millisecond or two, so render in the upload threads
+        futures = []
+        for job in jobs:
+            content_type, _, _ = SPARKLINE_VARIANTS[job.extension]
+            futures.append(
+                uploader.submit_bytes(
+                    job.object_name,
+                    job.render,
+                    content_type=content_type,
+                    encoding="gzip",
+                    source_digest=job.source_digest,
+                    skip_if_current=False,
+                )
             )
-        except ClientError as e:
-            raise RuntimeError(f"Failed to upload {object_name} to bucket {bucket_name} (endpoint: {endpoint_url}, access_key_id: {access_key_id}): {e}") from e
 
-    # Upload in parallel using threads (I/O bound)
-    upload_tasks = (delayed(_upload_row)(row) for row in render_data)
-    Parallel(n_jobs=max_workers, prefer="threads")(tqdm(upload_tasks, total=len(render_data), desc=f"Uploading sparklines to R2 bucket {bucket_name}"))
+        for future in tqdm(futures, desc=f"Uploading sparklines to R2 bucket {bucket_name}"):
+            future.result()
 
     print("Sparkline export complete")
 
@@ -0,0 +1,44 @@
+"""Migrate the pickled vault metadata database to the indexed SQLite store.
+
+The pickle is left in place. Tools read the store by passing a ``.sqlite``
+path to :py:meth:`eth_defi.vault.vaultdb.VaultDatabase.read`.
+See :py:mod:`eth_defi.vault.vaultdb_store`.
+
+Usage:
+
+.. code-block:: shell
+
+    poetry run python scripts/erc-4626/migrate-vault-db-to-sqlite.py
+
+Environment variables:
+
+- ``VAULT_DB_PATH``: Optional path to ``vault-metadata-db.pickle``.
+- ``VAULT_DB_STORE_PATH``: Optional path to the output ``vault-metadata-db.sqlite``.
+- ``LOG_LEVEL``: Optional console log level. Defaults to ``info``.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+from eth_defi.utils import setup_console_logging
+from eth_defi.vault.vaultdb import DEFAULT_VAULT_DATABASE
+from eth_defi.vault.vaultdb_store import DEFAULT_VAULT_METADATA_STORE, migrate_vault_database_pickle
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    setup_console_logging(default_log_level=os.environ.get("LOG_LEVEL", "info"))
+
+    pickle_path = Path(os.environ.get("VAULT_DB_PATH", DEFAULT_VAULT_DATABASE)).expanduser()
+    store_path = Path(os.environ.get("VAULT_DB_STORE_PATH", DEFAULT_VAULT_METADATA_STORE)).expanduser()
+
+    store = migrate_vault_database_pickle(pickle_path, store_path)
+    df = store.read_columns()
+    print(f"Migrated {len(df):,} vault rows from {pickle_path} to {store_path}")
+    print(df.groupby("protocol").size().sort_values(ascending=False).head(20).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ Environment variables:
 - ``CURRENCY_API_DB_PATH`` / ``CURRENCY_API_DATABASE_PATH``: Optional. Local FX DuckDB path for non-USD source-currency rates.
 - ``CURRENCY_API_SOURCE``: Optional. FX source column. Default: fawazahmed0.
 - ``COINGECKO_DEMO_API_KEY``: Optional. CoinGecko demo API key read by the rate module.
+- ``STABLECOIN_RATE_TABLE_PATH``: Optional. Write rates to this sidecar table, or ``default``, instead of the YAML files.
 - ``PROGRESS``: Optional. Set to ``false`` to hide tqdm progress bars. Default: true.
 - ``LOG_LEVEL``: Optional. Default: info.
 """
@@ -98,6 +99,7 @@ def main() -> int:
         ["Entries seen", summary.entries_seen],
         ["Rates fetched", summary.rates_fetched],
         ["Files updated", summary.files_updated],
+        ["Rate table entries updated", summary.rate_table_entries_updated],
         ["CoinGecko ids checked", summary.coingecko_ids_checked],
         ["CoinGecko ids valid", summary.coingecko_ids_valid],
         ["CoinGecko id validation failures", summary.coingecko_id_validation_failed_count],
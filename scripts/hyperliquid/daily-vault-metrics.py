@@ -37,6 +37,8 @@ Environment variables:
 - ``FULL_SCAN``: Set to ``1`` to force a full scan of all tracked vaults regardless of TVL.
 - ``FULL_SCAN_WEEKDAY``: Day of the week to automatically trigger a full scan (0=Monday, 6=Sunday).
   Default: 6 (Sunday). Ignored when ``FULL_SCAN=1``.
+- ``DELTA_SCAN``: Set to ``1`` to only fetch details of vaults that changed in the bulk listing
+  or have not been fetched yet today. Useful when the script runs several times a day.
 - ``VAULT_DB_PATH``: Path to existing ERC-4626 VaultDatabase pickle to merge into.
   Default: ~/.tradingstrategy/vaults/vault-metadata-db.pickle
 - ``PARQUET_PATH``: Path to uncleaned Parquet to merge into (raw format).
@@ -102,6 +104,8 @@ def main():
         full_scan_weekday = int(os.environ.get("FULL_SCAN_WEEKDAY", "6"))  # 0=Mon, 6=Sun
         full_scan = native_datetime_utc_now().date().weekday() == full_scan_weekday
 
+    delta_scan = os.environ.get("DELTA_SCAN", "").strip().lower() in {"1", "true", "yes"}
+
     vault_db_path_str = os.environ.get("VAULT_DB_PATH")
     vault_db_path = Path(vault_db_path_str).expanduser() if vault_db_path_str else DEFAULT_VAULT_DATABASE
 
@@ -120,6 +124,7 @@ def main():
         print(f"Min TVL: ${min_tvl:,.0f}")
         print(f"Max vaults: {max_vaults}")
     print(f"Full scan: {full_scan}")
+    print(f"Delta scan: {delta_scan}")
     print(f"Max workers: {max_workers}")
     print(f"Flow backfill days: {flow_backfill_days}")
     print(f"VaultDB path: {vault_db_path}")
@@ -143,6 +148,7 @@ def main():
         vault_addresses=vault_addresses,
         flow_backfill_days=flow_backfill_days,
         full_scan=full_scan,
+        delta_scan=delta_scan,
     )
 
     metadata_df = None
@@ -477,6 +477,7 @@ def decode_queue_events(
             topic0_list=list(event_by_topic.keys()),
             start_block=start_block,
             end_block=end_block,
+            web3=vault.web3,
         )
         logger.info("Fetched %d logs using Hypersync from blocks %d - %d", len(logs), start_block, end_block)
 
@@ -161,6 +161,7 @@ def test_asseto_hardcoded_lead_is_added_to_discovery(monkeypatch: pytest.MonkeyP
         block_identifier: int,
         max_workers: int,
         progress_bar_desc: str | None,
+        probe_cache: object = None,
     ):
         """Return Asseto classification for the only registered AoABT token."""
 
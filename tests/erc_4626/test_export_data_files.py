@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from eth_defi import cloudflare_r2_uploader
 from eth_defi.vault import data_file_export
 from eth_defi.vault.settlement_data import VAULT_SETTLEMENT_DATABASE_FILENAME, VaultSettlementDatabase
 
@@ -151,7 +152,7 @@ def test_core3_duckdb_upload_gets_alternative_daily_backup(
         return True
 
     monkeypatch.setattr(data_file_export, "create_r2_client", lambda **_: object())
-    monkeypatch.setattr(data_file_export, "upload_file_to_r2", fake_upload_file_to_r2)
+    monkeypatch.setattr(cloudflare_r2_uploader, "upload_file_to_r2", fake_upload_file_to_r2)
     monkeypatch.setattr(data_file_export, "copy_r2_object_daily_backup", fake_copy_r2_object_daily_backup)
 
     data_file_export.main()
@@ -209,7 +210,7 @@ def test_exchange_rate_duckdb_upload_gets_alternative_daily_backup(
         return True
 
     monkeypatch.setattr(data_file_export, "create_r2_client", lambda **_: object())
-    monkeypatch.setattr(data_file_export, "upload_file_to_r2", fake_upload_file_to_r2)
+    monkeypatch.setattr(cloudflare_r2_uploader, "upload_file_to_r2", fake_upload_file_to_r2)
     monkeypatch.setattr(data_file_export, "copy_r2_object_daily_backup", fake_copy_r2_object_daily_backup)
 
     data_file_export.main()
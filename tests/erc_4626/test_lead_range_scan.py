@@ -0,0 +1,125 @@
+"""Parallel range lead discovery and range checkpoint tests.
+
+No HyperSync: the stream is faked. See :mod:`eth_defi.erc_4626.lead_range_scan`.
+"""
+
+import asyncio
+import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from eth_defi.erc_4626.discovery_base import LeadScanReport, PotentialVaultMatch, VaultEventKind
+from eth_defi.erc_4626.hypersync_discovery import HypersyncVaultDiscover
+from eth_defi.erc_4626.lead_range_scan import LeadRangeCheckpointDatabase, merge_lead_maps, split_block_range
+
+VAULT_A = "0x0000000000000000000000000000000000000001"
+VAULT_B = "0x0000000000000000000000000000000000000002"
+
+
+def _lead(address: str, block: int, deposits: int = 0, withdrawals: int = 0) -> PotentialVaultMatch:
+    return PotentialVaultMatch(
+        chain=1,
+        address=address,
+        first_seen_at_block=block,
+        first_seen_at=datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds=block),
+        deposit_count=deposits,
+        withdrawal_count=withdrawals,
+    )
+
+
+def test_split_block_range():
+    """Ranges are contiguous, half-open and not split below the minimum size."""
+    assert split_block_range(0, 10_000_000, 4) == [(0, 2_500_000), (2_500_000, 5_000_000), (5_000_000, 7_500_000), (7_500_000, 10_000_000)]
+    assert split_block_range(100, 1_000, 4) == [(100, 1_000)]
+    assert split_block_range(0, 1_001, 3, min_range_blocks=1) == [(0, 333), (333, 666), (666, 1_001)]
+
+
+def test_merge_lead_maps_is_order_independent():
+    """Range results merge to the same leads whatever the completion order."""
+    first = {VAULT_A: _lead(VAULT_A, 100, deposits=2)}
+    second = {VAULT_A: _lead(VAULT_A, 500, deposits=1, withdrawals=3), VAULT_B: _lead(VAULT_B, 600, deposits=1)}
+
+    merged = merge_lead_maps(first, second)
+    assert merged == merge_lead_maps(second, first)
+    assert merged[VAULT_A].first_seen_at_block == 100
+    assert merged[VAULT_A].deposit_count == 3
+    assert merged[VAULT_A].withdrawal_count == 3
+    assert merged[VAULT_B].deposit_count == 1
+
+    # Inputs are not mutated
+    assert first[VAULT_A].deposit_count == 2
+
+
+def test_checkpoint_plan_resume(tmp_path):
+    """An interrupted plan is resumed, extended to the new head, or replaced when stale."""
+    db = LeadRangeCheckpointDatabase(tmp_path / "ranges.sqlite")
+
+    plan = db.plan_ranges(1, 0, 1_000, 2, min_range_blocks=1)
+    assert [(c.start_block, c.end_block) for c in plan] == [(0, 500), (500, 1_000)]
+
+    plan[0].cursor_block = 500
+    plan[0].leads = {VAULT_A: _lead(VAULT_A, 10, deposits=1)}
+    plan[1].cursor_block = 700
+    db.save(plan[0])
+    db.save(plan[1])
+
+    resumed = db.plan_ranges(1, 0, 1_200, 2, min_range_blocks=1)
+    assert [(c.start_block, c.cursor_block, c.end_block) for c in resumed] == [(0, 500, 500), (500, 700, 1_000), (1_000, 1_000, 1_200)]
+    assert resumed[0].is_complete()
+    assert resumed[0].leads[VAULT_A].deposit_count == 1
+
+    # A different start block means the vault database moved on, start over
+    fresh = db.plan_ranges(1, 1_200, 1_300, 2, min_range_blocks=1)
+    assert [(c.start_block, c.end_block) for c in fresh] == [(1_200, 1_250), (1_250, 1_300)]
+
+    db.clear_chain(1)
+    assert db.load_chain(1) == []
+
+
+class _FakeReceiver:
+    """One response with all logs of the range, then end of stream."""
+
+    def __init__(self, logs: list, end_block: int):
+        self.responses = [
+            SimpleNamespace(
+                next_block=end_block,
+                archive_height=end_block,
+                data=SimpleNamespace(logs=logs, blocks=[SimpleNamespace(number=log.block_number, timestamp=log.block_number) for log in logs]),
+            ),
+            None,
+        ]
+
+    async def recv(self):
+        return self.responses.pop(0)
+
+
+def test_parallel_ranges_match_single_stream(tmp_path):
+    """Scanning in parallel ranges gives the same leads as one linear stream."""
+    deposit_topic = "0xdeposit"
+    logs = [SimpleNamespace(address=address, block_number=block, topics=[deposit_topic]) for address, block in [(VAULT_A, 1_000_000), (VAULT_B, 4_000_000), (VAULT_A, 7_000_000), (VAULT_B, 9_000_000)]]
+
+    async def _open_stream(client, query):
+        return _FakeReceiver([log for log in logs if query.from_block <= log.block_number < query.to_block], query.to_block)
+
+    def _scan(**kwargs) -> LeadScanReport:
+        web3 = MagicMock()
+        web3.eth.chain_id = 1
+        discover = HypersyncVaultDiscover(web3=web3, web3factory=MagicMock(), client=MagicMock(), **kwargs)
+        discover.seed_existing_leads({VAULT_A: _lead(VAULT_A, 50, deposits=1)})
+        with (
+            patch.object(discover, "build_query", side_effect=lambda s, e: SimpleNamespace(from_block=s, to_block=e)),
+            patch("eth_defi.erc_4626.hypersync_discovery.open_hypersync_stream", side_effect=_open_stream),
+            patch("eth_defi.erc_4626.hypersync_discovery.get_vault_event_topic_map", return_value={deposit_topic: VaultEventKind.deposit}),
+        ):
+            report = asyncio.run(discover.scan_potential_vaults(0, 10_000_000, display_progress=False))
+        return report
+
+    linear = _scan()
+    checkpoint_db = LeadRangeCheckpointDatabase(tmp_path / "ranges.sqlite")
+    ranged = _scan(parallel_ranges=4, checkpoint_db=checkpoint_db)
+
+    assert ranged.leads == linear.leads
+    assert ranged.leads[VAULT_A].deposit_count == 3
+    assert ranged.new_leads == linear.new_leads == 1
+    assert ranged.deposits == linear.deposits == 4
+    assert all(c.is_complete() for c in checkpoint_db.load_chain(1))
@@ -0,0 +1,90 @@
+"""Staged vault feature probing and the code hash probe cache.
+
+No RPC: multicall results are faked. See :py:func:`eth_defi.erc_4626.classification.probe_vaults`.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from eth_defi.erc_4626.classification import CORE_PROBE_FUNCTIONS, VALUE_DEPENDENT_PROBE_FUNCTIONS, _ProbeResultsDict, create_probe_calls, identify_vault_features, probe_vaults
+from eth_defi.erc_4626.core import ERC4626Feature
+from eth_defi.erc_4626.probe_cache import VaultProbeCache
+from eth_defi.event_reader.multicall_batcher import EncodedCallResult
+
+TOKEN = "0x0000000000000000000000000000000000000001"
+MORPHO_VAULT_A = "0x0000000000000000000000000000000000000002"
+MORPHO_VAULT_B = "0x0000000000000000000000000000000000000003"
+BROKEN = "0x0000000000000000000000000000000000000004"
+
+#: Which probes answer on each fake contract
+CONTRACTS = {
+    TOKEN: {"name"},
+    MORPHO_VAULT_A: {"name", "convertToShares", "MORPHO"},
+    MORPHO_VAULT_B: {"name", "convertToShares", "MORPHO"},
+    BROKEN: {"EVM IS BROKEN SHIT", "name", "convertToShares"},
+}
+
+
+class _FakeMulticall:
+    """Answer probe calls from :py:data:`CONTRACTS` and record what was asked."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, chain_id, web3factory, calls, block_identifier, **kwargs):
+        self.calls += calls
+        for call in calls:
+            success = call.func_name in CONTRACTS[call.address]
+            yield EncodedCallResult(call=call, success=success, result=b"\x00" * 32 if success else b"", block_identifier=block_identifier)
+
+
+def _probe(**kwargs) -> tuple[dict, _FakeMulticall]:
+    fake = _FakeMulticall()
+    with patch("eth_defi.erc_4626.classification.read_multicall_chunked", side_effect=fake):
+        features = {p.address: p.features for p in probe_vaults(1, MagicMock(), list(CONTRACTS), block_identifier=1, **kwargs)}
+    return features, fake
+
+
+def test_staged_probing_matches_full_probing():
+    """Only vault-like survivors get protocol probes, and classification does not change."""
+    features, fake = _probe()
+
+    full_fake = _FakeMulticall()
+    for address in CONTRACTS:
+        results = {r.call.func_name: r for r in full_fake(1, None, list(create_probe_calls([address], chain_id=1)), 1)}
+        assert features[address] == identify_vault_features(address, _ProbeResultsDict(results), None, chain_id=1)
+
+    assert features[TOKEN] == {ERC4626Feature.broken}
+    assert features[BROKEN] == {ERC4626Feature.broken}
+    assert ERC4626Feature.morpho_like in features[MORPHO_VAULT_A]
+
+    protocol_probed = {c.address for c in fake.calls if c.func_name not in CORE_PROBE_FUNCTIONS}
+    assert protocol_probed == {MORPHO_VAULT_A, MORPHO_VAULT_B}
+
+
+def test_probe_cache_serves_clones(tmp_path):
+    """A second scan of contracts sharing the runtime code only calls value-dependent protocol probes."""
+    cache = VaultProbeCache(tmp_path / "probe-cache.sqlite")
+    same_code = {MORPHO_VAULT_A: b"\x01" * 32, MORPHO_VAULT_B: b"\x01" * 32}
+
+    with patch("eth_defi.erc_4626.classification.fetch_runtime_code_hashes", return_value=same_code):
+        first, _ = _probe(probe_cache=cache)
+        second, fake = _probe(probe_cache=cache)
+
+    assert second == first
+    assert {c.func_name for c in fake.calls if c.func_name not in CORE_PROBE_FUNCTIONS} <= VALUE_DEPENDENT_PROBE_FUNCTIONS
+
+
+def test_clones_probed_once(tmp_path):
+    """On a first scan, only one of the contracts sharing the runtime code gets the full protocol probes."""
+    cache = VaultProbeCache(tmp_path / "probe-cache.sqlite")
+    same_code = {MORPHO_VAULT_A: b"\x01" * 32, MORPHO_VAULT_B: b"\x01" * 32}
+
+    with patch("eth_defi.erc_4626.classification.fetch_runtime_code_hashes", return_value=same_code):
+        features, fake = _probe(probe_cache=cache)
+
+    uncached, _ = _probe()
+    assert features == uncached
+    probed_b = {c.func_name for c in fake.calls if c.address == MORPHO_VAULT_B and c.func_name not in CORE_PROBE_FUNCTIONS}
+    assert probed_b <= VALUE_DEPENDENT_PROBE_FUNCTIONS
+    with cache._connect() as connection:
+        assert connection.execute("SELECT COUNT(*) FROM probe_result").fetchone()[0] == 1
@@ -0,0 +1,120 @@
+"""Persistent historical multicall result cache tests.
+
+No RPC: the multicall contract is faked. See :mod:`eth_defi.event_reader.multicall_cache`.
+"""
+
+import pickle
+from types import SimpleNamespace
+
+from eth_defi.event_reader import multicall_batcher
+from eth_defi.event_reader.multicall_cache import MulticallResultCache, get_process_multicall_cache, hash_encoded_calls
+
+VAULT_A = "0x0000000000000000000000000000000000000001"
+VAULT_B = "0x0000000000000000000000000000000000000002"
+
+
+def test_multicall_cache_roundtrip(tmp_path):
+    """Only finalised blocks are written; results read back in call order."""
+    cache = MulticallResultCache(tmp_path / "cache.sqlite", finalised_block=1_000)
+    calls = [(VAULT_A, b"\x01\x02"), (VAULT_B, b"\x03")]
+    results = [(True, b"\x00" * 32), (True, b"\x01" * 32)]
+
+    assert cache.get(1, 900, calls) is None
+    assert cache.put(1, 900, calls, results)
+    assert cache.get(1, 900, calls) == results
+    assert cache.hits == 1 and cache.misses == 1
+
+    # Different block, chain or payload is a different key
+    assert cache.get(1, 901, calls) is None
+    assert cache.get(2, 900, calls) is None
+    assert cache.get(1, 900, list(reversed(calls))) is None
+
+    # Blocks past the finalised horizon and "latest" are not written
+    assert not cache.put(1, 1_001, calls, results)
+    assert not cache.put(1, "latest", calls, results)
+
+    # Reverting probes are final chain state, and are cached with their success flag
+    probe_results = [(True, b"\x00" * 32), (False, b"")]
+    assert cache.put(1, 902, calls, probe_results)
+    assert cache.get(1, 902, calls) == probe_results
+
+    # A batch that came back all empty hints a broken node, do not persist
+    assert not cache.put(1, 903, calls, [(True, b""), (False, b"")])
+
+    # Survives pickling to a worker process, where tasks share one instance per file
+    clone = pickle.loads(pickle.dumps(cache))
+    assert clone.get(1, 900, calls) == results
+    process_cache = get_process_multicall_cache(clone)
+    next_task_cache = pickle.loads(pickle.dumps(cache))
+    next_task_cache.finalised_block = 2_000
+    assert get_process_multicall_cache(next_task_cache) is process_cache
+    assert process_cache.finalised_block == 2_000
+
+
+def test_multicall_cache_hash_is_content_addressed():
+    """Batch hash does not depend on address checksum casing."""
+    assert hash_encoded_calls([(VAULT_A.upper().replace("0X", "0x"), b"\x01")]) == hash_encoded_calls([(VAULT_A, b"\x01")])
+    assert hash_encoded_calls([(VAULT_A, b"\x01\x02")]) != hash_encoded_calls([(VAULT_A, b"\x01"), (VAULT_A, b"\x02")])
+
+
+def test_multicall_cache_eviction(tmp_path):
+    """Least recently used entries are dropped when over the size cap."""
+    cache = MulticallResultCache(tmp_path / "cache.sqlite", finalised_block=1_000, max_bytes=1)
+    calls = [(VAULT_A, b"\x01")]
+    for block in range(10):
+        cache.put(1, block, calls, [(True, bytes([block]) * 32)])
+
+    assert cache.evict() == 10
+    assert cache.get_total_size() == 0
+
+
+def test_multicall_cache_hits_do_not_write(tmp_path):
+    """Hit access times are written in batches, and still steer eviction."""
+    cache = MulticallResultCache(tmp_path / "cache.sqlite", finalised_block=1_000)
+    old, recent = [(VAULT_A, b"\x01")], [(VAULT_B, b"\x02")]
+    cache.put(1, 1, recent, [(True, b"\x02" * 32)])
+    cache.put(1, 1, old, [(True, b"\x01" * 32)])
+
+    cache.connection.commit()
+    changes = cache.connection.total_changes
+    for _ in range(10):
+        assert cache.get(1, 1, recent)
+    assert cache.connection.total_changes == changes
+
+    # The entry that was read survives eviction
+    cache.max_bytes = cache.get_total_size() - 1
+    assert cache.evict() == 1
+    assert cache.get(1, 1, recent) and cache.get(1, 1, old) is None
+
+
+def test_reader_serves_cached_batches(tmp_path):
+    """MultiprocessMulticallReader skips the RPC for cached batches."""
+
+    calls_made = []
+
+    class _FakeFunction:
+        def __init__(self, calls):
+            self.calls = calls
+
+        def call(self, tx, block_identifier):
+            calls_made.append(block_identifier)
+            return block_identifier, b"", [(True, b"\x11" * 32) for _ in self.calls]
+
+    fake_multicall = SimpleNamespace(functions=SimpleNamespace(tryBlockAndAggregate=lambda calls, requireSuccess: _FakeFunction(calls)))
+
+    reader = object.__new__(multicall_batcher.MultiprocessMulticallReader)
+    reader.web3 = SimpleNamespace(eth=SimpleNamespace(chain_id=1))
+    reader.multicall_cache = MulticallResultCache(tmp_path / "cache.sqlite", finalised_block=1_000)
+
+    encoded_calls = [(VAULT_A, b"\x01"), (VAULT_B, b"\x02"), (VAULT_A, b"\x03")]
+    first = reader.call_multicall_with_batch_size(fake_multicall, 500, 2, encoded_calls, require_multicall_result=False)
+    assert len(calls_made) == 2
+
+    second = reader.call_multicall_with_batch_size(fake_multicall, 500, 2, encoded_calls, require_multicall_result=False)
+    assert second == first
+    assert len(calls_made) == 2
+
+    # Near-head block is always read live
+    reader.call_multicall_with_batch_size(fake_multicall, 2_000, 2, encoded_calls, require_multicall_result=False)
+    reader.call_multicall_with_batch_size(fake_multicall, 2_000, 2, encoded_calls, require_multicall_result=False)
+    assert len(calls_made) == 6
@@ -0,0 +1,101 @@
+"""Stablecoin rate sidecar table and batched CoinGecko fetches.
+
+See :py:mod:`eth_defi.feed.stablecoin_rate_table`.
+"""
+
+import dataclasses
+import datetime
+import shutil
+from pathlib import Path
+
+import pytest
+
+from eth_defi.feed import stablecoin_rate
+from eth_defi.feed.stablecoin_rate import _batch_coingecko_ids, build_depegged_stablecoin_lookups, fetch_stablecoin_rates, iter_stablecoin_rate_targets, refresh_stablecoin_rates
+from eth_defi.feed.stablecoin_rate_table import StablecoinRateTable
+from eth_defi.stablecoin_metadata import STABLECOINS_DATA_DIR, build_stablecoin_metadata_json
+
+#: Packaged files copied to the test data directories, single and multi-entry
+SAMPLE_FILES = ["usdc.yaml", "usdt.yaml", "ausd.yaml", "rusd.yaml", "ceur.yaml"]
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+def _fake_get(url, params, headers, timeout):
+    if url == stablecoin_rate.COINGECKO_COINS_LIST_URL:
+        return FakeResponse([{"id": coin_id} for coin_id in ("usd-coin", "tether", "agora-dollar")])
+    ids = params["ids"].split(",")
+    prices = {"usd-coin": 0.9998, "tether": 0.5, "agora-dollar": 1.0001}
+    return FakeResponse({coin_id: {"usd": prices[coin_id], "last_updated_at": 1782464168} for coin_id in ids if coin_id in prices})
+
+
+def _copy_sample_dir(path: Path) -> Path:
+    path.mkdir()
+    for fname in SAMPLE_FILES:
+        shutil.copy(STABLECOINS_DATA_DIR / fname, path / fname)
+    # Curated peg, so that the fake price depegs it
+    usdt = path / "usdt.yaml"
+    usdt.write_text(usdt.read_text().replace("source_currency: ''\nsource_currency_source: ''", "source_currency: usd\nsource_currency_source: manual"))
+    return path
+
+
+def _get_targets(data_dir: Path, rate_table: StablecoinRateTable | None = None) -> list[dict]:
+    return [dataclasses.asdict(target) | {"yaml_path": target.yaml_path.name} for target in iter_stablecoin_rate_targets(data_dir, rate_table=rate_table)]
+
+
+def test_rate_table_refresh_matches_yaml_refresh(tmp_path, monkeypatch):
+    """Refresh into the rate table leaves YAML files alone and gives the same joined data as a YAML refresh."""
+    monkeypatch.setattr(stablecoin_rate.requests, "get", _fake_get)
+    yaml_dir = _copy_sample_dir(tmp_path / "yaml")
+    table_dir = _copy_sample_dir(tmp_path / "table")
+    original = {fname: (table_dir / fname).read_bytes() for fname in SAMPLE_FILES}
+    rate_table = StablecoinRateTable(tmp_path / "rates.sqlite")
+
+    for day in (1, 2):
+        now_ = datetime.datetime(2026, 10, day, 12, 0, 0)
+        yaml_summary = refresh_stablecoin_rates(data_dir=yaml_dir, now_=now_)
+        table_summary = refresh_stablecoin_rates(data_dir=table_dir, now_=now_, rate_table=rate_table)
+        assert table_summary.files_updated == 0
+        assert table_summary.rate_table_entries_updated == yaml_summary.entries_seen
+        assert dataclasses.replace(table_summary, files_updated=yaml_summary.files_updated, rate_table_entries_updated=0) == yaml_summary
+        assert _get_targets(table_dir, rate_table) == _get_targets(yaml_dir)
+
+    assert {fname: (table_dir / fname).read_bytes() for fname in SAMPLE_FILES} == original
+    assert build_depegged_stablecoin_lookups(table_dir, rate_table=rate_table) == build_depegged_stablecoin_lookups(yaml_dir)
+    assert build_depegged_stablecoin_lookups(table_dir, rate_table=rate_table) != build_depegged_stablecoin_lookups(table_dir)
+
+    # Metadata export reads through the table configured in the environment
+    monkeypatch.setenv("STABLECOIN_RATE_TABLE_PATH", str(rate_table.path))
+    assert build_stablecoin_metadata_json(table_dir / "usdt.yaml") == build_stablecoin_metadata_json(yaml_dir / "usdt.yaml")
+
+
+def test_fetch_stablecoin_rates_batches_concurrently(tmp_path, monkeypatch):
+    """Coin ids are packed by count and URL length and fetched in parallel."""
+    ids = [f"coin-{i:04d}" for i in range(450)]
+    batches = _batch_coingecko_ids(ids, max_ids=200, max_length=1000)
+    assert [len(batch) for batch in batches] == [100, 100, 100, 100, 50]
+    assert [coin_id for batch in batches for coin_id in batch] == ids
+    assert [len(batch) for batch in _batch_coingecko_ids(ids)] == [200, 200, 50]
+
+    requested = []
+
+    def _get(url, params, headers, timeout):
+        requested.append(params["ids"])
+        return FakeResponse({coin_id: {"usd": 1.0} for coin_id in params["ids"].split(",")})
+
+    monkeypatch.setattr(stablecoin_rate.requests, "get", _get)
+    target = next(iter_stablecoin_rate_targets(_copy_sample_dir(tmp_path / "data")))
+    targets = [dataclasses.replace(target, coingecko_id=coin_id) for coin_id in ids]
+    prices = fetch_stablecoin_rates(targets, requests_per_minute=6000)
+    assert len(requested) == 3
+    assert sorted(prices) == ids
+    assert prices["coin-0449"]["usd"] == pytest.approx(1.0)
@@ -0,0 +1,91 @@
+"""Rolling 24h ticker candle cache.
+
+See :py:mod:`eth_defi.gmx.ccxt.ticker_candles`.
+"""
+
+import random
+
+from eth_defi.gmx.ccxt.exchange import GMX
+from eth_defi.gmx.ccxt.ticker_candles import TICKER_CANDLE_MS, TICKER_WINDOW_MS, RollingCandleWindow, TickerCandleCache, get_ticker_candle_cache
+
+#: 2026-01-01 00:00 UTC
+START = 1_767_225_600_000
+
+
+def _candle(rng: random.Random, timestamp: int) -> list:
+    low = rng.uniform(90, 100)
+    high = low + rng.uniform(0, 20)
+    return [timestamp, rng.uniform(low, high), high, low, rng.uniform(low, high), rng.uniform(0, 5)]
+
+
+def test_rolling_window_matches_full_recompute():
+    """Incrementally maintained 24h stats equal a recompute from the last 24h of candles."""
+    rng = random.Random(1)
+    history = [_candle(rng, START + i * TICKER_CANDLE_MS) for i in range(100)]
+    window = RollingCandleWindow()
+
+    for hour in range(100):
+        now = START + hour * TICKER_CANDLE_MS + 30 * 60 * 1000
+        limit = window.get_fetch_limit(now)
+        assert limit == (25 if hour == 0 else 2)
+        # API returns the latest candles, newest first
+        window.add_candles(history[: hour + 1][-limit:][::-1], now)
+        assert window.get_fetch_limit(now + 60_000) is None
+
+        expected = [c for c in history[: hour + 1] if c[0] >= now - TICKER_WINDOW_MS]
+        stats = window.get_stats(now)
+        assert stats.open == expected[0][1]
+        assert stats.high == max(c[2] for c in expected)
+        assert stats.low == min(c[3] for c in expected)
+        assert abs(stats.volume - sum(c[5] for c in expected)) < 1e-9
+
+    # Ticker prices extend the forming candle until it is refetched
+    window.observe_price(1_000.0)
+    assert window.get_stats(now).high == 1_000.0
+    assert window.get_fetch_limit(now + 15 * 60 * 1000) == 1
+
+
+def test_fetch_tickers_reuses_cached_candles(monkeypatch):
+    """Repeated ticker polls within an hour make no candle requests."""
+    rng = random.Random(2)
+    now = [START + 10 * TICKER_CANDLE_MS + 60_000]
+    requests = []
+
+    class FakeConfig:
+        def get_chain(self):
+            return "test_ticker_candles"
+
+    class FakeExchange:
+        config = FakeConfig()
+        _fetch_ohlcv_for_ticker = None
+
+        def milliseconds(self):
+            return now[0]
+
+    def _fetch(symbol, limit):
+        requests.append((symbol, limit))
+        last = now[0] - now[0] % TICKER_CANDLE_MS
+        return symbol, [_candle(rng, last - i * TICKER_CANDLE_MS) for i in range(limit)]
+
+    exchange = FakeExchange()
+    exchange._fetch_ohlcv_for_ticker = _fetch
+
+    def _poll():
+        tickers = {"ETH/USDC:USDC": {"last": 95.0}, "BTC/USDC:USDC": {"last": 96.0}}
+        GMX._apply_ticker_candles(exchange, tickers)
+        return tickers
+
+    tickers = _poll()
+    assert sorted(requests) == [("BTC/USDC:USDC", 25), ("ETH/USDC:USDC", 25)]
+    assert tickers["ETH/USDC:USDC"]["high"] >= tickers["ETH/USDC:USDC"]["low"]
+
+    requests.clear()
+    now[0] += 5 * 60 * 1000
+    _poll()
+    assert requests == []
+
+    now[0] += TICKER_CANDLE_MS
+    _poll()
+    assert sorted(requests) == [("BTC/USDC:USDC", 2), ("ETH/USDC:USDC", 2)]
+
+    assert isinstance(get_ticker_candle_cache("test_ticker_candles"), TickerCandleCache)
@@ -0,0 +1,94 @@
+"""Hyperliquid daily scan change detection.
+
+See :py:mod:`eth_defi.hyperliquid.daily_scan_planner`.
+"""
+
+import dataclasses
+import datetime
+from decimal import Decimal
+
+from eth_defi.hyperliquid import daily_metrics
+from eth_defi.hyperliquid.daily_metrics import run_daily_scan
+from eth_defi.hyperliquid.daily_scan_planner import create_scan_snapshot, plan_daily_scan
+from eth_defi.hyperliquid.vault import VaultSummary
+
+
+def _summary(n: int, tvl: float, pnl: str = "100.0") -> VaultSummary:
+    return VaultSummary(
+        name=f"Vault {n}",
+        vault_address=f"0x{n:040x}",
+        leader="0x0000000000000000000000000000000000000001",
+        tvl=Decimal(str(tvl)),
+        is_closed=False,
+        relationship_type="normal",
+        pnl_all_time=["0.0", pnl],
+    )
+
+
+def test_plan_daily_scan():
+    """New, failed, stale and changed vaults are fetched by TVL, idle ones skipped."""
+    now = datetime.datetime(2026, 3, 2, 12, 0)
+    earlier_today = datetime.datetime(2026, 3, 2, 6, 0)
+    yesterday = datetime.datetime(2026, 3, 1, 23, 0)
+
+    idle, moved, pnl_moved, old, failed, new = (_summary(i, 1_000 * i) for i in range(1, 7))
+    snapshots = {
+        idle.vault_address: create_scan_snapshot(idle, earlier_today, True),
+        moved.vault_address: create_scan_snapshot(dataclasses.replace(moved, tvl=Decimal(100)), earlier_today, True),
+        pnl_moved.vault_address: create_scan_snapshot(dataclasses.replace(pnl_moved, pnl_all_time=["0.0", "99.0"]), earlier_today, True),
+        old.vault_address: create_scan_snapshot(old, yesterday, True),
+        failed.vault_address: create_scan_snapshot(failed, earlier_today, False),
+    }
+    # TVL noise below the tolerance is not a change
+    noisy_idle = dataclasses.replace(idle, tvl=Decimal("1000.5"))
+
+    plan = plan_daily_scan([noisy_idle, moved, pnl_moved, old, failed, new], snapshots, now=now)
+    assert plan.skip == [noisy_idle]
+    assert plan.fetch == [new, failed, old, pnl_moved, moved]
+    assert plan.reasons == {
+        idle.vault_address: "unchanged",
+        moved.vault_address: "changed",
+        pnl_moved.vault_address: "changed",
+        old.vault_address: "stale",
+        failed.vault_address: "failed",
+        new.vault_address: "new",
+    }
+
+    plan = plan_daily_scan([idle], snapshots, now=now, max_staleness=datetime.timedelta(hours=1))
+    assert plan.reasons[idle.vault_address] == "stale"
+
+
+def test_run_daily_scan_delta(tmp_path, monkeypatch):
+    """Repeated delta scans fetch only vaults that moved, and record fetch costs."""
+    summaries = [_summary(1, 50_000), _summary(2, 20_000)]
+    fetched = []
+
+    monkeypatch.setattr(daily_metrics, "fetch_all_vaults", lambda session, timeout: iter(summaries))
+    monkeypatch.setattr(daily_metrics, "collect_hyperliquid_vault_observations", lambda *args, **kwargs: 0)
+
+    def _fetch_and_store_vault(session, db, summary, **kwargs):
+        fetched.append(summary.vault_address)
+        return True
+
+    monkeypatch.setattr(daily_metrics, "fetch_and_store_vault", _fetch_and_store_vault)
+
+    db_path = tmp_path / "daily.duckdb"
+
+    def _scan():
+        fetched.clear()
+        db = run_daily_scan(session=None, db_path=db_path, max_workers=1, delta_scan=True)
+        db.close()
+        return list(fetched)
+
+    assert _scan() == [summaries[0].vault_address, summaries[1].vault_address]
+    assert _scan() == []
+
+    summaries[1] = dataclasses.replace(summaries[1], tvl=Decimal(25_000))
+    assert _scan() == [summaries[1].vault_address]
+
+    db = daily_metrics.HyperliquidDailyMetricsDatabase(db_path)
+    costs = db.get_vault_scan_costs().set_index("vault_address")
+    assert costs.loc[summaries[0].vault_address, "fetch_count"] == 1
+    assert costs.loc[summaries[1].vault_address, "fetch_count"] == 2
+    assert costs.loc[summaries[1].vault_address, "tvl"] == 25_000
+    db.close()
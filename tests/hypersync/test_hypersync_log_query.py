@@ -0,0 +1,170 @@
+"""Unified Hypersync log query engine.
+
+No network: Hypersync streams are faked. See :py:mod:`eth_defi.hypersync.log_query`.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pyarrow as pa
+import pytest
+from eth_abi import encode
+
+from eth_defi.hypersync.log_query import HypersyncLogQueryEngine, LogQuerySpec, LogSegmentCache, decode_address_column, decode_uint256_column, decode_uint256_column_as_float
+from eth_defi.utils import from_unix_timestamp
+from eth_defi.vault.flow_events import _fetch_vault_flow_logs_for_addresses_hypersync_async
+
+VAULT_A = "0x000000000000000000000000000000000000000a"
+VAULT_B = "0x000000000000000000000000000000000000000b"
+DEPOSIT = "0x" + "d1" * 32
+WITHDRAW = "0x" + "e2" * 32
+OWNER = "0x00000000000000000000000000000000000000ff"
+
+
+def _log(address: str, topic0: str, block_number: int, amount: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        block_number=hex(block_number),
+        log_index="0x0",
+        address=address,
+        transaction_hash="0x" + f"{block_number:064x}",
+        topics=[topic0, "0x" + OWNER[2:].rjust(64, "0")],
+        data="0x" + encode(["uint256", "uint256"], [amount, 2**255]).hex(),
+    )
+
+
+#: Logs on the fake chain
+LOGS = [
+    _log(VAULT_A, DEPOSIT, 10, 100),
+    _log(VAULT_A, WITHDRAW, 20, 200),
+    _log(VAULT_B, DEPOSIT, 30, 300),
+    _log(VAULT_A, DEPOSIT, 40, 400),
+]
+
+
+class _FakeReceiver:
+    """Serve logs matching any log selection of the query, in one response."""
+
+    def __init__(self, query):
+        logs = []
+        for log in LOGS:
+            in_range = query.from_block <= int(log.block_number, 16) < query.to_block
+            matches = any(log.address in selection.address and log.topics[0] in selection.topics[0] for selection in query.logs)
+            if in_range and matches:
+                logs.append(log)
+        blocks = [SimpleNamespace(number=log.block_number, timestamp=hex(1_700_000_000 + int(log.block_number, 16))) for log in logs]
+        self.responses = iter([SimpleNamespace(data=SimpleNamespace(blocks=blocks, logs=logs)), None])
+
+    async def recv(self):
+        return next(self.responses)
+
+
+def _fetch(engine: HypersyncLogQueryEngine, specs: list[LogQuerySpec]) -> tuple[list[pa.Table], list]:
+    queries = []
+
+    async def _open_stream(client, query):
+        queries.append(query)
+        return _FakeReceiver(query)
+
+    with patch("eth_defi.hypersync.log_query.open_hypersync_stream", side_effect=_open_stream):
+        tables = engine.fetch_many(specs)
+    return tables, queries
+
+
+def test_merged_specs_share_stream():
+    """Overlapping specs use one stream, and each spec gets only its own logs."""
+    deposits = LogQuerySpec.create(addresses=[VAULT_A, VAULT_B], topics=[[DEPOSIT]], start_block=0, end_block=35)
+    withdrawals = LogQuerySpec.create(addresses=[VAULT_A.upper().replace("0X", "0x")], topics=[[WITHDRAW]], start_block=15, end_block=50)
+
+    engine = HypersyncLogQueryEngine(object())
+    (deposit_table, withdraw_table), queries = _fetch(engine, [deposits, withdrawals])
+    assert len(queries) == 1
+    assert queries[0].from_block == 0 and queries[0].to_block == 51
+
+    assert deposit_table["block_number"].to_pylist() == [10, 30]
+    assert withdraw_table["block_number"].to_pylist() == [20]
+    assert deposit_table["block_timestamp"].to_pylist() == [1_700_000_010, 1_700_000_030]
+
+    # Vectorised decoding
+    assert decode_address_column(deposit_table["topic1"]).to_pylist() == [OWNER, OWNER]
+    assert list(decode_uint256_column(deposit_table["data"])) == [100, 300]
+    assert list(decode_uint256_column(deposit_table["data"], word_index=1)) == [2**255, 2**255]
+    assert list(decode_uint256_column_as_float(deposit_table["data"], decimals=2)) == [1.0, 3.0]
+
+
+def test_segment_cache(tmp_path):
+    """Cached final blocks are not fetched again, and a longer range fetches only the new blocks."""
+    cache = LogSegmentCache(tmp_path)
+    engine = HypersyncLogQueryEngine(object(), chain_id=1, cache=cache, cacheable_until_block=35)
+    spec = LogQuerySpec.create(addresses=[VAULT_A, VAULT_B], topics=[[DEPOSIT]], start_block=0, end_block=35)
+
+    (first,), _ = _fetch(engine, [spec])
+    (second,), queries = _fetch(engine, [spec])
+    assert queries == []
+    assert second.equals(first)
+
+    engine.cacheable_until_block = 100
+    (longer,), queries = _fetch(engine, [spec.with_range(0, 50)])
+    assert queries[0].from_block == 36
+    assert longer["block_number"].to_pylist() == [10, 30, 40]
+
+    # A range spanning two cached segments
+    (shifted,), queries = _fetch(engine, [spec.with_range(5, 45)])
+    assert queries == []
+    assert shifted["block_number"].to_pylist() == [10, 30, 40]
+
+
+def test_vault_flow_logs_use_engine(tmp_path, monkeypatch):
+    """Vault flow event discovery reads through the engine and its segment cache."""
+    monkeypatch.setenv("HYPERSYNC_LOG_CACHE_PATH", str(tmp_path))
+    queries = []
+
+    async def _open_stream(client, query):
+        queries.append(query)
+        return _FakeReceiver(query)
+
+    def _fetch_flow_logs():
+        return asyncio.run(
+            _fetch_vault_flow_logs_for_addresses_hypersync_async(
+                hypersync_client=object(),
+                vault_addresses=[VAULT_A],
+                topic0_list=[DEPOSIT],
+                start_block=0,
+                end_block=100,
+                chain_id=1,
+                cacheable_until_block=100,
+            )
+        )
+
+    with patch("eth_defi.hypersync.log_query.open_hypersync_stream", side_effect=_open_stream):
+        logs = _fetch_flow_logs()
+        cached_logs = _fetch_flow_logs()
+
+    assert len(queries) == 1
+    assert cached_logs == logs
+    assert [log.block_number for log in logs] == [10, 40]
+    assert logs[0].topics == [DEPOSIT, "0x" + OWNER[2:].rjust(64, "0"), None, None]
+    assert logs[0].data == "0x" + encode(["uint256", "uint256"], [100, 2**255]).hex()
+    assert logs[0].address == "0x000000000000000000000000000000000000000A"
+    assert logs[0].block_timestamp == from_unix_timestamp(1_700_000_010)
+    assert logs[0].transaction_hash == "0x" + f"{10:064x}"
+
+
+def test_flaky_stream_retried():
+    """A rate limited stream is retried, other errors are not."""
+    spec = LogQuerySpec.create(addresses=[VAULT_A], topics=[[DEPOSIT]], start_block=0, end_block=50)
+    engine = HypersyncLogQueryEngine(object(), retry_sleep=0)
+    errors = [RuntimeError("429 Too Many Requests")]
+
+    async def _open_stream(client, query):
+        if errors:
+            raise errors.pop()
+        return _FakeReceiver(query)
+
+    with patch("eth_defi.hypersync.log_query.open_hypersync_stream", side_effect=_open_stream):
+        (table,) = engine.fetch_many([spec])
+        assert table["block_number"].to_pylist() == [10, 40]
+
+        errors.append(RuntimeError("bad query"))
+        with pytest.raises(RuntimeError, match="bad query"):
+            engine.fetch_many([spec])
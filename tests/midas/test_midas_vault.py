@@ -159,6 +159,7 @@ def test_midas_hardcoded_leads_are_added_to_discovery(monkeypatch: pytest.Monkey
         block_identifier: int,
         max_workers: int,
         progress_bar_desc: str | None,
+        probe_cache: object = None,
     ) -> Iterable[VaultFeatureProbe]:
         """Return Midas features for the hardcoded Midas lead addresses."""
 
@@ -602,6 +603,7 @@ def test_midas_lead_detection_lifetime_metrics_json_export(monkeypatch: pytest.M
         block_identifier: int,
         max_workers: int,
         progress_bar_desc: str | None,
+        probe_cache: object = None,
     ) -> Iterable[VaultFeatureProbe]:
         """Return Midas features only for mTBILL."""
 
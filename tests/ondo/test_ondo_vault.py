@@ -56,7 +56,7 @@ def test_ondo_hardcoded_classification_and_curator_are_chain_aware() -> None:
 def test_ondo_hardcoded_leads_are_added_to_discovery(monkeypatch: pytest.MonkeyPatch) -> None:
     """Add reviewed issuer share tokens without ERC-4626 flow events."""
 
-    def fake_probe_vaults(chain: int, web3factory: object, addresses: list[str], *, block_identifier: int, max_workers: int, progress_bar_desc: str | None):
+    def fake_probe_vaults(chain: int, web3factory: object, addresses: list[str], *, block_identifier: int, max_workers: int, progress_bar_desc: str | None, probe_cache: object = None):
         """Return explicit Ondo classifications for registered leads."""
 
         assert chain == ETHEREUM_CHAIN_ID
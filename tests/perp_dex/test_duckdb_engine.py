@@ -0,0 +1,93 @@
+"""Shared DuckDB storage helpers.
+
+See :py:mod:`eth_defi.perp_dex.duckdb_engine`.
+"""
+
+import datetime
+from decimal import Decimal
+
+import duckdb
+import pandas as pd
+
+from eth_defi.perp_dex.duckdb_engine import insert_new_rows, replace_rows, upsert_rows
+
+COLUMNS = ("vault_id", "date", "share_price", "tvl", "follower_count")
+
+
+def _create_table(con: duckdb.DuckDBPyConnection):
+    con.execute("""
+        CREATE TABLE prices (
+            vault_id VARCHAR NOT NULL,
+            date DATE NOT NULL,
+            share_price DOUBLE NOT NULL,
+            tvl DOUBLE,
+            follower_count INTEGER,
+            PRIMARY KEY (vault_id, date)
+        )
+    """)
+
+
+def test_upsert_rows_matches_executemany(tmp_path):
+    """Arrow batch upsert gives the same table as a row by row upsert."""
+    day = datetime.date(2026, 1, 1)
+    batches = [
+        [("a", day, 1.0, 100, 5), ("b", day, 1.0, None, None)],
+        # Update with sparse follower count, and a repeated key within the batch
+        [("a", day, 1.1, 110, None), ("b", day, 1.2, 50.5, 3), ("b", day, 1.3, 60.0, None)],
+    ]
+
+    reference = duckdb.connect()
+    _create_table(reference)
+    for batch in batches:
+        reference.executemany(
+            """
+            INSERT INTO prices VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (vault_id, date) DO UPDATE SET
+                share_price = EXCLUDED.share_price,
+                tvl = EXCLUDED.tvl,
+                follower_count = COALESCE(EXCLUDED.follower_count, prices.follower_count)
+            """,
+            batch,
+        )
+
+    con = duckdb.connect(str(tmp_path / "prices.duckdb"))
+    _create_table(con)
+    for batch in batches:
+        upsert_rows(con.cursor(), "prices", COLUMNS, batch, key_columns=("vault_id", "date"), coalesce_columns=("follower_count",))
+
+    query = "SELECT * FROM prices ORDER BY vault_id, date"
+    pd.testing.assert_frame_equal(con.execute(query).df(), reference.execute(query).df())
+    assert con.execute("SELECT follower_count FROM prices WHERE vault_id = 'b'").fetchone() == (3,)
+
+
+def test_upsert_rows_decimal():
+    """Decimal values in DOUBLE columns are converted, as executemany() does."""
+    con = duckdb.connect()
+    _create_table(con)
+    upsert_rows(con, "prices", COLUMNS, [("a", datetime.date(2026, 1, 1), Decimal("1.25"), None, 1)], ("vault_id", "date"))
+    assert con.execute("SELECT share_price, tvl FROM prices").fetchone() == (1.25, None)
+
+
+def test_insert_new_rows():
+    """Stored rows and the first row of a key in the batch win, as with INSERT OR IGNORE."""
+    day = datetime.date(2026, 1, 1)
+    con = duckdb.connect()
+    _create_table(con)
+    assert insert_new_rows(con, "prices", COLUMNS, [("a", day, 1.0, 10.0, 1), ("a", day, 2.0, 20.0, 2)], ("vault_id", "date")) == 1
+    assert insert_new_rows(con, "prices", COLUMNS, [("a", day, 3.0, 30.0, 3), ("b", day, 4.0, None, None)], ("vault_id", "date")) == 1
+    assert con.execute("SELECT vault_id, share_price FROM prices ORDER BY vault_id").fetchall() == [("a", 1.0), ("b", 4.0)]
+
+
+def test_replace_rows():
+    """Rows without a primary key are replaced by their key columns."""
+    con = duckdb.connect()
+    con.execute("CREATE TABLE prices (vault_id VARCHAR, timestamp TIMESTAMP, share_price DOUBLE, source VARCHAR)")
+    start = datetime.datetime(2026, 1, 1)
+    con.execute("INSERT INTO prices VALUES ('a', ?, 1.0, 'ranking'), ('a', ?, 1.1, 'ranking'), ('b', ?, 2.0, 'ranking')", [start, start + datetime.timedelta(hours=1), start])
+    assert replace_rows(con, "prices", None, [("a", start, 1.05, "history"), ("c", start, 3.0, "history")], ("vault_id", "timestamp")) == 2
+    assert con.execute("SELECT vault_id, share_price, source FROM prices ORDER BY vault_id, timestamp").fetchall() == [
+        ("a", 1.05, "history"),
+        ("a", 1.1, "ranking"),
+        ("b", 2.0, "ranking"),
+        ("c", 3.0, "history"),
+    ]
@@ -0,0 +1,93 @@
+"""ERC-20 balance slot discovery.
+
+No Anvil: a fake provider serves storage writes and ``balanceOf``. See :py:mod:`eth_defi.provider.balance_slot`.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from web3 import Web3
+
+from eth_defi.provider import balance_slot
+from eth_defi.provider.balance_slot import ERC7201_BALANCE_NAMESPACES, SOLADY_BALANCE_SLOT_SEED, BalanceSlotCache, BalanceSlotKind, BalanceSlotLayout, derive_balance_slot_layouts, get_balance_slot_layout
+
+TOKEN = Web3.to_checksum_address("0x00000000000000000000000000000000000000aa")
+HOLDER = Web3.to_checksum_address("0x00000000000000000000000000000000000000bb")
+
+
+class _FakeAnvilProvider:
+    """Token whose ``balanceOf`` reads the storage key given by ``layout``."""
+
+    def __init__(self, layout: BalanceSlotLayout):
+        self.layout = layout
+        self.storage = {}
+        self.snapshots = []
+        self.methods = []
+
+    def make_request(self, method, params):
+        self.methods.append(method)
+        holder = Web3.to_checksum_address("0x" + params[0]["data"][-40:]) if method in ("eth_call", "eth_createAccessList") else None
+        match method:
+            case "eth_createAccessList":
+                # An unrelated read first, like a proxy implementation slot
+                keys = ["0x" + "00" * 31 + "01", "0x" + self.layout.get_storage_key(holder).to_bytes(32, "big").hex()]
+                return {"result": {"accessList": [{"address": TOKEN.lower(), "storageKeys": keys}]}}
+            case "eth_call":
+                return {"result": "0x" + self.storage.get(self.layout.get_storage_key(holder), 0).to_bytes(32, "big").hex()}
+            case "anvil_setStorageAt":
+                self.storage[int(params[1], 16)] = int(params[2], 16)
+                return {"result": True}
+            case "evm_snapshot":
+                self.snapshots.append(dict(self.storage))
+                return {"result": hex(len(self.snapshots))}
+            case "evm_revert":
+                self.storage = self.snapshots.pop()
+                return {"result": True}
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [
+        BalanceSlotLayout(BalanceSlotKind.solidity, 9),
+        BalanceSlotLayout(BalanceSlotKind.vyper, 3),
+        BalanceSlotLayout(BalanceSlotKind.solidity, 51, offset=2),
+        BalanceSlotLayout(BalanceSlotKind.solady, SOLADY_BALANCE_SLOT_SEED),
+        BalanceSlotLayout(BalanceSlotKind.solidity, ERC7201_BALANCE_NAMESPACES["openzeppelin.storage.ERC20"]),
+    ],
+)
+def test_derive_layout(layout: BalanceSlotLayout):
+    """Access list keys are matched to the layout without RPC."""
+    keys = [1, layout.get_storage_key(HOLDER)]
+    assert derive_balance_slot_layouts(HOLDER, keys)[0] == layout
+
+
+def test_discovery_and_cache(tmp_path):
+    """Discovery costs one access list and one verification; the cache serves the next process."""
+    layout = BalanceSlotLayout(BalanceSlotKind.vyper, 7)
+    provider = _FakeAnvilProvider(layout)
+    web3 = MagicMock()
+    web3.provider = provider
+    web3.eth.chain_id = 1
+    cache = BalanceSlotCache(tmp_path / "slots.sqlite")
+
+    with patch.object(balance_slot, "fetch_token_code_hash", return_value=b"\x01" * 32), patch.dict(balance_slot._layout_memo, clear=True):
+        assert get_balance_slot_layout(web3, TOKEN, HOLDER, cache) == layout
+        assert provider.methods == ["eth_createAccessList", "evm_snapshot", "anvil_setStorageAt", "eth_call", "evm_revert"]
+        assert provider.storage == {}
+
+        balance_slot._layout_memo.clear()
+        provider.methods.clear()
+        assert get_balance_slot_layout(web3, TOKEN, HOLDER, cache) == layout
+        assert provider.methods == []
+
+
+def test_memo_keyed_by_code():
+    """A different token redeployed at the same address, like on a fresh Anvil, is discovered again."""
+    web3 = MagicMock()
+    web3.eth.chain_id = 31337
+
+    with patch.dict(balance_slot._layout_memo, clear=True):
+        for code_hash, layout in [(b"\x01" * 32, BalanceSlotLayout(BalanceSlotKind.solidity, 0)), (b"\x02" * 32, BalanceSlotLayout(BalanceSlotKind.vyper, 3))]:
+            web3.provider = _FakeAnvilProvider(layout)
+            with patch.object(balance_slot, "fetch_token_code_hash", return_value=code_hash):
+                assert get_balance_slot_layout(web3, TOKEN, HOLDER, cache=None) == layout
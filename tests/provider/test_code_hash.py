@@ -0,0 +1,71 @@
+"""Runtime code identity through proxies.
+
+No RPC: a fake provider serves code, storage and beacon calls. See :py:mod:`eth_defi.provider.code_hash`.
+"""
+
+from unittest.mock import MagicMock
+
+from web3 import Web3
+
+from eth_defi.provider.code_hash import EIP_1167_PREFIX, EIP_1167_SUFFIX, EIP_1967_BEACON_SLOT, EIP_1967_IMPLEMENTATION_SLOT, fetch_runtime_code_hashes
+
+IMPLEMENTATION = Web3.to_checksum_address("0x00000000000000000000000000000000000000aa")
+BEACON = Web3.to_checksum_address("0x00000000000000000000000000000000000000bb")
+MINIMAL_PROXY = Web3.to_checksum_address("0x0000000000000000000000000000000000000001")
+EIP_1967_PROXY = Web3.to_checksum_address("0x0000000000000000000000000000000000000002")
+BEACON_PROXY = Web3.to_checksum_address("0x0000000000000000000000000000000000000003")
+PLAIN = Web3.to_checksum_address("0x0000000000000000000000000000000000000004")
+EMPTY = Web3.to_checksum_address("0x0000000000000000000000000000000000000005")
+
+IMPLEMENTATION_CODE = b"\x60" * 10_000
+
+
+class _FakeBatchProvider:
+    """Serve batched ``eth_getCode``, ``eth_getStorageAt`` and ``eth_call``."""
+
+    def __init__(self):
+        self.batches = []
+        self.code = {
+            IMPLEMENTATION: IMPLEMENTATION_CODE,
+            MINIMAL_PROXY: EIP_1167_PREFIX + bytes.fromhex(IMPLEMENTATION[2:]) + EIP_1167_SUFFIX,
+            EIP_1967_PROXY: b"\x61" * 100,
+            BEACON_PROXY: b"\x62" * 100,
+            PLAIN: b"\x63" * 100,
+        }
+        self.storage = {
+            (EIP_1967_PROXY, EIP_1967_IMPLEMENTATION_SLOT): IMPLEMENTATION,
+            (BEACON_PROXY, EIP_1967_BEACON_SLOT): BEACON,
+        }
+
+    def _answer(self, method, params):
+        match method:
+            case "eth_getCode":
+                return "0x" + self.code.get(params[0], b"").hex()
+            case "eth_getStorageAt":
+                value = self.storage.get((params[0], int(params[1], 16)))
+                return "0x" + (bytes.fromhex(value[2:]) if value else b"").rjust(32, b"\x00").hex()
+            case "eth_call":
+                assert params[0]["to"] == BEACON
+                return "0x" + bytes.fromhex(IMPLEMENTATION[2:]).rjust(32, b"\x00").hex()
+
+    def make_batch_request(self, requests):
+        self.batches.append([method for method, _ in requests])
+        return [{"result": self._answer(method, params)} for method, params in requests]
+
+
+def test_fetch_runtime_code_hashes():
+    """Proxies resolve to their implementation code hash, in a few batched round trips."""
+    provider = _FakeBatchProvider()
+    web3 = MagicMock()
+    web3.provider = provider
+
+    code_hashes = fetch_runtime_code_hashes(web3, [MINIMAL_PROXY, EIP_1967_PROXY, BEACON_PROXY, PLAIN, EMPTY], 1)
+
+    implementation_hash = bytes(Web3.keccak(IMPLEMENTATION_CODE))
+    assert code_hashes == {
+        MINIMAL_PROXY: implementation_hash,
+        EIP_1967_PROXY: implementation_hash,
+        BEACON_PROXY: implementation_hash,
+        PLAIN: bytes(Web3.keccak(b"\x63" * 100)),
+    }
+    assert [batch[0] for batch in provider.batches if batch] == ["eth_getCode", "eth_getStorageAt", "eth_getStorageAt", "eth_call", "eth_getCode"]
@@ -0,0 +1,185 @@
+"""Unit tests for cross-process per-domain RPC token buckets.
+
+Pure logic with a fake clock, no network. See :mod:`eth_defi.provider.domain_rate_limit`.
+"""
+
+import multiprocessing
+import pickle
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from eth_defi.provider.domain_rate_limit import DomainRateLimiter, TokenBucketConfig, create_domain_rate_limiter_from_env, parse_rate_limit_config, parse_retry_after
+from eth_defi.provider.fallback import FallbackProvider
+from eth_defi.rate_limit import clear_sqlite_rate_limit_databases
+
+
+class _FakeClock:
+    """Deterministic time source; sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+        self.slept = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock() -> _FakeClock:
+    return _FakeClock()
+
+
+@pytest.fixture()
+def limiter(tmp_path, clock) -> DomainRateLimiter:
+    return DomainRateLimiter(
+        {"alchemy.com": TokenBucketConfig(requests_per_second=10, burst=3)},
+        db_path=tmp_path / "rpc" / "rate-limit.sqlite",
+        time_function=clock.time,
+        sleep_function=clock.sleep,
+    )
+
+
+def test_parse_rate_limit_config():
+    """Parse RPC_RATE_LIMITS entries, with and without burst."""
+    limits = parse_rate_limit_config("alchemy.com=25:50, quiknode.pro=10")
+    assert limits["alchemy.com"] == TokenBucketConfig(25, 50)
+    assert limits["quiknode.pro"] == TokenBucketConfig(10, 10)
+
+    with pytest.raises(ValueError):
+        parse_rate_limit_config("alchemy.com")
+
+    with pytest.raises(ValueError):
+        parse_rate_limit_config("alchemy.com=fast")
+
+
+def test_parse_retry_after():
+    """Retry-After supports delta-seconds and HTTP-date."""
+    assert parse_retry_after({"Retry-After": "7"}) == 7.0
+    assert parse_retry_after({"retry-after": "Wed, 21 Oct 2015 07:28:10 GMT"}, now=1445412480.0) == 10.0
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({}) is None
+    assert parse_retry_after(None) is None
+
+
+def test_burst_then_smooth_pacing(limiter: DomainRateLimiter, clock: _FakeClock):
+    """Burst credits are spent first, then requests are paced at the refill rate."""
+    for _ in range(3):
+        assert limiter.acquire("arb-mainnet.g.alchemy.com") == 0
+
+    # Reserved slots are spaced 1/rps apart even if callers do not sleep in between
+    assert limiter.reserve("arb-mainnet.g.alchemy.com") == pytest.approx(0.1)
+    assert limiter.reserve("arb-mainnet.g.alchemy.com") == pytest.approx(0.2)
+
+    # Idle refills burst credits, capped at capacity
+    clock.now += 60
+    for _ in range(3):
+        assert limiter.reserve("arb-mainnet.g.alchemy.com") == 0
+    assert limiter.reserve("arb-mainnet.g.alchemy.com") > 0
+
+    # Unconfigured domains are not throttled
+    assert limiter.reserve("rpc.ankr.com") == 0
+
+
+def test_subdomains_share_bucket(limiter: DomainRateLimiter):
+    """Subdomains of a configured domain draw from one account-wide bucket."""
+    for _ in range(3):
+        assert limiter.reserve("arb-mainnet.g.alchemy.com") == 0
+    assert limiter.reserve("base-mainnet.g.alchemy.com") == pytest.approx(0.1)
+
+    limiter.report_throttled("eth-mainnet.g.alchemy.com", retry_after=30)
+    assert limiter.reserve("arb-mainnet.g.alchemy.com") > 30
+
+
+def test_connection_per_thread(limiter: DomainRateLimiter):
+    """Each thread reuses its own connection, closed explicitly."""
+    connection = limiter.connection
+    assert limiter.connection is connection
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(lambda: limiter.connection).result()
+    assert other is not connection
+
+    limiter.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        connection.execute("SELECT 1")
+    assert limiter.reserve("arb-mainnet.g.alchemy.com") == 0
+
+    copy = pickle.loads(pickle.dumps(limiter))
+    assert copy.reserve("arb-mainnet.g.alchemy.com") == 0
+
+
+def test_retry_after_blocks_domain(limiter: DomainRateLimiter, clock: _FakeClock):
+    """HTTP 429 feedback empties the bucket and blocks the domain."""
+    assert limiter.report_throttled("eth-mainnet.g.alchemy.com", retry_after=30) == 30
+    assert limiter.reserve("eth-mainnet.g.alchemy.com") == pytest.approx(30.1)
+
+    # Unconfigured domain: nothing to report
+    assert limiter.report_throttled("rpc.ankr.com", retry_after=30) == 0
+
+
+def _reserve_in_subprocess(db_path: str) -> float:
+    limiter = DomainRateLimiter({"example.com": TokenBucketConfig(0.01, 1)}, db_path=db_path)
+    return limiter.reserve("example.com")
+
+
+def test_shared_between_processes(tmp_path):
+    """Two processes draw from the same bucket."""
+    db_path = tmp_path / "rate-limit.sqlite"
+    limiter = DomainRateLimiter({"example.com": TokenBucketConfig(0.01, 1)}, db_path=db_path)
+    assert limiter.reserve("example.com") == 0
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        delay = pool.apply(_reserve_in_subprocess, (db_path,))
+
+    assert delay > 50
+
+
+def test_bucket_state_cleared_on_scanner_start(tmp_path, limiter: DomainRateLimiter):
+    """The bucket table follows the scanner throttler reset convention."""
+    limiter.report_throttled("eth-mainnet.g.alchemy.com", retry_after=3600)
+    assert clear_sqlite_rate_limit_databases(tmp_path) == (limiter.db_path,)
+    with sqlite3.connect(limiter.db_path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM ratelimit_token_bucket").fetchone()[0] == 0
+
+
+def test_create_from_env(tmp_path):
+    """Limiter is opt-in through environment variables."""
+    assert create_domain_rate_limiter_from_env({}) is None
+    limiter = create_domain_rate_limiter_from_env({"RPC_RATE_LIMITS": "alchemy.com=5", "RPC_RATE_LIMIT_DATABASE": str(tmp_path / "x.sqlite")})
+    assert limiter.get_limit("base-mainnet.g.alchemy.com") == TokenBucketConfig(5, 5)
+    assert limiter.get_limit("notalchemy.com") is None
+
+
+def test_fallback_provider_shares_http_429(limiter: DomainRateLimiter, clock: _FakeClock):
+    """FallbackProvider paces requests and turns HTTP 429 into a shared domain block."""
+
+    class _ThrottlingProvider:
+        endpoint_uri = "https://eth-mainnet.g.alchemy.com/v2/secret"
+
+        def __init__(self):
+            self.calls = 0
+
+        def make_request(self, method, params):
+            self.calls += 1
+            if self.calls == 1:
+                response = requests.Response()
+                response.status_code = 429
+                response.headers["Retry-After"] = "12"
+                raise requests.exceptions.HTTPError(response=response)
+            return {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+
+    provider = _ThrottlingProvider()
+    fallback = FallbackProvider([provider], sleep=100, rate_limiter=limiter)
+    resp = fallback.make_request("eth_chainId", [])
+    assert resp["result"] == "0x1"
+    assert provider.calls == 2
+    assert fallback.get_active_provider_domain() == "eth-mainnet.g.alchemy.com"
+    # Waited out Retry-After via the shared bucket, not the 100s fallback sleep
+    assert sum(clock.slept) == pytest.approx(12.1)
@@ -0,0 +1,152 @@
+"""Learning eth_getLogs block range planner.
+
+No RPC: a fake fetch enforces result and range caps. See :py:mod:`eth_defi.provider.log_block_range`.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from eth_defi.provider.log_block_range import LogRangeErrorKind, LogRangePlanner, classify_get_logs_error, read_logs_planned
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("query returned more than 10000 results", (LogRangeErrorKind.too_many_results, None)),
+        ("Log response size exceeded. You can make eth_getLogs requests with up to a 2K block range and no limit on the response size, or you can request any block range with a cap of 10K logs in the response. Based on your parameters, this block range should work: [0x10, 0x1f]", (LogRangeErrorKind.too_many_results, 16)),
+        ("eth_getLogs is limited to a 10,000 range", (LogRangeErrorKind.range_too_large, 10_000)),
+        ("eth_getLogs and eth_newFilter are limited to a 10000 blocks range", (LogRangeErrorKind.range_too_large, 10_000)),
+        ("requested too many blocks from 0 to 50000, maximum is set to 2048", (LogRangeErrorKind.range_too_large, 2048)),
+        ("Query exceeds limit of 10000 results", (LogRangeErrorKind.too_many_results, None)),
+        ("execution reverted", (None, None)),
+        ("execution reverted: invalid result", (None, None)),
+        ("unexpected result format", (None, None)),
+        ("upstream returned no result", (None, None)),
+        ("block range extends beyond current head block", (None, None)),
+    ],
+)
+def test_classify_get_logs_error(message, expected):
+    """Provider error messages are told apart, including wrapped ones."""
+    try:
+        try:
+            raise ValueError({"code": -32005, "message": message})
+        except ValueError as e:
+            raise RuntimeError("Reading logs failed") from e
+    except RuntimeError as e:
+        assert classify_get_logs_error(e, 50_000) == expected
+
+
+def _count_logs(block: int, busy_blocks: range) -> int:
+    if block in busy_blocks:
+        return 50
+    return 1 if block % 10 == 0 else 0
+
+
+def _create_fake_chain(busy_blocks: range, max_results: int, max_range: int):
+    """One log every ten blocks, 50 logs per block in ``busy_blocks``."""
+    calls = []
+
+    def fetch(start: int, end: int) -> list:
+        calls.append((start, end))
+        if end - start + 1 > max_range:
+            raise ValueError({"code": -32602, "message": f"block range too large, max {max_range} range"})
+        logs = []
+        for block in range(start, end + 1):
+            logs.extend([block] * _count_logs(block, busy_blocks))
+        if len(logs) > max_results:
+            raise ValueError({"code": -32005, "message": f"query returned more than {max_results} results"})
+        return logs
+
+    web3 = MagicMock()
+    web3.provider.endpoint_uri = "https://rpc.example.com"
+    web3.eth.chain_id = 1
+    return web3, fetch, calls
+
+
+def test_planner_learns_limits():
+    """Windows bisect over busy ranges, respect the learnt range cap, and grow back over sparse ranges."""
+    web3, fetch, calls = _create_fake_chain(busy_blocks=range(1_000, 2_000), max_results=5_000, max_range=4_000)
+    planner = LogRangePlanner(initial_block_range=10_000, target_results=1_000)
+
+    windows = list(read_logs_planned(web3, 0, 30_000, fetch, filter_key="swaps", planner=planner))
+
+    # Every block read exactly once, in order
+    assert [log for _, _, logs in windows for log in logs] == [block for block in range(0, 30_001) for _ in range(_count_logs(block, range(1_000, 2_000)))]
+    assert windows[0][0] == 0 and windows[-1][1] == 30_000
+    assert all(prev[1] + 1 == cur[0] for prev, cur in zip(windows, windows[1:]))
+
+    assert planner.limits["rpc.example.com"].max_block_range == 4_000
+    assert all(end - start + 1 <= 4_000 for start, end, _ in windows)
+    # Busy range got small windows, sparse tail the full cap
+    assert windows[-2][1] - windows[-2][0] + 1 == 4_000
+
+    # A second scan knows the limits and gets no errors
+    calls.clear()
+    list(read_logs_planned(web3, 30_001, 40_000, fetch, filter_key="swaps", planner=planner))
+    assert all(end - start + 1 <= 4_000 for start, end in calls)
+    assert len(calls) == 3
+
+
+def test_unrelated_error_raised():
+    """Errors that are not about the range are not retried."""
+    web3 = MagicMock()
+    web3.provider.endpoint_uri = "https://rpc.example.com"
+    web3.eth.chain_id = 1
+
+    def fetch(start, end):
+        raise ValueError("execution reverted")
+
+    with pytest.raises(ValueError):
+        list(read_logs_planned(web3, 0, 100, fetch, filter_key="x", planner=LogRangePlanner()))
+
+
+def test_min_block_range_raised():
+    """Windows at the minimum size are not split further."""
+    web3, fetch, calls = _create_fake_chain(busy_blocks=range(0, 1_000), max_results=100, max_range=10_000)
+    planner = LogRangePlanner(initial_block_range=1_000)
+
+    with pytest.raises(ValueError):
+        list(read_logs_planned(web3, 0, 999, fetch, filter_key="busy", planner=planner, min_block_range=100))
+
+    assert min(end - start + 1 for start, end in calls) >= 100
+
+
+def test_range_error_below_largest_success():
+    """A range error without a limit shrinks the window even if a wider one succeeded before."""
+    web3, fetch, calls = _create_fake_chain(busy_blocks=range(0), max_results=10_000, max_range=2_000)
+    planner = LogRangePlanner(initial_block_range=3_000, max_block_range=5_000)
+    # The provider lowered its limit after this success
+    planner.record_success("rpc.example.com", 1, "sparse", 3_000, 0)
+
+    def fetch_without_limit(start: int, end: int) -> list:
+        if end - start + 1 > 2_000:
+            calls.append((start, end))
+            raise ValueError({"code": -32602, "message": "block range too large"})
+        return fetch(start, end)
+
+    windows = list(read_logs_planned(web3, 0, 20_000, fetch_without_limit, filter_key="sparse", planner=planner))
+    assert windows[-1][1] == 20_000
+    assert len(calls) < 30
+
+
+def test_retries_capped():
+    """A provider that keeps rejecting windows fails the scan instead of looping."""
+    web3, fetch, calls = _create_fake_chain(busy_blocks=range(0), max_results=10_000, max_range=0)
+
+    with pytest.raises(ValueError):
+        list(read_logs_planned(web3, 0, 100_000, fetch, filter_key="x", planner=LogRangePlanner(), max_retries=3))
+
+    assert len(calls) == 4
+
+
+def test_learnt_limits_expire(monkeypatch):
+    """Learnt provider limits are forgotten after the TTL."""
+    planner = LogRangePlanner(initial_block_range=10_000, limit_ttl=60)
+    planner.record_failure("rpc.example.com", 1, "x", 10_000, ValueError("eth_getLogs is limited to a 2,000 range"))
+    assert planner.plan("rpc.example.com", 1, "y", 100_000) == 2_000
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+    assert planner.plan("rpc.example.com", 1, "y", 100_000) == 10_000
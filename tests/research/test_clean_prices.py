@@ -14,6 +14,7 @@ import pytest
 import zstandard as zstd
 
 import eth_defi.research.wrangle_vault_prices as vault_price_wrangle
+from eth_defi.hyperliquid.constants import HYPERCORE_CHAIN_ID
 from eth_defi.research.wrangle_vault_prices import (
     approximate_hypercore_share_prices_from_pnl_nav,
     calculate_vault_returns,
@@ -26,7 +27,7 @@ from eth_defi.research.wrangle_vault_prices import (
     remove_inactive_lead_time,
     replace_cleaned_vault_histories,
 )
-from eth_defi.vault.base import VaultHistoricalRead
+from eth_defi.vault.base import VaultHistoricalRead, VaultSpec
 from eth_defi.vault.settlement_data import VaultSettlement, VaultSettlementDatabase
 from eth_defi.version_info import PARQUET_VERSION_METADATA_KEY
 
@@ -1236,3 +1237,41 @@ def test_fix_outlier_share_prices_with_duplicate_timestamps():
     assert spike["share_price"] == 1.0
     assert len(result) == len(df)
     assert result.index.duplicated().any()
+
+
+@pytest.mark.parametrize("shard_rows", [1, 6000])
+def test_clean_vault_price_data_parallel_matches_serial(
+    vault_db: Path,
+    raw_price_df: Path,
+    shard_rows: int,
+) -> None:
+    """Sharded multiprocess cleaning gives the same output as the single process pipeline.
+
+    - A Hypercore copy of a Hemi vault is added, so the stages that treat Hypercore and EVM rows differently see both
+    - ``shard_rows=1`` puts each vault in its own shard, ``6000`` puts EVM and Hypercore vaults in the same shard
+    """
+    rows = dict(pickle.load(vault_db.open("rb")).rows)
+    prices_df = pd.read_parquet(raw_price_df, dtype_backend="pyarrow")
+
+    evm_address = "0x1324285bb2ddadfc9bebc2f8fc5049d7985312c0"
+    hypercore_address = "0x" + "ab" * 20
+    hypercore_df = prices_df[prices_df["address"] == evm_address].copy()
+    hypercore_df["chain"] = HYPERCORE_CHAIN_ID
+    hypercore_df["address"] = hypercore_address
+    hypercore_df["account_pnl"] = np.cumsum(np.random.default_rng(1).normal(5, 20, len(hypercore_df)))
+    hypercore_df["hypercore_source"] = "daily"
+    prices_df = pd.concat([prices_df, hypercore_df], ignore_index=True)
+
+    evm_row = rows[VaultSpec(43111, evm_address)]
+    rows[VaultSpec(HYPERCORE_CHAIN_ID, hypercore_address)] = {
+        **evm_row,
+        "Address": hypercore_address,
+        "_detection_data": dataclasses.replace(evm_row["_detection_data"], chain=HYPERCORE_CHAIN_ID, address=hypercore_address),
+    }
+
+    serial = vault_price_wrangle.process_raw_vault_scan_data(rows, prices_df.copy(), logger=lambda x: None, max_workers=1)
+    parallel = vault_price_wrangle.process_raw_vault_scan_data(rows, prices_df.copy(), logger=lambda x: None, max_workers=2, shard_rows=shard_rows)
+
+    assert serial["id"].nunique() == 5
+    assert (serial["hypercore_repair_status"][serial["chain"] == HYPERCORE_CHAIN_ID] == "approximated_pnl_nav").any()
+    pd.testing.assert_frame_equal(parallel, serial)
@@ -0,0 +1,70 @@
+"""Matplotlib-free sparkline renderer tests.
+
+See :mod:`eth_defi.research.sparkline_vector`.
+"""
+
+import io
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+from PIL import Image
+
+from eth_defi.cloudflare_r2 import R2SourceDigest, is_remote_source_current
+from eth_defi.research.sparkline_vector import calculate_sparkline_digest, downsample_series, prepare_sparkline_series, render_sparkline_png, render_sparkline_svg
+
+
+def _create_prices(periods: int = 90) -> pd.DataFrame:
+    index = pd.date_range("2026-07-01", periods=periods, freq="D")
+    return pd.DataFrame(
+        {
+            "share_price": pd.Series([pd.NA] + list(np.linspace(1.0, 1.1, periods - 1)), index=index, dtype="object"),
+            "total_assets": np.full(periods, 10_000.0),
+        },
+        index=index,
+    )
+
+
+def test_render_svg_and_png():
+    """Nullable prices are dropped, the SVG parses and the PNG has the requested size and digest."""
+    x, y = prepare_sparkline_series(_create_prices(), ffill=False)
+    assert len(x) == 89
+
+    digest = calculate_sparkline_digest(x, y, width=100)
+    svg = ET.fromstring(render_sparkline_svg(x, y, width=100, height=25, digest=digest))
+    assert svg.get("data-source-sha256") == digest
+    paths = svg.findall("{http://www.w3.org/2000/svg}path")
+    assert len(paths) == 2
+    # Rising line ends at the top margin, right edge: 4/25 of the range above the line
+    assert paths[1].get("d").endswith("100.00,3.03")
+
+    png = Image.open(io.BytesIO(render_sparkline_png(x, y, width=300, height=300, digest=digest)))
+    assert png.size == (300, 300)
+    assert png.text["source-sha256"] == digest
+
+
+def test_digest_changes_with_input():
+    """Digest covers the series and the render parameters; the R2 metadata check uses it without rendering."""
+    x, y = prepare_sparkline_series(_create_prices(), ffill=False)
+    digest = calculate_sparkline_digest(x, y, width=100)
+    assert digest == calculate_sparkline_digest(x.copy(), y.copy(), width=100)
+    assert digest != calculate_sparkline_digest(x, y * 1.0001, width=100)
+    assert digest != calculate_sparkline_digest(x, y, width=101)
+
+    source = R2SourceDigest(sha256=digest, size=x.nbytes + y.nbytes)
+    assert is_remote_source_current({"Metadata": source.as_metadata()}, source)
+    assert not is_remote_source_current({"Metadata": {}}, source)
+
+
+def test_downsample_keeps_extremes():
+    """Downsampling to pixel buckets keeps the endpoints and the global min and max."""
+    x = np.arange(10_000, dtype=np.int64)
+    y = np.sin(np.arange(10_000) / 50.0)
+    y[1234] = 5.0
+    y[7777] = -5.0
+
+    dx, dy = downsample_series(x, y, 100)
+    assert len(dx) <= 400
+    assert dx[0] == 0 and dx[-1] == 9_999
+    assert dy.max() == 5.0 and dy.min() == -5.0
+    assert np.all(np.diff(dx) > 0)
@@ -0,0 +1,71 @@
+"""Vault price data indexed by vault id.
+
+See :py:mod:`eth_defi.research.vault_price_store`.
+"""
+
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from eth_defi.research.sparkline import extract_vault_price_data
+from eth_defi.research.vault_price_store import VaultPriceStore, get_vault_price_store_paths
+from eth_defi.vault.base import VaultSpec
+
+#: Cleaned prices of three vaults
+PRICES_PATH = Path(__file__).parent / "chain-hemi-prices-1h.parquet"
+
+
+@pytest.fixture()
+def source_path(tmp_path: Path) -> Path:
+    path = tmp_path / "cleaned-vault-prices-1h.parquet"
+    shutil.copy(PRICES_PATH, path)
+    return path
+
+
+def test_vault_price_store(source_path: Path):
+    """Per-vault slices and time windows match boolean mask filtering, and the store follows the source file."""
+    prices_df = pd.read_parquet(source_path)
+    store = VaultPriceStore.open(source_path)
+    store_path, index_path = get_vault_price_store_paths(source_path)
+    assert store_path.exists() and index_path.exists()
+    assert store.vault_ids == sorted(prices_df["id"].unique())
+
+    for vault_id in store.vault_ids:
+        expected = prices_df[prices_df["id"] == vault_id].sort_index(kind="stable")
+        pd.testing.assert_frame_equal(store.get_vault_prices(vault_id), expected)
+        start, end = expected.index[len(expected) // 3], expected.index[len(expected) // 2]
+        pd.testing.assert_frame_equal(store.get_vault_prices(vault_id, start=start, end=end), expected[(expected.index >= start) & (expected.index < end)])
+
+    # Worker processes reopen the store by path
+    vault_id = store.vault_ids[0]
+    unpickled = pickle.loads(pickle.dumps(store))
+    assert unpickled.path == store_path
+    pd.testing.assert_frame_equal(unpickled.get_vault_prices(vault_id), store.get_vault_prices(vault_id))
+
+    spec = VaultSpec.parse_string(vault_id)
+    pd.testing.assert_frame_equal(extract_vault_price_data(spec, store), extract_vault_price_data(spec, prices_df))
+
+    # Unchanged source: the store is reused, changed source: rebuilt
+    store_mtime = store_path.stat().st_mtime_ns
+    VaultPriceStore.open(source_path)
+    assert store_path.stat().st_mtime_ns == store_mtime
+    prices_df[prices_df["id"] == vault_id].to_parquet(source_path)
+    os.utime(source_path, ns=(store_mtime + 10**9, store_mtime + 10**9))
+    assert VaultPriceStore.open(source_path).vault_ids == [vault_id]
+
+    with pytest.raises(KeyError):
+        store.get_vault_table("1-0x0000000000000000000000000000000000000000")
+
+
+def test_vault_price_store_from_dataframe():
+    """An in-memory store sorts unsorted price data."""
+    prices_df = pd.read_parquet(PRICES_PATH).sample(frac=1, random_state=1)
+    store = VaultPriceStore.from_dataframe(prices_df)
+    assert store.path is None
+    for vault_id in store.vault_ids:
+        expected = prices_df[prices_df["id"] == vault_id].sort_index(kind="stable")
+        pd.testing.assert_frame_equal(store.get_vault_prices(vault_id), expected)
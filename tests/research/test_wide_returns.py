@@ -0,0 +1,85 @@
+"""Vectorised multi-vault returns.
+
+See :py:mod:`eth_defi.research.wide_returns`.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eth_defi.research.wide_returns import (
+    calculate_returns_correlation,
+    calculate_rolling_window_returns,
+    compound_resampled_returns,
+    pivot_vault_values,
+    resample_vault_prices,
+)
+
+
+@pytest.fixture()
+def prices_df() -> pd.DataFrame:
+    """Hourly prices of vaults with gaps, missing prices and different lifetimes."""
+    rng = np.random.default_rng(1)
+    frames = []
+    for vault_number in range(6):
+        start = pd.Timestamp("2025-01-01") + pd.Timedelta(hours=int(rng.integers(0, 24 * 20)))
+        index = pd.date_range(start, periods=24 * 60, freq="h")
+        # Drop random hours and a multi-day gap
+        keep = rng.random(len(index)) > 0.3
+        keep[200:400] = False
+        index = index[keep]
+        share_price = np.cumprod(1 + rng.normal(0.0002, 0.002, len(index)))
+        share_price[rng.random(len(index)) < 0.05] = np.nan
+        frames.append(
+            pd.DataFrame(
+                {
+                    "id": f"{1 + vault_number % 2}-0x{vault_number}",
+                    "chain": 1 + vault_number % 2,
+                    "address": f"0x{vault_number}",
+                    "share_price": share_price,
+                    "name": f"Vault {vault_number}",
+                },
+                index=pd.DatetimeIndex(index, name="timestamp"),
+            )
+        )
+    return pd.concat(frames).sort_index()
+
+
+def test_resample_vault_prices(prices_df: pd.DataFrame):
+    """Matches resampling each vault separately."""
+    expected_frames = []
+    for (chain_val, addr_val), group in prices_df.groupby(["chain", "address"]):
+        resampled = group.resample("D").last()
+        resampled["returns_1h"] = resampled["share_price"].pct_change(fill_method=None).fillna(0)
+        resampled["chain"] = chain_val
+        resampled["address"] = addr_val
+        expected_frames.append(resampled)
+    expected = pd.concat(expected_frames)
+
+    result = resample_vault_prices(prices_df, "D", returns_column="returns_1h")
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+    # Row order does not matter, like with resample()
+    shuffled = prices_df.sample(frac=1, random_state=1)
+    pd.testing.assert_frame_equal(resample_vault_prices(shuffled, "D", returns_column="returns_1h"), expected, check_freq=False)
+
+
+def test_rolling_returns_and_correlation(prices_df: pd.DataFrame):
+    """Rolling returns, compounded returns and correlation match per-vault pandas calculations."""
+    wide_prices = pivot_vault_values(prices_df, "share_price")
+    rolling = calculate_rolling_window_returns(wide_prices, pd.Timedelta(days=7))
+    for vault_id, group in prices_df.groupby("id"):
+        expected = group["share_price"].rolling(pd.Timedelta(days=7), min_periods=1).apply(lambda w: w.iloc[-1] / w.iloc[0] - 1, raw=False)
+        # The per-vault window keeps NaN prices as the first value, here they are missing observations
+        first_is_nan = group["share_price"].rolling(pd.Timedelta(days=7), min_periods=1).apply(lambda w: np.isnan(w[0]), raw=True).astype(bool)
+        expected = expected[~first_is_nan]
+        np.testing.assert_allclose(rolling.loc[expected.index, vault_id], expected)
+
+    prices_df["returns_1h"] = prices_df.groupby("id")["share_price"].pct_change(fill_method=None).fillna(0)
+    daily = compound_resampled_returns(pivot_vault_values(prices_df, "returns_1h"), "1D")
+    for vault_id, group in prices_df.groupby("id"):
+        expected = (1 + group["returns_1h"]).resample("1D").prod() - 1
+        pd.testing.assert_series_equal(daily[vault_id].dropna(), expected, check_names=False, check_freq=False)
+
+    pd.testing.assert_frame_equal(calculate_returns_correlation(daily), daily.corr(), check_names=False)
+    pd.testing.assert_frame_equal(calculate_returns_correlation(daily, min_periods=50), daily.corr(min_periods=50), check_names=False)
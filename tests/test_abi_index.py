@@ -0,0 +1,114 @@
+"""Precompiled ABI index.
+
+See :py:mod:`eth_defi.abi_index`.
+"""
+
+import json
+import shutil
+
+import pytest
+from web3 import Web3
+
+from eth_defi import abi as abi_module
+from eth_defi import abi_index as abi_index_module
+from eth_defi.abi import decode_function_output, get_abi_by_filename, get_contract
+from eth_defi.abi_index import ABI_ROOT, AbiIndex, build_abi_index, get_default_abi_index
+from eth_defi.event_reader.multicall_batcher import EncodedCall, EncodedCallResult
+
+#: Real bundled artefacts copied to the sample tree
+SAMPLE_FILES = ["lagoon/Vault.json", "sushi/IERC20.json"]
+
+
+def _create_sample_tree(tmp_path):
+    root = tmp_path / "abi"
+    for fname in SAMPLE_FILES:
+        (root / fname).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(ABI_ROOT / fname, root / fname)
+
+    (root / "etherscan").mkdir()
+    etherscan_abi = [{"type": "event", "name": "Ping", "anonymous": False, "inputs": [{"name": "who", "type": "address", "indexed": True}]}]
+    (root / "etherscan" / "Ping.json").write_text(json.dumps(etherscan_abi))
+
+    forge = {
+        "abi": [{"type": "function", "name": "get", "stateMutability": "view", "inputs": [], "outputs": [{"name": "", "type": "tuple", "components": [{"type": "uint256"}, {"type": "address"}]}]}],
+        "bytecode": {"object": "0x6001__$0123456789abcdef0123456789abcdef01$__00", "linkReferences": {}},
+    }
+    (root / "Linked.json").write_text(json.dumps(forge))
+    return root
+
+
+def test_abi_index_load(tmp_path):
+    """Index serves ABIs, bytecode, selectors and topics, and skips changed files."""
+    root = _create_sample_tree(tmp_path)
+    index = AbiIndex(build_abi_index(tmp_path / "abi-index.bin", abi_root=root, max_workers=1), abi_root=root)
+
+    for fname in SAMPLE_FILES:
+        abi, bytecode = index.load_contract_interface(fname)
+        assert abi == get_abi_by_filename(fname)["abi"]
+
+    abi, bytecode = index.load_contract_interface("etherscan/Ping.json")
+    assert abi[0]["name"] == "Ping"
+    assert bytecode is None
+
+    abi, bytecode = index.load_contract_interface("Linked.json")
+    assert bytecode == "0x6001" + "0" * 40 + "00"
+
+    assert {f.signature for f in index.get_functions_by_selector(bytes.fromhex("70a08231"))} == {"balanceOf(address)"}
+    assert index.get_output_types(bytes.fromhex("70a08231")) == ("uint256",)
+    assert index.get_output_types(Web3.keccak(text="get()")[:4]) == ("(uint256,address)",)
+    assert index.get_output_types(b"\x00\x00\x00\x00") is None
+
+    (ping,) = index.get_events_by_topic(Web3.keccak(text="Ping(address)"))
+    assert ping.fname == "etherscan/Ping.json"
+    assert ping.indexed == (True,)
+
+    # Edited file is read from JSON again
+    path = root / "sushi" / "IERC20.json"
+    path.write_text(path.read_text() + " ")
+    assert index.load_contract_interface("sushi/IERC20.json") is None
+    assert index.load_contract_interface("missing.json") is None
+
+
+def test_get_contract_uses_index(tmp_path, monkeypatch):
+    """get_contract() reads through the index when one is configured."""
+    index = AbiIndex(build_abi_index(tmp_path / "abi-index.bin", abi_root=_create_sample_tree(tmp_path), max_workers=1), abi_root=tmp_path / "abi")
+    monkeypatch.setattr(abi_module, "get_default_abi_index", lambda: index)
+
+    def _fail(fname):
+        raise AssertionError(f"JSON parsed for {fname}")
+
+    monkeypatch.setattr(abi_module, "get_abi_by_filename", _fail)
+
+    web3 = Web3()
+    Vault = get_contract(web3, "lagoon/Vault.json")
+    assert Vault.bytecode
+    assert Vault.events.Transfer
+
+
+def test_default_index_not_built_implicitly(tmp_path, monkeypatch):
+    """A configured but missing index falls back to JSON parsing instead of being built."""
+    path = tmp_path / "abi-index.bin"
+    monkeypatch.setenv("ABI_INDEX_PATH", str(path))
+    assert get_default_abi_index() is None
+    assert not path.exists()
+    assert get_contract(Web3(), "sushi/IERC20.json").abi
+
+
+def test_decode_with_index(tmp_path, monkeypatch):
+    """Call results decode with the selector table, without web3 ABI processing."""
+    index = AbiIndex(build_abi_index(tmp_path / "abi-index.bin", abi_root=_create_sample_tree(tmp_path), max_workers=1), abi_root=tmp_path / "abi")
+    monkeypatch.setattr(abi_index_module, "get_default_abi_index", lambda: index)
+
+    holder = "0x0000000000000000000000000000000000000002"
+    raw = (10**18).to_bytes(32, "big")
+    call = EncodedCall.from_keccak_signature(address="0x0000000000000000000000000000000000000001", function="balanceOf", signature=bytes.fromhex("70a08231"), data=bytes(12) + bytes.fromhex(holder[2:]), extra_data=None)
+    assert EncodedCallResult(call, True, raw, block_identifier=1).decode() == (10**18,)
+
+    unknown = EncodedCall.from_keccak_signature(address=call.address, function="unknown", signature=b"\x00" * 4, data=b"", extra_data=None)
+    with pytest.raises(ValueError):
+        EncodedCallResult(unknown, True, raw, block_identifier=1).decode()
+    assert EncodedCallResult(unknown, True, raw, block_identifier=1).decode(["uint256"]) == (10**18,)
+
+    token = get_contract(Web3(), "sushi/IERC20.json")(address=call.address)
+    monkeypatch.setattr("eth_defi.abi.get_function_info", lambda *args, **kwargs: pytest.fail("web3 ABI lookup"))
+    assert decode_function_output(token.functions.balanceOf(holder), raw) == (10**18,)
@@ -295,3 +295,70 @@ def test_dispose_survives_close_failure(monkeypatch: pytest.MonkeyPatch) -> None
     monkeypatch.setattr(pool_module, "is_fork_alive", lambda _launch: False)
     with pytest.warns(pool_module.WedgedForkRecycledWarning):
         assert pool.get_launch("https://a.example https://b.example", 300) is fresh
+
+
+def _patch_lease_backend(monkeypatch: pytest.MonkeyPatch, launches: list, fingerprints: list) -> Mock:
+    """Fake Anvil launches, snapshots and fingerprints for lease tests.
+
+    :return:
+        The fake ``reset_anvil_snapshot``.
+    """
+    monkeypatch.setattr(pool_module, "fork_network_anvil", Mock(side_effect=launches))
+    monkeypatch.setattr(pool_module, "create_multi_provider_web3", Mock())
+    monkeypatch.setattr(pool_module, "is_fork_alive", lambda _launch: True)
+    monkeypatch.setattr(pool_module, "create_anvil_snapshot_state", Mock(return_value=anvil_module.AnvilSnapshotState(snapshot_id=1)))
+    monkeypatch.setattr(pool_module, "fetch_fork_fingerprint", Mock(side_effect=fingerprints))
+    reset = Mock()
+    monkeypatch.setattr(pool_module, "reset_anvil_snapshot", reset)
+    return reset
+
+
+def test_lease_reverts_and_reuses_fork(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Mutating tests share one fork, reverted after each lease and recycled after the lease cap.
+
+    :param monkeypatch:
+        Pytest monkeypatch fixture.
+
+    :return:
+        None.
+    """
+    first = Mock(json_rpc_url="http://localhost:23475")
+    second = Mock(json_rpc_url="http://localhost:23476")
+    clean = pool_module.ForkStateFingerprint(block_number=1, block_hash=b"\x01", accounts=())
+    reset = _patch_lease_backend(monkeypatch, [first, second], [clean] * 10)
+
+    pool = AnvilForkPool()
+    for _ in range(3):
+        with pool.lease("https://a.example https://b.example", 400, max_leases=3):
+            pass
+
+    assert reset.call_count == 3
+    assert pool.launches == {}
+    first.close.assert_called_once()
+
+    with pool.lease("https://a.example https://b.example", 400):
+        assert pool_module.fork_network_anvil.call_count == 2
+
+
+def test_lease_recycles_dirty_fork(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A fork whose fingerprint differs after the revert is never handed out again.
+
+    :param monkeypatch:
+        Pytest monkeypatch fixture.
+
+    :return:
+        None.
+    """
+    dirty = Mock(json_rpc_url="http://localhost:23477")
+    clean = pool_module.ForkStateFingerprint(block_number=1, block_hash=b"\x01", accounts=())
+    changed = pool_module.ForkStateFingerprint(block_number=2, block_hash=b"\x02", accounts=())
+    _patch_lease_backend(monkeypatch, [dirty], [clean, changed])
+
+    pool = AnvilForkPool()
+    with pytest.warns(pool_module.DirtyForkRecycledWarning):
+        with pool.lease("https://a.example https://b.example", 500):
+            pass
+
+    assert pool.launches == {}
+    assert pool.baselines == {}
+    dirty.close.assert_called_once()
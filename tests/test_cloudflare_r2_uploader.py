@@ -0,0 +1,117 @@
+"""Parallel R2 uploader with an upload manifest.
+
+See :py:mod:`eth_defi.cloudflare_r2_uploader`.
+"""
+
+import datetime
+import gzip
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import zstandard
+
+from eth_defi.cloudflare_r2 import R2RetryableOperationError, calculate_bytes_digest
+from eth_defi.cloudflare_r2_uploader import R2Uploader, R2UploadManifest, R2UploadRetry
+
+try:
+    from botocore.exceptions import ClientError
+except ModuleNotFoundError:  # pragma: no cover - exercised in CI dependency matrix
+    pytestmark = pytest.mark.skip(reason="Cloudflare R2 tests require optional boto3/botocore dependency")
+
+
+class FakeS3Client:
+    """In-memory S3 client counting requests."""
+
+    def __init__(self, put_failures: int = 0):
+        self.objects: dict[str, dict] = {}
+        self.head_calls: list[str] = []
+        self.put_calls: list[str] = []
+        self.upload_configs: list[object] = []
+        self.put_failures = put_failures
+        self.meta = SimpleNamespace(endpoint_url="https://example.r2.cloudflarestorage.com")
+
+    def head_object(self, Bucket, Key):
+        self.head_calls.append(Key)
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "404", "Message": "Not found"}}, "HeadObject")
+        return self.objects[Key]
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.put_calls.append(Key)
+        if self.put_failures:
+            self.put_failures -= 1
+            raise ClientError({"Error": {"Code": "InternalError", "Message": "Try again"}, "ResponseMetadata": {"HTTPStatusCode": 503}}, "PutObject")
+        self.objects[Key] = {"ContentLength": len(Body), "ContentType": kwargs.get("ContentType"), "ContentEncoding": kwargs.get("ContentEncoding"), "CacheControl": kwargs.get("CacheControl"), "Metadata": kwargs["Metadata"], "Body": Body}
+
+    def upload_fileobj(self, fileobj, bucket_name, object_name, ExtraArgs, Callback=None, Config=None):
+        self.put_calls.append(object_name)
+        self.upload_configs.append(Config)
+        payload = fileobj.read()
+        self.objects[object_name] = {"ContentLength": len(payload), "ContentType": ExtraArgs.get("ContentType"), "CacheControl": ExtraArgs.get("CacheControl"), "Metadata": ExtraArgs["Metadata"], "Body": payload}
+
+
+def test_manifest_skips_head_requests(tmp_path: Path):
+    """Unchanged objects are skipped and changed objects uploaded without a head request."""
+    s3_client = FakeS3Client()
+    payloads = {f"metadata/{i}.json": f'{{"id": {i}}}'.encode() for i in range(20)}
+
+    # First run without a manifest entry: head request per object
+    with R2Uploader(s3_client, "bucket", manifest=R2UploadManifest(tmp_path / "manifest.sqlite"), max_workers=4) as uploader:
+        futures = [uploader.submit_bytes(key, payload, content_type="application/json", encoding="gzip") for key, payload in payloads.items()]
+        assert all(future.result() for future in futures)
+    assert len(s3_client.head_calls) == 20
+    assert gzip.decompress(s3_client.objects["metadata/3.json"]["Body"]) == payloads["metadata/3.json"]
+
+    # Second run reads the manifest from disk: no requests
+    s3_client.head_calls.clear()
+    s3_client.put_calls.clear()
+    uploader = R2Uploader(s3_client, "bucket", manifest=R2UploadManifest(tmp_path / "manifest.sqlite"))
+    assert not any(uploader.upload_bytes(key, payload, content_type="application/json", encoding="gzip") for key, payload in payloads.items())
+    assert uploader.stats.skipped_by_manifest == 20
+    assert s3_client.head_calls == [] and s3_client.put_calls == []
+
+    # Changed source, or changed encoding: upload without a head request
+    assert uploader.upload_bytes("metadata/1.json", b'{"id": 100}', content_type="application/json", encoding="gzip")
+    assert uploader.upload_bytes("metadata/2.json", payloads["metadata/2.json"], content_type="application/json", encoding="zstd")
+    assert s3_client.head_calls == []
+    assert s3_client.put_calls == ["metadata/1.json", "metadata/2.json"]
+    assert zstandard.ZstdDecompressor().decompress(s3_client.objects["metadata/2.json"]["Body"]) == payloads["metadata/2.json"]
+
+    # Payload functions are not called for current objects
+    digest = calculate_bytes_digest(payloads["metadata/5.json"])
+    assert not uploader.upload_bytes("metadata/5.json", lambda: pytest.fail("rendered"), content_type="application/json", encoding="gzip", source_digest=digest)
+    assert uploader.is_current("metadata/5.json", digest, content_type="application/json", encoding="gzip")
+
+    # Old entries are verified with a head request
+    uploader.manifest.max_age = datetime.timedelta(0)
+    assert not uploader.upload_bytes("metadata/6.json", payloads["metadata/6.json"], content_type="application/json", encoding="gzip")
+    assert s3_client.head_calls == ["metadata/6.json"]
+
+
+def test_retry_budget_and_multipart(tmp_path: Path):
+    """Transient failures are retried within the shared budget and large files use multipart uploads."""
+    retry = R2UploadRetry(max_attempts=3, initial_delay_seconds=0, budget=2)
+
+    s3_client = FakeS3Client(put_failures=2)
+    uploader = R2Uploader(s3_client, "bucket", retry=retry)
+    assert uploader.upload_bytes("a.json", b"{}", skip_if_current=False)
+    assert uploader.stats.retries == 2
+
+    # Budget spent: the next failure is raised at once
+    s3_client.put_failures = 1
+    with pytest.raises(R2RetryableOperationError):
+        uploader.upload_bytes("b.json", b"{}", skip_if_current=False)
+    assert uploader.stats.failed == 1
+
+    small = tmp_path / "small.parquet"
+    small.write_bytes(b"x" * 100)
+    large = tmp_path / "large.parquet"
+    large.write_bytes(b"x" * 2000)
+    uploader = R2Uploader(s3_client, "bucket", manifest=R2UploadManifest(tmp_path / "manifest.sqlite"), multipart_threshold=1000)
+    assert uploader.upload_file(small, "small.parquet")
+    assert uploader.upload_file(large, "large.parquet")
+    assert s3_client.upload_configs[0] is None
+    assert s3_client.upload_configs[1].multipart_threshold == 1000
+    assert not uploader.upload_file(large, "large.parquet")
+    assert uploader.stats.skipped_by_manifest == 1
@@ -0,0 +1,69 @@
+"""Import time budget of scanner entry points.
+
+See :py:mod:`eth_defi.testing.import_time` and :py:mod:`eth_defi.lazy_import`.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+from eth_defi.lazy_import import lazy_import_module
+from eth_defi.testing.import_time import measure_import_time, parse_import_time
+
+#: Generous for slow CI machines, the scanner imported in ~3 s / 250 MB when this was set
+IMPORT_TIME_BUDGET_SECONDS = 6.0
+
+IMPORT_MEMORY_BUDGET_MB = 400
+
+#: Subsystems the scanner must not load before they are used
+DEFERRED_MODULES = ["matplotlib", "plotly", "ffn", "eth_tester", "eth_defi.vault.top_vaults_json"]
+
+SAMPLE_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     leaf
+import time:       200 |        300 |   middle
+import time:        50 |         50 |   other.sub
+import time:       400 |        750 | top
+"""
+
+
+def test_parse_import_time():
+    """Parse ``-X importtime`` output and walk the import chain."""
+    entries = parse_import_time(SAMPLE_OUTPUT)
+    assert [(e.module, e.self_us, e.cumulative_us, e.depth) for e in entries] == [
+        ("leaf", 100, 100, 2),
+        ("middle", 200, 300, 1),
+        ("other.sub", 50, 50, 1),
+        ("top", 400, 750, 0),
+    ]
+
+
+def test_lazy_import_module(tmp_path, monkeypatch):
+    """The module body runs on first attribute access, attributes patched before that survive."""
+    (tmp_path / "lazy_sample_module.py").write_text("import os\nos.environ['LAZY_SAMPLE_LOADED'] = '1'\ndef value():\n    return 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_sample_module", raising=False)
+    monkeypatch.delenv("LAZY_SAMPLE_LOADED", raising=False)
+
+    module = lazy_import_module("lazy_sample_module")
+    assert "LAZY_SAMPLE_LOADED" not in os.environ
+    module.value = lambda: 2
+    assert module.value() == 2
+    assert os.environ["LAZY_SAMPLE_LOADED"] == "1"
+
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import_module("lazy_sample_module_missing")
+
+
+@pytest.mark.skipif(importlib.util.find_spec("ffn") is None, reason="Vault research dependencies not installed")
+def test_scan_all_chains_import_budget():
+    """Importing the scanner stays within the time and memory budget and defers heavy subsystems."""
+    report = measure_import_time("eth_defi.vault.scan_all_chains", repeats=3)
+
+    loaded = report.get_loaded_modules()
+    for module in DEFERRED_MODULES:
+        assert module not in loaded, f"{module} loaded eagerly: {' <- '.join(report.get_import_chain(module))}"
+
+    assert report.seconds < IMPORT_TIME_BUDGET_SECONDS
+    assert report.peak_rss_mb < IMPORT_MEMORY_BUDGET_MB
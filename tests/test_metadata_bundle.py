@@ -0,0 +1,78 @@
+"""Precompiled metadata YAML bundle.
+
+See :py:mod:`eth_defi.metadata_bundle`.
+"""
+
+import shutil
+
+from eth_defi import metadata_bundle, stablecoin_metadata
+from eth_defi.feed import sources
+from eth_defi.metadata_bundle import METADATA_ROOT, MetadataBundle, build_metadata_bundle
+from eth_defi.stablecoin_metadata import parse_stablecoin_yaml, read_stablecoin_metadata
+from eth_defi.vault.protocol_metadata import parse_protocol_yaml
+
+#: Real files copied to the sample tree
+SAMPLE_FILES = [
+    "stablecoins/usdc.yaml",
+    "stablecoins/usdt.yaml",
+    "vaults/metadata/euler.yaml",
+    "feeds/curators/gauntlet.yaml",
+]
+
+
+def _create_sample_tree(tmp_path):
+    root = tmp_path / "data"
+    for fname in SAMPLE_FILES:
+        (root / fname).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(METADATA_ROOT / fname, root / fname)
+    # Fails the feeder schema, left out of the bundle
+    (root / "feeds" / "curators" / "broken.yaml").write_text("name: Broken\n")
+    return root
+
+
+def test_metadata_bundle_lookups(tmp_path):
+    """Bundle serves the same data as YAML parsing, and skips changed files."""
+    root = _create_sample_tree(tmp_path)
+    bundle = MetadataBundle(build_metadata_bundle(tmp_path / "bundle.bin", root=root, max_workers=1), root=root)
+    assert len(bundle.entries) == len(SAMPLE_FILES)
+
+    usdc = root / "stablecoins" / "usdc.yaml"
+    assert bundle.get("stablecoin", usdc, usdc.read_bytes()) == parse_stablecoin_yaml(usdc.read_text())
+
+    euler = root / "vaults" / "metadata" / "euler.yaml"
+    assert bundle.get("protocol", euler, euler.read_bytes()) == parse_protocol_yaml(euler.read_text())
+
+    gauntlet = root / "feeds" / "curators" / "gauntlet.yaml"
+    assert bundle.get("feeder", gauntlet, gauntlet.read_bytes()) == sources.parse_feeder_yaml(gauntlet.read_text())
+    assert bundle.get("protocol", gauntlet, gauntlet.read_bytes()) is None
+
+    # Edited and unknown files are parsed from YAML
+    assert bundle.get("stablecoin", usdc, usdc.read_bytes() + b"\n") is None
+    assert bundle.get("stablecoin", tmp_path / "other.yaml", b"") is None
+
+
+def test_loaders_read_through_bundle(tmp_path, monkeypatch):
+    """Stablecoin and feeder loaders use the bundle and do not parse YAML."""
+    root = _create_sample_tree(tmp_path)
+    bundle = MetadataBundle(build_metadata_bundle(tmp_path / "bundle.bin", root=root, max_workers=1), root=root)
+    usdt = root / "stablecoins" / "usdt.yaml"
+    expected = read_stablecoin_metadata(usdt)
+
+    def _fail(yaml_content):
+        raise AssertionError("YAML parsed")
+
+    monkeypatch.setattr(metadata_bundle, "get_default_metadata_bundle", lambda: bundle)
+    monkeypatch.setattr(stablecoin_metadata, "parse_stablecoin_yaml", _fail)
+    monkeypatch.setattr(sources, "parse_feeder_yaml", _fail)
+
+    assert read_stablecoin_metadata(usdt) == expected
+    assert sources.load_feeder_metadata(root / "feeds" / "curators" / "gauntlet.yaml")["feeder-id"] == "gauntlet"
+
+
+def test_default_bundle_not_built_implicitly(tmp_path, monkeypatch):
+    """A configured but missing bundle falls back to YAML parsing instead of being built."""
+    path = tmp_path / "bundle.bin"
+    monkeypatch.setenv("METADATA_BUNDLE_PATH", str(path))
+    assert metadata_bundle.get_default_metadata_bundle() is None
+    assert not path.exists()
+    assert read_stablecoin_metadata(METADATA_ROOT / "stablecoins" / "usdt.yaml")
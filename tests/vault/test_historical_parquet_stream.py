@@ -0,0 +1,115 @@
+"""Streaming Parquet writes of historical vault reads.
+
+No RPC: the multicall reader is replaced with canned reads.
+"""
+
+import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from eth_defi.vault import historical
+from eth_defi.vault.base import VaultHistoricalRead, VaultHistoricalReadBatchBuilder
+
+VAULT = SimpleNamespace(
+    chain_id=1,
+    address="0x00000000000000000000000000000000000000AA",
+    vault_address="0x00000000000000000000000000000000000000AA",
+    first_seen_at_block=1,
+)
+
+
+def _read(block_number: int, **kwargs) -> VaultHistoricalRead:
+    values = dict(
+        vault=VAULT,
+        block_number=block_number,
+        timestamp=datetime.datetime(2025, 1, 1) + datetime.timedelta(days=block_number),
+        share_price=Decimal("1.5"),
+        total_assets=Decimal(1000),
+        total_supply=None,
+        performance_fee=0.2,
+        management_fee=None,
+        errors=None,
+    )
+    values.update(kwargs)
+    return VaultHistoricalRead(**values)
+
+
+def test_batch_builder_matches_export():
+    """Column buffers produce the same table as the per-row dict export, and are reusable."""
+    reads = [
+        _read(1),
+        _read(2, errors=["call reverted", "timeout"], deposits_open=True, trading=False, vault_poll_frequency="1d"),
+        _read(3, share_price=None, max_deposit=Decimal("1e30"), utilisation=0.5),
+    ]
+    written_at = datetime.datetime(2025, 2, 1)
+    schema = VaultHistoricalRead.to_pyarrow_schema()
+
+    expected_rows = [r.export() | {"written_at": written_at} for r in reads]
+    expected = pa.Table.from_pylist(expected_rows, schema=schema)
+
+    builder = VaultHistoricalReadBatchBuilder(capacity=2)
+    builder.append(reads[0])
+    builder.append(reads[1])
+    assert builder.is_full()
+    first = builder.flush(written_at)
+    builder.append(reads[2])
+    second = builder.flush(written_at)
+
+    table = pa.Table.from_batches([first, second])
+    assert table.schema == expected.schema
+    # NaN aware comparison
+    assert table.to_pandas().equals(expected.to_pandas())
+
+
+def test_scan_rewrites_existing_rows_streaming(tmp_path):
+    """Rows of the rescanned range are replaced, other chains and native columns are kept, each chunk is a row group."""
+    output_fname = tmp_path / "prices.parquet"
+    schema = VaultHistoricalRead.to_pyarrow_schema()
+    old_rows = [_read(b).export() | {"written_at": None} for b in (1, 2, 10)]
+    old_rows.append(old_rows[0] | {"chain": 2})
+    old = pa.Table.from_pylist(old_rows, schema=schema)
+    old = old.append_column("account_pnl", pa.array([1.0, 2.0, 3.0, 4.0]))
+    pq.write_table(old, output_fname)
+
+    class _FakeMulticaller:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def read_historical(self, start_block, end_block, step, **kwargs):
+            for block_number in range(start_block, end_block + 1, step):
+                yield _read(block_number, share_price=Decimal(7))
+
+    web3 = MagicMock()
+    web3.eth.chain_id = 1
+
+    with patch.object(historical, "VaultHistoricalReadMulticaller", _FakeMulticaller):
+        result = historical.scan_historical_prices_to_parquet(
+            output_fname,
+            web3,
+            web3factory=None,
+            vaults=[VAULT],
+            token_cache=SimpleNamespace(filename="tokens.sqlite"),
+            start_block=2,
+            end_block=11,
+            step=1,
+            chunk_size=4,
+        )
+
+    assert result["rows_deleted"] == 2
+    assert result["existing_row_count"] == 2
+    assert result["rows_written"] == 10
+    assert result["chunks_done"] == 3
+
+    table = pq.read_table(output_fname)
+    assert table.schema.names[-1] == "account_pnl"
+    chain_1 = table.filter(pa.compute.equal(table["chain"], 1))
+    assert chain_1["block_number"].to_pylist() == [1, *range(2, 12)]
+    assert chain_1["share_price"].to_pylist() == [1.5] + [7.0] * 10
+    assert table["account_pnl"].to_pylist() == [1.0, 4.0] + [None] * 10
+
+    # Existing rows are copied batch by batch, new rows as one row group per chunk
+    assert pq.ParquetFile(output_fname).metadata.num_row_groups == 4
@@ -0,0 +1,92 @@
+"""Streaming JSON writer for vault exports.
+
+See :py:mod:`eth_defi.vault.json_stream`.
+"""
+
+import datetime
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+import zstandard
+
+from eth_defi.vault.json_stream import JSONStreamWriter, release_list_items, write_json_stream, write_json_streams
+
+#: Export-like document: vault records, nested protocol data, empty containers and JSON edge cases
+DOCUMENT = {
+    "generated_at": "2026-10-18T00:00:00",
+    "metadata": {"version": {"tag": "v1", "commit": None}},
+    "core3_protocols": {},
+    "curators": {"steakhouse": {"name": "Steakhouse Financial", "posts": [{"text": 'Line\nbreak "quoted" Ünïcode'}]}},
+    "vaults": [
+        {"id": "1-0x1", "name": "USDC Prime", "cagr": 0.0825, "tvl": 1234567.5, "fees": {"management": 0.0, "performance": 0.1}, "flags": [], "sticky_export": False},
+        # Beyond 64 bits, encoded by the json module
+        {"id": "8453-0x2", "name": "Σ vault", "raw_supply": 2**70, "risk": None, "periods": [{"period": "1M", "returns": -0.02}]},
+    ],
+    "xerberus_stats": {"coverage_pct": 50.0},
+}
+
+
+def test_stream_matches_json_dump(tmp_path: Path):
+    """Output is laid out as json.dump(indent=2), and compressed by suffix."""
+    write_json_stream(tmp_path / "top.json", DOCUMENT)
+    assert (tmp_path / "top.json").read_text(encoding="utf-8") == json.dumps(DOCUMENT, indent=2, ensure_ascii=False, allow_nan=False)
+
+    write_json_stream(tmp_path / "top.json.gz", DOCUMENT)
+    assert json.loads(gzip.decompress((tmp_path / "top.json.gz").read_bytes())) == DOCUMENT
+
+    # Records from a generator
+    with JSONStreamWriter(tmp_path / "top.json.zst") as writer:
+        writer.write_value("generated_at", DOCUMENT["generated_at"])
+        assert writer.write_array("vaults", (vault for vault in DOCUMENT["vaults"])) == 2
+    with zstandard.ZstdDecompressor().stream_reader((tmp_path / "top.json.zst").open("rb")) as reader:
+        assert json.loads(reader.read()) == {"generated_at": DOCUMENT["generated_at"], "vaults": DOCUMENT["vaults"]}
+
+
+def test_stream_releases_records(tmp_path: Path):
+    """Document generators are written as arrays, and exported rows are released as they are written."""
+    vaults = list(DOCUMENT["vaults"])
+    write_json_stream(tmp_path / "top.json", {**DOCUMENT, "vaults": release_list_items(vaults)})
+    assert vaults == []
+    assert (tmp_path / "top.json").read_text(encoding="utf-8") == json.dumps(DOCUMENT, indent=2, ensure_ascii=False, allow_nan=False)
+
+    write_json_stream(tmp_path / "empty.json", {})
+    assert (tmp_path / "empty.json").read_text() == json.dumps({}, indent=2)
+
+
+@pytest.mark.parametrize(
+    "bad_vault, message",
+    [
+        ({"id": "1-0x1", "cagr": float("nan")}, "vaults -> 1 -> cagr"),
+        ({"id": "1-0x1", "periods": [{"returns": float("inf")}]}, "vaults -> 1 -> periods -> 0 -> returns"),
+        ({"id": "1-0x1", "range": (0.1, float("nan"))}, "vaults -> 1 -> range -> 1"),
+        ({"id": "1-0x1", "last_updated_at": datetime.datetime(2026, 1, 1)}, "Non-serializable type: datetime"),
+        ({"id": "1-0x1", "fees": {1: 0.1}}, "Non-string key: int"),
+    ],
+)
+def test_stream_rejects_invalid_records(tmp_path: Path, bad_vault: dict, message: str):
+    """Invalid records abort the export and leave the previous file in place."""
+    path = tmp_path / "top.json"
+    path.write_text("previous")
+    with pytest.raises(ValueError, match=message):
+        write_json_stream(path, {"vaults": [DOCUMENT["vaults"][0], bad_vault]})
+    assert path.read_text() == "previous"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_streams_replace_all_or_nothing(tmp_path: Path):
+    """An invalid second document leaves both files untouched."""
+    export_path, state_path = tmp_path / "top.json", tmp_path / "state.json"
+    export_path.write_text("previous export")
+    state_path.write_text("previous state")
+
+    with pytest.raises(ValueError, match="vaults -> 0 -> cagr"):
+        write_json_streams([(export_path, DOCUMENT), (state_path, {"vaults": [{"cagr": float("nan")}]})])
+    assert export_path.read_text() == "previous export"
+    assert state_path.read_text() == "previous state"
+    assert sorted(tmp_path.iterdir()) == [state_path, export_path]
+
+    write_json_streams([(export_path, DOCUMENT), (state_path, {"vaults": []})])
+    assert json.loads(export_path.read_text()) == DOCUMENT
+    assert json.loads(state_path.read_text()) == {"vaults": []}
@@ -0,0 +1,59 @@
+"""Single-pass curator name matching.
+
+See :py:mod:`eth_defi.vault.name_matcher`.
+"""
+
+import re
+
+from eth_defi.vault.curator import PROTOCOL_BOUND_CURATOR_SLUGS, _build_matching_patterns, _build_protocol_manager_index, _get_pattern_texts, _identify_curator_by_name, _identify_curator_by_patterns, _identify_curator_by_protocol_manager_name, load_curator_map
+from eth_defi.vault.name_matcher import WordBoundaryMatcher
+
+
+def _find_first_regex(phrases: list[str], text: str) -> int | None:
+    for idx, phrase in enumerate(phrases):
+        if re.search(r"\b" + re.escape(phrase) + r"\b", text, re.IGNORECASE):
+            return idx
+    return None
+
+
+def test_matcher_equals_regex_loop():
+    """Phrase priority, overlaps, word boundaries and Unicode match the per-phrase regexes."""
+    phrases = ["Steakhouse Financial", "Steakhouse", "Re7 Labs", "Re7", "(Prime)", "K3 Capital", "σ-Labs", "Labs", "a.b"]
+    texts = [
+        "Steakhouse Financial USDC",
+        "steakhouse financialx",
+        "STEAKHOUSE",
+        "Steakhouses",
+        "xRe7 Labs",
+        "Re7_Labs",
+        "Re7-Labs WETH",
+        "USDC (Prime) Vault",
+        "USDC(Prime)x",
+        "Labs K3 Capital",
+        "Σ-Labs Vault",
+        "Σ-LABS",
+        "Café Steakhouse",
+        "axb a.b",
+        "",
+        "Kelvin K3 Capital",
+    ]
+    matcher = WordBoundaryMatcher(phrases)
+    for text in texts:
+        assert matcher.find_first(text) == _find_first_regex(phrases, text), text
+
+    # Real curator patterns, including exclusions
+    patterns = _build_matching_patterns()
+    for pattern_text, _ in _get_pattern_texts():
+        for text in (pattern_text, f"{pattern_text.upper()} USDC", f"x{pattern_text}", f"({pattern_text})", f"Vault {pattern_text.lower()}s"):
+            assert _identify_curator_by_name(text, exclude_slugs=PROTOCOL_BOUND_CURATOR_SLUGS) == _identify_curator_by_patterns(text, patterns, exclude_slugs=PROTOCOL_BOUND_CURATOR_SLUGS), text
+
+
+def test_protocol_manager_index():
+    """Manager name index gives the first curator in YAML order, ignoring case."""
+    index = _build_protocol_manager_index()
+    for slug, info in load_curator_map().items():
+        for protocol_slug, raw_values in info["protocol_manager_names"].items():
+            values = (raw_values,) if isinstance(raw_values, str) else raw_values
+            for value in values:
+                assert index[(protocol_slug, value.casefold())] == slug
+                assert _identify_curator_by_protocol_manager_name(protocol_slug, value.upper()) in (slug, None)
@@ -0,0 +1,77 @@
+"""Indexed vault metadata store tests.
+
+See :mod:`eth_defi.vault.vaultdb_store`.
+"""
+
+import datetime
+import pickle
+from decimal import Decimal
+
+from eth_defi.erc_4626.discovery_base import PotentialVaultMatch
+from eth_defi.vault.base import VaultSpec
+from eth_defi.vault.vaultdb import VaultDatabase
+from eth_defi.vault.vaultdb_store import LazyVaultRows, VaultMetadataStore, migrate_vault_database_pickle
+
+SPEC_A = VaultSpec(1, "0x0000000000000000000000000000000000000001")
+SPEC_B = VaultSpec(8453, "0x0000000000000000000000000000000000000002")
+
+
+def _create_pickled_db(path):
+    vault_db = VaultDatabase(
+        rows={
+            SPEC_A: {"Name": "Alpha", "Symbol": "A", "Denomination": "USDC", "Protocol": "Morpho", "NAV": Decimal("1000.5")},
+            SPEC_B: {"Name": "Beta", "Symbol": "B", "Denomination": "WETH", "Protocol": "Euler", "NAV": Decimal(3)},
+        },
+        leads={
+            SPEC_A: PotentialVaultMatch(chain=1, address=SPEC_A.vault_address, first_seen_at_block=10, first_seen_at=datetime.datetime(2024, 1, 1), deposit_count=5),
+        },
+        last_scanned_block={1: 100, 8453: 200},
+    )
+    vault_db.write(path)
+    return vault_db
+
+
+def test_migrate_and_read_lazily(tmp_path):
+    """Migrated store reads back through the VaultDatabase facade, loading rows on demand."""
+    _create_pickled_db(tmp_path / "vault-db.pickle")
+    store = migrate_vault_database_pickle(tmp_path / "vault-db.pickle", tmp_path / "vault-db.sqlite")
+
+    columns = store.read_columns(protocol="Morpho")
+    assert columns.to_dict("records") == [{"chain_id": 1, "vault_address": SPEC_A.vault_address, "name": "Alpha", "symbol": "A", "denomination": "USDC", "protocol": "Morpho", "nav": 1000.5}]
+
+    vault_db = VaultDatabase.read(tmp_path / "vault-db.sqlite")
+    assert isinstance(vault_db.rows, LazyVaultRows)
+    assert len(vault_db) == 2
+    assert SPEC_B in vault_db.rows
+    assert vault_db.rows.get_loaded_rows() == {}
+    connection = vault_db.rows.store.connection
+    assert vault_db.rows[SPEC_B]["Name"] == "Beta"
+    # Row loads reuse the store connection
+    assert vault_db.rows.store.connection is connection
+    assert list(vault_db.rows.get_loaded_rows()) == [SPEC_B]
+    assert vault_db.get_existing_leads_by_chain(1)[SPEC_A.vault_address].deposit_count == 5
+    assert vault_db.get_chain_start_block(8453) == 201
+
+
+def test_incremental_write(tmp_path):
+    """Scanner updates and in-place edits are written back; the facade still pickles."""
+    _create_pickled_db(tmp_path / "vault-db.pickle")
+    migrate_vault_database_pickle(tmp_path / "vault-db.pickle", tmp_path / "vault-db.sqlite")
+
+    vault_db = VaultDatabase.read(tmp_path / "vault-db.sqlite")
+    vault_db.rows[SPEC_A]["Name"] = "Alpha renamed"
+    spec_c = VaultSpec(1, "0x0000000000000000000000000000000000000003")
+    vault_db.update_leads_and_rows(1, 150, {}, {spec_c: {"Name": "Gamma", "Protocol": "Morpho"}})
+    del vault_db.rows[SPEC_B]
+    vault_db.write(tmp_path / "vault-db.sqlite")
+
+    reread = VaultDatabase.read(tmp_path / "vault-db.sqlite")
+    assert set(reread.rows) == {SPEC_A, spec_c}
+    assert reread.rows[SPEC_A]["Name"] == "Alpha renamed"
+    assert reread.last_scanned_block[1] == 150
+    assert VaultMetadataStore(tmp_path / "vault-db.sqlite").read_columns(protocol="Morpho")["name"].tolist() == ["Alpha renamed", "Gamma"]
+
+    # Legacy pickle consumers get a plain dict
+    legacy = pickle.loads(pickle.dumps(reread))
+    assert isinstance(legacy.rows, dict)
+    assert legacy.rows[spec_c]["Name"] == "Gamma"